@@ -2,8 +2,10 @@
 
 This API is used to access course data."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from ...database import read_only
 from ..authentication import registered_user
+from ..cached_response import cached_json_response
 from ...services.academics import CourseService
 from ...models import User
 from ...models.academics import Course, CourseDetails
@@ -21,19 +23,22 @@ openapi_tags = {
 
 
 @api.get("", response_model=list[CourseDetails], tags=["Academics"])
-def get_courses(course_service: CourseService = Depends()) -> list[CourseDetails]:
+def get_courses(
+    request: Request,
+    course_service: CourseService = Depends(read_only(CourseService)),
+) -> Response:
     """
     Get all courses
 
     Returns:
         list[CourseDetails]: All `Course`s in the `Course` database table
     """
-    return course_service.all()
+    return cached_json_response(request, "course", course_service.all)
 
 
 @api.get("/{id}", response_model=CourseDetails, tags=["Academics"])
 def get_course_by_id(
-    id: str, course_service: CourseService = Depends()
+    id: str, course_service: CourseService = Depends(read_only(CourseService))
 ) -> CourseDetails:
     """
     Gets one course by its id
@@ -46,7 +51,9 @@ def get_course_by_id(
 
 @api.get("/{subject_code}/{number}", response_model=CourseDetails, tags=["Academics"])
 def get_course_by_subject_code(
-    subject_code: str, number: str, course_service: CourseService = Depends()
+    subject_code: str,
+    number: str,
+    course_service: CourseService = Depends(read_only(CourseService)),
 ) -> CourseDetails:
     """
     Gets one course by its properties
@@ -2,8 +2,11 @@
 
 This API is used to access course data."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from ...database import read_only
 from ..authentication import registered_user
+from ..compression_policy import STREAMING_POLICY, compression
+from ..streaming import streamed_json_response
 from ...services.academics import SectionService
 from ...models import User
 from ...models.academics import Section, SectionDetails
@@ -17,19 +20,23 @@ api = APIRouter(prefix="/api/academics/section")
 
 
 @api.get("", response_model=list[SectionDetails], tags=["Academics"])
-def get_sections(section_service: SectionService = Depends()) -> list[SectionDetails]:
+@compression(STREAMING_POLICY)
+def get_sections(
+    request: Request,
+    section_service: SectionService = Depends(read_only(SectionService)),
+) -> Response:
     """
-    Get all sections
+    Get all sections, streamed as they are read
 
     Returns:
         list[SectionDetails]: All `Section`s in the `Section` database table
     """
-    return section_service.all()
+    return streamed_json_response(request, section_service.stream())
 
 
 @api.get("/{id}", response_model=SectionDetails, tags=["Academics"])
 def get_section_by_id(
-    id: int, section_service: SectionService = Depends()
+    id: int, section_service: SectionService = Depends(read_only(SectionService))
 ) -> SectionDetails:
     """
     Gets one section by its id
@@ -42,7 +49,7 @@ def get_section_by_id(
 
 @api.get("/term/{term_id}", response_model=list[SectionDetails], tags=["Academics"])
 def get_section_by_term_id(
-    term_id: str, section_service: SectionService = Depends()
+    term_id: str, section_service: SectionService = Depends(read_only(SectionService))
 ) -> list[SectionDetails]:
     """
     Gets list of sections by term ID
@@ -55,7 +62,7 @@ def get_section_by_term_id(
 
 @api.get("/subject/{subject}", response_model=list[SectionDetails], tags=["Academics"])
 def get_section_by_subject(
-    subject: str, section_service: SectionService = Depends()
+    subject: str, section_service: SectionService = Depends(read_only(SectionService))
 ) -> list[SectionDetails]:
     """
     Gets a list of sections by a subject
@@ -75,7 +82,7 @@ def get_section_by_subject_code(
     subject_code: str,
     course_number: str,
     section_number: str,
-    section_service: SectionService = Depends(),
+    section_service: SectionService = Depends(read_only(SectionService)),
 ) -> SectionDetails:
     """
     Gets one section by its properties
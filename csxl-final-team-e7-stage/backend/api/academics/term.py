@@ -2,8 +2,10 @@
 
 This API is used to access term data."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from ...database import read_only
 from ..authentication import registered_user
+from ..cached_response import cached_json_response
 from ...services.academics import TermService
 from ...models import User
 from ...models.academics import Term, TermDetails
@@ -18,18 +20,23 @@ api = APIRouter(prefix="/api/academics/term")
 
 
 @api.get("", response_model=list[TermDetails], tags=["Academics"])
-def get_terms(term_service: TermService = Depends()) -> list[TermDetails]:
+def get_terms(
+    request: Request,
+    term_service: TermService = Depends(read_only(TermService)),
+) -> Response:
     """
     Get all terms
 
     Returns:
         list[TermDetails]: All `Term`s in the `Term` database table
     """
-    return term_service.all()
+    return cached_json_response(request, "term", term_service.all)
 
 
 @api.get("/current", response_model=TermDetails, tags=["Academics"])
-def get_current_term(term_service: TermService = Depends()) -> TermDetails:
+def get_current_term(
+    term_service: TermService = Depends(read_only(TermService)),
+) -> TermDetails:
     """
     Gets the current term based on the current date
 
@@ -40,7 +47,9 @@ def get_current_term(term_service: TermService = Depends()) -> TermDetails:
 
 
 @api.get("/{id}", response_model=TermDetails, tags=["Academics"])
-def get_term_by_id(id: str, term_service: TermService = Depends()) -> TermDetails:
+def get_term_by_id(
+    id: str, term_service: TermService = Depends(read_only(TermService))
+) -> TermDetails:
     """
     Gets one term by its id
 
@@ -87,13 +87,15 @@ def registered_user(
     user_service: UserService = Depends(),
     token: HTTPAuthorizationCredentials | None = Depends(HTTPBearer()),
 ) -> User:
-    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated."""
+    """Returns the authenticated user or raises a 401 HTTPException if the user is not authenticated.
+
+    The user is resolved without their permissions, which services check as needed."""
     if token:
         try:
             auth_info = jwt.decode(
                 token.credentials, _JWT_SECRET, algorithms=[_JST_ALGORITHM]
             )
-            user = user_service.get(auth_info["pid"])
+            user = user_service.get_identity(auth_info["pid"])
             if user:
                 return user
         except:
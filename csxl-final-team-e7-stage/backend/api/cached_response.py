@@ -0,0 +1,45 @@
+"""Serve catalog listings from the cache of serialized responses.
+
+On a hit the routes skip loading entities, building models, and encoding JSON entirely,
+and the body is sent already compressed, which CompressionMiddleware passes through
+as is."""
+
+from typing import Callable, Sequence
+from fastapi import Request, Response
+from pydantic import BaseModel
+from ..services.response_cache import catalog_responses
+from .response_model import dump_json
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def cached_json_response(
+    request: Request, resource: str, load: Callable[[], Sequence[BaseModel]]
+) -> Response:
+    """The JSON response of a resource, loading and caching it if not cached.
+
+    Args:
+        request (Request): The request, whose Accept-Encoding header is honored, and
+            whose route's response model the models are encoded through.
+        resource (str): The name the resource is invalidated by, e.g. "room".
+        load (Callable[[], Sequence[BaseModel]]): Loads the models of the resource.
+
+    Returns:
+        Response: The JSON body of the models, gzipped if the client accepts it.
+    """
+    cache = catalog_responses()
+    cached = cache.get(resource)
+    if cached is None:
+        version = cache.version(resource)
+        body = dump_json(request, list(load()))
+        cached = cache.put(resource, version, body)
+
+    if cached.gzipped is None:
+        return Response(cached.body, media_type="application/json")
+    headers = {"Vary": "Accept-Encoding"}
+    if "gzip" not in request.headers.get("Accept-Encoding", ""):
+        return Response(cached.body, media_type="application/json", headers=headers)
+    headers["Content-Encoding"] = "gzip"
+    return Response(cached.gzipped, media_type="application/json", headers=headers)
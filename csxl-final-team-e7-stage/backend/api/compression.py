@@ -0,0 +1,199 @@
+"""Response compression with a per-route policy.
+
+Responses are compressed in the best encoding the client accepts, preferring zstd and
+Brotli to gzip, at a level chosen for their content type. Responses are left as they
+are when they are smaller than the policy's minimum size, of a type that is already
+compressed or must not be buffered, or already encoded. Responses streamed in more
+than one body message are compressed as they stream, with the compressor flushed after
+each message so that clients can decode every message as soon as it arrives. Bodies and
+messages of at least `OFFLOAD_SIZE` bytes are compressed on a worker thread, so that
+compressing them does not hold up other requests served by the event loop.
+
+Routes use `DEFAULT_POLICY` unless their endpoint is given another with `compression`,
+as defined in `compression_policy`. The bytes saved and CPU time spent compressing are recorded in the metrics of the
+request and reported per route at `/api/metrics`.
+"""
+
+import gzip
+import time
+import zlib
+from typing import Callable
+import anyio
+import brotli
+import zstandard
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from . import metrics
+from .compression_policy import (
+    DEFAULT_POLICY,
+    EXCLUDED_TYPES,
+    LEVELS,
+    MINIMUM_SIZE,
+    NO_COMPRESSION,
+    STREAMING_POLICY,
+    CompressionPolicy,
+    compression,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# Bodies, and messages of streamed responses, at least this large are compressed on a
+# worker thread rather than on the event loop
+OFFLOAD_SIZE = 64 * 1024
+
+# Encodings in order of preference, with a function to compress a body at a level
+ENCODERS: dict[str, Callable[[bytes, int], bytes]] = {
+    "zstd": lambda body, level: zstandard.ZstdCompressor(level=level).compress(body),
+    "br": lambda body, level: brotli.compress(body, quality=level),
+    "gzip": lambda body, level: gzip.compress(body, compresslevel=level),
+}
+
+StreamEncoder = tuple[Callable[[bytes], bytes], Callable[[], bytes]]
+
+
+def _zstd_stream(level: int) -> StreamEncoder:
+    compressor = zstandard.ZstdCompressor(level=level).compressobj()
+    flush_block = zstandard.COMPRESSOBJ_FLUSH_BLOCK
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(flush_block),
+        compressor.flush,
+    )
+
+
+def _brotli_stream(level: int) -> StreamEncoder:
+    compressor = brotli.Compressor(quality=level)
+    return (
+        lambda chunk: compressor.process(chunk) + compressor.flush(),
+        compressor.finish,
+    )
+
+
+def _gzip_stream(level: int) -> StreamEncoder:
+    compressor = zlib.compressobj(level, wbits=31)
+    return (
+        lambda chunk: compressor.compress(chunk) + compressor.flush(zlib.Z_SYNC_FLUSH),
+        compressor.flush,
+    )
+
+
+# Encodings of streamed responses, with a function starting a stream at a level. The
+# stream compresses and flushes each chunk given to its first function, and is ended
+# by its second.
+STREAM_ENCODERS: dict[str, Callable[[int], StreamEncoder]] = {
+    "zstd": _zstd_stream,
+    "br": _brotli_stream,
+    "gzip": _gzip_stream,
+}
+
+
+def _timed(compress: Callable[[], bytes]) -> tuple[bytes, float]:
+    """Compress, measuring the CPU time spent by the thread compressing."""
+    cpu_start = time.thread_time()
+    compressed = compress()
+    return compressed, time.thread_time() - cpu_start
+
+
+async def _compress(size: int, compress: Callable[[], bytes]) -> tuple[bytes, float]:
+    """Compress size bytes, on a worker thread if there are at least OFFLOAD_SIZE."""
+    if size < OFFLOAD_SIZE:
+        return _timed(compress)
+    return await anyio.to_thread.run_sync(_timed, compress)
+
+
+def accepted_encodings(request_headers: Headers) -> set[str]:
+    """The content codings named by the request's Accept-Encoding header."""
+    accepted = set()
+    for coding in request_headers.get("accept-encoding", "").split(","):
+        name, _, params = coding.strip().partition(";")
+        if params.replace(" ", "") not in ("q=0", "q=0.0", "q=0.00", "q=0.000"):
+            accepted.add(name.strip().lower())
+    return accepted
+
+
+class CompressionMiddleware:
+    """ASGI middleware compressing responses according to their route's policy."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        accepted = accepted_encodings(Headers(scope=scope))
+        encoding = next((e for e in ENCODERS if e in accepted), None)
+        start_message: Message | None = None
+        policy = DEFAULT_POLICY
+        stream: StreamEncoder | None = None
+
+        async def send_compressed(message: Message) -> None:
+            nonlocal start_message, policy, stream
+            if stream is not None and message["type"] == "http.response.body":
+                await send_stream_message(message)
+                return
+            if message["type"] == "http.response.start":
+                headers = Headers(raw=message["headers"])
+                policy = getattr(
+                    scope.get("endpoint"), "compression_policy", DEFAULT_POLICY
+                )
+                content_type = headers.get("content-type", "")
+                if "content-encoding" in headers or not policy.compresses(content_type):
+                    await send(message)
+                    return
+                if "accept-encoding" not in headers.get("vary", "").lower():
+                    MutableHeaders(scope=message).add_vary_header("Accept-Encoding")
+                if encoding is None:
+                    await send(message)
+                    return
+                # Hold the start of the response until its body is known
+                start_message = message
+                return
+
+            if start_message is None or message["type"] != "http.response.body":
+                await send(message)
+                return
+
+            start, start_message = start_message, None
+            body = message.get("body", b"")
+            headers = MutableHeaders(scope=start)
+            level = policy.level(headers.get("content-type", ""), encoding)
+            if message.get("more_body", False):
+                stream = STREAM_ENCODERS[encoding](level)
+                headers["content-encoding"] = encoding
+                if "content-length" in headers:
+                    del headers["content-length"]
+                await send(start)
+                await send_stream_message(message)
+                return
+            if len(body) < policy.minimum_size:
+                await send(start)
+                await send(message)
+                return
+
+            compressed, cpu_seconds = await _compress(
+                len(body), lambda: ENCODERS[encoding](body, level)
+            )
+            metrics.record_compression(len(body), len(compressed), cpu_seconds)
+            headers["content-encoding"] = encoding
+            headers["content-length"] = str(len(compressed))
+            await send(start)
+            await send({**message, "body": compressed})
+
+        async def send_stream_message(message: Message) -> None:
+            body = message.get("body", b"")
+            more_body = message.get("more_body", False)
+            compress, finish = stream
+
+            def compress_message() -> bytes:
+                compressed = compress(body) if body else b""
+                return compressed if more_body else compressed + finish()
+
+            compressed, cpu_seconds = await _compress(len(body), compress_message)
+            metrics.record_compression(len(body), len(compressed), cpu_seconds)
+            if compressed or not more_body:
+                await send({**message, "body": compressed})
+
+        await self.app(scope, receive, send_compressed)
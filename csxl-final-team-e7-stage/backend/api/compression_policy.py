@@ -0,0 +1,95 @@
+"""Per-route policies of when and how strongly `CompressionMiddleware` compresses responses.
+
+Routes use `DEFAULT_POLICY` unless their endpoint is given another with `compression`:
+`STREAMING_POLICY` for listings streamed a batch at a time, and `NO_COMPRESSION` for
+`/api/metrics`. Policies are kept apart from the middleware, which records what it
+saves in the request metrics, so that the metrics routes can be given a policy too.
+"""
+
+from typing import Callable, TypeVar
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+E = TypeVar("E")
+
+# Bodies that fit in a single packet gain nothing from compression
+MINIMUM_SIZE = 1400
+
+# Types already compressed, or whose proxies and clients expect each event unencoded
+EXCLUDED_TYPES = (
+    "image/png",
+    "image/jpeg",
+    "image/gif",
+    "image/webp",
+    "font/woff",
+    "video/",
+    "audio/",
+    "application/zip",
+    "application/gzip",
+    "application/octet-stream",
+    "text/event-stream",
+)
+
+# Levels of each encoding by content type, for the first matching prefix. API
+# responses are compressed on every request, so they favor speed over ratio.
+LEVELS: dict[str, dict[str, int]] = {
+    "application/json": {"zstd": 3, "br": 4, "gzip": 5},
+    "text/html": {"zstd": 6, "br": 5, "gzip": 6},
+    "": {"zstd": 3, "br": 4, "gzip": 6},
+}
+
+
+class CompressionPolicy:
+    """When and how strongly the responses of a route are compressed."""
+
+    __slots__ = ("minimum_size", "excluded_types", "levels")
+
+    def __init__(
+        self,
+        minimum_size: int | None = MINIMUM_SIZE,
+        excluded_types: tuple[str, ...] = EXCLUDED_TYPES,
+        levels: dict[str, dict[str, int]] = LEVELS,
+    ):
+        """
+        Args:
+            minimum_size (int | None): Smallest body compressed, or None to never compress.
+            excluded_types (tuple[str, ...]): Prefixes of content types never compressed.
+            levels (dict[str, dict[str, int]]): Levels of each encoding by content type prefix.
+        """
+        self.minimum_size = minimum_size
+        self.excluded_types = excluded_types
+        self.levels = levels
+
+    def compresses(self, content_type: str) -> bool:
+        """Whether responses of the content type may be compressed."""
+        return self.minimum_size is not None and not content_type.startswith(
+            self.excluded_types
+        )
+
+    def level(self, content_type: str, encoding: str) -> int:
+        """The level to compress a content type at in an encoding."""
+        for prefix, levels in self.levels.items():
+            if content_type.startswith(prefix) and encoding in levels:
+                return levels[encoding]
+        return LEVELS[""][encoding]
+
+
+DEFAULT_POLICY = CompressionPolicy()
+
+NO_COMPRESSION = CompressionPolicy(minimum_size=None)
+
+# Streamed listings compress and flush each batch as it is read, which delays the next
+# batch, so they use the fastest level of each encoding
+STREAMING_POLICY = CompressionPolicy(levels={"": {"zstd": 1, "br": 1, "gzip": 1}})
+
+
+def compression(policy: CompressionPolicy) -> Callable[[E], E]:
+    """Decorate a route's endpoint to compress its responses with the given policy."""
+
+    def decorate(endpoint: E) -> E:
+        endpoint.compression_policy = policy
+        return endpoint
+
+    return decorate
@@ -7,7 +7,7 @@ from typing import Sequence
 from fastapi import APIRouter, Depends
 from ..authentication import registered_user
 from ...models import User
-from ...models.coworking import OperatingHours, TimeRange
+from ...models.coworking import OperatingHours, OperatingHoursRecurrence, TimeRange
 from ...services.coworking import OperatingHoursService
 
 __authors__ = ["Kris Jordan"]
@@ -55,3 +55,51 @@ def delete_operating_hours(
     """Delete operating hours for the XL."""
     operating_hours = operating_hours_svc.get_by_id(id)
     return operating_hours_svc.delete(subject, operating_hours)
+
+
+@api.get(
+    "/recurrence/{id}", response_model=OperatingHoursRecurrence, tags=["Coworking"]
+)
+def get_operating_hours_recurrence(
+    id: int,
+    operating_hours_svc: OperatingHoursService = Depends(),
+):
+    """Get a recurring weekly operating hours template."""
+    return operating_hours_svc.get_recurrence(id)
+
+
+@api.post("/recurrence", response_model=OperatingHoursRecurrence, tags=["Coworking"])
+def new_operating_hours_recurrence(
+    recurrence: OperatingHoursRecurrence,
+    subject: User = Depends(registered_user),
+    operating_hours_svc: OperatingHoursService = Depends(),
+):
+    """Create recurring weekly opening hours for the XL over a term."""
+    return operating_hours_svc.create_recurrence(subject, recurrence)
+
+
+@api.post(
+    "/recurrence/{id}/extend",
+    response_model=OperatingHoursRecurrence,
+    tags=["Coworking"],
+)
+def extend_operating_hours_recurrence(
+    id: int,
+    until: datetime,
+    subject: User = Depends(registered_user),
+    operating_hours_svc: OperatingHoursService = Depends(),
+):
+    """Materialize a recurring template's operating hours through a later date."""
+    recurrence = operating_hours_svc.get_recurrence(id)
+    return operating_hours_svc.extend_recurrence(subject, recurrence, until)
+
+
+@api.delete("/recurrence/{id}", tags=["Coworking"])
+def delete_operating_hours_recurrence(
+    id: int,
+    subject: User = Depends(registered_user),
+    operating_hours_svc: OperatingHoursService = Depends(),
+):
+    """Delete a recurring template and its upcoming operating hours."""
+    recurrence = operating_hours_svc.get_recurrence(id)
+    return operating_hours_svc.delete_recurrence(subject, recurrence)
@@ -0,0 +1,74 @@
+"""Coworking Policy API
+
+This API manages the data-driven policies of the coworking reservation system."""
+
+from fastapi import APIRouter, Depends
+from ..authentication import registered_user
+from ...models import User
+from ...models.coworking import GroupPolicy, RoomPolicy
+from ...services.coworking import PolicyService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+api = APIRouter(prefix="/api/coworking/policy")
+
+
+@api.get("/group", response_model=list[GroupPolicy], tags=["Coworking"])
+def list_group_policies(
+    subject: User = Depends(registered_user),
+    policy_svc: PolicyService = Depends(),
+):
+    """List policy values overridden for everyone or for a role."""
+    return policy_svc.list_group_policies(subject)
+
+
+@api.put("/group", response_model=GroupPolicy, tags=["Coworking"])
+def set_group_policy(
+    policy: GroupPolicy,
+    subject: User = Depends(registered_user),
+    policy_svc: PolicyService = Depends(),
+):
+    """Create or replace a policy value for everyone or for a role."""
+    return policy_svc.set_group_policy(subject, policy)
+
+
+@api.delete("/group/{id}", tags=["Coworking"])
+def delete_group_policy(
+    id: int,
+    subject: User = Depends(registered_user),
+    policy_svc: PolicyService = Depends(),
+):
+    """Remove a policy override, restoring the default value."""
+    return policy_svc.delete_group_policy(subject, id)
+
+
+@api.get("/room", response_model=list[RoomPolicy], tags=["Coworking"])
+def list_room_policies(
+    subject: User = Depends(registered_user),
+    policy_svc: PolicyService = Depends(),
+):
+    """List weekly blocks during which rooms are held."""
+    return policy_svc.list_room_policies(subject)
+
+
+@api.post("/room", response_model=RoomPolicy, tags=["Coworking"])
+def add_room_policy(
+    policy: RoomPolicy,
+    subject: User = Depends(registered_user),
+    policy_svc: PolicyService = Depends(),
+):
+    """Hold a room during a weekly block, such as office hours."""
+    return policy_svc.add_room_policy(subject, policy)
+
+
+@api.delete("/room/{id}", tags=["Coworking"])
+def delete_room_policy(
+    id: int,
+    subject: User = Depends(registered_user),
+    policy_svc: PolicyService = Depends(),
+):
+    """Remove a weekly room hold."""
+    return policy_svc.delete_room_policy(subject, id)
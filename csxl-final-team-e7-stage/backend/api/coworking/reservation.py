@@ -2,20 +2,24 @@
 
 This API is used to make and manage reservations."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from typing import Sequence
-from datetime import datetime
+from datetime import date, datetime, time, timedelta
 
 from backend.models.room import Room
 from ..authentication import registered_user
+from ..idempotency import idempotency_key, idempotent_json_response
+from ...services.idempotency import IdempotencyService
 from ...services.coworking.reservation import ReservationException, ReservationService
+from ...services.coworking.room_search import RoomSearchService
 from ...models import User
 from ...models.coworking import (
     Reservation,
     ReservationRequest,
     ReservationPartial,
     ReservationState,
-    ReservationMapDetails
+    ReservationMapDetails,
+    RoomSlot,
 )
 
 __authors__ = ["Kris Jordan, Yuvraj Jain"]
@@ -32,12 +36,24 @@ openapi_tags = {
 
 @api.post("/reservation", tags=["Coworking"])
 def draft_reservation(
+    request: Request,
     reservation_request: ReservationRequest,
     subject: User = Depends(registered_user),
     reservation_svc: ReservationService = Depends(),
+    key: str | None = Depends(idempotency_key),
+    idempotency_svc: IdempotencyService = Depends(),
 ) -> Reservation:
-    """Draft a reservation request."""
-    return reservation_svc.draft_reservation(subject, reservation_request)
+    """Draft a reservation request.
+
+    Retries sent with the same `Idempotency-Key` are sent the first draft again."""
+    return idempotent_json_response(  # type: ignore[return-value]
+        request,
+        subject,
+        key,
+        idempotency_svc,
+        lambda: reservation_svc.draft_reservation(subject, reservation_request),
+        reservation_request,
+    )
 
 
 @api.get("/reservation/{id}", tags=["Coworking"])
@@ -105,3 +121,29 @@ def get_total_hours_study_room_reservations(
 ) -> str:
     """Allows a user to know how many hours they have reserved in all study rooms (Excludes CSXL)."""
     return reservation_svc._get_total_time_user_reservations(subject)
+
+
+@api.get("/room-search", tags=["Coworking"])
+def search_free_rooms(
+    duration: int,
+    start_date: date,
+    end_date: date,
+    earliest: time = time(0),
+    latest: time | None = None,
+    capacity: int = 1,
+    limit: int = 10,
+    subject: User = Depends(registered_user),
+    room_search_svc: RoomSearchService = Depends(),
+) -> Sequence[RoomSlot]:
+    """Find free study rooms for `duration` minutes between `start_date` and `end_date`,
+    starting no earlier than `earliest` and ending by `latest` each day."""
+    return room_search_svc.search(
+        subject,
+        timedelta(minutes=duration),
+        start_date,
+        end_date,
+        earliest,
+        latest,
+        capacity,
+        limit,
+    )
@@ -0,0 +1,30 @@
+"""Coworking Utilization API
+
+This API reports how the seats and rooms of the XL are used, for staff analytics."""
+
+from datetime import datetime, timedelta
+from fastapi import APIRouter, Depends
+from ..authentication import registered_user
+from ...models import User
+from ...models.coworking import TimeRange, UtilizationReport
+from ...services.coworking import UtilizationService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+api = APIRouter(prefix="/api/coworking/utilization")
+
+
+@api.get("", response_model=UtilizationReport, tags=["Coworking"])
+def get_utilization(
+    start: datetime | None = None,
+    end: datetime | None = None,
+    subject: User = Depends(registered_user),
+    utilization_svc: UtilizationService = Depends(),
+):
+    """Summarize seat and room utilization over a span, by default the past four weeks."""
+    end = end or datetime.now()
+    start = start or end - timedelta(weeks=4)
+    return utilization_svc.get_report(subject, TimeRange(start=start, end=end))
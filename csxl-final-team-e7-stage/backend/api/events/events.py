@@ -2,7 +2,7 @@
 
 Event routes are used to create, retrieve, and update Events."""
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request, Response
 from datetime import datetime, timedelta
 from typing import Sequence
 from backend.models.public_user import PublicUser
@@ -10,6 +10,7 @@ from backend.models.pagination import EventPaginationParams, Paginated, Paginati
 
 from backend.services.organization import OrganizationService
 
+from ...database import read_only
 from ...services.event import EventService
 from ...services.user import UserService
 from ...services.exceptions import ResourceNotFoundException, UserPermissionException
@@ -17,6 +18,10 @@ from ...models.event import DraftEvent
 from ...models.event_details import EventDetails
 from ...models.coworking.time_range import TimeRange
 from ...api.authentication import registered_user
+from ...api.compression_policy import STREAMING_POLICY, compression
+from ...api.idempotency import idempotency_key, idempotent_json_response
+from ...services.idempotency import IdempotencyService
+from ...api.streaming import streamed_json_response
 from ...models.user import User
 
 __authors__ = [
@@ -39,7 +44,7 @@ openapi_tags = {
 @api.get("/paginate", tags=["Events"])
 def list_events(
     subject: User = Depends(registered_user),
-    event_service: EventService = Depends(),
+    event_service: EventService = Depends(read_only(EventService)),
     order_by: str = "time",
     ascending: str = "true",
     filter: str = "",
@@ -60,7 +65,7 @@ def list_events(
 
 @api.get("/paginate/unauthenticated", tags=["Events"])
 def list_events_unauthenticated(
-    event_service: EventService = Depends(),
+    event_service: EventService = Depends(read_only(EventService)),
     order_by: str = "time",
     ascending: str = "true",
     filter: str = "",
@@ -80,33 +85,40 @@ def list_events_unauthenticated(
 
 
 @api.get("", response_model=list[EventDetails], tags=["Events"])
+@compression(STREAMING_POLICY)
 def get_events(
-    subject: User = Depends(registered_user), event_service: EventService = Depends()
-) -> list[EventDetails]:
+    request: Request,
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(read_only(EventService)),
+) -> Response:
     """
-    Get all events
+    Get all events, streamed as they are read
 
     Args:
+        request: the request, whose Accept header may ask for newline-delimited JSON
         subject: a valid User model representing the currently logged in User
         event_service: a valid EventService
 
     Returns:
         list[EventDetails]: All `EventDetails`s in the `Event` database table
     """
-    return event_service.all(subject)
+    return streamed_json_response(request, event_service.stream(subject))
 
 
 @api.get("/range", response_model=list[EventDetails], tags=["Events"])
+@compression(STREAMING_POLICY)
 def get_events_in_time_range(
+    request: Request,
     subject: User = Depends(registered_user),
     start: datetime | None = None,
     end: datetime | None = None,
-    event_service: EventService = Depends(),
-) -> list[EventDetails]:
+    event_service: EventService = Depends(read_only(EventService)),
+) -> Response:
     """
-    Get all events in the time range
+    Get all events in the time range, streamed as they are read
 
     Args:
+        request: the request, whose Accept header may ask for newline-delimited JSON
         subject: a valid User model representing the currently logged in User
         start (optional): a datetime object representing the start time of the range.
         end (optional): a datetime object representing the start time of the range.
@@ -119,15 +131,17 @@ def get_events_in_time_range(
     end = datetime.now() + timedelta(days=365) if end is None else end
     time_range = TimeRange(start=start, end=end)
 
-    return event_service.get_events_in_time_range(time_range, subject)
+    return streamed_json_response(
+        request, event_service.stream_in_time_range(time_range, subject)
+    )
 
 
 @api.get("/organization/{slug}", response_model=list[EventDetails], tags=["Events"])
 def get_events_by_organization(
     slug: str,
     subject: User = Depends(registered_user),
-    event_service: EventService = Depends(),
-    organization_service: OrganizationService = Depends(),
+    event_service: EventService = Depends(read_only(EventService)),
+    organization_service: OrganizationService = Depends(read_only(OrganizationService)),
 ) -> list[EventDetails]:
     """
     Get all events from an organization
@@ -145,6 +159,24 @@ def get_events_by_organization(
     return event_service.get_events_by_organization(organization, subject)
 
 
+@api.get("/managed", response_model=list[EventDetails], tags=["Events"])
+def get_managed_events(
+    subject: User = Depends(registered_user),
+    event_service: EventService = Depends(read_only(EventService)),
+) -> list[EventDetails]:
+    """
+    Get the events the current user can edit
+
+    Args:
+        subject: a valid User model representing the currently logged in User
+        event_service: a valid EventService
+
+    Returns:
+        list[EventDetails]: The events the user organizes or may update, in order of time
+    """
+    return event_service.get_managed_events(subject)
+
+
 @api.get(
     "/{id}",
     responses={404: {"model": None}},
@@ -154,7 +186,7 @@ def get_events_by_organization(
 def get_event_by_id(
     id: int,
     subject: User = Depends(registered_user),
-    event_service: EventService = Depends(),
+    event_service: EventService = Depends(read_only(EventService)),
 ) -> EventDetails:
     """
     Get event with matching id
@@ -171,15 +203,18 @@ def get_event_by_id(
 
 
 @api.get("/range/unauthenticated", response_model=list[EventDetails], tags=["Events"])
+@compression(STREAMING_POLICY)
 def get_events_in_time_range_unauthenticated(
+    request: Request,
     start: datetime | None = None,
     end: datetime | None = None,
-    event_service: EventService = Depends(),
-) -> list[EventDetails]:
+    event_service: EventService = Depends(read_only(EventService)),
+) -> Response:
     """
-    Get all events in the time range for unauthenticated users
+    Get all events in the time range for unauthenticated users, streamed as they are read
 
     Args:
+        request: the request, whose Accept header may ask for newline-delimited JSON
         start (optional): a datetime object representing the start time of the range.
         end (optional): a datetime object representing the start time of the range.
         event_service: a valid EventService
@@ -191,7 +226,9 @@ def get_events_in_time_range_unauthenticated(
     end = datetime.now() + timedelta(days=365) if end is None else end
     time_range = TimeRange(start=start, end=end)
 
-    return event_service.get_events_in_time_range(time_range)
+    return streamed_json_response(
+        request, event_service.stream_in_time_range(time_range)
+    )
 
 
 @api.get(
@@ -201,8 +238,8 @@ def get_events_in_time_range_unauthenticated(
 )
 def get_events_by_organization_unauthenticated(
     slug: str,
-    event_service: EventService = Depends(),
-    organization_service: OrganizationService = Depends(),
+    event_service: EventService = Depends(read_only(EventService)),
+    organization_service: OrganizationService = Depends(read_only(OrganizationService)),
 ) -> list[EventDetails]:
     """
     Get all events from an organization for unauthenticated users
@@ -226,7 +263,7 @@ def get_events_by_organization_unauthenticated(
     tags=["Events"],
 )
 def get_event_by_id_unauthenticated(
-    id: int, event_service: EventService = Depends()
+    id: int, event_service: EventService = Depends(read_only(EventService))
 ) -> EventDetails:
     """
     Get event with matching id for unauthenticated users
@@ -302,11 +339,14 @@ def delete_event(
 
 @api.post("/{event_id}/registration", tags=["Events"])
 def register_for_event(
+    request: Request,
     event_id: int,
     user_id: int = -1,
     subject: User = Depends(registered_user),
     event_service: EventService = Depends(),
     user_service: UserService = Depends(),
+    key: str | None = Depends(idempotency_key),
+    idempotency_svc: IdempotencyService = Depends(),
 ) -> PublicUser:
     """
     Register a user event based on the event ID.
@@ -315,22 +355,33 @@ def register_for_event(
     logged in user's ID as the user_id. Another user's ID is expected when a
     user is being registered by an administrator.
 
+    Retries sent with the same `Idempotency-Key` are sent the first registration again.
+
     Args:
+        request: the request, which identifies retries along with the key
         event_id: an int representing a unique event ID
         user_id: (optional) an int representing the user being registered for an event
         subject: a valid User model representing the currently logged in User
         event_service: a valid EventService
+        key: (optional) the Idempotency-Key header of the request
+        idempotency_svc: a valid IdempotencyService
 
     Returns:
         EventRegistration details
     """
-    if user_id == -1 and subject.id is not None:
-        user = subject
-    else:
-        user = user_service.get_by_id(user_id)
 
-    event: EventDetails = event_service.get_by_id(event_id, subject)
-    return event_service.register(subject, user, event)
+    def register() -> PublicUser:
+        if user_id == -1 and subject.id is not None:
+            user = subject
+        else:
+            user = user_service.get_by_id(user_id)
+
+        event: EventDetails = event_service.get_by_id(event_id, subject)
+        return event_service.register(subject, user, event)
+
+    return idempotent_json_response(  # type: ignore[return-value]
+        request, subject, key, idempotency_svc, register
+    )
 
 
 @api.get("/{event_id}/registration", tags=["Events"])
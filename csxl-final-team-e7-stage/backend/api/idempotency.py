@@ -0,0 +1,72 @@
+"""Honor the `Idempotency-Key` header of requests that create things.
+
+Routes depend on `idempotency_key` for the header and return the
+`idempotent_json_response` of the operation they run. Without a key the operation is
+run as usual. With one, a retry of a request that succeeded is sent the first response
+again, marked by an `Idempotent-Replayed` header, without the operation being rerun."""
+
+import hashlib
+from typing import Callable
+from fastapi import Header, Request, Response
+from pydantic import BaseModel
+from ..models import User
+from .response_model import dump_json
+from ..services.idempotency import IdempotencyService
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def idempotency_key(
+    idempotency_key: str | None = Header(None, min_length=1, max_length=255),
+) -> str | None:
+    """The request's `Idempotency-Key` header, if it has one."""
+    return idempotency_key
+
+
+def fingerprint(request: Request, payload: BaseModel | None = None) -> str:
+    """A digest of a request's method, URL, and parsed body."""
+    digest = hashlib.sha256(f"{request.method} {request.url.path}".encode())
+    digest.update(f"?{request.url.query}\n".encode())
+    if payload is not None:
+        digest.update(payload.model_dump_json().encode())
+    return digest.hexdigest()
+
+
+def idempotent_json_response(
+    request: Request,
+    subject: User,
+    key: str | None,
+    idempotency_svc: IdempotencyService,
+    operation: Callable[[], BaseModel],
+    payload: BaseModel | None = None,
+) -> Response | BaseModel:
+    """Run an operation once per idempotency key, replaying its response to retries.
+
+    Args:
+        request (Request): The request, whose method and URL identify it, and whose
+            route's response model the response is encoded through.
+        subject (User): The user making the request.
+        key (str | None): The request's `Idempotency-Key`, if any.
+        idempotency_svc (IdempotencyService): Injected with the same session as the
+            services the operation writes through, so the key commits with its effects.
+        operation (Callable[[], BaseModel]): Runs the request.
+        payload (BaseModel | None): The request's parsed body, if it has one.
+
+    Returns:
+        Response | BaseModel: The operation's model, if there is no key, or otherwise
+            the JSON response of its first successful run.
+    """
+    if key is None:
+        return operation()
+    replay = idempotency_svc.claim(subject, key, fingerprint(request, payload))
+    if replay is not None:
+        return Response(
+            replay,
+            media_type="application/json",
+            headers={"Idempotent-Replayed": "true"},
+        )
+    body = dump_json(request, operation())
+    idempotency_svc.complete(subject, key, body)
+    return Response(body, media_type="application/json")
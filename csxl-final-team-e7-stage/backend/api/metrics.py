@@ -0,0 +1,328 @@
+"""Request and database instrumentation.
+
+Every HTTP request is timed along with each SQL statement it executes. Per-request
+totals are returned to the client in a `Server-Timing` header, aggregated per route
+for scraping at `/api/metrics` in the Prometheus text format by users granted
+`metrics.read`, and logged when a request exceeds the configured thresholds:
+
+* `SLOW_REQUEST_MS` (default 500): total request time in milliseconds
+* `SLOW_REQUEST_QUERIES` (default 25): number of SQL statements executed
+
+The bytes saved and CPU time spent by `CompressionMiddleware` are aggregated per route
+as well.
+"""
+
+import logging
+import os
+import time
+from contextvars import ContextVar
+from threading import Lock
+from fastapi import APIRouter, Depends
+from fastapi.responses import PlainTextResponse
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+from ..models import User
+from ..services.permission import PermissionService
+from .authentication import registered_user
+from .compression_policy import NO_COMPRESSION, compression
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+logger = logging.getLogger(__name__)
+
+api = APIRouter(prefix="/api/metrics")
+
+# Upper bounds, in seconds, of the request duration histogram buckets
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0)
+
+# Longest prefix of a SQL statement kept when reporting the slowest statement
+STATEMENT_PREVIEW_LENGTH = 200
+
+
+class RequestStats:
+    """Database activity recorded while serving a single request."""
+
+    __slots__ = (
+        "query_count",
+        "commit_count",
+        "db_seconds",
+        "slowest_seconds",
+        "slowest_statement",
+        "bytes_saved",
+        "compression_seconds",
+    )
+
+    def __init__(self):
+        self.query_count = 0
+        self.commit_count = 0
+        self.db_seconds = 0.0
+        self.slowest_seconds = 0.0
+        self.slowest_statement = ""
+        self.bytes_saved = 0
+        self.compression_seconds = 0.0
+
+    def record(self, statement: str, seconds: float) -> None:
+        self.query_count += 1
+        self.db_seconds += seconds
+        if seconds > self.slowest_seconds:
+            self.slowest_seconds = seconds
+            self.slowest_statement = statement[:STATEMENT_PREVIEW_LENGTH]
+
+
+_current_stats: ContextVar[RequestStats | None] = ContextVar(
+    "current_request_stats", default=None
+)
+
+
+def current_stats() -> RequestStats | None:
+    """The stats of the request being served in this context, if any."""
+    return _current_stats.get()
+
+
+def track_queries() -> RequestStats:
+    """Begin recording SQL statements executed in the current context.
+
+    Used by the middleware for each request, and by tools such as the benchmark
+    harness to count queries outside of HTTP requests."""
+    stats = RequestStats()
+    _current_stats.set(stats)
+    return stats
+
+
+def record_compression(size: int, compressed_size: int, cpu_seconds: float) -> None:
+    """Record a response body compressed while serving the current request."""
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.bytes_saved += size - compressed_size
+        stats.compression_seconds += cpu_seconds
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    if _current_stats.get() is not None:
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    stats = _current_stats.get()
+    if stats is not None and conn.info.get("query_start_time"):
+        stats.record(
+            statement, time.perf_counter() - conn.info["query_start_time"].pop()
+        )
+
+
+def _commit(conn):
+    stats = _current_stats.get()
+    if stats is not None:
+        stats.commit_count += 1
+
+
+def install_query_listeners() -> None:
+    """Listen to statements and commits of every Engine. Safe to call more than once."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "commit", _commit)
+
+
+class RouteMetrics:
+    """Aggregate metrics of every request served by one route."""
+
+    __slots__ = (
+        "count",
+        "seconds",
+        "db_seconds",
+        "query_count",
+        "commit_count",
+        "bytes_saved",
+        "compression_seconds",
+        "max_seconds",
+        "buckets",
+    )
+
+    def __init__(self):
+        self.count = 0
+        self.seconds = 0.0
+        self.db_seconds = 0.0
+        self.query_count = 0
+        self.commit_count = 0
+        self.bytes_saved = 0
+        self.compression_seconds = 0.0
+        self.max_seconds = 0.0
+        self.buckets = [0] * len(DURATION_BUCKETS)
+
+    def observe(self, seconds: float, stats: RequestStats) -> None:
+        self.count += 1
+        self.seconds += seconds
+        self.db_seconds += stats.db_seconds
+        self.query_count += stats.query_count
+        self.commit_count += stats.commit_count
+        self.bytes_saved += stats.bytes_saved
+        self.compression_seconds += stats.compression_seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        for i, bound in enumerate(DURATION_BUCKETS):
+            if seconds <= bound:
+                self.buckets[i] += 1
+
+
+_metrics_lock = Lock()
+_route_metrics: dict[tuple[str, str, int], RouteMetrics] = {}
+
+
+def observe(method: str, route: str, status: int, seconds: float, stats: RequestStats):
+    """Add a served request to the per-route aggregates."""
+    with _metrics_lock:
+        key = (method, route, status)
+        if key not in _route_metrics:
+            _route_metrics[key] = RouteMetrics()
+        _route_metrics[key].observe(seconds, stats)
+
+
+def reset_metrics() -> None:
+    """Clear all aggregated metrics."""
+    with _metrics_lock:
+        _route_metrics.clear()
+
+
+# Families of the per-route aggregates, by name, type, and help text
+FAMILIES = (
+    ("http_requests_total", "counter", "Requests served."),
+    ("http_request_duration_seconds", "histogram", "Time spent serving requests."),
+    (
+        "http_request_db_seconds_total",
+        "counter",
+        "Time spent executing SQL statements.",
+    ),
+    ("http_request_db_queries_total", "counter", "SQL statements executed."),
+    ("http_request_db_commits_total", "counter", "Transactions committed."),
+    (
+        "http_response_compression_bytes_saved_total",
+        "counter",
+        "Bytes saved by compressing responses.",
+    ),
+    (
+        "http_response_compression_seconds_total",
+        "counter",
+        "CPU time spent compressing responses.",
+    ),
+    ("http_request_duration_seconds_max", "gauge", "Slowest request served."),
+)
+
+
+def _samples(labels: str, metrics: RouteMetrics) -> dict[str, list[str]]:
+    """The sample lines of a route's aggregates, by family."""
+    histogram = [
+        f'http_request_duration_seconds_bucket{{{labels},le="{bound}"}} {count}'
+        for bound, count in zip(DURATION_BUCKETS, metrics.buckets)
+    ]
+    histogram += [
+        f'http_request_duration_seconds_bucket{{{labels},le="+Inf"}} {metrics.count}',
+        f"http_request_duration_seconds_sum{{{labels}}} {metrics.seconds}",
+        f"http_request_duration_seconds_count{{{labels}}} {metrics.count}",
+    ]
+    values = {
+        "http_requests_total": metrics.count,
+        "http_request_db_seconds_total": metrics.db_seconds,
+        "http_request_db_queries_total": metrics.query_count,
+        "http_request_db_commits_total": metrics.commit_count,
+        "http_response_compression_bytes_saved_total": metrics.bytes_saved,
+        "http_response_compression_seconds_total": metrics.compression_seconds,
+        "http_request_duration_seconds_max": metrics.max_seconds,
+    }
+    samples = {name: [f"{name}{{{labels}}} {value}"] for name, value in values.items()}
+    samples["http_request_duration_seconds"] = histogram
+    return samples
+
+
+def render_metrics() -> str:
+    """Render the per-route aggregates in the Prometheus text exposition format.
+
+    The samples of each family follow its `# HELP` and `# TYPE` lines, as the format
+    requires, rather than being grouped by route."""
+    with _metrics_lock:
+        routes = [
+            _samples(f'method="{method}",route="{route}",status="{status}"', metrics)
+            for (method, route, status), metrics in sorted(_route_metrics.items())
+        ]
+    lines = []
+    for name, kind, help in FAMILIES:
+        lines.append(f"# HELP {name} {help}")
+        lines.append(f"# TYPE {name} {kind}")
+        for samples in routes:
+            lines.extend(samples[name])
+    return "\n".join(lines) + "\n"
+
+
+class RequestMetricsMiddleware:
+    """ASGI middleware recording time and SQL statements of each HTTP request."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+        self.slow_request_seconds = int(os.getenv("SLOW_REQUEST_MS", "500")) / 1000
+        self.slow_request_queries = int(os.getenv("SLOW_REQUEST_QUERIES", "25"))
+        install_query_listeners()
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        stats = track_queries()
+        start = time.perf_counter()
+        status = 500
+
+        async def send_with_server_timing(message: Message) -> None:
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+                elapsed_ms = (time.perf_counter() - start) * 1000
+                server_timing = (
+                    f"app;dur={elapsed_ms:.1f}, "
+                    f'db;dur={stats.db_seconds * 1000:.1f};desc="{stats.query_count} queries"'
+                )
+                message["headers"] = list(message.get("headers", [])) + [
+                    (b"server-timing", server_timing.encode("latin-1"))
+                ]
+            await send(message)
+
+        try:
+            await self.app(scope, receive, send_with_server_timing)
+        finally:
+            seconds = time.perf_counter() - start
+            route = scope.get("route")
+            route_path = route.path if route is not None else "static"
+            observe(scope["method"], route_path, status, seconds, stats)
+            if (
+                seconds >= self.slow_request_seconds
+                or stats.query_count >= self.slow_request_queries
+            ):
+                logger.warning(
+                    "Slow request %s %s (%s): %.1fms total, %.1fms in %d queries; "
+                    "slowest %.1fms: %s",
+                    scope["method"],
+                    scope["path"],
+                    route_path,
+                    seconds * 1000,
+                    stats.db_seconds * 1000,
+                    stats.query_count,
+                    stats.slowest_seconds * 1000,
+                    stats.slowest_statement,
+                )
+            _current_stats.set(None)
+
+
+# Scrapes are not compressed, so that they do not add to the compression they report
+@api.get("", response_class=PlainTextResponse, include_in_schema=False)
+@compression(NO_COMPRESSION)
+def metrics(
+    subject: User = Depends(registered_user),
+    permission_svc: PermissionService = Depends(),
+) -> str:
+    """Per-route request and database metrics in the Prometheus text format.
+
+    Scrapers authenticate as a user granted `metrics.read` on `metrics`, since routes,
+    traffic, and timings reveal more about the API than it serves to others."""
+    permission_svc.enforce(subject, "metrics.read", "metrics")
+    return render_metrics()
@@ -2,15 +2,19 @@
 
 Organization routes are used to create, retrieve, and update Organizations."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
 from backend.services.user import UserService
 
+from ..database import read_only
 from ..services import OrganizationService
 from ..models.organization import Organization
 from ..models.organization_details import OrganizationDetails
 from ..models.organization_member import OrganizationMember
 from ..api.authentication import registered_user
+from .cached_response import cached_json_response
+from .compression_policy import STREAMING_POLICY, compression
+from .streaming import accepts_ndjson, streamed_json_response
 from ..models.user import User
 from ..models.public_user import PublicUser
 
@@ -26,21 +30,32 @@ openapi_tags = {
 
 
 @api.get("", response_model=list[Organization], tags=["Organizations"])
+@compression(STREAMING_POLICY)
 def get_organizations(
-    organization_service: OrganizationService = Depends(),
-) -> list[Organization]:
+    request: Request,
+    organization_service: OrganizationService = Depends(
+        read_only(OrganizationService)
+    ),
+) -> Response:
     """
     Get all organizations
 
     Parameters:
+        request: the request, for the encodings and formats it accepts
         organization_service: a valid OrganizationService
 
     Returns:
         list[Organization]: All `Organization`s in the `Organization` database table
     """
 
-    # Return all organizations
-    return organization_service.all()
+    # Stream organizations to clients asking for newline-delimited JSON
+    if accepts_ndjson(request):
+        return streamed_json_response(request, organization_service.stream())
+
+    # Return all organizations, as seen by an anonymous subject
+    response = cached_json_response(request, "organization", organization_service.all)
+    response.headers.add_vary_header("Accept")
+    return response
 
 
 @api.post("", response_model=Organization, tags=["Organizations"])
@@ -67,6 +82,26 @@ def new_organization(
     return organization_service.create(subject, organization)
 
 
+@api.get("/managed", response_model=list[Organization], tags=["Organizations"])
+def get_managed_organizations(
+    subject: User = Depends(registered_user),
+    organization_service: OrganizationService = Depends(
+        read_only(OrganizationService)
+    ),
+) -> list[Organization]:
+    """
+    Get the organizations the current user can manage
+
+    Parameters:
+        subject: a valid User model representing the currently logged in User
+        organization_service: a valid OrganizationService
+
+    Returns:
+        list[Organization]: Each `Organization` the user may update, as an admin or leader
+    """
+    return organization_service.get_managed_organizations(subject)
+
+
 @api.get(
     "/{slug}",
     responses={404: {"model": None}},
@@ -74,7 +109,10 @@ def new_organization(
     tags=["Organizations"],
 )
 def get_organization_by_slug(
-    slug: str, organization_service: OrganizationService = Depends()
+    slug: str,
+    organization_service: OrganizationService = Depends(
+        read_only(OrganizationService)
+    ),
 ) -> OrganizationDetails:
     """
     Get organization with matching slug
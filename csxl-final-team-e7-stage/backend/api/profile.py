@@ -2,10 +2,11 @@
 
 This API is used to retrieve and update a user's profile."""
 
-from fastapi import APIRouter, Depends
-from .authentication import authenticated_pid
-from ..services import UserService
-from ..models import UserDetails, User, UnregisteredUser, ProfileForm
+from fastapi import APIRouter, Depends, HTTPException
+from .authentication import authenticated_pid, registered_user
+from ..database import read_only
+from ..services import PermissionService, UserService
+from ..models import UserDetails, User, UnregisteredUser, ProfileForm, PermissionCheck
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -21,6 +22,9 @@ openapi_tags = {
 PID = 0
 ONYEN = 1
 
+# Most permission checks answered by one request
+MAX_PERMISSION_CHECKS = 500
+
 
 @api.get("", response_model=UserDetails | UnregisteredUser, tags=["Profile"])
 def read_profile(
@@ -82,3 +86,24 @@ def update_profile(
         return user_details
     else:
         raise Exception("Unexpected internal server error.")
+
+
+@api.post("/permissions/check", response_model=list[bool], tags=["Profile"])
+def check_permissions(
+    checks: list[PermissionCheck],
+    subject: User = Depends(registered_user),
+    permission_svc: PermissionService = Depends(read_only(PermissionService)),
+) -> list[bool]:
+    """Check whether you may carry out each of a batch of actions on resources.
+
+    Every check is answered from your permissions, loaded once, so that a page can decide
+    which of its capabilities to show with a single request.
+    """
+    if len(checks) > MAX_PERMISSION_CHECKS:
+        raise HTTPException(
+            status_code=422,
+            detail=f"At most {MAX_PERMISSION_CHECKS} permissions can be checked at once",
+        )
+    return permission_svc.check_many(
+        subject, [(check.action, check.resource) for check in checks]
+    )
@@ -0,0 +1,75 @@
+"""Encode what a route returns through its response model, for routes that build their
+JSON responses themselves.
+
+FastAPI validates and serializes the value a route returns through its response model,
+which drops fields the model does not declare and encodes values, such as durations,
+as the OpenAPI schema documents them. Routes returning a `Response` they encoded skip
+that, so they encode with `dump_json` and `dump_json_items`, which do the same."""
+
+import orjson
+from typing import Any, Callable, Iterable, get_args, get_origin
+from fastapi import Request
+from fastapi.encoders import jsonable_encoder
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, TypeAdapter
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# Adapters of the response model of each endpoint, and of the items of list models
+_adapters: dict[tuple[Callable, bool], TypeAdapter | None] = {}
+
+
+def response_adapter(request: Request, items: bool = False) -> TypeAdapter | None:
+    """The adapter of the response model of the route serving a request.
+
+    Args:
+        request (Request): The request being served.
+        items (bool): Whether to adapt the items of a list response model instead.
+
+    Returns:
+        TypeAdapter | None: The adapter, or None if the route has no response model.
+    """
+    route = request.scope.get("route")
+    if not isinstance(route, APIRoute):
+        return None
+    key = (route.endpoint, items)
+    if key not in _adapters:
+        response_model = route.response_model
+        if items and get_origin(response_model) is list:
+            (response_model,) = get_args(response_model)
+        elif items:
+            response_model = None
+        _adapters[key] = None if response_model is None else TypeAdapter(response_model)
+    return _adapters[key]
+
+
+def _is_built(content: Any) -> bool:
+    """Whether content is made of models already, which need no validation."""
+    if isinstance(content, BaseModel):
+        return True
+    return isinstance(content, list) and all(
+        isinstance(item, BaseModel) for item in content
+    )
+
+
+def _dump(adapter: TypeAdapter | None, content: Any) -> bytes:
+    if adapter is None:
+        return orjson.dumps(jsonable_encoder(content))
+    # Models, including those constructed without validation from trusted entities,
+    # are dumped as they are; only other content, such as dicts, is validated
+    if not _is_built(content):
+        content = adapter.validate_python(content, from_attributes=True)
+    return orjson.dumps(adapter.dump_python(content, mode="json"))
+
+
+def dump_json(request: Request, content: Any) -> bytes:
+    """Encode the content of a response as JSON through the route's response model."""
+    return _dump(response_adapter(request), content)
+
+
+def dump_json_items(request: Request, items: Iterable[Any]) -> Iterable[bytes]:
+    """Encode each item of a list response as JSON through the route's response model."""
+    adapter = response_adapter(request, items=True)
+    return (_dump(adapter, item) for item in items)
@@ -2,12 +2,14 @@
 
 Room routes are used to create, retrieve, and update Rooms."""
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
 
+from ..database import read_only
 from ..services import RoomService
 from ..models import Room
 from ..models import RoomDetails
 from ..api.authentication import registered_user
+from .cached_response import cached_json_response
 from ..models.user import User
 
 __authors__ = ["Ajay Gandecha"]
@@ -23,18 +25,20 @@ openapi_tags = {
 
 @api.get("", response_model=list[RoomDetails], tags=["Rooms"])
 def get_rooms(
-    room_service: RoomService = Depends(),
-) -> list[RoomDetails]:
+    request: Request,
+    room_service: RoomService = Depends(read_only(RoomService)),
+) -> Response:
     """
     Get all room
 
     Parameters:
+        request: the request, for the encodings it accepts
         room_service: a valid RoomService
 
     Returns:
         list[RoomDetails]: All rooms in the `Room` database table
     """
-    return room_service.all()
+    return cached_json_response(request, "room", room_service.all)
 
 
 @api.get(
@@ -42,7 +46,9 @@ def get_rooms(
     response_model=RoomDetails,
     tags=["Rooms"],
 )
-def get_room_by_id(id: str, room_service: RoomService = Depends()) -> RoomDetails:
+def get_room_by_id(
+    id: str, room_service: RoomService = Depends(read_only(RoomService))
+) -> RoomDetails:
     """
     Get room with matching id
 
@@ -1,8 +1,17 @@
 """Single-page application middleware.
 
 Our application is organized as a single-page application (SPA). This middleware class
-extends the functionality of the StaticFiles middleware and was inspired by: 
+extends the functionality of the StaticFiles middleware and was inspired by:
 <https://stackoverflow.com/questions/63069190/how-to-capture-arbitrary-paths-at-one-route-in-fastapi>
+
+The Angular build is immutable once deployed, so the directory is read into a manifest
+when the middleware is created rather than looked up on every request. Requests for
+paths not in the manifest are served the index file, which is held in memory.
+
+Compressible files are served in the best encoding the client accepts. Encodings are
+read from `.br` and `.gz` siblings written at build time by `script.compress_static`,
+or compressed on the first request for them and held in memory. Files with a content
+hash in their name, as Angular names its bundles, are cached by browsers indefinitely.
 """
 
 __authors__ = ["Kris Jordan"]
@@ -10,28 +19,199 @@ __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 import os
+import re
+import stat
+from email.utils import formatdate
+from hashlib import md5
+from mimetypes import guess_type
 
+import anyio
+from fastapi import HTTPException
 from fastapi.staticfiles import StaticFiles
+from starlette.datastructures import Headers
+from starlette.responses import FileResponse, Response
+from starlette.staticfiles import NotModifiedResponse
+from starlette.types import Scope
+from .compression import ENCODERS, MINIMUM_SIZE, accepted_encodings
+
+# Fingerprinted file names, e.g. main.8c2e44c5ef0a7b1d.js
+FINGERPRINTED = re.compile(r"[.-][0-9a-f]{16,}\.[A-Za-z0-9]+$")
+
+IMMUTABLE = "public, max-age=31536000, immutable"
+
+COMPRESSIBLE_TYPES = (
+    "text/",
+    "application/javascript",
+    "application/json",
+    "application/manifest+json",
+    "application/xml",
+    "image/svg+xml",
+)
+
+# Encodings in order of preference, with the file extension of their siblings
+ENCODINGS = {"br": ".br", "gzip": ".gz"}
+
+# Files are compressed once, so they are compressed as small as each encoding allows
+MAXIMUM_LEVELS = {"br": 11, "gzip": 9}
+
+
+def compressible(path: str, size: int) -> bool:
+    """Whether a file of the given path and size is worth serving compressed."""
+    media_type = guess_type(path)[0] or ""
+    return size >= MINIMUM_SIZE and media_type.startswith(COMPRESSIBLE_TYPES)
+
+
+def compress(body: bytes, encoding: str) -> bytes:
+    """Compress a body in the given encoding at its highest level."""
+    return ENCODERS[encoding](body, MAXIMUM_LEVELS[encoding])
+
+
+class StaticAsset:
+    """A file of the static directory, and the encodings it can be served in."""
+
+    __slots__ = (
+        "full_path",
+        "stat_result",
+        "media_type",
+        "etag",
+        "cache_control",
+        "compressible",
+        "body",
+        "siblings",
+        "encoded",
+    )
+
+    def __init__(self, full_path: str, stat_result: os.stat_result):
+        self.full_path = full_path
+        self.stat_result = stat_result
+        self.media_type = guess_type(full_path)[0] or "text/plain"
+        etag_base = f"{stat_result.st_mtime}-{stat_result.st_size}"
+        self.etag = md5(etag_base.encode(), usedforsecurity=False).hexdigest()
+        self.cache_control = IMMUTABLE if FINGERPRINTED.search(full_path) else None
+        self.compressible = compressible(full_path, stat_result.st_size)
+        self.body: bytes | None = None
+        self.siblings: dict[str, tuple[str, os.stat_result]] = {}
+        self.encoded: dict[str, bytes] = {}
+
+    def read(self) -> bytes:
+        """The contents of the file, held in memory once read."""
+        if self.body is None:
+            with open(self.full_path, "rb") as file:
+                self.body = file.read()
+        return self.body
+
+    def encode(self, encoding: str) -> bytes:
+        """The file compressed in an encoding, held in memory once compressed."""
+        if encoding not in self.encoded:
+            self.encoded[encoding] = compress(self.read(), encoding)
+        return self.encoded[encoding]
 
 
 class StaticFileMiddleware(StaticFiles):
     def __init__(self, directory: os.PathLike, index: str = "index.html") -> None:
         self.index = index
         super().__init__(directory=directory, packages=None, html=True, check_dir=True)
+        self.manifest = self.build_manifest()
+        self.index_asset = self.manifest.get(index)
+        if self.index_asset is not None:
+            self.index_asset.read()
+            self.index_asset.etag = md5(
+                self.index_asset.body, usedforsecurity=False
+            ).hexdigest()
+            self.index_asset.cache_control = "no-cache"
+
+    def build_manifest(self) -> dict[str, StaticAsset]:
+        """Index the files of the directory by their path relative to it.
+
+        Returns:
+            dict[str, StaticAsset]: Each file, with its precompressed siblings.
+        """
+        manifest: dict[str, StaticAsset] = {}
+        siblings: list[tuple[str, str, str, os.stat_result]] = []
+        for root, _, files in os.walk(self.directory, followlinks=True):
+            for name in files:
+                full_path = os.path.join(root, name)
+                path = os.path.relpath(full_path, self.directory)
+                stat_result = os.stat(full_path)
+                if not stat.S_ISREG(stat_result.st_mode):
+                    continue
+                base, extension = os.path.splitext(path)
+                encoding = next(
+                    (e for e, ext in ENCODINGS.items() if ext == extension), None
+                )
+                if encoding is not None:
+                    siblings.append((base, encoding, full_path, stat_result))
+                manifest[path] = StaticAsset(full_path, stat_result)
+
+        for base, encoding, full_path, stat_result in siblings:
+            asset = manifest.get(base)
+            if asset is not None and asset.compressible:
+                asset.siblings[encoding] = (full_path, stat_result)
+        return manifest
 
-    def lookup_path(self, path: str) -> tuple[str, os.stat_result | None]:
-        """Returns the index file when no match is found.
+    async def get_response(self, path: str, scope: Scope) -> Response:
+        """Serve the file of a path from the manifest, or the index file if none.
 
         Args:
-            path (str): Resource path.
+            path (str): Resource path, relative to the directory.
+            scope (Scope): The request.
 
         Returns:
-            tuple[str, os.stat_result | None]: Returns a full path and stat result or None if file not found.
+            Response: The file in the best encoding the client accepts.
         """
-        full_path, stat_result = super().lookup_path(path)
+        if scope["method"] not in ("GET", "HEAD"):
+            raise HTTPException(status_code=405)
+        asset = self.manifest.get(path, self.index_asset)
+        if asset is None:
+            raise HTTPException(status_code=404)
+
+        request_headers = Headers(scope=scope)
+        headers = {
+            "etag": asset.etag,
+            "last-modified": formatdate(asset.stat_result.st_mtime, usegmt=True),
+        }
+        if asset.cache_control is not None:
+            headers["cache-control"] = asset.cache_control
+        if asset.compressible:
+            headers["vary"] = "Accept-Encoding"
+
+        encoding = None
+        if asset.compressible:
+            accepted = accepted_encodings(request_headers)
+            encoding = next((e for e in ENCODINGS if e in accepted), None)
+            if encoding is not None and encoding not in asset.siblings:
+                await anyio.to_thread.run_sync(asset.encode, encoding)
+        if encoding is not None:
+            headers["etag"] = f"{asset.etag}-{encoding}"
+            headers["content-encoding"] = encoding
+
+        if self.is_not_modified(Headers(headers=headers), request_headers):
+            return NotModifiedResponse(Headers(headers=headers))
 
-        if stat_result is None:
-            full_path, stat_result = super().lookup_path(self.index)
-            return (full_path, stat_result)
+        method = scope["method"]
+        if encoding is not None and encoding in asset.siblings:
+            full_path, stat_result = asset.siblings[encoding]
+            return FileResponse(
+                full_path,
+                headers=headers,
+                media_type=asset.media_type,
+                stat_result=stat_result,
+                method=method,
+            )
+        if encoding is not None:
+            body = asset.encoded[encoding]
+        elif asset.body is not None:
+            body = asset.body
         else:
-            return (full_path, stat_result)
+            return FileResponse(
+                asset.full_path,
+                headers=headers,
+                media_type=asset.media_type,
+                stat_result=asset.stat_result,
+                method=method,
+            )
+        return Response(
+            b"" if method == "HEAD" else body,
+            headers={**headers, "content-length": str(len(body))},
+            media_type=asset.media_type,
+        )
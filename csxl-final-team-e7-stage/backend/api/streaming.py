@@ -0,0 +1,77 @@
+"""Stream unbounded listings to clients as their rows are read.
+
+Routes listing every row of a table return a `streamed_json_response` of the models
+their service yields. Models are encoded a batch at a time as they arrive, so the first
+bytes are sent once the first rows are read, and memory stays flat however many rows
+there are. Clients accepting `application/x-ndjson` are sent one item per line; others
+are sent the JSON array the route has always returned.
+
+Models are encoded through the route's response model, as FastAPI would encode them.
+The status and headers are sent before the rows are read, so an error while streaming
+ends the response early rather than with an error status."""
+
+from itertools import islice
+from typing import Iterable, Iterator
+from fastapi import Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel
+from .response_model import dump_json_items
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+NDJSON = "application/x-ndjson"
+
+# Models encoded into each body message
+ENCODE_BATCH_SIZE = 100
+
+
+def accepts_ndjson(request: Request) -> bool:
+    """Whether the request's Accept header names newline-delimited JSON."""
+    return NDJSON in request.headers.get("accept", "")
+
+
+def _batches(models: Iterable[BaseModel]) -> Iterator[list[BaseModel]]:
+    iterator = iter(models)
+    while batch := list(islice(iterator, ENCODE_BATCH_SIZE)):
+        yield batch
+
+
+def json_array_chunks(request: Request, models: Iterable[BaseModel]) -> Iterator[bytes]:
+    """Encode models as the chunks of a JSON array."""
+    prefix = b"["
+    for batch in _batches(models):
+        yield prefix + b",".join(dump_json_items(request, batch))
+        prefix = b","
+    yield b"[]" if prefix == b"[" else b"]"
+
+
+def ndjson_chunks(request: Request, models: Iterable[BaseModel]) -> Iterator[bytes]:
+    """Encode models as chunks of newline-delimited JSON, one model per line."""
+    for batch in _batches(models):
+        yield b"".join(line + b"\n" for line in dump_json_items(request, batch))
+
+
+def streamed_json_response(
+    request: Request, models: Iterable[BaseModel]
+) -> StreamingResponse:
+    """Stream models as newline-delimited JSON, if accepted, or as a JSON array.
+
+    Args:
+        request (Request): The request, whose Accept header chooses the format.
+        models (Iterable[BaseModel]): The models, typically yielded by a service.
+
+    Returns:
+        StreamingResponse: The models, encoded as they are iterated.
+    """
+    headers = {"Vary": "Accept"}
+    if accepts_ndjson(request):
+        return StreamingResponse(
+            ndjson_chunks(request, models), media_type=NDJSON, headers=headers
+        )
+    return StreamingResponse(
+        json_array_chunks(request, models),
+        media_type="application/json",
+        headers=headers,
+    )
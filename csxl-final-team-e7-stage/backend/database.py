@@ -1,32 +1,249 @@
-"""SQLAlchemy DB Engine and Session niceties for FastAPI dependency injection."""
+"""SQLAlchemy DB Engine and Session niceties for FastAPI dependency injection.
 
+Reads may optionally be served by a streaming replica of the primary database, whose
+host is given by `POSTGRES_READ_HOST` (and `POSTGRES_READ_PORT`, if it differs from
+the primary's). Services opt in by being injected with `read_only(Service)`. Replicas
+lag slightly behind the primary, so a client that has just written is pinned to the
+primary for `READ_YOUR_WRITES_SECONDS` (default 10) and reads its own writes.
+
+FastAPI runs the code of a dependency after its `yield` only once the response has
+been sent. `UnitOfWorkMiddleware` therefore commits the sessions of a request before
+the start of its response is sent, so that a write is durable when the client is told
+it succeeded, and a commit that fails is answered with an error.
+"""
+
+import hashlib
+import inspect
+import os
 import sqlalchemy
+import time
+from functools import cache
+from threading import Lock
+from typing import Callable, TypeVar
+from fastapi import Depends, Request
+from sqlalchemy import event
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
 from .env import getenv
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+T = TypeVar("T")
 
-def _engine_str(database: str = getenv("POSTGRES_DATABASE")) -> str:
+
+def _engine_str(
+    database: str = getenv("POSTGRES_DATABASE"),
+    host: str | None = None,
+    port: str | None = None,
+) -> str:
     """Helper function for reading settings from environment variables to produce connection string."""
     dialect = "postgresql+psycopg2"
     user = getenv("POSTGRES_USER")
     password = getenv("POSTGRES_PASSWORD")
-    host = getenv("POSTGRES_HOST")
-    port = getenv("POSTGRES_PORT")
+    host = host or getenv("POSTGRES_HOST")
+    port = port or getenv("POSTGRES_PORT")
     return f"{dialect}://{user}:{password}@{host}:{port}/{database}"
 
 
 engine = sqlalchemy.create_engine(_engine_str(), echo=True)
 """Application-level SQLAlchemy database engine."""
 
+read_engine = (
+    sqlalchemy.create_engine(
+        _engine_str(
+            host=os.getenv("POSTGRES_READ_HOST"), port=os.getenv("POSTGRES_READ_PORT")
+        ),
+        echo=True,
+    )
+    if os.getenv("POSTGRES_READ_HOST")
+    else engine
+)
+"""Engine of the read replica, or the primary engine when no replica is configured."""
+
+READ_YOUR_WRITES_SECONDS = float(os.getenv("READ_YOUR_WRITES_SECONDS", "10"))
+
+# Rows fetched per round trip, through a server-side cursor, by service methods that
+# stream their results rather than load them all at once
+STREAM_BATCH_SIZE = 200
+
+# Expired pins are pruned once this many clients are pinned
+MAX_PRIMARY_PINS = 1024
+
+# Key of the ASGI scope listing the sessions of a request yet to be committed
+UNIT_OF_WORK = "db_sessions"
+
+_primary_pins: dict[str, float] = {}
+_primary_pins_lock = Lock()
+
+
+def _client_key(request: Request | None) -> str | None:
+    """Identify the client of a request by a digest of its bearer token, if any."""
+    if request is None or "authorization" not in request.headers:
+        return None
+    return hashlib.sha256(request.headers["authorization"].encode()).hexdigest()
+
+
+def pin_to_primary(key: str) -> None:
+    """Serve a client's reads from the primary until the replica has caught up."""
+    now = time.monotonic()
+    with _primary_pins_lock:
+        if len(_primary_pins) >= MAX_PRIMARY_PINS:
+            for expired in [k for k, until in _primary_pins.items() if until <= now]:
+                del _primary_pins[expired]
+        _primary_pins[key] = now + READ_YOUR_WRITES_SECONDS
+
+
+def is_pinned_to_primary(key: str) -> bool:
+    """Whether a client wrote recently enough that its reads must use the primary."""
+    with _primary_pins_lock:
+        until = _primary_pins.get(key)
+    return until is not None and until > time.monotonic()
 
-def db_session():
-    """Generator function offering dependency injection of SQLAlchemy Sessions."""
+
+def db_session(request: Request = None):  # type: ignore[assignment]
+    """Generator function offering dependency injection of SQLAlchemy Sessions.
+
+    Each request is a single unit of work: services flush their changes, and the
+    session commits once the request completes, before its response is sent by
+    `UnitOfWorkMiddleware`, or rolls back if it raised. A client whose request writes
+    is pinned to the primary for subsequent reads."""
     session = Session(engine)
+    pending: list[Session] = (
+        request.scope.get(UNIT_OF_WORK, []) if request is not None else []
+    )
+    pending.append(session)
+    try:
+        yield session
+        _commit(session, _client_key(request))
+    except:
+        session.rollback()
+        raise
+    finally:
+        if session in pending:
+            pending.remove(session)
+        session.close()
+
+
+def _commit(session: Session, key: str | None) -> None:
+    """Commit a request's session, pinning its client to the primary if it wrote."""
+    session.commit()
+    if key is not None and session.info.get("wrote") and read_engine is not engine:
+        pin_to_primary(key)
+
+
+class UnitOfWorkMiddleware:
+    """ASGI middleware committing the sessions of each request before its response.
+
+    A commit that fails raises before the response is started, so the request's session
+    is rolled back and the client is sent an error rather than the route's response."""
+
+    def __init__(self, app: ASGIApp):
+        self.app = app
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        pending: list[Session] = []
+        scope[UNIT_OF_WORK] = pending
+        key = _client_key(Request(scope))
+
+        async def send_after_commit(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                while pending:
+                    await run_in_threadpool(_commit, pending.pop(0), key)
+            await send(message)
+
+        await self.app(scope, receive, send_after_commit)
+
+
+def db_read_session(request: Request = None):  # type: ignore[assignment]
+    """Generator function offering dependency injection of read-only SQLAlchemy Sessions.
+
+    Sessions read from the replica, unless none is configured or the client is pinned
+    to the primary after a recent write. Flushing changes through them raises."""
+    key = _client_key(request)
+    bind = engine if key is not None and is_pinned_to_primary(key) else read_engine
+    session = Session(bind, info={"read_only": True})
     try:
         yield session
     finally:
         session.close()
+
+
+@cache
+def read_only(service: Callable[..., T]) -> Callable[..., T]:
+    """A dependency constructing a service whose `session` is a `db_read_session`.
+
+    Only services whose methods used by the route are read-only should opt in, e.g.
+    `term_svc: TermService = Depends(read_only(TermService))`. Services the service
+    depends upon are still injected with their own sessions."""
+    signature = inspect.signature(service)
+    parameters = [
+        parameter.replace(default=Depends(db_read_session))
+        if parameter.name == "session"
+        else parameter
+        for parameter in signature.parameters.values()
+    ]
+
+    def dependency(**kwargs) -> T:
+        return service(**kwargs)
+
+    dependency.__signature__ = signature.replace(  # type: ignore[attr-defined]
+        parameters=parameters, return_annotation=service
+    )
+    return dependency
+
+
+def checkpoint(session: Session) -> None:
+    """Commit the work of a request so far, before the request completes.
+
+    Services flush rather than commit. This is the escape hatch for operations whose
+    effects must be durable before they are published outside of the session, and so
+    must not be rolled back if the rest of the request fails."""
+    session.commit()
+
+
+def after_commit(session: Session, callback: Callable[[], None]) -> None:
+    """Run a callback once the session's current transaction commits.
+
+    Callbacks are discarded if the transaction rolls back instead."""
+    session.info.setdefault("after_commit", []).append(callback)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_after_commit_callbacks(session: Session) -> None:
+    for callback in session.info.pop("after_commit", []):
+        callback()
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_after_commit_callbacks(session: Session, previous_transaction) -> None:
+    session.info.pop("after_commit", None)
+
+
+def _record_write(session: Session) -> None:
+    if session.info.get("read_only"):
+        raise sqlalchemy.exc.InvalidRequestError(
+            "Changes cannot be written through a read-only session."
+        )
+    session.info["wrote"] = True
+
+
+@event.listens_for(Session, "before_flush")
+def _record_flush(session: Session, flush_context, instances) -> None:
+    _record_write(session)
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _record_dml(orm_execute_state) -> None:
+    if (
+        orm_execute_state.is_insert
+        or orm_execute_state.is_update
+        or orm_execute_state.is_delete
+    ):
+        _record_write(orm_execute_state.session)
@@ -19,10 +19,12 @@ from .role_entity import RoleEntity
 from .room_entity import RoomEntity
 from .permission_entity import PermissionEntity
 from .user_role_table import user_role_table
+from .effective_permission_entity import EffectivePermissionEntity
 from .organization_entity import OrganizationEntity
 from .event_entity import EventEntity
 from .event_registration_entity import EventRegistrationEntity
 from .organization_member_entity import OrganizationMemberEntity
+from .idempotency_key_entity import IdempotencyKeyEntity
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..entity_base import EntityBase
 from ...models.academics import Course
 from ...models.academics import CourseDetails
+from ...models.trusted import construct
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2023"
@@ -66,7 +67,8 @@ class CourseEntity(EntityBase):
         Returns:
             Course: `Course` object from the entity
         """
-        return Course(
+        return construct(
+            Course,
             id=self.id,
             subject_code=self.subject_code,
             number=self.number,
@@ -82,7 +84,8 @@ class CourseEntity(EntityBase):
         Returns:
             CourseDetails: `CourseDetails` object from the entity
         """
-        return CourseDetails(
+        return construct(
+            CourseDetails,
             id=self.id,
             subject_code=self.subject_code,
             number=self.number,
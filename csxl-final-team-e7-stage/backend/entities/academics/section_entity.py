@@ -12,6 +12,7 @@ from ...models.academics import Section
 from ...models.academics import SectionDetails
 from ...models.academics.section_member import SectionMember
 from ...models.roster_role import RosterRole
+from ...models.trusted import construct
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2023"
@@ -30,7 +31,9 @@ class SectionEntity(EntityBase):
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     # Course the section is for
     # NOTE: This defines a one-to-many relationship between the course and sections tables.
-    course_id: Mapped[str] = mapped_column(ForeignKey("academics__course.id"))
+    course_id: Mapped[str] = mapped_column(
+        ForeignKey("academics__course.id"), index=True
+    )
     course: Mapped["CourseEntity"] = relationship(back_populates="sections")
 
     # Number of the section (for example, COMP 100-003's code would be "003")
@@ -38,7 +41,7 @@ class SectionEntity(EntityBase):
 
     # Term the section is in
     # NOTE: This defines a one-to-many relationship between the term and sections tables.
-    term_id: Mapped[str] = mapped_column(ForeignKey("academics__term.id"))
+    term_id: Mapped[str] = mapped_column(ForeignKey("academics__term.id"), index=True)
     term: Mapped["TermEntity"] = relationship(back_populates="course_sections")
 
     # Meeting pattern of the course
@@ -107,7 +110,8 @@ class SectionEntity(EntityBase):
             Section: `Section` object from the entity
         """
 
-        return Section(
+        return construct(
+            Section,
             id=self.id,
             course_id=self.course_id,
             number=self.number,
@@ -134,7 +138,8 @@ class SectionEntity(EntityBase):
 
         section = self.to_model()
 
-        return SectionDetails(
+        return construct(
+            SectionDetails,
             id=self.id,
             course_id=self.course_id,
             course=self.course.to_model(),
@@ -7,6 +7,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from ...models.roster_role import RosterRole
 from ...models.academics.section_member import SectionMember
+from ...models.trusted import construct
 
 from ..entity_base import EntityBase
 
@@ -39,7 +40,9 @@ class SectionMemberEntity(EntityBase):
 
     # User for the current relation
     # NOTE: This is ultimately a join table for a many-to-many relationship
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), primary_key=True, index=True
+    )
     user: Mapped["UserEntity"] = relationship(back_populates="sections")
 
     # Type of relationship
@@ -52,7 +55,8 @@ class SectionMemberEntity(EntityBase):
         Returns:
             SectionMember: `SectionMember` object from the entity
         """
-        return SectionMember(
+        return construct(
+            SectionMember,
             id=self.user.id,
             first_name=self.user.first_name,
             last_name=self.user.last_name,
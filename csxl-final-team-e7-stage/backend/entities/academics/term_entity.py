@@ -7,6 +7,7 @@ from ..entity_base import EntityBase
 from datetime import datetime
 from ...models.academics.term import Term
 from ...models.academics.term_details import TermDetails
+from ...models.trusted import construct
 
 __authors__ = ["Ajay Gandecha"]
 __copyright__ = "Copyright 2023"
@@ -59,7 +60,9 @@ class TermEntity(EntityBase):
         Returns:
             Term: `Term` object from the entity
         """
-        return Term(id=self.id, name=self.name, start=self.start, end=self.end)
+        return construct(
+            Term, id=self.id, name=self.name, start=self.start, end=self.end
+        )
 
     def to_details_model(self) -> TermDetails:
         """
@@ -68,7 +71,8 @@ class TermEntity(EntityBase):
         Returns:
             TermDetails: `TermDetails` object from the entity
         """
-        return TermDetails(
+        return construct(
+            TermDetails,
             id=self.id,
             name=self.name,
             start=self.start,
@@ -1,4 +1,10 @@
 from .operating_hours_entity import OperatingHoursEntity
+from .operating_hours_recurrence_entity import OperatingHoursRecurrenceEntity
 from .reservation_entity import ReservationEntity
+from .reservation_archive_entity import ReservationArchiveEntity
 from .reservation_seat_table import reservation_seat_table
 from .seat_entity import SeatEntity
+from .seat_utilization_entity import SeatUtilizationEntity
+from .room_utilization_entity import RoomUtilizationEntity
+from .group_policy_entity import GroupPolicyEntity
+from .room_policy_entity import RoomPolicyEntity
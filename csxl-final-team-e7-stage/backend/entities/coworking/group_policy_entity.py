@@ -0,0 +1,54 @@
+"""Entity for group-level coworking policies."""
+
+from datetime import timedelta
+from typing import Self
+from sqlalchemy import Integer, String, Interval, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+from ...models.coworking import GroupPolicy
+from ...models.trusted import construct
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class GroupPolicyEntity(EntityBase):
+    """Entity for a duration policy applied to everyone or to a role's members."""
+
+    __tablename__ = "coworking__group_policy"
+    __table_args__ = (
+        Index("coworking__group_policy_idx", "role_id", "key", unique=True),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    # None applies the policy to all users
+    role_id: Mapped[int | None] = mapped_column(
+        Integer, ForeignKey("role.id", ondelete="CASCADE"), nullable=True
+    )
+    key: Mapped[str] = mapped_column(String, nullable=False)
+    value: Mapped[timedelta] = mapped_column(Interval, nullable=False)
+
+    def to_model(self) -> GroupPolicy:
+        """Converts the entity to a model.
+
+        Returns:
+            GroupPolicy: The model representation of the entity."""
+        return construct(
+            GroupPolicy,
+            id=self.id,
+            role_id=self.role_id,
+            key=self.key,
+            value=self.value,
+        )
+
+    @classmethod
+    def from_model(cls, model: GroupPolicy) -> Self:
+        """Create a GroupPolicyEntity from a GroupPolicy model.
+
+        Args:
+            model (GroupPolicy): The model to create the entity from.
+
+        Returns:
+            Self: The entity (not yet persisted)."""
+        return cls(id=model.id, role_id=model.role_id, key=model.key, value=model.value)
@@ -1,9 +1,10 @@
 """Entity for Operating Hours.""" ""
 
-from sqlalchemy import Integer, DateTime, Index
+from sqlalchemy import Integer, DateTime, Index, ForeignKey
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from ..entity_base import EntityBase
 from ...models.coworking import OperatingHours
+from ...models.trusted import construct
 from datetime import datetime
 from typing import Self
 
@@ -23,13 +24,19 @@ class OperatingHoursEntity(EntityBase):
     id: Mapped[int] = mapped_column(Integer, primary_key=True)
     start: Mapped[datetime] = mapped_column(DateTime, index=True)
     end: Mapped[datetime] = mapped_column(DateTime, index=True)
+    # Set when the row was materialized from a recurring template
+    recurrence_id: Mapped[int | None] = mapped_column(
+        Integer,
+        ForeignKey("coworking__operating_hours_recurrence.id", ondelete="SET NULL"),
+        nullable=True,
+    )
 
     def to_model(self) -> OperatingHours:
         """Converts the entity to a model.
 
         Returns:
             OperatingHours: The model representation of the entity."""
-        return OperatingHours(id=self.id, start=self.start, end=self.end)
+        return construct(OperatingHours, id=self.id, start=self.start, end=self.end)
 
     @classmethod
     def from_model(cls, model: OperatingHours) -> Self:
@@ -0,0 +1,69 @@
+"""Entity for recurring Operating Hours templates."""
+
+from datetime import date, datetime
+from typing import Self
+from sqlalchemy import Integer, String, DateTime, Date, ForeignKey
+from sqlalchemy.dialects.postgresql import ARRAY, JSONB
+from sqlalchemy.orm import Mapped, mapped_column, relationship
+from ..entity_base import EntityBase
+from ...models.coworking import OperatingHoursRecurrence, WeeklyOperatingHours
+from ...models.trusted import construct
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class OperatingHoursRecurrenceEntity(EntityBase):
+    """Entity for a weekly Operating Hours template bound to a term."""
+
+    __tablename__ = "coworking__operating_hours_recurrence"
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    term_id: Mapped[str] = mapped_column(
+        String(6), ForeignKey("academics__term.id"), index=True
+    )
+    # Weekly windows stored as a list of {"weekday", "start", "end"} objects
+    weekly_hours: Mapped[list[dict]] = mapped_column(JSONB, nullable=False)
+    # Dates within the term on which the template does not apply
+    exceptions: Mapped[list[date]] = mapped_column(ARRAY(Date), default=list)
+    # Occurrences before this instant exist as OperatingHoursEntity rows
+    materialized_until: Mapped[datetime | None] = mapped_column(DateTime, nullable=True)
+
+    term: Mapped["TermEntity"] = relationship("TermEntity")
+
+    def to_model(self) -> OperatingHoursRecurrence:
+        """Converts the entity to a model.
+
+        Returns:
+            OperatingHoursRecurrence: The model representation of the entity."""
+        return construct(
+            OperatingHoursRecurrence,
+            id=self.id,
+            term_id=self.term_id,
+            weekly_hours=[
+                WeeklyOperatingHours.model_validate(window)
+                for window in self.weekly_hours
+            ],
+            exceptions=self.exceptions or [],
+            materialized_until=self.materialized_until,
+        )
+
+    @classmethod
+    def from_model(cls, model: OperatingHoursRecurrence) -> Self:
+        """Create an OperatingHoursRecurrenceEntity from an OperatingHoursRecurrence model.
+
+        Args:
+            model (OperatingHoursRecurrence): The model to create the entity from.
+
+        Returns:
+            Self: The entity (not yet persisted)."""
+        return cls(
+            id=model.id,
+            term_id=model.term_id,
+            weekly_hours=[
+                window.model_dump(mode="json") for window in model.weekly_hours
+            ],
+            exceptions=model.exceptions,
+            materialized_until=model.materialized_until,
+        )
@@ -0,0 +1,36 @@
+"""Entity for archived Reservations."""
+
+from datetime import datetime
+from sqlalchemy import ARRAY, Boolean, DateTime, Index, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+from ...models.coworking import ReservationState
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class ReservationArchiveEntity(EntityBase):
+    """Reservations that have ended in a final state, moved out of `coworking__reservation`.
+
+    Archived rows are never changed again, so the users and seats of a reservation are
+    kept as arrays of their ids on the row rather than in join tables."""
+
+    __tablename__ = "coworking__reservation_archive"
+    __table_args__ = (Index("coworking__reservation_archive_time_idx", "start", "end"),)
+
+    # Same id as the reservation had before it was archived
+    id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=False)
+    start: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    end: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    state: Mapped[ReservationState] = mapped_column(String, nullable=False)
+    walkin: Mapped[bool] = mapped_column(Boolean, nullable=False)
+    room_id: Mapped[str | None] = mapped_column(String, nullable=True)
+    created_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    updated_at: Mapped[datetime] = mapped_column(DateTime, nullable=False)
+    user_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    seat_ids: Mapped[list[int]] = mapped_column(ARRAY(Integer), nullable=False)
+    archived_at: Mapped[datetime] = mapped_column(
+        DateTime, default=datetime.now, nullable=False
+    )
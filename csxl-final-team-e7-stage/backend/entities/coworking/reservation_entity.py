@@ -5,6 +5,7 @@ from sqlalchemy import Integer, String, Boolean, ForeignKey, DateTime, Index
 from sqlalchemy.orm import Mapped, mapped_column, relationship, Session
 from ..entity_base import EntityBase
 from ...models.coworking import Reservation, ReservationState
+from ...models.trusted import construct
 from .seat_entity import SeatEntity
 from ..user_entity import UserEntity
 from .reservation_user_table import reservation_user_table
@@ -20,6 +21,8 @@ class ReservationEntity(EntityBase):
     __tablename__ = "coworking__reservation"
     __table_args__ = (
         Index("coworking__reservation_time_idx", "start", "end", "state", unique=False),
+        # Finds the next reservation of a room in order of start, as extensions do
+        Index("coworking__reservation_room_start_idx", "room_id", "start"),
     )
 
     # Reservation Model Fields
@@ -35,6 +38,10 @@ class ReservationEntity(EntityBase):
     updated_at: Mapped[datetime] = mapped_column(
         DateTime, default=datetime.now, onupdate=datetime.now, nullable=False
     )
+    # Incremented by each update, which is conditional on the version read
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
+    __mapper_args__ = {"version_id_col": version}
 
     # Relationships
     users: Mapped[list[UserEntity]] = relationship(secondary=reservation_user_table)
@@ -46,7 +53,8 @@ class ReservationEntity(EntityBase):
 
         Returns:
             Reservation: The model representation of the entity."""
-        return Reservation(
+        return construct(
+            Reservation,
             id=self.id,
             start=self.start,
             end=self.end,
@@ -57,6 +65,7 @@ class ReservationEntity(EntityBase):
             room=self.room.to_model() if self.room else None,
             created_at=self.created_at,
             updated_at=self.updated_at,
+            version=self.version,
         )
 
     @classmethod
@@ -11,5 +11,5 @@ reservation_seat_table = Table(
     "coworking__reservation_seat",
     EntityBase.metadata,
     Column("reservation_id", ForeignKey("coworking__reservation.id"), primary_key=True),
-    Column("seat_id", ForeignKey("coworking__seat.id"), primary_key=True),
+    Column("seat_id", ForeignKey("coworking__seat.id"), primary_key=True, index=True),
 )
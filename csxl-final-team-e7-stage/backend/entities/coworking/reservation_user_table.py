@@ -11,5 +11,5 @@ reservation_user_table = Table(
     "coworking__reservation_user",
     EntityBase.metadata,
     Column("reservation_id", ForeignKey("coworking__reservation.id"), primary_key=True),
-    Column("user_id", ForeignKey("user.id"), primary_key=True),
+    Column("user_id", ForeignKey("user.id"), primary_key=True, index=True),
 )
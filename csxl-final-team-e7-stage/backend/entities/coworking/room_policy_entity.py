@@ -0,0 +1,61 @@
+"""Entity for room-level coworking policies."""
+
+from datetime import time
+from typing import Self
+from sqlalchemy import Integer, String, Time, ForeignKey, Index
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+from ...models.coworking import RoomPolicy
+from ...models.trusted import construct
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class RoomPolicyEntity(EntityBase):
+    """Entity for a weekly block during which a room cannot be reserved."""
+
+    __tablename__ = "coworking__room_policy"
+    __table_args__ = (
+        Index("coworking__room_policy_idx", "room_id", "weekday", unique=False),
+    )
+
+    id: Mapped[int] = mapped_column(Integer, primary_key=True)
+    room_id: Mapped[str] = mapped_column(
+        String, ForeignKey("room.id", ondelete="CASCADE"), nullable=False
+    )
+    weekday: Mapped[int] = mapped_column(Integer, nullable=False)
+    start: Mapped[time] = mapped_column(Time, nullable=False)
+    end: Mapped[time] = mapped_column(Time, nullable=False)
+
+    def to_model(self) -> RoomPolicy:
+        """Converts the entity to a model.
+
+        Returns:
+            RoomPolicy: The model representation of the entity."""
+        return construct(
+            RoomPolicy,
+            id=self.id,
+            room_id=self.room_id,
+            weekday=self.weekday,
+            start=self.start,
+            end=self.end,
+        )
+
+    @classmethod
+    def from_model(cls, model: RoomPolicy) -> Self:
+        """Create a RoomPolicyEntity from a RoomPolicy model.
+
+        Args:
+            model (RoomPolicy): The model to create the entity from.
+
+        Returns:
+            Self: The entity (not yet persisted)."""
+        return cls(
+            id=model.id,
+            room_id=model.room_id,
+            weekday=model.weekday,
+            start=model.start,
+            end=model.end,
+        )
@@ -0,0 +1,29 @@
+"""Entity for hourly rollups of Room utilization."""
+
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer, String
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class RoomUtilizationEntity(EntityBase):
+    """How a room was used during an hour, summed over the reservations of it.
+
+    Kept alongside `SeatUtilizationEntity`, with the same measures, for reservations
+    of rooms rather than seats."""
+
+    __tablename__ = "coworking__room_utilization"
+
+    room_id: Mapped[str] = mapped_column(
+        String, ForeignKey("room.id"), primary_key=True
+    )
+    # The start of the hour, which is on the hour
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+
+    reserved_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    checked_in_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    no_shows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
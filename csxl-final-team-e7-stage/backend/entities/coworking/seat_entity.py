@@ -5,6 +5,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship, Session, joinedl
 from ..entity_base import EntityBase
 from ...models.coworking import SeatDetails
 from ...models.coworking.seat import SeatIdentity, Seat
+from ...models.trusted import construct
 from typing import Self
 
 __authors__ = ["Kris Jordan"]
@@ -36,7 +37,8 @@ class SeatEntity(EntityBase):
 
         Returns:
             Seat: The model representation of the entity."""
-        return SeatDetails(
+        return construct(
+            SeatDetails,
             id=self.id,
             title=self.title,
             shorthand=self.shorthand,
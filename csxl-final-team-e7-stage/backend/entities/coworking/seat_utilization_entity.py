@@ -0,0 +1,32 @@
+"""Entity for hourly rollups of Seat utilization."""
+
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, Integer
+from sqlalchemy.orm import Mapped, mapped_column
+from ..entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class SeatUtilizationEntity(EntityBase):
+    """How a seat was used during an hour, summed over the reservations of it.
+
+    Rows are added to as reservations of the seat are checked out or missed, so that
+    utilization analytics never read `coworking__reservation` itself."""
+
+    __tablename__ = "coworking__seat_utilization"
+
+    seat_id: Mapped[int] = mapped_column(
+        ForeignKey("coworking__seat.id"), primary_key=True
+    )
+    # The start of the hour, which is on the hour
+    hour: Mapped[datetime] = mapped_column(DateTime, primary_key=True, index=True)
+
+    # Minutes of the hour reserved by reservations that were checked into or missed
+    reserved_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Minutes of the hour reserved by reservations that were checked into
+    checked_in_minutes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Reservations starting in the hour that were never checked into
+    no_shows: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
@@ -8,6 +8,7 @@ from typing import Self
 from ..models.event import DraftEvent, Event
 from ..models.registration_type import RegistrationType
 from ..models.user import User
+from ..models.trusted import construct
 
 from datetime import datetime
 
@@ -29,7 +30,7 @@ class EventEntity(EntityBase):
     # Name of the event
     name: Mapped[str] = mapped_column(String)
     # Time of the event
-    time: Mapped[datetime] = mapped_column(DateTime)
+    time: Mapped[datetime] = mapped_column(DateTime, index=True)
     # Location of the event
     location: Mapped[str] = mapped_column(String)
     # Description of the event
@@ -38,10 +39,14 @@ class EventEntity(EntityBase):
     public: Mapped[bool] = mapped_column(Boolean)
     # Maximim number of people who can register for the event
     registration_limit: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
+    # Version of the event, incremented by each update, which is conditional on it
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
 
     # Organization hosting the event
     # NOTE: This defines a one-to-many relationship between the organization and events tables.
-    organization_id: Mapped[int] = mapped_column(ForeignKey("organization.id"))
+    organization_id: Mapped[int] = mapped_column(
+        ForeignKey("organization.id"), index=True
+    )
     organization: Mapped["OrganizationEntity"] = relationship(back_populates="events")
 
     # Registrations for the event
@@ -50,6 +55,8 @@ class EventEntity(EntityBase):
         back_populates="event", cascade="all,delete"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     @classmethod
     def from_draft_model(cls, model: DraftEvent) -> Self:
         """
@@ -123,7 +130,8 @@ class EventEntity(EntityBase):
             else False
         )
 
-        return Event(
+        return construct(
+            Event,
             id=self.id,
             name=self.name,
             time=self.time,
@@ -136,6 +144,7 @@ class EventEntity(EntityBase):
             is_attendee=is_attendee,
             is_organizer=is_organizer,
             organizers=organizers,
+            version=self.version,
         )
 
     def to_details_model(self, subject: User | None = None) -> EventDetails:
@@ -147,7 +156,8 @@ class EventEntity(EntityBase):
 
         event = self.to_model(subject)
 
-        return EventDetails(
+        return construct(
+            EventDetails,
             id=self.id,
             name=self.name,
             time=self.time,
@@ -161,4 +171,5 @@ class EventEntity(EntityBase):
             is_attendee=event.is_attendee,
             is_organizer=event.is_organizer,
             organizers=event.organizers,
+            version=self.version,
         )
@@ -11,6 +11,7 @@ from ..models.public_user import PublicUser
 from .entity_base import EntityBase
 from typing import Self
 from ..models.event_registration import EventRegistration, NewEventRegistration
+from ..models.trusted import construct
 from sqlalchemy import Enum as SQLAlchemyEnum
 
 __authors__ = ["Ajay Gandecha"]
@@ -39,7 +40,9 @@ class EventRegistrationEntity(EntityBase):
 
     # User for the current event registration
     # NOTE: This is ultimately a join table for a many-to-many relationship
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), primary_key=True, index=True
+    )
     user: Mapped["UserEntity"] = relationship()
 
     # Type of relationship
@@ -89,7 +92,8 @@ class EventRegistrationEntity(EntityBase):
         Returns:
             EventRegistration: `EventRegistration` object from the entity
         """
-        return EventRegistration(
+        return construct(
+            EventRegistration,
             event_id=self.event_id,
             event=self.event.to_model(),
             user_id=self.user_id,
@@ -105,7 +109,8 @@ class EventRegistrationEntity(EntityBase):
         Returns:
             PublicUser: `PublicUser` object from the entity
         """
-        return PublicUser(
+        return construct(
+            PublicUser,
             id=self.user_id,
             first_name=self.user.first_name,
             last_name=self.user.last_name,
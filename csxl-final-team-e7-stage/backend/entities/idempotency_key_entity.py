@@ -0,0 +1,34 @@
+"""Definition of SQLAlchemy table-backed object mapping entity for Idempotency Keys."""
+
+from datetime import datetime
+from sqlalchemy import DateTime, ForeignKey, LargeBinary, String
+from sqlalchemy.orm import Mapped, mapped_column
+from .entity_base import EntityBase
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class IdempotencyKeyEntity(EntityBase):
+    """Serves as the database model schema defining the shape of the `IdempotencyKey` table
+
+    Each row is an `Idempotency-Key` a user has sent with a request, along with the
+    response to its first attempt, which is replayed to any retries of the request."""
+
+    # Name for the idempotency key table in the PostgreSQL database
+    __tablename__ = "idempotency_key"
+
+    # Keys are chosen by clients, so they are unique per user rather than globally
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id", ondelete="CASCADE"), primary_key=True
+    )
+    key: Mapped[str] = mapped_column(String(255), primary_key=True)
+
+    # Digest of the request the key was first sent with
+    fingerprint: Mapped[str] = mapped_column(String(64))
+
+    # JSON body of the first attempt's response, or None until it is complete
+    response: Mapped[bytes | None] = mapped_column(LargeBinary, nullable=True)
+
+    created_at: Mapped[datetime] = mapped_column(DateTime)
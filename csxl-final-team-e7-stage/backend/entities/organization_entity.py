@@ -9,6 +9,7 @@ from typing import Self
 from ..models.organization import Organization
 from ..models.organization_details import OrganizationDetails
 from ..models.organization_status import OrganizationStatus
+from ..models.trusted import construct
 from sqlalchemy import Enum as SQLAlchemyEnum
 from enum import Enum
 
@@ -61,6 +62,9 @@ class OrganizationEntity(EntityBase):
 
     application_link: Mapped[str] = mapped_column(String)
 
+    # Version of the organization, incremented by each update, which is conditional on it
+    version: Mapped[int] = mapped_column(Integer, nullable=False, server_default="1")
+
     # NOTE: This field establishes a one-to-many relationship between the organizations and events table.
     events: Mapped[list["EventEntity"]] = relationship(
         back_populates="organization", cascade="all,delete"
@@ -70,6 +74,8 @@ class OrganizationEntity(EntityBase):
         back_populates="organization", cascade="all,delete"
     )
 
+    __mapper_args__ = {"version_id_col": version}
+
     @classmethod
     def from_model(cls, model: Organization) -> Self:
         """
@@ -118,7 +124,8 @@ class OrganizationEntity(EntityBase):
             else False
         )
 
-        return Organization(
+        return construct(
+            Organization,
             id=self.id,
             name=self.name,
             shorthand=self.shorthand,
@@ -137,7 +144,8 @@ class OrganizationEntity(EntityBase):
             is_member=is_member,
             member_count=len(members),
             status=self.status.value,
-            application_link=self.application_link
+            application_link=self.application_link,
+            version=self.version,
         )
 
     def to_details_model(self, subject: User | None = None) -> OrganizationDetails:
@@ -149,7 +157,8 @@ class OrganizationEntity(EntityBase):
         """
         organization = self.to_model(subject)
 
-        return OrganizationDetails(
+        return construct(
+            OrganizationDetails,
             id=self.id,
             name=self.name,
             shorthand=self.shorthand,
@@ -169,6 +178,7 @@ class OrganizationEntity(EntityBase):
             member_count=organization.member_count,
             status=self.status.value,
             application_link=self.application_link,
+            version=self.version,
 
             events=[event.to_model() for event in self.events],
         )
@@ -9,6 +9,7 @@ from ..models.organization_member import NewOrganizationMember, OrganizationMemb
 from ..models.public_user import PublicUser
 from ..models.member_role import MemberRole
 from ..models.semester import Semester
+from ..models.trusted import construct
 from sqlalchemy import Enum as SQLAlchemyEnum
 
 
@@ -26,7 +27,9 @@ class OrganizationMemberEntity(EntityBase):
     organization_id: Mapped[int] = mapped_column(
         ForeignKey("organization.id"), primary_key=True
     )
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), primary_key=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), primary_key=True, index=True
+    )
 
     year: Mapped[int] = mapped_column(Integer)
     semester: Mapped[Semester] = mapped_column(SQLAlchemyEnum(Semester))
@@ -54,7 +57,8 @@ class OrganizationMemberEntity(EntityBase):
         return cls(organization_id=model.organization_id, user_id=model.user_id)
 
     def to_model(self, subject: User | None = None) -> OrganizationMember:
-        return OrganizationMember(
+        return construct(
+            OrganizationMember,
             user_id=self.user_id,
             organization_id=self.organization.id,
             user=self.user.to_model(),
@@ -66,7 +70,8 @@ class OrganizationMemberEntity(EntityBase):
         )
 
     def to_flat_model(self) -> PublicUser:
-        return PublicUser(
+        return construct(
+            PublicUser,
             id=self.user_id,
             first_name=self.user.first_name,
             last_name=self.user.last_name,
@@ -7,6 +7,7 @@ from .entity_base import EntityBase
 from .user_entity import UserEntity
 from .role_entity import RoleEntity
 from ..models import Permission
+from ..models.trusted import construct
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -28,12 +29,16 @@ class PermissionEntity(EntityBase):
 
     # The role with the given permissions
     # NOTE: This field establishes a one-to-many relationship between the permissions and roles table.
-    role_id: Mapped[int] = mapped_column(ForeignKey("role.id"), nullable=True)
+    role_id: Mapped[int] = mapped_column(
+        ForeignKey("role.id"), nullable=True, index=True
+    )
     role: Mapped[RoleEntity] = relationship(back_populates="permissions")
 
     # The users with the given permissions
     # NOTE: This field establishes a one-to-many relationship between the permissions and users table.
-    user_id: Mapped[int] = mapped_column(ForeignKey("user.id"), nullable=True)
+    user_id: Mapped[int] = mapped_column(
+        ForeignKey("user.id"), nullable=True, index=True
+    )
     user: Mapped[UserEntity] = relationship(back_populates="permissions")
 
     @classmethod
@@ -54,4 +59,6 @@ class PermissionEntity(EntityBase):
 
         Returns:
             Permission: A Permission model for API usage."""
-        return Permission(id=self.id, action=self.action, resource=self.resource)
+        return construct(
+            Permission, id=self.id, action=self.action, resource=self.resource
+        )
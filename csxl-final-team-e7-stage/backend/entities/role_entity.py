@@ -6,6 +6,7 @@ from typing import Self
 from .entity_base import EntityBase
 from .user_role_table import user_role_table
 from ..models import Role, RoleDetails
+from ..models.trusted import construct
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -54,7 +55,7 @@ class RoleEntity(EntityBase):
         Returns:
             Role: A Role model for API usage.
         """
-        return Role(id=self.id, name=self.name)
+        return construct(Role, id=self.id, name=self.name)
 
     def to_details_model(self) -> RoleDetails:
         """
@@ -63,7 +64,8 @@ class RoleEntity(EntityBase):
         Returns:
             RoleDetails: A RoleDetails model for API usage.
         """
-        return RoleDetails(
+        return construct(
+            RoleDetails,
             id=self.id,
             name=self.name,
             permissions=[permission.to_model() for permission in self.permissions],
@@ -6,6 +6,7 @@ from sqlalchemy.orm import Mapped, mapped_column, relationship
 from backend.entities.coworking import SeatEntity
 from .entity_base import EntityBase
 from ..models import Room, RoomDetails
+from ..models.trusted import construct
 from typing import Self
 
 __authors__ = ["Kris Jordan"]
@@ -40,14 +41,15 @@ class RoomEntity(EntityBase):
 
         Returns:
             Room: The model representation of the entity."""
-        return Room(id=self.id, nickname=self.nickname)
+        return construct(Room, id=self.id, nickname=self.nickname)
 
     def to_details_model(self) -> RoomDetails:
         """Converts the entity to a RoomDetail model.
 
         Returns:
             RoomDetails: The model representation of the entity."""
-        return RoomDetails(
+        return construct(
+            RoomDetails,
             id=self.id,
             nickname=self.nickname,
             building=self.building,
@@ -9,6 +9,7 @@ from backend.models.academics.section_member import SectionMember
 from .entity_base import EntityBase
 from .user_role_table import user_role_table
 from ..models import User
+from ..models.trusted import construct
 
 __authors__ = ["Kris Jordan", "Matt Vu"]
 __copyright__ = "Copyright 2023 - 2024"
@@ -100,7 +101,8 @@ class UserEntity(EntityBase):
         Returns:
             User: A User model for API usage.
         """
-        return User(
+        return construct(
+            User,
             id=self.id,
             pid=self.pid,
             onyen=self.onyen,
@@ -13,5 +13,5 @@ user_role_table = Table(
     "user_role",
     EntityBase.metadata,
     Column("user_id", ForeignKey("user.id"), primary_key=True),
-    Column("role_id", ForeignKey("role.id"), primary_key=True),
+    Column("role_id", ForeignKey("role.id"), primary_key=True, index=True),
 )
@@ -3,15 +3,17 @@
 
 from pathlib import Path
 from fastapi import FastAPI, Request
+from fastapi.encoders import jsonable_encoder
 from fastapi.responses import JSONResponse
-from fastapi.middleware.gzip import GZipMiddleware
 
 from backend.services.coworking.reservation import ReservationException
 
 from .api.events import events
 
 from .api import (
+    compression,
     health,
+    metrics,
     organizations,
     static_files,
     profile,
@@ -19,15 +21,28 @@ from .api import (
     user,
     room,
 )
-from .api.coworking import status, reservation, ambassador, operating_hours
+from .api.coworking import (
+    status,
+    reservation,
+    ambassador,
+    operating_hours,
+    policy,
+    utilization,
+)
 from .api.academics import term, course, section
 from .api.admin import users as admin_users
 from .api.admin import roles as admin_roles
 from .services.exceptions import (
     EventRegistrationException,
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
     UserPermissionException,
     ResourceNotFoundException,
+    VersionConflictException,
 )
+from .services.coworking.policy import load_policies
+from .database import UnitOfWorkMiddleware, engine
+from sqlalchemy.orm import Session
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -56,19 +71,28 @@ app = FastAPI(
     ],
 )
 
-# Use GZip middleware for compressing HTML responses over the network
-app.add_middleware(GZipMiddleware)
+# Commit each request's unit of work before its response is sent
+app.add_middleware(UnitOfWorkMiddleware)
+
+# Compress responses over the network according to each route's compression policy
+app.add_middleware(compression.CompressionMiddleware)
+
+# Record request latency and SQL statements for Server-Timing headers and /api/metrics
+app.add_middleware(metrics.RequestMetricsMiddleware)
 
 # Plugging in each of the router APIs
 feature_apis = [
     status,
     reservation,
     operating_hours,
+    policy,
+    utilization,
     events,
     user,
     profile,
     organizations,
     health,
+    metrics,
     ambassador,
     authentication,
     admin_users,
@@ -82,6 +106,14 @@ feature_apis = [
 for feature_api in feature_apis:
     app.include_router(feature_api.api)
 
+
+# Load data-driven coworking policies into memory before serving requests
+@app.on_event("startup")
+def load_coworking_policies():
+    with Session(engine) as session:
+        load_policies(session)
+
+
 # Static file mount used for serving Angular front-end in production, as well as static assets
 app.mount("/", static_files.StaticFileMiddleware(directory=Path("./static")))
 
@@ -99,6 +131,28 @@ def resource_not_found_exception_handler(
     return JSONResponse(status_code=404, content={"message": str(e)})
 
 
+@app.exception_handler(VersionConflictException)
+def version_conflict_exception_handler(request: Request, e: VersionConflictException):
+    return JSONResponse(
+        status_code=409,
+        content={"message": str(e), "current": jsonable_encoder(e.current)},
+    )
+
+
+@app.exception_handler(IdempotencyKeyReusedException)
+def idempotency_key_reused_exception_handler(
+    request: Request, e: IdempotencyKeyReusedException
+):
+    return JSONResponse(status_code=422, content={"message": str(e)})
+
+
+@app.exception_handler(IdempotencyKeyInProgressException)
+def idempotency_key_in_progress_exception_handler(
+    request: Request, e: IdempotencyKeyInProgressException
+):
+    return JSONResponse(status_code=409, content={"message": str(e)})
+
+
 # Add feature-specific exception handling middleware
 from .api import coworking
 from .api import events
@@ -0,0 +1,100 @@
+"""Add effective_permission table
+
+Every permission each user holds, directly or through a role, denormalized from the
+permission and user_role tables so that a permission check is one indexed query. The
+table is populated from the existing grants.
+
+Revision ID: 3e5b1c9a7d20
+Revises: c4d7e2a91b3f
+Create Date: 2024-04-15 09:41:07.503118
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "3e5b1c9a7d20"
+down_revision = "c4d7e2a91b3f"
+branch_labels = None
+depends_on = None
+
+
+def _prefix(column: str) -> str:
+    return f"split_part({column}, '*', 1)"
+
+
+def _like(column: str) -> str:
+    escaped = (
+        f"replace(replace(replace({column}, '\\', '\\\\'), '%', '\\%'), '_', '\\_')"
+    )
+    return f"replace({escaped}, '*', '%')"
+
+
+def upgrade() -> None:
+    op.create_table(
+        "effective_permission",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("permission_id", sa.Integer(), nullable=False),
+        sa.Column("role_id", sa.Integer(), nullable=True),
+        sa.Column("action_prefix", sa.String(), nullable=False),
+        sa.Column("action_like", sa.String(), nullable=False),
+        sa.Column("resource_prefix", sa.String(), nullable=False),
+        sa.Column("resource_like", sa.String(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.ForeignKeyConstraint(
+            ["permission_id"], ["permission.id"], ondelete="CASCADE"
+        ),
+        sa.ForeignKeyConstraint(["role_id"], ["role.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "permission_id"),
+    )
+    op.create_index(
+        op.f("ix_effective_permission_permission_id"),
+        "effective_permission",
+        ["permission_id"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_effective_permission_user_id_action_prefix",
+        "effective_permission",
+        ["user_id", "action_prefix"],
+        unique=False,
+    )
+    op.create_index(
+        "ix_effective_permission_resource_prefix_action_prefix",
+        "effective_permission",
+        ["resource_prefix", "action_prefix"],
+        unique=False,
+    )
+
+    columns = (
+        f"{_prefix('p.action')}, {_like('p.action')}, "
+        f"{_prefix('p.resource')}, {_like('p.resource')}"
+    )
+    op.execute(
+        f"""
+        INSERT INTO effective_permission
+        SELECT p.user_id, p.id, NULL, {columns}
+        FROM permission p WHERE p.user_id IS NOT NULL
+        UNION ALL
+        SELECT ur.user_id, p.id, p.role_id, {columns}
+        FROM permission p JOIN user_role ur ON ur.role_id = p.role_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "ix_effective_permission_resource_prefix_action_prefix",
+        table_name="effective_permission",
+    )
+    op.drop_index(
+        "ix_effective_permission_user_id_action_prefix",
+        table_name="effective_permission",
+    )
+    op.drop_index(
+        op.f("ix_effective_permission_permission_id"),
+        table_name="effective_permission",
+    )
+    op.drop_table("effective_permission")
@@ -0,0 +1,67 @@
+"""Add coworking utilization rollup tables
+
+Hourly seat and room utilization, maintained as reservations are checked out or missed.
+
+Revision ID: 5c9e1f3a8b74
+Revises: d2e8b7c41f06
+Create Date: 2024-04-25 09:12:07.318452
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "5c9e1f3a8b74"
+down_revision = "d2e8b7c41f06"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__seat_utilization",
+        sa.Column("seat_id", sa.Integer(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("reserved_minutes", sa.Integer(), nullable=False),
+        sa.Column("checked_in_minutes", sa.Integer(), nullable=False),
+        sa.Column("no_shows", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["seat_id"], ["coworking__seat.id"]),
+        sa.PrimaryKeyConstraint("seat_id", "hour"),
+    )
+    op.create_index(
+        op.f("ix_coworking__seat_utilization_hour"),
+        "coworking__seat_utilization",
+        ["hour"],
+        unique=False,
+    )
+    op.create_table(
+        "coworking__room_utilization",
+        sa.Column("room_id", sa.String(), nullable=False),
+        sa.Column("hour", sa.DateTime(), nullable=False),
+        sa.Column("reserved_minutes", sa.Integer(), nullable=False),
+        sa.Column("checked_in_minutes", sa.Integer(), nullable=False),
+        sa.Column("no_shows", sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(["room_id"], ["room.id"]),
+        sa.PrimaryKeyConstraint("room_id", "hour"),
+    )
+    op.create_index(
+        op.f("ix_coworking__room_utilization_hour"),
+        "coworking__room_utilization",
+        ["hour"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        op.f("ix_coworking__room_utilization_hour"),
+        table_name="coworking__room_utilization",
+    )
+    op.drop_table("coworking__room_utilization")
+    op.drop_index(
+        op.f("ix_coworking__seat_utilization_hour"),
+        table_name="coworking__seat_utilization",
+    )
+    op.drop_table("coworking__seat_utilization")
@@ -0,0 +1,69 @@
+"""Add operating hours recurrence table
+
+Weekly operating hours templates bound to terms, and the template each materialized
+occurrence in coworking__operating_hours was created from.
+
+Revision ID: 7b2e9d41c6a8
+Revises: 90c56e5464ff
+Create Date: 2024-03-18 11:04:52.716305
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision = "7b2e9d41c6a8"
+down_revision = "90c56e5464ff"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__operating_hours_recurrence",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("term_id", sa.String(length=6), nullable=False),
+        sa.Column(
+            "weekly_hours", postgresql.JSONB(astext_type=sa.Text()), nullable=False
+        ),
+        sa.Column("exceptions", postgresql.ARRAY(sa.Date()), nullable=False),
+        sa.Column("materialized_until", sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(["term_id"], ["academics__term.id"]),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        op.f("ix_coworking__operating_hours_recurrence_term_id"),
+        "coworking__operating_hours_recurrence",
+        ["term_id"],
+        unique=False,
+    )
+    # Nullable, so adding the column does not rewrite existing operating hours
+    op.add_column(
+        "coworking__operating_hours",
+        sa.Column("recurrence_id", sa.Integer(), nullable=True),
+    )
+    op.create_foreign_key(
+        "coworking__operating_hours_recurrence_id_fkey",
+        "coworking__operating_hours",
+        "coworking__operating_hours_recurrence",
+        ["recurrence_id"],
+        ["id"],
+        ondelete="SET NULL",
+    )
+
+
+def downgrade() -> None:
+    op.drop_constraint(
+        "coworking__operating_hours_recurrence_id_fkey",
+        "coworking__operating_hours",
+        type_="foreignkey",
+    )
+    op.drop_column("coworking__operating_hours", "recurrence_id")
+    op.drop_index(
+        op.f("ix_coworking__operating_hours_recurrence_term_id"),
+        table_name="coworking__operating_hours_recurrence",
+    )
+    op.drop_table("coworking__operating_hours_recurrence")
@@ -0,0 +1,36 @@
+"""Add idempotency_key table
+
+Keys sent with retried requests, with the responses of their first attempts.
+
+Revision ID: 8a4f2c6e1d93
+Revises: 3e5b1c9a7d20
+Create Date: 2024-04-22 14:12:38.215604
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "8a4f2c6e1d93"
+down_revision = "3e5b1c9a7d20"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "idempotency_key",
+        sa.Column("user_id", sa.Integer(), nullable=False),
+        sa.Column("key", sa.String(length=255), nullable=False),
+        sa.Column("fingerprint", sa.String(length=64), nullable=False),
+        sa.Column("response", sa.LargeBinary(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(["user_id"], ["user.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("user_id", "key"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table("idempotency_key")
@@ -0,0 +1,54 @@
+"""Add index of reservations by room and start
+
+Extensions look up the next reservation of a room in order of start. The index on
+(room_id, start) serves that lookup with an index-ordered scan, and replaces the index
+on room_id alone, of which it is a prefix. The next reservation of a seat is found
+through the index on coworking__reservation_seat.seat_id.
+
+Revision ID: a9c3e5d71b20
+Revises: 5c9e1f3a8b74
+Create Date: 2024-04-26 15:47:33.802614
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "a9c3e5d71b20"
+down_revision = "5c9e1f3a8b74"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside of a transaction.
+    with op.get_context().autocommit_block():
+        op.create_index(
+            "coworking__reservation_room_start_idx",
+            "coworking__reservation",
+            ["room_id", "start"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            op.f("ix_coworking__reservation_room_id"),
+            table_name="coworking__reservation",
+            postgresql_concurrently=True,
+        )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        op.create_index(
+            op.f("ix_coworking__reservation_room_id"),
+            "coworking__reservation",
+            ["room_id"],
+            unique=False,
+            postgresql_concurrently=True,
+        )
+        op.drop_index(
+            "coworking__reservation_room_start_idx",
+            table_name="coworking__reservation",
+            postgresql_concurrently=True,
+        )
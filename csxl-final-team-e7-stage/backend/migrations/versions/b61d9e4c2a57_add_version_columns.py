@@ -0,0 +1,34 @@
+"""Add version columns to reservation, event, and organization tables
+
+Each update of a row is conditional on the version it was read at, and increments it.
+
+Revision ID: b61d9e4c2a57
+Revises: 8a4f2c6e1d93
+Create Date: 2024-04-24 10:27:51.640193
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "b61d9e4c2a57"
+down_revision = "8a4f2c6e1d93"
+branch_labels = None
+depends_on = None
+
+TABLES = ["coworking__reservation", "event", "organization"]
+
+
+def upgrade() -> None:
+    for table in TABLES:
+        op.add_column(
+            table,
+            sa.Column("version", sa.Integer(), server_default="1", nullable=False),
+        )
+
+
+def downgrade() -> None:
+    for table in TABLES:
+        op.drop_column(table, "version")
@@ -0,0 +1,60 @@
+"""Add indexes for foreign keys and frequently filtered columns
+
+Foreign keys that are not the leading column of a primary key, and columns such as
+event.time that services filter or sort by, had no supporting index. Indexes are
+created concurrently so that tables remain writable while they build.
+
+Revision ID: c4d7e2a91b3f
+Revises: e3a6c1f8d245
+Create Date: 2024-04-08 10:12:41.318254
+
+"""
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision = "c4d7e2a91b3f"
+down_revision = "e3a6c1f8d245"
+branch_labels = None
+depends_on = None
+
+# (table, column) pairs indexed as ix_<table>_<column>, matching `index=True` on the entities
+INDEXED_COLUMNS = [
+    ("event", "organization_id"),
+    ("event", "time"),
+    ("event_registration", "user_id"),
+    ("organization_member", "user_id"),
+    ("permission", "user_id"),
+    ("permission", "role_id"),
+    ("user_role", "role_id"),
+    ("academics__section", "term_id"),
+    ("academics__section", "course_id"),
+    ("academics__user_section", "user_id"),
+    ("coworking__reservation", "room_id"),
+    ("coworking__reservation_user", "user_id"),
+    ("coworking__reservation_seat", "seat_id"),
+]
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY cannot run inside of a transaction.
+    with op.get_context().autocommit_block():
+        for table, column in INDEXED_COLUMNS:
+            op.create_index(
+                op.f(f"ix_{table}_{column}"),
+                table,
+                [column],
+                unique=False,
+                postgresql_concurrently=True,
+            )
+
+
+def downgrade() -> None:
+    with op.get_context().autocommit_block():
+        for table, column in reversed(INDEXED_COLUMNS):
+            op.drop_index(
+                op.f(f"ix_{table}_{column}"),
+                table_name=table,
+                postgresql_concurrently=True,
+            )
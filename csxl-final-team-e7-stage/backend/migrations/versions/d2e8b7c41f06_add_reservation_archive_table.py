@@ -0,0 +1,51 @@
+"""Add coworking__reservation_archive table
+
+Reservations that ended in a final state, moved out of coworking__reservation.
+
+Revision ID: d2e8b7c41f06
+Revises: b61d9e4c2a57
+Create Date: 2024-04-24 10:31:52.640178
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "d2e8b7c41f06"
+down_revision = "b61d9e4c2a57"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__reservation_archive",
+        sa.Column("id", sa.Integer(), autoincrement=False, nullable=False),
+        sa.Column("start", sa.DateTime(), nullable=False),
+        sa.Column("end", sa.DateTime(), nullable=False),
+        sa.Column("state", sa.String(), nullable=False),
+        sa.Column("walkin", sa.Boolean(), nullable=False),
+        sa.Column("room_id", sa.String(), nullable=True),
+        sa.Column("created_at", sa.DateTime(), nullable=False),
+        sa.Column("updated_at", sa.DateTime(), nullable=False),
+        sa.Column("user_ids", sa.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("seat_ids", sa.ARRAY(sa.Integer()), nullable=False),
+        sa.Column("archived_at", sa.DateTime(), nullable=False),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "coworking__reservation_archive_time_idx",
+        "coworking__reservation_archive",
+        ["start", "end"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index(
+        "coworking__reservation_archive_time_idx",
+        table_name="coworking__reservation_archive",
+    )
+    op.drop_table("coworking__reservation_archive")
@@ -0,0 +1,62 @@
+"""Add coworking policy tables
+
+Duration policies overridden for everyone or for a role's members, and weekly blocks
+during which rooms cannot be reserved. Both are empty until overridden, in which case
+the defaults in `backend/services/coworking/policy.py` apply.
+
+Revision ID: e3a6c1f8d245
+Revises: 7b2e9d41c6a8
+Create Date: 2024-03-21 16:38:09.284117
+
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = "e3a6c1f8d245"
+down_revision = "7b2e9d41c6a8"
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        "coworking__group_policy",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("role_id", sa.Integer(), nullable=True),
+        sa.Column("key", sa.String(), nullable=False),
+        sa.Column("value", sa.Interval(), nullable=False),
+        sa.ForeignKeyConstraint(["role_id"], ["role.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "coworking__group_policy_idx",
+        "coworking__group_policy",
+        ["role_id", "key"],
+        unique=True,
+    )
+    op.create_table(
+        "coworking__room_policy",
+        sa.Column("id", sa.Integer(), nullable=False),
+        sa.Column("room_id", sa.String(), nullable=False),
+        sa.Column("weekday", sa.Integer(), nullable=False),
+        sa.Column("start", sa.Time(), nullable=False),
+        sa.Column("end", sa.Time(), nullable=False),
+        sa.ForeignKeyConstraint(["room_id"], ["room.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id"),
+    )
+    op.create_index(
+        "coworking__room_policy_idx",
+        "coworking__room_policy",
+        ["room_id", "weekday"],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("coworking__room_policy_idx", table_name="coworking__room_policy")
+    op.drop_table("coworking__room_policy")
+    op.drop_index("coworking__group_policy_idx", table_name="coworking__group_policy")
+    op.drop_table("coworking__group_policy")
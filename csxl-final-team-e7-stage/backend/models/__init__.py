@@ -1,7 +1,7 @@
 """Package for all models in the application."""
 
 from .pagination import Paginated, PaginationParams, EventPaginationParams
-from .permission import Permission
+from .permission import Permission, PermissionCheck
 from .user import User, ProfileForm
 from .user_details import UserDetails
 from .unregistered_user import UnregisteredUser
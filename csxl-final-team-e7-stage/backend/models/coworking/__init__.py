@@ -4,6 +4,10 @@ from .seat_details import SeatDetails
 from .time_range import TimeRange
 
 from .operating_hours import OperatingHours
+from .operating_hours_recurrence import (
+    OperatingHoursRecurrence,
+    WeeklyOperatingHours,
+)
 
 from .reservation import (
     Reservation,
@@ -15,22 +19,48 @@ from .reservation import (
 )
 
 from .availability_list import AvailabilityList
-from .availability import RoomState, SeatAvailability, RoomAvailability
+from .interval_set import IntervalSet
+from .availability import RoomState, SeatAvailability, RoomAvailability, RoomSlot
+from .slot_calendar import SlotCalendar
 
 from .status import Status
 
+from .policy import GroupPolicy, RoomPolicy
+
+from .utilization import (
+    Utilization,
+    HourlyUtilization,
+    WeekdayUtilization,
+    SeatTypeUtilization,
+    RoomUtilization,
+    UtilizationReport,
+)
+
 __all__ = [
     "Seat",
     "SeatDetails",
     "TimeRange",
     "OperatingHours",
+    "OperatingHoursRecurrence",
+    "WeeklyOperatingHours",
     "Reservation",
     "ReservationState",
     "ReservationRequest",
     "ReservationPartial",
     "ReservationIdentity",
     "AvailabilityList",
+    "IntervalSet",
     "RoomAvailability",
     "SeatAvailability",
+    "RoomSlot",
+    "SlotCalendar",
     "Status",
+    "GroupPolicy",
+    "RoomPolicy",
+    "Utilization",
+    "HourlyUtilization",
+    "WeekdayUtilization",
+    "SeatTypeUtilization",
+    "RoomUtilization",
+    "UtilizationReport",
 ]
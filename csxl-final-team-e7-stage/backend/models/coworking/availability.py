@@ -31,3 +31,10 @@ class SeatAvailability(Seat, AvailabilityList, BaseModel):
     """A seat that is available for a given time range."""
 
     ...
+
+
+class RoomSlot(TimeRange):
+    """A free time range in a room, found by searching for rooms to reserve."""
+
+    room: Room
+    capacity: int
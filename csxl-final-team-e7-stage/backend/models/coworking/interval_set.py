@@ -0,0 +1,238 @@
+"""Lightweight, immutable set of time intervals.
+
+AvailabilityList validates and copies a pydantic TimeRange for every intermediate
+result. IntervalSet instead stores interval bounds as int64 microseconds since the
+Unix epoch in two parallel arrays, and implements set operations as single merge
+passes over both operands. Convert to and from the pydantic models at the edges.
+
+Intervals are half-open, [start, end). Stored intervals are sorted, non-empty, and
+disjoint; touching intervals are coalesced.
+"""
+
+from array import array
+from bisect import bisect_left, bisect_right
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator, Self
+from .time_range import TimeRange
+from .availability_list import AvailabilityList
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+_EPOCH = datetime(1970, 1, 1)
+_MICROSECOND = timedelta(microseconds=1)
+
+
+def to_micros(value: datetime) -> int:
+    """Convert a naive datetime to integer microseconds since the epoch."""
+    return (value - _EPOCH) // _MICROSECOND
+
+
+def from_micros(value: int) -> datetime:
+    """Convert integer microseconds since the epoch to a naive datetime."""
+    return _EPOCH + timedelta(microseconds=value)
+
+
+class IntervalSet:
+    """An immutable, normalized set of half-open time intervals."""
+
+    __slots__ = ("_starts", "_ends")
+
+    def __init__(self, intervals: Iterable[tuple[int, int]] = ()):
+        """Build a set from (start, end) pairs of epoch microseconds in any order.
+
+        Empty and inverted pairs are dropped; overlapping and touching pairs are merged.
+        """
+        starts = array("q")
+        ends = array("q")
+        for start, end in sorted(intervals):
+            if start >= end:
+                continue
+            if len(ends) > 0 and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        self._starts = starts
+        self._ends = ends
+
+    @classmethod
+    def _from_arrays(cls, starts: array, ends: array) -> Self:
+        """Wrap arrays that are already normalized without re-checking them."""
+        interval_set = cls.__new__(cls)
+        interval_set._starts = starts
+        interval_set._ends = ends
+        return interval_set
+
+    @classmethod
+    def from_time_ranges(cls, time_ranges: Iterable[TimeRange]) -> Self:
+        """Build a set from TimeRange models, such as OperatingHours or Reservations."""
+        return cls(
+            (to_micros(time_range.start), to_micros(time_range.end))
+            for time_range in time_ranges
+        )
+
+    @classmethod
+    def from_availability_list(cls, availability_list: AvailabilityList) -> Self:
+        """Build a set from an AvailabilityList."""
+        return cls.from_time_ranges(availability_list.availability)
+
+    @classmethod
+    def between(cls, start: datetime, end: datetime) -> Self:
+        """A set holding the single interval [start, end)."""
+        return cls(((to_micros(start), to_micros(end)),))
+
+    def to_time_ranges(self) -> list[TimeRange]:
+        """Convert to TimeRange models.
+
+        Normalization already guarantees each interval is valid, so validation is skipped.
+        """
+        return [
+            TimeRange.model_construct(start=from_micros(start), end=from_micros(end))
+            for start, end in zip(self._starts, self._ends)
+        ]
+
+    def to_availability_list(self) -> AvailabilityList:
+        """Convert to an AvailabilityList."""
+        return AvailabilityList.model_construct(availability=self.to_time_ranges())
+
+    def union(self, other: Self) -> Self:
+        """Time covered by either set."""
+        a_starts, a_ends, b_starts, b_ends = (
+            self._starts,
+            self._ends,
+            other._starts,
+            other._ends,
+        )
+        starts = array("q")
+        ends = array("q")
+        i = j = 0
+        while i < len(a_starts) or j < len(b_starts):
+            if j == len(b_starts) or (i < len(a_starts) and a_starts[i] <= b_starts[j]):
+                start, end = a_starts[i], a_ends[i]
+                i += 1
+            else:
+                start, end = b_starts[j], b_ends[j]
+                j += 1
+            if len(ends) > 0 and start <= ends[-1]:
+                if end > ends[-1]:
+                    ends[-1] = end
+            else:
+                starts.append(start)
+                ends.append(end)
+        return self._from_arrays(starts, ends)
+
+    def intersection(self, other: Self) -> Self:
+        """Time covered by both sets."""
+        a_starts, a_ends, b_starts, b_ends = (
+            self._starts,
+            self._ends,
+            other._starts,
+            other._ends,
+        )
+        starts = array("q")
+        ends = array("q")
+        i = j = 0
+        while i < len(a_starts) and j < len(b_starts):
+            start = max(a_starts[i], b_starts[j])
+            end = min(a_ends[i], b_ends[j])
+            if start < end:
+                starts.append(start)
+                ends.append(end)
+            if a_ends[i] < b_ends[j]:
+                i += 1
+            else:
+                j += 1
+        return self._from_arrays(starts, ends)
+
+    def difference(self, other: Self) -> Self:
+        """Time covered by this set and not by the other."""
+        a_starts, a_ends, b_starts, b_ends = (
+            self._starts,
+            self._ends,
+            other._starts,
+            other._ends,
+        )
+        starts = array("q")
+        ends = array("q")
+        j = 0
+        for i in range(len(a_starts)):
+            cursor, end = a_starts[i], a_ends[i]
+            while j < len(b_starts) and b_ends[j] <= cursor:
+                j += 1
+            k = j
+            while k < len(b_starts) and b_starts[k] < end:
+                if b_starts[k] > cursor:
+                    starts.append(cursor)
+                    ends.append(b_starts[k])
+                if b_ends[k] > cursor:
+                    cursor = b_ends[k]
+                if cursor >= end:
+                    break
+                k += 1
+            if cursor < end:
+                starts.append(cursor)
+                ends.append(end)
+            j = k
+        return self._from_arrays(starts, ends)
+
+    def constrain(self, start: datetime, end: datetime) -> Self:
+        """The portion of this set within [start, end)."""
+        lo, hi = to_micros(start), to_micros(end)
+        if lo >= hi:
+            return self._from_arrays(array("q"), array("q"))
+        first = bisect_right(self._ends, lo)
+        last = bisect_left(self._starts, hi)
+        starts = self._starts[first:last]
+        ends = self._ends[first:last]
+        if len(starts) > 0:
+            starts[0] = max(starts[0], lo)
+            ends[-1] = min(ends[-1], hi)
+        return self._from_arrays(starts, ends)
+
+    def filter_shorter_than(self, minimum: timedelta) -> Self:
+        """Drop intervals lasting less than the minimum."""
+        threshold = minimum // _MICROSECOND
+        starts = array("q")
+        ends = array("q")
+        for start, end in zip(self._starts, self._ends):
+            if end - start >= threshold:
+                starts.append(start)
+                ends.append(end)
+        return self._from_arrays(starts, ends)
+
+    def bounds(self) -> TimeRange | None:
+        """The span from the earliest start to the latest end, or None when empty."""
+        if len(self._starts) == 0:
+            return None
+        return TimeRange.model_construct(
+            start=from_micros(self._starts[0]), end=from_micros(self._ends[-1])
+        )
+
+    def total_duration(self) -> timedelta:
+        """Total time covered by the set."""
+        return timedelta(microseconds=sum(self._ends) - sum(self._starts))
+
+    def __iter__(self) -> Iterator[tuple[datetime, datetime]]:
+        for start, end in zip(self._starts, self._ends):
+            yield from_micros(start), from_micros(end)
+
+    def __len__(self) -> int:
+        return len(self._starts)
+
+    def __bool__(self) -> bool:
+        return len(self._starts) > 0
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, IntervalSet):
+            return NotImplemented
+        return self._starts == other._starts and self._ends == other._ends
+
+    def __repr__(self) -> str:
+        return f"IntervalSet({[(start, end) for start, end in self]!r})"
+
+    __or__ = union
+    __and__ = intersection
+    __sub__ = difference
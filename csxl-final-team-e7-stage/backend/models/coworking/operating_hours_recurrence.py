@@ -0,0 +1,62 @@
+"""Models recurring weekly operating hours of the XL over an academic term."""
+
+from datetime import date, datetime, time
+from pydantic import BaseModel, field_validator, ValidationInfo
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class WeeklyOperatingHours(BaseModel):
+    """A single open window on a day of the week.
+
+    Weekdays follow `datetime.weekday()`, where Monday is 0 and Sunday is 6."""
+
+    weekday: int
+    start: time
+    end: time
+
+    @field_validator("weekday")
+    @classmethod
+    def check_weekday_in_range(cls, v: int):
+        if v < 0 or v > 6:
+            raise ValueError("weekday must be between 0 (Monday) and 6 (Sunday)")
+        return v
+
+    @field_validator("end")
+    @classmethod
+    def check_end_greater_than_start(cls, v: time, info: ValidationInfo):
+        if "start" in info.data and v <= info.data["start"]:
+            raise ValueError("end must be greater than start")
+        return v
+
+    def overlaps(self, other: "WeeklyOperatingHours") -> bool:
+        """Returns True if both windows fall on the same weekday and touch or overlap."""
+        return (
+            self.weekday == other.weekday
+            and self.start <= other.end
+            and other.start <= self.end
+        )
+
+
+class OperatingHoursRecurrence(BaseModel):
+    """A weekly operating hours template bound to the dates of a term.
+
+    Occurrences are materialized as OperatingHours up to `materialized_until` and
+    expanded on demand past it. Dates listed in `exceptions` are skipped."""
+
+    id: int | None = None
+    term_id: str
+    weekly_hours: list[WeeklyOperatingHours]
+    exceptions: list[date] = []
+    materialized_until: datetime | None = None
+
+    @field_validator("weekly_hours")
+    @classmethod
+    def check_weekly_hours_do_not_overlap(cls, v: list[WeeklyOperatingHours]):
+        for i, window in enumerate(v):
+            for other in v[i + 1 :]:
+                if window.overlaps(other):
+                    raise ValueError("weekly hours on the same weekday cannot overlap")
+        return v
@@ -0,0 +1,45 @@
+"""Models for data-driven coworking policies."""
+
+from datetime import time, timedelta
+from pydantic import BaseModel, field_validator, ValidationInfo
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class GroupPolicy(BaseModel):
+    """A duration policy value for a group of users.
+
+    A `role_id` of None overrides the default for everyone; otherwise the value
+    applies to members of the role."""
+
+    id: int | None = None
+    role_id: int | None = None
+    key: str
+    value: timedelta
+
+
+class RoomPolicy(BaseModel):
+    """A recurring weekly block during which a room is unavailable for reservations,
+    such as office hours. Weekdays follow `datetime.weekday()`."""
+
+    id: int | None = None
+    room_id: str
+    weekday: int
+    start: time
+    end: time
+
+    @field_validator("weekday")
+    @classmethod
+    def check_weekday_in_range(cls, v: int):
+        if v < 0 or v > 6:
+            raise ValueError("weekday must be between 0 (Monday) and 6 (Sunday)")
+        return v
+
+    @field_validator("end")
+    @classmethod
+    def check_end_greater_than_start(cls, v: time, info: ValidationInfo):
+        if "start" in info.data and v <= info.data["start"]:
+            raise ValueError("end must be greater than start")
+        return v
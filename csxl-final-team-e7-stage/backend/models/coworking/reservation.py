@@ -37,6 +37,8 @@ class Reservation(ReservationIdentity, TimeRange):
     walkin: bool = False
     created_at: datetime
     updated_at: datetime
+    # Version read, which changes sent with it must match, if given
+    version: int | None = None
 
 
 class ReservationMapDetails(BaseModel):
@@ -0,0 +1,142 @@
+"""Per-room, per-day bitsets of free reservation slots.
+
+Each day is divided into fixed slots, half hours by default. The free time of a room on
+a day is an int whose bit i is set when slot i is free. Finding every start of n free
+consecutive slots is then a few shifts and ands per room and day, regardless of how
+many reservations the room has.
+"""
+
+from datetime import date, datetime, time, timedelta
+from typing import Iterable, Iterator
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+ONE_DAY = timedelta(days=1)
+DEFAULT_GRANULARITY = timedelta(minutes=30)
+
+
+class SlotCalendar:
+    """Free slots of a set of rooms over a range of consecutive days.
+
+    Every slot starts out busy. Open time, such as operating hours, is added with
+    `open` and rounded inward to whole slots. Busy time, such as reservations, is
+    removed with `block` and rounded outward, so any slot it touches is busy."""
+
+    __slots__ = ("first_day", "days", "granularity", "slots_per_day", "_free")
+
+    def __init__(
+        self,
+        first_day: date,
+        days: int,
+        room_ids: Iterable[str],
+        granularity: timedelta = DEFAULT_GRANULARITY,
+    ):
+        if granularity <= timedelta(0) or ONE_DAY % granularity != timedelta(0):
+            raise ValueError("Slot granularity must evenly divide a day.")
+        self.first_day = first_day
+        self.days = days
+        self.granularity = granularity
+        self.slots_per_day = ONE_DAY // granularity
+        self._free: dict[str, list[int]] = {room_id: [0] * days for room_id in room_ids}
+
+    @property
+    def room_ids(self) -> list[str]:
+        return list(self._free)
+
+    def slot_start(self, day: int, slot: int) -> datetime:
+        """The time slot `slot` of day `day` begins."""
+        return (
+            datetime.combine(self.first_day, time())
+            + day * ONE_DAY
+            + slot * self.granularity
+        )
+
+    def slot_of(self, value: time, round_up: bool = False) -> int:
+        """The index of the slot a time of day falls in, or of the next slot when rounding up."""
+        offset = datetime.combine(date.min, value) - datetime.min
+        if round_up:
+            return -(-offset // self.granularity)
+        return offset // self.granularity
+
+    def open(self, start: datetime, end: datetime, room_id: str | None = None) -> None:
+        """Mark the whole slots within [start, end) free, for one room or every room."""
+        for day, mask in self._day_masks(self._ceil_slot(start), self._floor_slot(end)):
+            for free in self._rows(room_id):
+                free[day] |= mask
+
+    def block(self, start: datetime, end: datetime, room_id: str | None = None) -> None:
+        """Mark every slot touching [start, end) busy, for one room or every room."""
+        for day, mask in self._day_masks(self._floor_slot(start), self._ceil_slot(end)):
+            for free in self._rows(room_id):
+                free[day] &= ~mask
+
+    def free_slots(self, room_id: str, day: int) -> int:
+        """The bitset of free slots of a room on a day."""
+        return self._free[room_id][day]
+
+    def find(
+        self, room_id: str, length: int, earliest: int = 0, latest: int | None = None
+    ) -> Iterator[tuple[datetime, datetime]]:
+        """Find non-overlapping runs of `length` free slots of a room, earliest first.
+
+        Args:
+            room_id (str): The room to search.
+            length (int): The number of consecutive free slots needed.
+            earliest (int): The first slot of each day a run may start in.
+            latest (int | None): The slot of each day a run must end by. Defaults to midnight.
+
+        Yields:
+            tuple[datetime, datetime]: The start and end of each run found.
+        """
+        latest = self.slots_per_day if latest is None else latest
+        if length <= 0 or earliest + length > latest:
+            return
+        # Bit j of window is set when a run starting at slot j fits in [earliest, latest).
+        window = ((1 << (latest - length - earliest + 1)) - 1) << earliest
+        for day, free in enumerate(self._free[room_id]):
+            runs = _runs_of(free, length) & window
+            while runs:
+                slot = (runs & -runs).bit_length() - 1
+                yield self.slot_start(day, slot), self.slot_start(day, slot + length)
+                runs &= ~((1 << (slot + length)) - 1)
+
+    def _rows(self, room_id: str | None) -> Iterable[list[int]]:
+        if room_id is None:
+            return self._free.values()
+        if room_id in self._free:
+            return (self._free[room_id],)
+        return ()
+
+    def _offset(self, value: datetime) -> timedelta:
+        return value - datetime.combine(self.first_day, time())
+
+    def _floor_slot(self, value: datetime) -> int:
+        return self._offset(value) // self.granularity
+
+    def _ceil_slot(self, value: datetime) -> int:
+        return -(-self._offset(value) // self.granularity)
+
+    def _day_masks(self, first: int, last: int) -> Iterator[tuple[int, int]]:
+        """Split the calendar-wide slots [first, last) into a mask per day."""
+        first = max(first, 0)
+        last = min(last, self.days * self.slots_per_day)
+        while first < last:
+            day, slot = divmod(first, self.slots_per_day)
+            end = min(last - day * self.slots_per_day, self.slots_per_day)
+            yield day, ((1 << (end - slot)) - 1) << slot
+            first = (day + 1) * self.slots_per_day
+
+
+def _runs_of(free: int, length: int) -> int:
+    """The bits j of `free` such that bits j through j + length - 1 are all set.
+
+    Doubles the run length checked with each shift, so needs O(log length) operations.
+    """
+    runs, span = free, 1
+    while span < length:
+        step = min(span, length - span)
+        runs &= runs >> step
+        span += step
+    return runs
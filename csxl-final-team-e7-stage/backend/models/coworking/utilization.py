@@ -0,0 +1,57 @@
+"""Models for coworking utilization analytics."""
+
+from datetime import datetime
+from pydantic import BaseModel
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class Utilization(BaseModel):
+    """Use of seats or rooms, summed over the reservations that ended in use or missed.
+
+    Reservations count once they are checked out, or cancelled for not being checked
+    into, in which case they are no-shows whose minutes count as reserved only."""
+
+    reserved_minutes: int = 0
+    checked_in_minutes: int = 0
+    no_shows: int = 0
+
+
+class HourlyUtilization(Utilization):
+    """Utilization during an hour of the day, from 0 to 23."""
+
+    hour: int
+
+
+class WeekdayUtilization(Utilization):
+    """Utilization on a weekday, following `datetime.weekday()`."""
+
+    weekday: int
+
+
+class SeatTypeUtilization(Utilization):
+    """Utilization of the seats with the same equipment."""
+
+    has_monitor: bool
+    sit_stand: bool
+
+
+class RoomUtilization(Utilization):
+    """Utilization of a room."""
+
+    room_id: str
+
+
+class UtilizationReport(BaseModel):
+    """Seat and room utilization over the hours from `start` until `end`."""
+
+    start: datetime
+    end: datetime
+    seats_by_hour: list[HourlyUtilization]
+    seats_by_weekday: list[WeekdayUtilization]
+    seats_by_type: list[SeatTypeUtilization]
+    rooms_by_hour: list[HourlyUtilization]
+    rooms_by_weekday: list[WeekdayUtilization]
+    rooms: list[RoomUtilization]
@@ -38,3 +38,5 @@ class Event(DraftEvent):
     registration_count: int = 0
     is_attendee: bool = False
     is_organizer: bool = False
+    # Version read, which updates sent with it must match, if given
+    version: int | None = None
@@ -11,3 +11,6 @@ class EventDetails(Event):
     """
 
     organization: Organization
+
+    # Whether the user viewing the event can edit it, as an organizer or by permission
+    can_edit: bool = False
@@ -34,3 +34,5 @@ class Organization(BaseModel):
     member_count: int = 0
     status: str
     application_link: str
+    # Version read, which updates sent with it must match, if given
+    version: int | None = None
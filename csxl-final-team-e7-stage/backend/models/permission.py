@@ -20,3 +20,13 @@ class Permission(BaseModel):
     id: int | None = None
     action: str
     resource: str
+
+
+class PermissionCheck(BaseModel):
+    """
+    Pydantic model to represent one check, in a batch, of whether the user making the
+    request may carry out an action on a resource.
+    """
+
+    action: str
+    resource: str
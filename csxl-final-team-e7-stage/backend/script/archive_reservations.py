@@ -0,0 +1,58 @@
+"""
+This script moves reservations that ended in a final state, cancelled or checked out,
+more than a number of days ago out of the coworking__reservation table and into
+coworking__reservation_archive, committing after each batch. It is meant to be run
+periodically, such as nightly from cron.
+
+With --compact, lapsed drafts and other reservations cancelled before their check-in
+timeout passed are deleted rather than archived. No-shows, cancelled once the timeout
+had passed, are archived regardless, since backfill_utilization counts them.
+
+Usage: python3 -m backend.script.archive_reservations [--days 30] [--compact]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services.coworking import reservation_archive
+from ..services.coworking.policy import load_policies
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def main(argv: list[str] | None = None) -> tuple[int, int]:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--days",
+        type=int,
+        default=30,
+        help="Archive reservations that ended more than this many days ago",
+    )
+    parser.add_argument(
+        "--compact",
+        action="store_true",
+        help="Delete lapsed drafts and early cancellations rather than archive them",
+    )
+    args = parser.parse_args(argv)
+
+    before = datetime.now() - timedelta(days=args.days)
+    archived = compacted = 0
+    with Session(engine) as session:
+        # The check-in timeout telling no-shows from lapsed drafts may be overridden
+        load_policies(session)
+        while True:
+            batch = reservation_archive.archive_batch(session, before, args.compact)
+            session.commit()
+            if batch == (0, 0):
+                break
+            archived += batch[0]
+            compacted += batch[1]
+    return archived, compacted
+
+
+if __name__ == "__main__":
+    archived, compacted = main()
+    print(f"Archived {archived} reservations and compacted {compacted}")
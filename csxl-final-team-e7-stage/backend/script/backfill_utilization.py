@@ -0,0 +1,47 @@
+"""
+This script rebuilds the hourly coworking utilization rollups from the reservation
+tables, including archived reservations, for the hours in a span of days. It is run
+once to build the history of utilization, and again after reservations are changed
+other than through the ReservationService, such as by a bulk load or a manual fix.
+
+Usage: python3 -m backend.script.backfill_utilization [--days 365] [--until 2024-05-01]
+"""
+
+import argparse
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..models.coworking import TimeRange
+from ..services.coworking import utilization
+from ..services.coworking.policy import load_policies
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--days", type=int, default=365, help="Number of days of rollups to rebuild"
+    )
+    parser.add_argument(
+        "--until",
+        type=datetime.fromisoformat,
+        default=None,
+        help="End of the span to rebuild, by default the current hour",
+    )
+    args = parser.parse_args(argv)
+
+    end = args.until or datetime.now().replace(minute=0, second=0, microsecond=0)
+    time_range = TimeRange(start=end - timedelta(days=args.days), end=end)
+    with Session(engine) as session:
+        # The check-in timeout telling no-shows apart may be overridden
+        load_policies(session)
+        written = utilization.backfill(session, time_range)
+        session.commit()
+    return written
+
+
+if __name__ == "__main__":
+    print(f"Wrote {main()} utilization rollups")
@@ -0,0 +1,55 @@
+"""
+This script precompresses the front-end build so that the static file middleware can
+serve each compressible file's `.br` and `.gz` siblings rather than compressing it on
+the first request in every process.
+
+Usage: python3 -m backend.script.compress_static [directory]
+"""
+
+import os
+import sys
+from ..api.static_files import ENCODINGS, compress, compressible
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def compress_directory(directory: str) -> int:
+    """Write the compressed siblings of every compressible file in a directory.
+
+    Siblings newer than their file are left as they are.
+
+    Returns:
+        int: The number of siblings written.
+    """
+    written = 0
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if os.path.splitext(name)[1] in ENCODINGS.values():
+                continue
+            path = os.path.join(root, name)
+            stat_result = os.stat(path)
+            if not compressible(path, stat_result.st_size):
+                continue
+            with open(path, "rb") as file:
+                body = file.read()
+            for encoding, extension in ENCODINGS.items():
+                sibling = path + extension
+                if (
+                    os.path.exists(sibling)
+                    and os.stat(sibling).st_mtime >= stat_result.st_mtime
+                ):
+                    continue
+                encoded = compress(body, encoding)
+                if len(encoded) >= len(body):
+                    continue
+                with open(sibling, "wb") as file:
+                    file.write(encoded)
+                written += 1
+    return written
+
+
+if __name__ == "__main__":
+    directory = sys.argv[1] if len(sys.argv) > 1 else "static"
+    print(f"Wrote {compress_directory(directory)} compressed files in {directory}")
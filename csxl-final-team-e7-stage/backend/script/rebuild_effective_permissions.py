@@ -0,0 +1,22 @@
+"""
+This script recomputes the effective_permission table from the permission and user_role
+tables, for use after either is changed other than through the PermissionService and
+RoleService, such as by a bulk load or a manual fix in the database.
+
+Usage: python3 -m backend.script.rebuild_effective_permissions
+"""
+
+from sqlalchemy.orm import Session
+from ..database import engine
+from ..services import effective_permission
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+if __name__ == "__main__":
+    with Session(engine) as session:
+        count = effective_permission.rebuild(session)
+        session.commit()
+    print(f"Rebuilt {count} effective permissions")
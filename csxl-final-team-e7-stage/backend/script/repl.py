@@ -40,7 +40,7 @@ print(" - all models in backend/models/__init__.py")
 print(" - all models in backend/models/coworking/__init__.py")
 
 session = next(db_session())
-print(" - session: a SQLAlchemy ORM Session")
+print(" - session: a SQLAlchemy ORM Session; call session.commit() to save changes")
 
 permission_svc = PermissionService(session)
 print(" - permission_svc: a PermissionService")
@@ -12,6 +12,7 @@ from ...models.academics import CourseDetails
 from ...models.user import User
 from ...entities.academics import CourseEntity
 from ..permission import PermissionService
+from ..response_cache import catalog_responses
 
 from ...services.exceptions import ResourceNotFoundException
 from datetime import datetime
@@ -107,9 +108,10 @@ class CourseService:
         # Create new object
         course_entity = CourseEntity.from_model(course)
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         self._session.add(course_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("course", session=self._session)
 
         # Return added object
         return course_entity.to_details_model()
@@ -146,8 +148,9 @@ class CourseService:
         course_entity.description = course.description
         course_entity.credit_hours = course.credit_hours
 
-        # Commit changes
-        self._session.commit()
+        # Flush changes
+        self._session.flush()
+        catalog_responses().invalidate("course", session=self._session)
 
         # Return edited object
         return course_entity.to_details_model()
@@ -170,6 +173,7 @@ class CourseService:
         if course_entity is None:
             raise ResourceNotFoundException(f"Course with id: {id} does not exist.")
 
-        # Delete and commit changes
+        # Delete and flush changes
         self._session.delete(course_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("course", session=self._session)
@@ -2,11 +2,12 @@
 The Section Service allows the API to manipulate sections data in the database.
 """
 
+from typing import Iterator
 from fastapi import Depends
 from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy.orm import Session, joinedload, selectinload
 
-from ...database import db_session
+from ...database import STREAM_BATCH_SIZE, db_session
 from ...models.academics import Section
 from ...models.academics import SectionDetails
 from ...models import User, Room
@@ -14,7 +15,10 @@ from ...models.room_assignment_type import RoomAssignmentType
 from ...entities.academics import SectionEntity
 from ...entities.academics import CourseEntity
 from ...entities.academics import SectionRoomEntity
+from ...entities.academics import SectionMemberEntity
+from ...entities.room_entity import RoomEntity
 from ..permission import PermissionService
+from ..response_cache import catalog_responses
 
 from ...services.exceptions import ResourceNotFoundException
 from datetime import datetime
@@ -51,6 +55,34 @@ class SectionService:
         # Convert entries to a model and return
         return [entity.to_details_model() for entity in entities]
 
+    def stream(self) -> Iterator[SectionDetails]:
+        """Yields all sections from the table as they are read, in the order of `all`
+
+        Sections are fetched `STREAM_BATCH_SIZE` at a time through a server-side cursor,
+        with the course, term, rooms, and staff of each batch loaded alongside it.
+
+        Returns:
+            Iterator[SectionDetails]: Each `SectionDetails`
+        """
+        query = (
+            select(SectionEntity)
+            .options(
+                joinedload(SectionEntity.course),
+                joinedload(SectionEntity.term),
+                selectinload(SectionEntity.lecture_rooms)
+                .joinedload(SectionRoomEntity.room)
+                .selectinload(RoomEntity.seats),
+                selectinload(SectionEntity.office_hour_rooms)
+                .joinedload(SectionRoomEntity.room)
+                .selectinload(RoomEntity.seats),
+                selectinload(SectionEntity.staff).joinedload(SectionMemberEntity.user),
+            )
+            .order_by(SectionEntity.course_id, SectionEntity.number)
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        for entity in self._session.scalars(query):
+            yield entity.to_details_model()
+
     def get_by_term(self, term_id: str) -> list[SectionDetails]:
         """Retrieves all sections from the table by a term.
 
@@ -158,32 +190,22 @@ class SectionService:
         # Create new object
         section_entity = SectionEntity.from_model(section)
 
-        # Add new object to table and commit changes
+        # Add new object to table, along with its lecture room, if any
         self._session.add(section_entity)
-
-        self._session.commit()
-
-        # Find added object
-        added_section = section_entity.to_details_model()
-
-        # Now, attempt to add the lecture room
         if section.lecture_room is not None:
-            # Check if user has admin permissions
-            self._permission_svc.enforce(
-                subject, "academics.section.create", f"section/"
+            section_entity.rooms.append(
+                SectionRoomEntity(
+                    room_id=section.lecture_room.id,
+                    assignment_type=RoomAssignmentType.LECTURE_ROOM,
+                )
             )
 
-            # Then, attempt to create room relation
-            section_room_entity = SectionRoomEntity(
-                section_id=added_section.id,
-                room_id=section.lecture_room.id,
-                assignment_type=RoomAssignmentType.LECTURE_ROOM,
-            )
-            self._session.add(section_room_entity)
-            self._session.commit()
+        # Flush changes
+        self._session.flush()
+        catalog_responses().invalidate("term", "course", session=self._session)
 
-        # Now, refresh the data and return.
-        return self._session.get(SectionEntity, added_section.id).to_details_model()
+        # Return added object
+        return section_entity.to_details_model()
 
     def update(self, subject: User, section: Section) -> SectionDetails:
         """Updates a section.
@@ -235,8 +257,10 @@ class SectionService:
                 )
                 self._session.add(section_room_entity)
 
-        # Commit changes
-        self._session.commit()
+        # Flush changes, reloading rooms that may have been assigned by id
+        self._session.flush()
+        catalog_responses().invalidate("term", "course", session=self._session)
+        self._session.expire(section_entity, ["rooms", "lecture_rooms"])
 
         # Return edited object
         return section_entity.to_details_model()
@@ -261,6 +285,7 @@ class SectionService:
         if section_entity is None:
             raise ResourceNotFoundException(f"Section with id: {id} does not exist.")
 
-        # Delete and commit changes
+        # Delete and flush changes
         self._session.delete(section_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("term", "course", session=self._session)
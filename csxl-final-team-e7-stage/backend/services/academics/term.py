@@ -12,6 +12,7 @@ from ...models.academics import TermDetails
 from ...models import User
 from ...entities.academics import TermEntity
 from ..permission import PermissionService
+from ..response_cache import catalog_responses
 
 from ...services.exceptions import ResourceNotFoundException
 from datetime import datetime
@@ -108,9 +109,10 @@ class TermService:
         # Create new object
         term_entity = TermEntity.from_model(term)
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         self._session.add(term_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("term", session=self._session)
 
         # Return added object
         return term_entity.to_details_model()
@@ -143,8 +145,9 @@ class TermService:
         term_entity.start = term.start
         term_entity.end = term.end
 
-        # Commit changes
-        self._session.commit()
+        # Flush changes
+        self._session.flush()
+        catalog_responses().invalidate("term", session=self._session)
 
         # Return edited object
         return term_entity.to_details_model()
@@ -167,6 +170,7 @@ class TermService:
         if term_entity is None:
             raise ResourceNotFoundException(f"Term with id: {id} does not exist.")
 
-        # Delete and commit changes
+        # Delete and flush changes
         self._session.delete(term_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("term", session=self._session)
@@ -1,19 +1,32 @@
 """Service that manages operating hours of the XL."""
 
+from datetime import date, datetime, timedelta
+from typing import Iterable, Iterator, Sequence
 from fastapi import Depends
-from sqlalchemy.orm import Session
+from sqlalchemy import insert, delete
+from sqlalchemy.orm import Session, contains_eager
 from .exceptions import OperatingHoursCannotOverlapException
 from ..exceptions import ResourceNotFoundException
 from ..permission import PermissionService
+from .room_grid import room_grids
 from ...models import User
 from ...database import db_session
-from ...models.coworking import OperatingHours, TimeRange
-from ...entities.coworking import OperatingHoursEntity
+from ...models.coworking import (
+    OperatingHours,
+    OperatingHoursRecurrence,
+    TimeRange,
+    WeeklyOperatingHours,
+)
+from ...entities.coworking import OperatingHoursEntity, OperatingHoursRecurrenceEntity
+from ...entities.academics import TermEntity
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+# How far past today recurring templates are materialized into operating hours rows.
+MATERIALIZATION_HORIZON = timedelta(weeks=4)
+
 
 class OperatingHoursService:
     """OperatingHoursService is the access layer to the operating hours data model."""
@@ -66,7 +79,52 @@ class OperatingHoursService:
             .order_by(OperatingHoursEntity.start)
             .all()
         )
-        return [entity.to_model() for entity in entities]
+        schedule = [entity.to_model() for entity in entities]
+
+        # Recurring templates whose materialized rows stop short of the range are
+        # expanded in memory; these occurrences have no id until materialized.
+        recurrences = (
+            self._session.query(OperatingHoursRecurrenceEntity)
+            .join(OperatingHoursRecurrenceEntity.term)
+            .options(contains_eager(OperatingHoursRecurrenceEntity.term))
+            .filter(
+                TermEntity.start <= time_range.end,
+                TermEntity.end >= time_range.start,
+                OperatingHoursRecurrenceEntity.materialized_until.is_(None)
+                | (OperatingHoursRecurrenceEntity.materialized_until < time_range.end),
+            )
+            .all()
+        )
+        if len(recurrences) == 0:
+            return schedule
+
+        occurrences: list[TimeRange] = []
+        for recurrence in recurrences:
+            first_day = time_range.start.date()
+            if recurrence.materialized_until is not None:
+                first_day = max(first_day, recurrence.materialized_until.date())
+            occurrences.extend(
+                occurrence
+                for occurrence in self._expand_recurrence(
+                    recurrence, first_day, time_range.end.date() + timedelta(days=1)
+                )
+                if occurrence.start <= time_range.end
+                and occurrence.end >= time_range.start
+            )
+        occurrences.sort(key=lambda occurrence: occurrence.start)
+
+        # Occurrences touching a persisted row, or one taken before them, are dropped
+        expanded: list[OperatingHours] = []
+        taken_until: datetime | None = None
+        for occurrence, touches in _sweep(schedule, occurrences):
+            if touches or (taken_until is not None and occurrence.start <= taken_until):
+                continue
+            expanded.append(OperatingHours(start=occurrence.start, end=occurrence.end))
+            taken_until = max(occurrence.end, taken_until or occurrence.end)
+
+        return sorted(
+            schedule + expanded, key=lambda operating_hours: operating_hours.start
+        )
 
     def create(self, subject: User, time_range: TimeRange) -> OperatingHours:
         """Create new, open Operating Hours for XL coworking.
@@ -90,7 +148,8 @@ class OperatingHoursService:
 
         entity = OperatingHoursEntity(start=time_range.start, end=time_range.end)
         self._session.add(entity)
-        self._session.commit()
+        self._session.flush()
+        room_grids().clear(self._session)
         return entity.to_model()
 
     def delete(self, subject: User, operating_hours: OperatingHours) -> None:
@@ -113,4 +172,267 @@ class OperatingHoursService:
             OperatingHoursEntity, operating_hours.id
         )
         self._session.delete(operating_hours_entity)
-        self._session.commit()
+        self._session.flush()
+        room_grids().clear(self._session)
+
+    def get_recurrence(self, id: int) -> OperatingHoursRecurrence:
+        """Lookup a recurring Operating Hours template by its id.
+
+        Args:
+            id (int): The id of the template to lookup.
+
+        Returns:
+            OperatingHoursRecurrence
+
+        Raises:
+            ResourceNotFoundException"""
+        entity = self._session.get(OperatingHoursRecurrenceEntity, id)
+        if entity is None:
+            raise ResourceNotFoundException(
+                f"No operating hours recurrence with id {id}"
+            )
+        return entity.to_model()
+
+    def create_recurrence(
+        self, subject: User, recurrence: OperatingHoursRecurrence
+    ) -> OperatingHoursRecurrence:
+        """Create a weekly Operating Hours template spanning a term.
+
+        Every occurrence from today (or the term start, if later) through the term end
+        is checked for conflicts with one query, and those through the materialization
+        horizon are inserted in a single batch. Later occurrences are expanded by
+        `schedule`.
+
+        Args:
+            subject (User): The user creating the template.
+            recurrence (OperatingHoursRecurrence): The weekly pattern, term, and exceptions.
+
+        Returns:
+            OperatingHoursRecurrence: The persisted template.
+
+        Raises:
+            ResourceNotFoundException: If the term does not exist.
+            OperatingHoursCannotOverlapException: If any occurrence overlaps existing operating hours.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.operating_hours.create", "coworking/operating_hours"
+        )
+
+        term = self._session.get(TermEntity, recurrence.term_id)
+        if term is None:
+            raise ResourceNotFoundException(f"No term with id {recurrence.term_id}")
+
+        # Templates on the same term would collide on every unmaterialized week.
+        for other in (
+            self._session.query(OperatingHoursRecurrenceEntity)
+            .filter(OperatingHoursRecurrenceEntity.term_id == term.id)
+            .all()
+        ):
+            for window in recurrence.weekly_hours:
+                if any(
+                    window.overlaps(other_window)
+                    for other_window in other.to_model().weekly_hours
+                ):
+                    raise OperatingHoursCannotOverlapException(
+                        f"Conflicts with recurring operating hours {other.id}"
+                    )
+
+        entity = OperatingHoursRecurrenceEntity.from_model(recurrence)
+        entity.id = None
+        entity.materialized_until = None
+        self._session.add(entity)
+        self._session.flush()
+
+        first_day = max(term.start.date(), date.today())
+        occurrences = self._expand_recurrence(
+            entity, first_day, term.end.date() + timedelta(days=1)
+        )
+        self._check_overlaps(occurrences)
+        horizon = first_day + MATERIALIZATION_HORIZON
+        self._insert_occurrences(
+            entity,
+            [
+                occurrence
+                for occurrence in occurrences
+                if occurrence.start.date() < horizon
+            ],
+            horizon,
+        )
+        self._session.flush()
+        room_grids().clear(self._session)
+        return entity.to_model()
+
+    def extend_recurrence(
+        self, subject: User, recurrence: OperatingHoursRecurrence, until: datetime
+    ) -> OperatingHoursRecurrence:
+        """Materialize a template's occurrences through a later date.
+
+        Args:
+            subject (User): The user extending the template.
+            recurrence (OperatingHoursRecurrence): The template to extend.
+            until (datetime): Occurrences on days before this date are materialized.
+
+        Returns:
+            OperatingHoursRecurrence: The template with its updated horizon.
+
+        Raises:
+            OperatingHoursCannotOverlapException: If any new occurrence overlaps existing operating hours.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.operating_hours.create", "coworking/operating_hours"
+        )
+
+        entity = self._session.get(OperatingHoursRecurrenceEntity, recurrence.id)
+        if entity is None:
+            raise ResourceNotFoundException(
+                f"No operating hours recurrence with id {recurrence.id}"
+            )
+
+        first_day = max(entity.term.start.date(), date.today())
+        if entity.materialized_until is not None:
+            first_day = max(first_day, entity.materialized_until.date())
+        self._materialize(entity, first_day, until.date())
+        self._session.flush()
+        room_grids().clear(self._session)
+        return entity.to_model()
+
+    def delete_recurrence(
+        self, subject: User, recurrence: OperatingHoursRecurrence
+    ) -> None:
+        """Delete a template along with its upcoming materialized Operating Hours.
+
+        Past occurrences are kept as standalone Operating Hours.
+
+        Args:
+            subject (User): The user deleting the template.
+            recurrence (OperatingHoursRecurrence): The template to delete.
+
+        Returns:
+            None
+        """
+        self._permission_svc.enforce(
+            subject,
+            "coworking.operating_hours.delete",
+            f"coworking/operating_hours/recurrence/{recurrence.id}",
+        )
+
+        self._session.execute(
+            delete(OperatingHoursEntity).where(
+                OperatingHoursEntity.recurrence_id == recurrence.id,
+                OperatingHoursEntity.start >= datetime.now(),
+            )
+        )
+        entity = self._session.get(OperatingHoursRecurrenceEntity, recurrence.id)
+        self._session.delete(entity)
+        self._session.flush()
+        room_grids().clear(self._session)
+
+    def _materialize(
+        self, entity: OperatingHoursRecurrenceEntity, first_day: date, last_day: date
+    ) -> None:
+        """Insert a template's occurrences on days in [first_day, last_day) in one batch.
+
+        Raises:
+            OperatingHoursCannotOverlapException: If any occurrence overlaps existing operating hours.
+        """
+        occurrences = self._expand_recurrence(entity, first_day, last_day)
+        self._check_overlaps(occurrences)
+        self._insert_occurrences(entity, occurrences, last_day)
+
+    def _check_overlaps(self, occurrences: Sequence[TimeRange]) -> None:
+        """Check sorted occurrences against existing operating hours.
+
+        Existing rows across the whole span are fetched with a single query and
+        compared against the occurrences in one linear sweep.
+
+        Raises:
+            OperatingHoursCannotOverlapException: If any occurrence overlaps existing operating hours.
+        """
+        if len(occurrences) == 0:
+            return
+        existing = (
+            self._session.query(OperatingHoursEntity)
+            .filter(
+                OperatingHoursEntity.start <= occurrences[-1].end,
+                OperatingHoursEntity.end >= occurrences[0].start,
+            )
+            .order_by(OperatingHoursEntity.start)
+            .all()
+        )
+        for occurrence, touches in _sweep(existing, occurrences):
+            if touches:
+                raise OperatingHoursCannotOverlapException(
+                    f"Conflicts in the range of {str(occurrence)}"
+                )
+
+    def _insert_occurrences(
+        self,
+        entity: OperatingHoursRecurrenceEntity,
+        occurrences: Sequence[TimeRange],
+        last_day: date,
+    ) -> None:
+        """Insert occurrences of a template in one batch, materializing it through last_day."""
+        if len(occurrences) > 0:
+            self._session.execute(
+                insert(OperatingHoursEntity),
+                [
+                    {
+                        "start": occurrence.start,
+                        "end": occurrence.end,
+                        "recurrence_id": entity.id,
+                    }
+                    for occurrence in occurrences
+                ],
+            )
+
+        horizon = datetime.combine(
+            min(last_day, entity.term.end.date() + timedelta(days=1)),
+            datetime.min.time(),
+        )
+        if entity.materialized_until is None or horizon > entity.materialized_until:
+            entity.materialized_until = horizon
+
+    def _expand_recurrence(
+        self, entity: OperatingHoursRecurrenceEntity, first_day: date, last_day: date
+    ) -> list[TimeRange]:
+        """Expand a template into sorted occurrences on days in [first_day, last_day).
+
+        Days outside of the template's term and exception dates are skipped."""
+        windows_by_weekday: dict[int, list[WeeklyOperatingHours]] = {}
+        for window in entity.to_model().weekly_hours:
+            windows_by_weekday.setdefault(window.weekday, []).append(window)
+        for windows in windows_by_weekday.values():
+            windows.sort(key=lambda window: window.start)
+
+        exceptions = set(entity.exceptions or [])
+        day = max(first_day, entity.term.start.date())
+        end = min(last_day, entity.term.end.date() + timedelta(days=1))
+
+        occurrences: list[TimeRange] = []
+        while day < end:
+            if day not in exceptions:
+                for window in windows_by_weekday.get(day.weekday(), []):
+                    occurrences.append(
+                        TimeRange(
+                            start=datetime.combine(day, window.start),
+                            end=datetime.combine(day, window.end),
+                        )
+                    )
+            day += timedelta(days=1)
+        return occurrences
+
+
+def _sweep(
+    existing: Sequence[TimeRange | OperatingHoursEntity],
+    occurrences: Iterable[TimeRange],
+) -> Iterator[tuple[TimeRange, bool]]:
+    """Pair each occurrence with whether it touches any existing range, in one pass.
+
+    Both are sorted by start. Bounds are inclusive, matching the `schedule` conflict
+    checks. Existing ranges ending before an occurrence starts cannot touch the
+    occurrences after it, so they are passed over once."""
+    i = 0
+    for occurrence in occurrences:
+        while i < len(existing) and existing[i].end < occurrence.start:
+            i += 1
+        yield occurrence, i < len(existing) and existing[i].start <= occurrence.end
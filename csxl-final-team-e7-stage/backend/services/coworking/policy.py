@@ -1,10 +1,20 @@
 """Service that manages policies around the reservation system."""
 
+from time import monotonic
+from types import MappingProxyType
+from typing import Mapping
 from fastapi import Depends
+from sqlalchemy import select
 from sqlalchemy.orm import Session
 from datetime import timedelta, datetime, time
-from ...database import db_session
+from ..exceptions import ResourceNotFoundException
+from ..permission import PermissionService
+from .room_grid import room_grids
+from ...database import checkpoint, db_session
 from ...models import User
+from ...models.coworking import GroupPolicy, RoomPolicy
+from ...entities import RoomEntity, user_role_table
+from ...entities.coworking import GroupPolicyEntity, RoomPolicyEntity
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -18,114 +28,385 @@ FRIDAY = 4
 SATURDAY = 5
 SUNDAY = 6
 
+# Keys of duration policies that can be overridden in the coworking__group_policy table
+WALKIN_WINDOW = "walkin_window"
+WALKIN_INITIAL_DURATION = "walkin_initial_duration"
+RESERVATION_WINDOW = "reservation_window"
+MINIMUM_RESERVATION_DURATION = "minimum_reservation_duration"
+MAXIMUM_INITIAL_RESERVATION_DURATION = "maximum_initial_reservation_duration"
+RESERVATION_DRAFT_TIMEOUT = "reservation_draft_timeout"
+RESERVATION_CHECKIN_TIMEOUT = "reservation_checkin_timeout"
+RESERVATION_EXTEND_WINDOW = "reservation_extend_window"
+RESERVATION_EXTEND_DURATION = "reservation_extend_duration"
+ROOM_RESERVATION_WEEKLY_LIMIT = "room_reservation_weekly_limit"
+
+DEFAULT_POLICIES: Mapping[str, timedelta] = MappingProxyType(
+    {
+        WALKIN_WINDOW: timedelta(minutes=10),
+        WALKIN_INITIAL_DURATION: timedelta(hours=2),
+        RESERVATION_WINDOW: timedelta(weeks=1),
+        MINIMUM_RESERVATION_DURATION: timedelta(minutes=10),
+        MAXIMUM_INITIAL_RESERVATION_DURATION: timedelta(hours=2),
+        RESERVATION_DRAFT_TIMEOUT: timedelta(minutes=5),
+        RESERVATION_CHECKIN_TIMEOUT: timedelta(minutes=10),
+        RESERVATION_EXTEND_WINDOW: timedelta(minutes=15),
+        RESERVATION_EXTEND_DURATION: timedelta(hours=1),
+        ROOM_RESERVATION_WEEKLY_LIMIT: timedelta(hours=6),
+    }
+)
+
+# Each process holds its own snapshot; changes made through another process are seen
+# once the snapshot is older than this
+POLICY_SNAPSHOT_TTL = timedelta(seconds=30)
+
+_NO_OFFICE_HOURS: Mapping[str, tuple[tuple[time, time], ...]] = MappingProxyType({})
+
+
+class PolicySnapshot:
+    """An immutable view of all policies, built once per load so that lookups by
+    (group, key) and by (room, weekday) are dictionary hits."""
+
+    __slots__ = (
+        "_defaults",
+        "_group_values",
+        "_groups_by_user",
+        "_groups",
+        "_office_hours",
+        "_non_reservable_rooms",
+        "_loaded_at",
+    )
+
+    def __init__(
+        self,
+        defaults: Mapping[str, timedelta] = DEFAULT_POLICIES,
+        group_values: Mapping[tuple[int, str], timedelta] = MappingProxyType({}),
+        groups_by_user: Mapping[int, tuple[int, ...]] = MappingProxyType({}),
+        office_hours: Mapping[int, Mapping[str, tuple[tuple[time, time], ...]]] = (
+            MappingProxyType({})
+        ),
+        non_reservable_rooms: tuple[str, ...] = (),
+    ):
+        self._defaults = defaults
+        self._group_values = group_values
+        self._groups_by_user = groups_by_user
+        self._groups = frozenset(role_id for role_id, _ in group_values)
+        self._office_hours = office_hours
+        self._non_reservable_rooms = non_reservable_rooms
+        self._loaded_at = monotonic()
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, PolicySnapshot):
+            return NotImplemented
+        return (
+            self._defaults == other._defaults
+            and self._group_values == other._group_values
+            and self._groups_by_user == other._groups_by_user
+            and self._office_hours == other._office_hours
+            and self._non_reservable_rooms == other._non_reservable_rooms
+        )
+
+    def age(self) -> timedelta:
+        """How long ago the snapshot was loaded."""
+        return timedelta(seconds=monotonic() - self._loaded_at)
+
+    def duration(self, key: str, subject: User | None = None) -> timedelta:
+        """Look up a duration policy for a subject.
+
+        When the subject belongs to several groups overriding the key, the most
+        generous value applies."""
+        value = self._defaults[key]
+        if subject is None or subject.id not in self._groups_by_user:
+            return value
+        for role_id in self._groups_by_user[subject.id]:
+            override = self._group_values.get((role_id, key))
+            if override is not None and override > value:
+                value = override
+        return value
+
+    def has_group(self, role_id: int) -> bool:
+        """Whether any policy is overridden for members of the role."""
+        return role_id in self._groups
+
+    def office_hours(self, weekday: int) -> Mapping[str, tuple[tuple[time, time], ...]]:
+        """Blocks of time, keyed by room id, when rooms are unavailable on a weekday."""
+        return self._office_hours.get(weekday, _NO_OFFICE_HOURS)
+
+    def non_reservable_rooms(self) -> tuple[str, ...]:
+        return self._non_reservable_rooms
+
+
+_snapshot = PolicySnapshot()
+
+
+def current_policies(session: Session | None = None) -> PolicySnapshot:
+    """The most recently loaded policy snapshot.
+
+    Given a session, a snapshot older than POLICY_SNAPSHOT_TTL is reloaded first, so
+    that changes made through other processes are picked up. Cached room grids are
+    cleared when the reloaded policies differ.
+
+    Args:
+        session (Session | None): The database session to reload policies with, if any.
+
+    Returns:
+        PolicySnapshot: The current snapshot."""
+    if session is None or _snapshot.age() < POLICY_SNAPSHOT_TTL:
+        return _snapshot
+    previous = _snapshot
+    snapshot = load_policies(session)
+    if snapshot != previous:
+        room_grids().clear()
+    return snapshot
+
+
+def load_policies(session: Session) -> PolicySnapshot:
+    """Rebuild the policy snapshot from the database and make it current.
+
+    Called at application startup and after any change to policies or to the
+    membership of a role with group policies.
+
+    Args:
+        session (Session): The database session to read policies with.
+
+    Returns:
+        PolicySnapshot: The newly current snapshot."""
+    global _snapshot
+
+    defaults = dict(DEFAULT_POLICIES)
+    group_values: dict[tuple[int, str], timedelta] = {}
+    for policy in session.scalars(select(GroupPolicyEntity)):
+        if policy.role_id is None:
+            defaults[policy.key] = policy.value
+        else:
+            group_values[(policy.role_id, policy.key)] = policy.value
+
+    # Only memberships in roles that override a policy need to be known.
+    groups_by_user: dict[int, tuple[int, ...]] = {}
+    policy_roles = {role_id for role_id, _ in group_values}
+    if len(policy_roles) > 0:
+        memberships = session.execute(
+            select(user_role_table.c.user_id, user_role_table.c.role_id).where(
+                user_role_table.c.role_id.in_(policy_roles)
+            )
+        )
+        for user_id, role_id in memberships:
+            groups_by_user[user_id] = groups_by_user.get(user_id, ()) + (role_id,)
+
+    office_hours: dict[int, dict[str, list[tuple[time, time]]]] = {}
+    for block in session.scalars(
+        select(RoomPolicyEntity).order_by(RoomPolicyEntity.start)
+    ):
+        office_hours.setdefault(block.weekday, {}).setdefault(block.room_id, []).append(
+            (block.start, block.end)
+        )
+
+    non_reservable_rooms = session.scalars(
+        select(RoomEntity.id).where(RoomEntity.reservable == False)
+    ).all()
+
+    _snapshot = PolicySnapshot(
+        defaults=MappingProxyType(defaults),
+        group_values=MappingProxyType(group_values),
+        groups_by_user=MappingProxyType(groups_by_user),
+        office_hours=MappingProxyType(
+            {
+                weekday: MappingProxyType(
+                    {room_id: tuple(blocks) for room_id, blocks in rooms.items()}
+                )
+                for weekday, rooms in office_hours.items()
+            }
+        ),
+        non_reservable_rooms=tuple(non_reservable_rooms),
+    )
+    return _snapshot
+
+
 class PolicyService:
-    """RoleService is the access layer to the role data model, its members, and permissions.
+    """PolicyService is the access layer to coworking policies.
 
-    We are carving out a simple service for looking up policies in anticipation of having different policies
-    for different groups of users (e.g. majors, ambassadors, LAs, etc).
+    Policies default to the values in DEFAULT_POLICIES and can be overridden for
+    everyone or for members of a role (e.g. ambassadors, LAs) in the database.
+    Reads are served from the in-memory PolicySnapshot current when the service
+    was constructed, so a request sees one consistent set of policies.
     """
 
-    def __init__(self): ...
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        permission_svc: PermissionService = Depends(),
+    ):
+        """Initializes a new PolicyService.
+
+        Args:
+            session (Session, optional): The database session to use, typically injected by FastAPI.
+            permission_svc (PermissionService, optional): The backend permission service, injected by FastAPI.
+        """
+        self._session = session
+        self._permission_svc = permission_svc
+        self._snapshot = current_policies(session)
 
-    def walkin_window(self, _subject: User) -> timedelta:
+    def walkin_window(self, subject: User) -> timedelta:
         """How far into the future can walkins be reserved?"""
-        return timedelta(minutes=10)
+        return self._snapshot.duration(WALKIN_WINDOW, subject)
 
-    def walkin_initial_duration(self, _subject: User) -> timedelta:
+    def walkin_initial_duration(self, subject: User) -> timedelta:
         """When making a walkin, this sets how long the initial reservation is for."""
-        return timedelta(hours=2)
+        return self._snapshot.duration(WALKIN_INITIAL_DURATION, subject)
 
-    def reservation_window(self, _subject: User) -> timedelta:
+    def reservation_window(self, subject: User) -> timedelta:
         """Returns the number of days in advance the user can make reservations."""
-        return timedelta(weeks=1)
+        return self._snapshot.duration(RESERVATION_WINDOW, subject)
 
     def minimum_reservation_duration(self) -> timedelta:
         """The minimum amount of time a reservation can be made for."""
-        return timedelta(minutes=10)
+        return self._snapshot.duration(MINIMUM_RESERVATION_DURATION)
 
-    def maximum_initial_reservation_duration(self, _subject: User) -> timedelta:
+    def maximum_initial_reservation_duration(self, subject: User) -> timedelta:
         """The maximum amount of time a reservation can be made for before extending."""
-        return timedelta(hours=2)
+        return self._snapshot.duration(MAXIMUM_INITIAL_RESERVATION_DURATION, subject)
 
-    # Implement and involve in testing once extending a reservation functionality is added.
-    # def extend_window(self, _subject: User) -> timedelta:
-    #     """When no reservation follows a given reservation, within this period preceeding the end of a reservation the user is able to extend their reservation by an hour."""
-    #     return timedelta(minutes=15 * -1)
+    def extend_window(self, subject: User) -> timedelta:
+        """When no reservation follows a given reservation, within this period preceeding the end of a reservation the user is able to extend their reservation."""
+        return self._snapshot.duration(RESERVATION_EXTEND_WINDOW, subject)
 
-    # def extend_duration(self, _subject: User) -> timedelta:
-    #     return timedelta(hours=1)
+    def extend_duration(self, subject: User) -> timedelta:
+        """The most a reservation can be extended by at once."""
+        return self._snapshot.duration(RESERVATION_EXTEND_DURATION, subject)
 
     def reservation_draft_timeout(self) -> timedelta:
-        return timedelta(minutes=5)
-    
+        return self._snapshot.duration(RESERVATION_DRAFT_TIMEOUT)
 
     def reservation_checkin_timeout(self) -> timedelta:
-        return timedelta(minutes=10)
+        return self._snapshot.duration(RESERVATION_CHECKIN_TIMEOUT)
 
-
-    def room_reservation_weekly_limit(self) -> timedelta:
+    def room_reservation_weekly_limit(self, subject: User | None = None) -> timedelta:
         """The maximum amount of hours a student can reserve the study rooms outside of the csxl."""
-        return timedelta(hours=6)
-    
+        return self._snapshot.duration(ROOM_RESERVATION_WEEKLY_LIMIT, subject)
+
     def non_reservable_rooms(self) -> list[str]:
-        return ['404']
-
-    def office_hours(self, date: datetime):
-        day = date.weekday()
-        if day == MONDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : [
-                #     (time(hour=16, minute=00), time(hour=17, minute=30))
-                # ]
-            }
-        elif day == TUESDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : [
-                #     (time(hour=10, minute=00), time(hour=11, minute=00))
-                # ]
-            }
-        elif day == WEDNESDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : [
-                #     (time(hour=10, minute=00), time(hour=11, minute=00))
-                # ]
-            }
-        elif day == THURSDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : []
-            }
-        elif day == FRIDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : [
-                #     (time(hour=10, minute=00), time(hour=11, minute=00))
-                # ]
-            }
-        elif day == SATURDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : []
-            }
-        elif day == SUNDAY:
-            return {
-                'SN135' : [],
-                'SN137' : [],
-                'SN139' : [],
-                # 'SN141' : []
-            }    
\ No newline at end of file
+        return list(self._snapshot.non_reservable_rooms())
+
+    def office_hours(
+        self, date: datetime
+    ) -> Mapping[str, tuple[tuple[time, time], ...]]:
+        """Blocks of time, keyed by room id, when rooms are held for office hours on a date."""
+        return self._snapshot.office_hours(date.weekday())
+
+    def list_group_policies(self, subject: User) -> list[GroupPolicy]:
+        """List all group policy overrides stored in the database.
+
+        Args:
+            subject (User): The user listing policies.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.policy.read", "coworking/policy"
+        )
+        entities = self._session.scalars(
+            select(GroupPolicyEntity).order_by(GroupPolicyEntity.id)
+        )
+        return [entity.to_model() for entity in entities]
+
+    def list_room_policies(self, subject: User) -> list[RoomPolicy]:
+        """List all room policy blocks stored in the database.
+
+        Args:
+            subject (User): The user listing policies.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.policy.read", "coworking/policy"
+        )
+        entities = self._session.scalars(
+            select(RoomPolicyEntity).order_by(RoomPolicyEntity.id)
+        )
+        return [entity.to_model() for entity in entities]
+
+    def set_group_policy(self, subject: User, policy: GroupPolicy) -> GroupPolicy:
+        """Create or replace the value of a policy for a group and reload policies.
+
+        Args:
+            subject (User): The user changing the policy.
+            policy (GroupPolicy): The group, key, and new value.
+
+        Returns:
+            GroupPolicy: The persisted policy.
+
+        Raises:
+            ResourceNotFoundException: If the key is not a known policy.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.policy.update", "coworking/policy"
+        )
+        if policy.key not in DEFAULT_POLICIES:
+            raise ResourceNotFoundException(f"No policy named {policy.key}")
+
+        entity = self._session.scalars(
+            select(GroupPolicyEntity).where(
+                GroupPolicyEntity.role_id.is_(None)
+                if policy.role_id is None
+                else GroupPolicyEntity.role_id == policy.role_id,
+                GroupPolicyEntity.key == policy.key,
+            )
+        ).one_or_none()
+        if entity is None:
+            entity = GroupPolicyEntity.from_model(policy)
+            entity.id = None
+            self._session.add(entity)
+        else:
+            entity.value = policy.value
+        self._reload()
+        return entity.to_model()
+
+    def delete_group_policy(self, subject: User, id: int) -> None:
+        """Remove a group policy override and reload policies.
+
+        Raises:
+            ResourceNotFoundException: If no group policy has the id.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.policy.update", "coworking/policy"
+        )
+        entity = self._session.get(GroupPolicyEntity, id)
+        if entity is None:
+            raise ResourceNotFoundException(f"No group policy with id {id}")
+        self._session.delete(entity)
+        self._reload()
+
+    def add_room_policy(self, subject: User, policy: RoomPolicy) -> RoomPolicy:
+        """Add a weekly block during which a room is held and reload policies.
+
+        Args:
+            subject (User): The user changing the policy.
+            policy (RoomPolicy): The room, weekday, and block of time.
+
+        Returns:
+            RoomPolicy: The persisted policy.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.policy.update", "coworking/policy"
+        )
+        entity = RoomPolicyEntity.from_model(policy)
+        entity.id = None
+        self._session.add(entity)
+        self._reload()
+        return entity.to_model()
+
+    def delete_room_policy(self, subject: User, id: int) -> None:
+        """Remove a room policy block and reload policies.
+
+        Raises:
+            ResourceNotFoundException: If no room policy has the id.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.policy.update", "coworking/policy"
+        )
+        entity = self._session.get(RoomPolicyEntity, id)
+        if entity is None:
+            raise ResourceNotFoundException(f"No room policy with id {id}")
+        self._session.delete(entity)
+        self._reload()
+
+    def _reload(self) -> None:
+        # Policies are published to every request, so must be committed first.
+        checkpoint(self._session)
+        self._snapshot = load_policies(self._session)
+        room_grids().clear()
@@ -3,8 +3,8 @@
 from fastapi import Depends
 from datetime import datetime, timedelta
 from random import random
-from typing import Sequence
-from sqlalchemy import or_
+from typing import Iterable, Sequence
+from sqlalchemy import or_, select, update
 from sqlalchemy.orm import Session, joinedload
 from backend.entities.room_entity import RoomEntity
 
@@ -22,20 +22,32 @@ from ...models.coworking import (
     SeatAvailability,
     ReservationState,
     RoomState,
-    AvailabilityList,
+    IntervalSet,
     OperatingHours,
 )
 from ...entities import UserEntity
-from ...entities.coworking import ReservationEntity, SeatEntity
+from ...entities.coworking import (
+    ReservationEntity,
+    SeatEntity,
+    reservation_seat_table,
+)
+from ...entities.coworking.reservation_user_table import reservation_user_table
 from .seat import SeatService
 from .policy import PolicyService
 from .operating_hours import OperatingHoursService
+from .room_grid import ROOM_SLOT_DURATION, RoomGrid, room_grids
+from . import utilization
 from ..permission import PermissionService
+from ..versioning import expect_version, flush_versioned
 
 __authors__ = ["Kris Jordan", "Matt Vu","Yuvraj Jain"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
+# Times seats are chosen for a draft before giving up, as drafts racing for the same seats
+# may each take seats the others chose
+SEAT_CHOICE_ATTEMPTS = 3
+
 
 class ReservationException(Exception):
     def __init__(self, message: str):
@@ -137,16 +149,35 @@ class ReservationService:
     def _get_active_reservations_for_user(
         self, focus: UserIdentity, time_range: TimeRange
     ) -> Sequence[Reservation]:
+        return self._get_active_reservations_for_users([focus], time_range)
+
+    def _get_active_reservations_for_users(
+        self, focus: Sequence[UserIdentity], time_range: TimeRange
+    ) -> Sequence[Reservation]:
+        """Active reservations of any of a group of users overlapping a time range.
+
+        Args:
+            focus (Sequence[UserIdentity]): The users, such as the party of a reservation.
+            time_range (TimeRange): The time range reservations must overlap.
+
+        Returns:
+            Sequence[Reservation]: The reservations, in order of start, found in one query.
+        """
         reservations = (
             self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
             .filter(
                 ReservationEntity.start < time_range.end,
                 ReservationEntity.end > time_range.start,
                 ReservationEntity.state.not_in(
                     [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
                 ),
-                UserEntity.id == focus.id,
+                ReservationEntity.id.in_(
+                    select(reservation_user_table.c.reservation_id).where(
+                        reservation_user_table.c.user_id.in_(
+                            [user.id for user in focus]
+                        )
+                    )
+                ),
             )
             .options(
                 joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
@@ -190,27 +221,39 @@ class ReservationService:
         return [reservation.to_model() for reservation in reservations]
 
     def _check_user_reservation_duration(
-        self, user: UserIdentity, bounds: TimeRange
+        self, users: Sequence[UserIdentity], bounds: TimeRange
     ) -> bool:
-        """Helper method to check if the total reservation duration for a user exceeds 6 hours.
+        """Helper method to check if reserving a room for bounds keeps users within their weekly limit.
+
+        The current reservations of every user are found in one query.
 
         Args:
-            user (User): The user for whom to check reservation duration.
+            users (Sequence[UserIdentity]): The users for whom to check reservation duration.
             bounds (TimeRange): The time range to check for reservation duration.
 
         Returns:
-            True if a user has >= 6 total hours reserved
-            False if a user has exceeded the limit
+            True if every user remains within `PolicyService#room_reservation_weekly_limit`
+            False if any user would exceed the limit
         """
-        reservations = self.get_current_reservations_for_user(user, user)
-        total_duration = timedelta()
-        total_duration += bounds.end - bounds.start
-
-        for reservation in reservations:
-            if reservation.room:
-                total_duration += reservation.end - reservation.start
-        if total_duration > self._policy_svc.room_reservation_weekly_limit():
-            return False
+        now = datetime.now()
+        horizons = {
+            user.id: now + self._policy_svc.reservation_window(user) for user in users
+        }
+        reservations = self._get_active_reservations_for_users(
+            users,
+            TimeRange(start=now - timedelta(days=1), end=max(horizons.values())),
+        )
+        for user in users:
+            total_duration = bounds.end - bounds.start
+            for reservation in reservations:
+                if (
+                    reservation.room
+                    and reservation.start < horizons[user.id]
+                    and any(member.id == user.id for member in reservation.users)
+                ):
+                    total_duration += reservation.end - reservation.start
+            if total_duration > self._policy_svc.room_reservation_weekly_limit(user):
+                return False
         return True
 
     def _get_total_time_user_reservations(self, user: UserIdentity) -> str:
@@ -251,7 +294,7 @@ class ReservationService:
 
         It handles various scenarios including days without operating hours by providing a default schedule
         (10 am to 6 pm) and adjusting time slots based on current time to mark past slots as unavailable.
-        It supports rounding start and end times to the nearest half-hour and excludes reservations that
+        It supports rounding start and end times to the nearest slot boundary and excludes reservations that
         are outside the operating hours.
 
         Args:
@@ -269,12 +312,10 @@ class ReservationService:
 
             Future reservations are shown up to the current time, with past slots marked as unavailable
             for today's date.
-        """
-        reserved_date_map: dict[str, list[int]] = {}
-
-        # Query DB to get reservable rooms. 
-        rooms = self._get_reservable_rooms()
 
+            The reservations and office hours shared by every user are cached per date in a
+            RoomGrid, and only the subject's own reservations are queried for each request.
+        """
         # Generate a 1 day time range to get operating hours on date.
         date_midnight = date.replace(hour=0, minute=0, second=0)
         tomorrow_midnight = date_midnight + timedelta(days=1)
@@ -287,123 +328,205 @@ class ReservationService:
             # TODO: Possibly consider thowing exception and handling on the frontend?
             # If operating hours don't exist, then return an all grayed out table
             # from 10 am to 6 pm which is the standard office hours.
-            for room in rooms:
+            operating_hours_start = datetime.now().replace(hour=10, minute=0)
+            operating_hours_end = datetime.now().replace(hour=18, minute=0)
+            number_of_time_slots = (
+                operating_hours_end - operating_hours_start
+            ) // ROOM_SLOT_DURATION
+            reserved_date_map: dict[str, list[int]] = {}
+            for room in self._get_reservable_rooms():
                 if room.id:
-                    reserved_date_map[room.id] = [RoomState.UNAVAILABLE.value] * 16
+                    reserved_date_map[room.id] = [
+                        RoomState.UNAVAILABLE.value
+                    ] * number_of_time_slots
             return ReservationMapDetails(
                 reserved_date_map=reserved_date_map,
-                operating_hours_start=datetime.now().replace(hour=10, minute=0),
-                operating_hours_end=datetime.now().replace(hour=18, minute=0),
-                number_of_time_slots=16,
+                operating_hours_start=operating_hours_start,
+                operating_hours_end=operating_hours_end,
+                number_of_time_slots=number_of_time_slots,
             )
 
-        # Extract the start time and end time for operating hours rounded to the closest half hour
+        # Extract the start time and end time for operating hours rounded to whole slots
         operating_hours_start = max(
-            self._round_to_closest_half_hour(
+            self._round_to_slot(
                 operating_hours_on_date.start, round_up=True
             ),
-            self._round_to_closest_half_hour(
+            self._round_to_slot(
                 datetime.now(), round_up=False
             )
         )
-        operating_hours_end = self._round_to_closest_half_hour(
+        operating_hours_end = self._round_to_slot(
             operating_hours_on_date.end, round_up=False
         )
-        operating_hours_time_delta = operating_hours_end - operating_hours_start
 
-        # Multiply by 2 because 30 min interval indexes
-        operating_hours_duration = int(
-            2 * operating_hours_time_delta.total_seconds() / 3600
+        # The grid of reservations and office hours is the same for every user, so it
+        # is shared until its first slot passes or a room reservation on date changes.
+        grid = room_grids().get(date.date(), operating_hours_start)
+        if grid is None:
+            grid = self._build_room_grid(
+                date, operating_hours_start, operating_hours_end
+            )
+            room_grids().put(date.date(), grid)
+
+        return ReservationMapDetails(
+            reserved_date_map=self._overlay_subject_reservations(date, grid, subject),
+            operating_hours_start=grid.operating_hours_start,
+            operating_hours_end=grid.operating_hours_end,
+            number_of_time_slots=grid.number_of_time_slots,
         )
 
+    def _build_room_grid(
+        self,
+        date: datetime,
+        operating_hours_start: datetime,
+        operating_hours_end: datetime,
+    ) -> RoomGrid:
+        """
+        Builds the subject-independent grid of room slot states for a date.
+
+        Slots reserved by anyone are marked as reserved and slots held for office hours
+        as unavailable. The XL (SN156) is not part of the grid.
+
+        Args:
+            date (datetime): The date of the grid.
+            operating_hours_start (datetime): The start of the first slot.
+            operating_hours_end (datetime): The end of the last slot.
+
+        Returns:
+            RoomGrid: The grid, ready to be cached.
+        """
+        operating_hours_time_delta = operating_hours_end - operating_hours_start
+
+        operating_hours_duration = operating_hours_time_delta // ROOM_SLOT_DURATION
+
         # Need current time to gray out slots in the past on that day.
         current_time = datetime.now()
-        current_time_idx = self._idx_calculation(current_time, operating_hours_start)
-
-        for room in rooms:
-            time_slots_for_room = [0] * operating_hours_duration
 
-            # # Making slots up till current time gray
-            # This code no longer required, but may be required in the future. 
-            # Please keep this here for now.
-            # if date.date() == current_time.date():
-            #     for i in range(0, current_time_idx):
-            #         time_slots_for_room[i] = RoomState.UNAVAILABLE.value
+        rows: dict[str, list[int]] = {
+            room.id: [RoomState.AVAILABLE.value] * operating_hours_duration
+            for room in self._get_reservable_rooms()
+            if room.id != "SN156"
+        }
+        for room_id, start, end in self._query_reservation_times_by_date(
+            date, room_ids=list(rows)
+        ):
+            for idx in self._reservation_slots(
+                date,
+                start,
+                end,
+                operating_hours_start,
+                operating_hours_duration,
+                current_time,
+            ):
+                rows[room_id][idx] = RoomState.RESERVED.value
 
-            if room.id == "SN156":
-                reservations = self._query_xl_reservations_by_date_for_user(date, subject)
-            else:
-                reservations = self._query_confirmed_reservations_by_date_and_room(
-                    date, room.id
-                )
-            for reservation in reservations:
-                start_idx = self._idx_calculation(
-                    reservation.start, operating_hours_start
-                )
-                end_idx = self._idx_calculation(reservation.end, operating_hours_start)
-
-                if start_idx < 0 or end_idx > operating_hours_duration:
-                    continue
-
-                # Gray out previous time slots for today only
-                if date.date() == current_time.date():
-                    if end_idx < current_time_idx:
-                        continue
-                    start_idx = max(current_time_idx, start_idx)
-
-                for idx in range(start_idx, end_idx):
-                    # Currently only assuming single user.
-                    # TODO: If making group reservations, need to change this.
-                    if reservation.users[0].id == subject.id:
-                        time_slots_for_room[idx] = RoomState.SUBJECT_RESERVED.value
-                    else:
-                        if time_slots_for_room[idx] != RoomState.SUBJECT_RESERVED.value:
-                            time_slots_for_room[idx] = RoomState.RESERVED.value
-            reserved_date_map[room.id] = time_slots_for_room
-
-        self._transform_date_map_for_unavailable(reserved_date_map)
-        if "SN156" in reserved_date_map:
-            del reserved_date_map["SN156"]
         self._transform_date_map_for_officehours(
-            date, reserved_date_map, operating_hours_start, operating_hours_duration
+            date, rows, operating_hours_start, operating_hours_duration
         )
-
-        return ReservationMapDetails(
-            reserved_date_map=reserved_date_map,
-            operating_hours_start=operating_hours_start,
-            operating_hours_end=operating_hours_end,
-            number_of_time_slots=operating_hours_duration,
+        return RoomGrid(
+            operating_hours_start, operating_hours_end, operating_hours_duration, rows
         )
 
-    def _round_to_closest_half_hour(
+    def _overlay_subject_reservations(
+        self, date: datetime, grid: RoomGrid, subject: User
+    ) -> dict[str, list[int]]:
+        """
+        Applies the subject's own reservations to a copy of a shared room grid.
+
+        The subject's room reservations are marked as theirs, except in slots held for
+        office hours. Slots at times the subject has any reservation, including in the
+        XL, are unavailable in every other room.
+
+        Args:
+            date (datetime): The date of the grid.
+            grid (RoomGrid): The shared grid for date.
+            subject (User): The user whose reservations are highlighted.
+
+        Returns:
+            dict[str, list[int]]: The reserved date map for the subject.
+        """
+        reserved_date_map = grid.copy_rows()
+        current_time = datetime.now()
+        subject_columns: set[int] = set()
+        for room_id, start, end in self._query_reservation_times_by_date(
+            date, user_id=subject.id
+        ):
+            # Reservations of rooms that are no longer reservable are not shown
+            if room_id is not None and room_id not in reserved_date_map:
+                continue
+            slots = self._reservation_slots(
+                date,
+                start,
+                end,
+                grid.operating_hours_start,
+                grid.number_of_time_slots,
+                current_time,
+            )
+            subject_columns.update(slots)
+            if room_id is not None:
+                row = reserved_date_map[room_id]
+                for idx in slots:
+                    if row[idx] != RoomState.UNAVAILABLE.value:
+                        row[idx] = RoomState.SUBJECT_RESERVED.value
+
+        self._transform_date_map_for_unavailable(reserved_date_map, subject_columns)
+        return reserved_date_map
+
+    def _reservation_slots(
+        self,
+        date: datetime,
+        start: datetime,
+        end: datetime,
+        operating_hours_start: datetime,
+        operating_hours_duration: int,
+        current_time: datetime,
+    ) -> range:
+        """
+        The indexes of the time slots covered by a reservation on the room map.
+
+        Reservations extending outside of operating hours are not shown, and on today's
+        date only the slots from the current time onward are shown.
+
+        Returns:
+            range: The covered slot indexes, which is empty when none are shown.
+        """
+        start_idx = self._idx_calculation(start, operating_hours_start)
+        end_idx = self._idx_calculation(end, operating_hours_start)
+
+        if start_idx < 0 or end_idx > operating_hours_duration:
+            return range(0)
+
+        # Gray out previous time slots for today only
+        if date.date() == current_time.date():
+            current_time_idx = self._idx_calculation(
+                current_time, operating_hours_start
+            )
+            if end_idx < current_time_idx:
+                return range(0)
+            start_idx = max(current_time_idx, start_idx)
+
+        return range(start_idx, end_idx)
+
+    def _round_to_slot(
         self, dt: datetime, round_up: bool = True
     ) -> datetime:
         """
-        This helper rounds a datetime object to the closest half hour either up or down based on the round_up flag.
+        This helper rounds a datetime object to the closest slot boundary of the room map either up or down based on the round_up flag.
 
         Args:
             dt (datetime): The datetime object you want to round.
-            round_up (bool): If True, rounds up to the closest half hour. If False, rounds down to the closest half hour.
+            round_up (bool): If True, rounds up to the closest slot boundary. If False, rounds down to the closest slot boundary.
 
         Returns:
             datetime: Rounded datetime object.
         """
-        minutes = dt.minute
+        slot_minutes = ROOM_SLOT_DURATION // timedelta(minutes=1)
+        minutes = dt.minute % slot_minutes
 
-        if round_up:
-            if minutes == 0:
-                to_add = timedelta(minutes=0)
-            elif minutes < 30:
-                to_add = timedelta(minutes=(30 - minutes))
-            else:
-                to_add = timedelta(minutes=(60 - minutes))
-            rounded_dt = dt + to_add
+        if round_up and minutes != 0:
+            rounded_dt = dt + timedelta(minutes=(slot_minutes - minutes))
         else:
-            if minutes > 30:
-                to_subtract = timedelta(minutes=(minutes - 30))
-            else:
-                to_subtract = timedelta(minutes=minutes)
-            rounded_dt = dt - to_subtract
+            rounded_dt = dt - timedelta(minutes=minutes)
 
         rounded_dt = rounded_dt.replace(second=0, microsecond=0)
 
@@ -414,7 +537,7 @@ class ReservationService:
         Calculates the index of a time slot based on a given time.
 
         This function converts a datetime object into an index representing a specific
-        time slot in the reservation system. Each hour is divided into two slots.
+        time slot in the reservation system. Each slot lasts `ROOM_SLOT_DURATION`.
 
         Args:
             time (datetime): The time to convert into an index.
@@ -423,12 +546,15 @@ class ReservationService:
         Returns:
             int: The index of the time slot corresponding to the given time.
         """
-        return int(2 * (time.hour - operating_hours_start.hour)) + (
-            (time.minute - operating_hours_start.minute) // 30
+        minutes = 60 * (time.hour - operating_hours_start.hour) + (
+            time.minute - operating_hours_start.minute
         )
+        return minutes // (ROOM_SLOT_DURATION // timedelta(minutes=1))
 
     def _transform_date_map_for_unavailable(
-        self, reserved_date_map: dict[str, list[int]]
+        self,
+        reserved_date_map: dict[str, list[int]],
+        columns_with_4: set[int] | None = None,
     ) -> None:
         """
         Modifies the reserved date map to mark certain slots as unavailable.
@@ -439,16 +565,18 @@ class ReservationService:
 
         Args:
             reserved_date_map (dict[str, list[int]]): The map of room reservations to be transformed.
+            columns_with_4 (set[int] | None): The columns reserved by the subject, when already known.
 
         Returns:
             None: This function modifies the reserved_date_map in place.
         """
         # Identify the columns where 4 appears
-        columns_with_4 = set()
-        for key, values in reserved_date_map.items():
-            for i, value in enumerate(values):
-                if value == RoomState.SUBJECT_RESERVED.value:
-                    columns_with_4.add(i)
+        if columns_with_4 is None:
+            columns_with_4 = set()
+            for key, values in reserved_date_map.items():
+                for i, value in enumerate(values):
+                    if value == RoomState.SUBJECT_RESERVED.value:
+                        columns_with_4.add(i)
 
         # Transform the dictionary as per the rules
         for key, values in reserved_date_map.items():
@@ -468,6 +596,8 @@ class ReservationService:
         """
         office_hours = self._policy_svc.office_hours(date=date)
         for room_id, hours in office_hours.items():
+            if room_id not in reserved_date_map:
+                continue
             for start, end in hours:
                 start_idx = max(self._idx_calculation(start, operating_hours_start), 0)
                 end_idx = min(
@@ -478,65 +608,45 @@ class ReservationService:
                     for idx in range(start_idx, end_idx):
                         reserved_date_map[room_id][idx] = RoomState.UNAVAILABLE.value
 
-    def _query_confirmed_reservations_by_date_and_room(
-        self, date: datetime, room_id: str
-    ) -> Sequence[Reservation]:
+    def _query_reservation_times_by_date(
+        self,
+        date: datetime,
+        room_ids: Sequence[str] | None = None,
+        user_id: int | None = None,
+    ) -> Sequence[tuple[str | None, datetime, datetime]]:
         """
-        Queries and returns confirmed and checked-in reservations for a given date and room.
+        Queries the room, start, and end of active reservations overlapping a date.
 
-        This function fetches all confirmed and checked-in reservations from the database for a specified date and room.
-        It includes reservations that have any overlap with the 24-hour period starting from the
-        beginning of the given date, and are associated with a specific room ID.
+        Only the columns needed to draw the room map are selected, rather than loading
+        each reservation with its users and seats.
 
         Args:
-            date (datetime): The date for which to query confirmed reservations.
-            room_id (str): The ID of the room for which to query confirmed reservations.
+            date (datetime): The date for which to query reservations.
+            room_ids (Sequence[str] | None): Limit to reservations of these rooms.
+            user_id (int | None): Limit to reservations of this user, including in the XL.
 
         Returns:
-            Sequence[Reservation]: A sequence of Reservation model objects representing the confirmed reservations for the specified date and room.
+            Sequence[tuple[str | None, datetime, datetime]]: The room ID, which is None in the
+                XL, start, and end of each reservation ordered by start.
         """
         start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.room)
-            .filter(
-                ReservationEntity.start < start + timedelta(hours=24),
-                ReservationEntity.end > start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                RoomEntity.id == room_id,
-            )
-            .options(
-                joinedload(ReservationEntity.users), joinedload(ReservationEntity.seats)
-            )
-            .order_by(ReservationEntity.start)
-            .all()
-        )
-
-        return [reservation.to_model() for reservation in reservations]
-
-    def _query_xl_reservations_by_date_for_user(
-        self, date: datetime, subject: User
-    ) -> Sequence[Reservation]:
-        start = date.replace(hour=0, minute=0, second=0, microsecond=0)
-        reservations = (
-            self._session.query(ReservationEntity)
-            .join(ReservationEntity.users)
-            .filter(
-                ReservationEntity.start < start + timedelta(hours=24),
-                ReservationEntity.end > start,
-                ReservationEntity.state.not_in(
-                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
-                ),
-                ReservationEntity.room == None,
-                UserEntity.id == subject.id
-            )
-            .order_by(ReservationEntity.start)
-            .all()
+        query = select(
+            ReservationEntity.room_id, ReservationEntity.start, ReservationEntity.end
+        ).where(
+            ReservationEntity.start < start + timedelta(hours=24),
+            ReservationEntity.end > start,
+            ReservationEntity.state.not_in(
+                [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+            ),
         )
-
-        return [reservation.to_model() for reservation in reservations]
+        if room_ids is not None:
+            query = query.where(ReservationEntity.room_id.in_(room_ids))
+        if user_id is not None:
+            query = query.join(ReservationEntity.users).where(UserEntity.id == user_id)
+        return [
+            tuple(row)
+            for row in self._session.execute(query.order_by(ReservationEntity.start))
+        ]
 
     def _get_reservable_rooms(self) -> Sequence[RoomDetails]:
         """
@@ -615,7 +725,9 @@ class ReservationService:
             Sequence[ReservationEntity] - All ReservationEntities that were not state transitioned.
         """
         valid: list[ReservationEntity] = []
-        dirty = False
+        expired: dict[
+            tuple[ReservationState, ReservationState], list[ReservationEntity]
+        ] = {}
         for reservation in reservations:
             if (
                 reservation.state == ReservationState.DRAFT
@@ -623,26 +735,52 @@ class ReservationService:
                 + self._policy_svc.reservation_draft_timeout()
                 < cutoff
             ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
+                transition = (ReservationState.DRAFT, ReservationState.CANCELLED)
             elif (
                 reservation.state == ReservationState.CONFIRMED
                 and reservation.start + self._policy_svc.reservation_checkin_timeout()
                 < cutoff
             ):
-                reservation.state = ReservationState.CANCELLED
-                dirty = True
+                transition = (ReservationState.CONFIRMED, ReservationState.CANCELLED)
             elif (
                 reservation.state == ReservationState.CHECKED_IN
                 and reservation.end <= cutoff
             ):
-                reservation.state = ReservationState.CHECKED_OUT
-                dirty = True
+                transition = (ReservationState.CHECKED_IN, ReservationState.CHECKED_OUT)
             else:
                 valid.append(reservation)
+                continue
+            expired.setdefault(transition, []).append(reservation)
+            if reservation.room_id is not None:
+                room_grids().invalidate(
+                    reservation.start, reservation.end, self._session
+                )
 
-        if dirty:
-            self._session.commit()
+        for (state, new_state), entities in expired.items():
+            # Concurrent requests observe the same expirations, so each transition is a
+            # conditional update made by only one of them, which records its utilization.
+            transitioned = set(
+                self._session.scalars(
+                    update(ReservationEntity)
+                    .where(
+                        ReservationEntity.id.in_([entity.id for entity in entities]),
+                        ReservationEntity.state == state,
+                    )
+                    .values(state=new_state, version=ReservationEntity.version + 1)
+                    .returning(ReservationEntity.id)
+                    .execution_options(synchronize_session="fetch")
+                )
+            )
+            for entity in entities:
+                if entity.id not in transitioned:
+                    self._session.refresh(entity)
+            # Lapsed drafts were never held, whereas missed confirmations are no-shows
+            if state != ReservationState.DRAFT:
+                utilization.record(
+                    self._session,
+                    (entity for entity in entities if entity.id in transitioned),
+                    checked_in=new_state == ReservationState.CHECKED_OUT,
+                )
 
         return valid
 
@@ -681,41 +819,45 @@ class ReservationService:
         if len(open_hours) == 0:
             return []
 
-        # Convert the operating hours during the bounds into an availability list
-        # and constrain the availability list within the bounds.
-        open_availability_list = self._operating_hours_to_bounded_availability_list(
-            open_hours, bounds
+        # Intersect the operating hours with the bounds.
+        open_intervals = IntervalSet.from_time_ranges(open_hours).constrain(
+            bounds.start, bounds.end
         )
-        if len(open_availability_list.availability) == 0:
+        if not open_intervals:
             return []
 
-        # Start from a position where all seats begin with same availability as
-        # open_availability_list. From there, reservations will subtract availability
-        # from the given seat.
-        seat_availability_dict = self._initialize_seat_availability_dict(
-            seats, open_availability_list
-        )
-
-        # Get all active reservations during the availability bounds for the seats.
-        reservation_range = TimeRange(
-            start=open_availability_list.availability[0].start,
-            end=open_availability_list.availability[-1].end,
-        )
-        reservations = self.get_seat_reservations(seats, reservation_range)
-
-        # Subtract all seat reservations from their availability
-        self._remove_reservations_from_availability(
-            seat_availability_dict, reservations
-        )
-
-        # Remove seats with availability below threshold
-        available_seats: list[SeatAvailability] = list(
-            self._prune_seats_below_availability_threshold(
-                list(seat_availability_dict.values()),
-                self._policy_svc.minimum_reservation_duration()
-                - MINUMUM_RESERVATION_EPSILON,
-            )
+        # Get all active reservations during the availability bounds for the seats,
+        # grouped by seat so each seat's availability is a single difference pass.
+        reservations = self.get_seat_reservations(seats, open_intervals.bounds())
+        reserved_by_seat: dict[int, list[TimeRange]] = {}
+        for reservation in reservations:
+            for seat in reservation.seats:
+                if seat.id is not None:
+                    reserved_by_seat.setdefault(seat.id, []).append(reservation)
+
+        # Subtract seat reservations from the open hours and remove seats with
+        # availability below threshold
+        threshold = (
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON
         )
+        available_seats: list[SeatAvailability] = []
+        for seat in seats:
+            if seat.id is None:
+                continue
+            availability = open_intervals
+            if seat.id in reserved_by_seat:
+                availability = availability - IntervalSet.from_time_ranges(
+                    reserved_by_seat[seat.id]
+                )
+            availability = availability.filter_shorter_than(threshold)
+            if availability:
+                available_seats.append(
+                    SeatAvailability(
+                        availability=availability.to_time_ranges(),
+                        **seat.model_dump(),
+                    )
+                )
 
         # Sort by nearest available ASC, duration DESC, reservable (False before True), with entropy
         # The rationale for entropy is when XL is wide open for walkins, within the given seat search
@@ -737,9 +879,10 @@ class ReservationService:
     ) -> Reservation:
         """When a user begins the process of making a reservation, a draft holds its place until confired.
 
-        For launch, reservations are limited to a single user. Reservations must either be made by and for
-        the subject initiating the request, or by an admin with permission to complete the action
-        "coworking.reservation.manage" for resource "user/{user.id}".
+        A reservation may be for a party of several users, each of whom is given a seat, or who
+        share a room no smaller than the party. The subject may include themselves in a party,
+        but every other user requires permission to complete the action
+        "coworking.reservation.manage" for resource "user/{user.id}", as held by admins.
 
         Args:
             subject (User): The user initiating the draft request.
@@ -754,19 +897,13 @@ class ReservationService:
         Future work:
             * Think about errors/validations of drafts that can be edited rather than raising exceptions.
             * Multi-user reservations
-                * Check for equality between users and available seats
                 * Limit users and seats counts to policy
             * Clean-up / Refactor Implementation
         """
-        # For the time being, reservations are limited to one user. As soon as
-        # possible, we'd like to add multi-user reservations so that pairs and teams
-        # can be simplified.
-        if len(request.users) > 1:
-            raise NotImplementedError("Multi-user reservations not yet supproted.")
-
-        # Enforce Reservation Draft Permissions
-        if subject.id not in [user.id for user in request.users]:
-            for user in request.users:
+        # Enforce Reservation Draft Permissions for everyone but the subject, since
+        # drafting for others blocks their own reservations and uses up their limits
+        for user in request.users:
+            if user.id != subject.id:
                 self._permission_svc.enforce(
                     subject, "coworking.reservation.manage", f"user/{user.id}"
                 )
@@ -791,9 +928,9 @@ class ReservationService:
         # Enforce request range is within bounds of walkin vs. pre-reserved policies
         bounds = TimeRange(start=start, end=end)
 
-        # Check if user has exceeded reservation limit
+        # Check if any user has exceeded reservation limit
         if request.room:
-            if not self._check_user_reservation_duration(request.users[0], bounds):
+            if not self._check_user_reservation_duration(request.users, bounds):
                 raise ReservationException(
                     "Oops! Looks like you've reached your weekly study room reservation limit"
                 )
@@ -808,10 +945,21 @@ class ReservationService:
             raise ReservationException(
                 "At least one valid user is required to make a reservation."
             )
+        if not all(user.accepted_community_agreement for user in user_entities):
+            raise ReservationException(
+                "Every user in a party must accept the community agreement."
+            )
+        if request.room:
+            room_entity = self._session.get(RoomEntity, request.room.id)
+            if room_entity is None:
+                raise ResourceNotFoundException(f"No room with id: {request.room.id}")
+            if len(user_entities) > room_entity.capacity:
+                raise ReservationException(
+                    f"Room {room_entity.id} holds at most {room_entity.capacity} users."
+                )
 
-        # Check for overlapping reservations for a single user
-        # if len(user_entities) == 1:
-        conflicts = self._get_active_reservations_for_user(request.users[0], bounds)
+        # Check for overlapping reservations of any user in the party at once
+        conflicts = self._get_active_reservations_for_users(request.users, bounds)
         for conflict in conflicts:
             if is_walkin and conflict.walkin:
                 raise ReservationException(
@@ -826,42 +974,26 @@ class ReservationService:
                     "Users may not have conflicting reservations."
                 )
 
-        # Dead code because of the NotImplementedError testing for multiple users at the top
-        # else:
-        #     # Draft of expected functionality (needs testing and sanity checking)
-        #     # Multiple users all need to not have conflicts
-        #     for user in request.users:
-        #         conflicts = self._get_active_reservations_for_user(user, bounds)
-        #         if len(conflicts) > 0:
-        #             raise ReservationException(
-        #                 "Users may not have conflicting reservations."
-        #             )
-
         # Look at the seats - match bounds of assigned seat's availability
         # TODO: Fetch all seats
         if request.room is None:
             seats: list[Seat] = SeatEntity.get_models_from_identities(
                 self._session, request.seats
             )
-            seat_availability = self.seat_availability(seats, bounds)
-
-            if not is_walkin:
-                seat_availability = [
-                    seat for seat in seat_availability if seat.reservable
-                ]
-
-            if len(seat_availability) == 0:
-                raise ReservationException(
-                    "The requested seat(s) are no longer available."
+            chosen, bounds = self._choose_and_lock_seats(
+                seats, bounds, len(user_entities), is_walkin
+            )
+            seat_entities = list(
+                self._session.scalars(
+                    select(SeatEntity)
+                    .where(SeatEntity.id.in_([seat.id for seat in chosen]))
+                    .options(joinedload(SeatEntity.room))
+                    .order_by(SeatEntity.id)
                 )
-
-            # TODO (limit to # of users on request if multiple users)
-            # Here we constrain the reservation start/end to that of the best available seat requested.
-            # This matters as walk-in availability becomes scarce (may start in the near future even though request
-            # start is for right now), alternatively may end early due to reserved seat on backend.
-            seat_entities = [self._session.get(SeatEntity, seat_availability[0].id)]
-            bounds = seat_availability[0].availability[0]
+            )
         else:
+            # The room's reservations are checked and the draft added while holding it
+            self._lock_reservables([], request.room.id)
             seat_entities = []
 
         room_id = request.room.id if request.room else None
@@ -877,9 +1009,104 @@ class ReservationService:
         )
 
         self._session.add(draft)
-        self._session.commit()
+        self._session.flush()
+        if room_id is not None:
+            room_grids().invalidate(draft.start, draft.end, self._session)
         return draft.to_model()
 
+    def _choose_and_lock_seats(
+        self, seats: Sequence[Seat], bounds: TimeRange, party_size: int, is_walkin: bool
+    ) -> tuple[list[SeatAvailability], TimeRange]:
+        """Choose seats for a party from those requested, and lock them until the draft is added.
+
+        Only the chosen seats are locked, so that drafts asking for the same seats, as every
+        walk-in does, wait on one another only when they are assigned the same seats. Once
+        locked, the chosen seats are checked again, and seats are chosen anew from what
+        remains if another draft took one of them first.
+
+        Args:
+            seats (Sequence[Seat]): The seats requested.
+            bounds (TimeRange): The time requested.
+            party_size (int): The number of seats to choose.
+            is_walkin (bool): Whether the draft is a walk-in, which may take unreservable seats.
+
+        Returns:
+            tuple[list[SeatAvailability], TimeRange]: The seats and the time they are reserved for.
+
+        Raises:
+            ReservationException: If too few of the seats are available at once.
+        """
+        for _ in range(SEAT_CHOICE_ATTEMPTS):
+            seat_availability = self.seat_availability(seats, bounds.model_copy())
+
+            if not is_walkin:
+                seat_availability = [
+                    seat for seat in seat_availability if seat.reservable
+                ]
+
+            # Each user in the party is given a seat, from one pass over availability.
+            # This matters as walk-in availability becomes scarce (may start in the near future even though request
+            # start is for right now), alternatively may end early due to reserved seat on backend.
+            party = self._choose_seats(seat_availability, party_size)
+            if party is None:
+                break
+            chosen, chosen_bounds = party
+            self._lock_reservables([seat.id for seat in chosen], None)  # type: ignore
+            if not self.get_seat_reservations(chosen, chosen_bounds):
+                return chosen, chosen_bounds
+        raise ReservationException("The requested seat(s) are no longer available.")
+
+    def _choose_seats(
+        self, seat_availability: Sequence[SeatAvailability], party_size: int
+    ) -> tuple[list[SeatAvailability], TimeRange] | None:
+        """Choose seats for a party that are available at the same time, close together.
+
+        Seats are considered at the earliest start at which enough of them are available,
+        in the order `seat_availability` ranks them. Among those, the seats nearest one
+        another are chosen, and the reservation lasts for as long as all of them are free.
+
+        Args:
+            seat_availability (Sequence[SeatAvailability]): Available seats, as ranked by
+                `seat_availability`.
+            party_size (int): The number of seats to choose.
+
+        Returns:
+            tuple[list[SeatAvailability], TimeRange] | None: The seats and the time they
+                are reserved for, or None if too few seats are available at once.
+        """
+        MINUMUM_RESERVATION_EPSILON = timedelta(minutes=1)
+        threshold = (
+            self._policy_svc.minimum_reservation_duration()
+            - MINUMUM_RESERVATION_EPSILON
+        )
+
+        def distance(a: SeatAvailability, b: SeatAvailability) -> int:
+            return abs(a.x - b.x) + abs(a.y - b.y)
+
+        for start in sorted({seat.availability[0].start for seat in seat_availability}):
+            available = [
+                seat
+                for seat in seat_availability
+                if seat.availability[0].start <= start
+                and seat.availability[0].end - start >= threshold
+            ]
+            if len(available) < party_size:
+                continue
+
+            # Each seat anchors the group of itself and its nearest available seats
+            best: list[SeatAvailability] = []
+            best_spread: int | None = None
+            for anchor in available:
+                group = sorted(available, key=lambda seat: distance(anchor, seat))[
+                    :party_size
+                ]
+                spread = sum(distance(anchor, seat) for seat in group)
+                if best_spread is None or spread < best_spread:
+                    best, best_spread = group, spread
+            end = min(seat.availability[0].end for seat in best)
+            return best, TimeRange(start=start, end=end)
+        return None
+
     def change_reservation(
         self, subject: User, delta: ReservationPartial
     ) -> Reservation:
@@ -897,10 +1124,12 @@ class ReservationService:
         Raises:
             ResourceNotFoundException when the requested ID is not found
             UserPermissionException when user does not have permission to modify the reservation
+            VersionConflictException when the reservation was changed by another request
+            ReservationException when a requested extension of the reservation is not allowed
             NotImplementedError when requested changes are not yet implemented as features
 
         Future work:
-            Implement the ability to change seats, party, and start/end time within policy restrictions
+            Implement the ability to change seats, party, and start time within policy restrictions
         """
         entity = self._session.get(ReservationEntity, delta.id)
         if entity is None:
@@ -918,6 +1147,9 @@ class ReservationService:
                     subject, "coworking.reservation.manage", f"user/{user_id}"
                 )
 
+        # Changes must be to the version of the reservation the client read, if sent
+        expect_version(entity, delta.version, ReservationEntity.to_model)
+
         # Handle Requested State Changes
         dirty = False
         if delta.state is not None and delta.state != entity.state:
@@ -933,16 +1165,162 @@ class ReservationService:
         if delta.users is not None:
             raise NotImplementedError("Changing party not yet supported.")
 
-        # Handle Requested Time Changes (TODO)
-        if delta.start is not None or delta.end is not None or delta.seats is not None:
+        # Handle Requested Time Changes
+        if delta.start is not None and delta.start != current.start:
             # TODO: Assure these requested changes are valid within policies
-            raise NotImplementedError("Changing start/end not yet supported")
+            raise NotImplementedError("Changing start not yet supported")
+        if delta.end is not None and delta.end != current.end:
+            self._extend(subject, entity, delta.end)
+            dirty = True
 
         if dirty:  # and valid():
-            self._session.commit()
+            flush_versioned(self._session, entity, ReservationEntity.to_model)
+            if entity.room_id is not None:
+                room_grids().invalidate(
+                    current.start, max(current.end, entity.end), self._session
+                )
+            if entity.state == ReservationState.CHECKED_OUT:
+                utilization.record(self._session, [entity], checked_in=True)
 
         return entity.to_model()
 
+    def _extend(self, subject: User, entity: ReservationEntity, end: datetime) -> None:
+        """Extend a confirmed or checked in reservation to end later.
+
+        Extensions are requested within `PolicyService#extend_window()` of the end of a
+        reservation, for up to `PolicyService#extend_duration()`, and must not overlap the
+        next reservation of its seats or room, nor other reservations of its users.
+
+        Args:
+            subject (User): The user extending the reservation.
+            entity (ReservationEntity): The reservation, whose end is set when valid.
+            end (datetime): The requested new end.
+
+        Raises:
+            ReservationException: If the reservation cannot be extended until `end`.
+        """
+        if entity.state not in (ReservationState.CONFIRMED, ReservationState.CHECKED_IN):
+            raise ReservationException(
+                "Only confirmed and checked in reservations can be extended."
+            )
+        if end <= entity.end:
+            raise ReservationException("Reservations can only be extended to end later.")
+
+        now = datetime.now()
+        if not entity.end - self._policy_svc.extend_window(subject) <= now < entity.end:
+            raise ReservationException(
+                "Reservations can only be extended shortly before they end."
+            )
+        if end - entity.end > self._policy_svc.extend_duration(subject):
+            raise ReservationException(
+                "Reservations cannot be extended by that long at once."
+            )
+
+        extension = TimeRange(start=entity.end, end=end)
+        if not any(
+            hours.start <= extension.start and extension.end <= hours.end
+            for hours in self._operating_hours_svc.schedule(extension)
+        ):
+            raise ReservationException(
+                "Reservations cannot be extended beyond operating hours."
+            )
+        users = [UserIdentity(id=user.id) for user in entity.users]
+        if any(
+            reservation.id != entity.id
+            for reservation in self._get_active_reservations_for_users(
+                users, extension
+            )
+        ):
+            raise ReservationException("Users may not have conflicting reservations.")
+        if entity.room_id is not None and not self._check_user_reservation_duration(
+            users, extension
+        ):
+            raise ReservationException(
+                "Oops! Looks like you've reached your weekly study room reservation limit"
+            )
+
+        # A draft of the seats or room cannot be added between the check and update
+        self._lock_reservables([seat.id for seat in entity.seats], entity.room_id)
+        next_start = self._next_reservation_start(entity)
+        if next_start is not None and next_start < end:
+            raise ReservationException(
+                "The reservation cannot be extended past the next reservation of its seat or room."
+            )
+        entity.end = end
+
+    def _next_reservation_start(self, entity: ReservationEntity) -> datetime | None:
+        """The start of the next active reservation of the seats or room of a reservation.
+
+        Args:
+            entity (ReservationEntity): The reservation to look ahead from.
+
+        Drafts past the draft timeout and confirmations past the check-in timeout are
+        not counted, as they are cancelled by the next time-based transition.
+
+        Returns:
+            datetime | None: The earliest start of another reservation of the same seats
+                or room ending after the reservation does, or None if there is none.
+        """
+        now = datetime.now()
+        query = (
+            select(ReservationEntity.start)
+            .where(
+                ReservationEntity.id != entity.id,
+                ReservationEntity.end > entity.end,
+                ReservationEntity.state.not_in(
+                    [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+                ),
+                or_(
+                    ReservationEntity.state != ReservationState.DRAFT,
+                    ReservationEntity.created_at
+                    >= now - self._policy_svc.reservation_draft_timeout(),
+                ),
+                or_(
+                    ReservationEntity.state != ReservationState.CONFIRMED,
+                    ReservationEntity.start
+                    >= now - self._policy_svc.reservation_checkin_timeout(),
+                ),
+            )
+            .order_by(ReservationEntity.start)
+            .limit(1)
+        )
+        if entity.room_id is not None:
+            query = query.where(ReservationEntity.room_id == entity.room_id)
+        else:
+            query = query.join(
+                reservation_seat_table,
+                reservation_seat_table.c.reservation_id == ReservationEntity.id,
+            ).where(
+                reservation_seat_table.c.seat_id.in_([seat.id for seat in entity.seats])
+            )
+        return self._session.scalars(query).first()
+
+    def _lock_reservables(self, seat_ids: Iterable[int], room_id: str | None) -> None:
+        """Lock seats and a room until the transaction ends.
+
+        Drafts and extensions check for overlapping reservations of their seats or room
+        and then write their own, so those of the same seats or room are serialized by
+        locking their rows first. Rows are locked in order of id to avoid deadlocks.
+
+        Args:
+            seat_ids (Iterable[int]): The seats to lock.
+            room_id (str | None): The room to lock, if any.
+        """
+        seat_ids = sorted(set(seat_ids))
+        if seat_ids:
+            self._session.execute(
+                select(SeatEntity.id)
+                .where(SeatEntity.id.in_(seat_ids))
+                .order_by(SeatEntity.id)
+                .with_for_update(key_share=True)
+            ).all()
+        if room_id is not None:
+            self._session.execute(
+                select(RoomEntity.id)
+                .where(RoomEntity.id == room_id)
+                .with_for_update(key_share=True)
+            ).all()
+
     def _change_state(self, entity: ReservationEntity, delta: ReservationState) -> bool:
         RS = ReservationState
 
@@ -1072,6 +1450,7 @@ class ReservationService:
         Raises:
             ReservationError: If the requested checkin request cannot be satisfied, such as
             attempting to check-in a reservation that's in the wrong state.
+            VersionConflictException: If the reservation was changed by another request.
 
         Future Work:
             Should staff only be able to check-in reservations whose start time is
@@ -1088,8 +1467,9 @@ class ReservationService:
 
         # Update state iff ReservationState is current CONFIRMED
         if entity.state == ReservationState.CONFIRMED:
+            expect_version(entity, reservation.version, ReservationEntity.to_model)
             entity.state = ReservationState.CHECKED_IN
-            self._session.commit()
+            flush_versioned(self._session, entity, ReservationEntity.to_model)
         elif entity.state in (
             ReservationState.CANCELLED,
             ReservationState.CHECKED_OUT,
@@ -1102,50 +1482,3 @@ class ReservationService:
             ...  # Idempotent case of ReservationState.CHECKED_IN
 
         return entity.to_model()
-
-    # Private helper methods
-
-    def _operating_hours_to_bounded_availability_list(
-        self, operating_hours: Sequence[OperatingHours], bounds: TimeRange
-    ) -> AvailabilityList:
-        availability = AvailabilityList(
-            availability=[
-                TimeRange(start=operating_hour.start, end=operating_hour.end)
-                for operating_hour in operating_hours
-            ]
-        )
-        availability.constrain(bounds)
-        return availability
-
-    def _initialize_seat_availability_dict(
-        self, seats: Sequence[Seat], availability: AvailabilityList
-    ) -> dict[int, SeatAvailability]:
-        return {
-            seat.id: SeatAvailability(
-                availability=availability.model_copy(deep=True).availability,
-                **seat.model_dump(),
-            )
-            for seat in seats
-            if seat.id is not None
-        }
-
-    def _remove_reservations_from_availability(
-        self,
-        seat_availability_dict: dict[int, SeatAvailability],
-        reservations: Sequence[Reservation],
-    ):
-        for reservation in reservations:
-            if len(reservation.seats) > 0:
-                for seat in reservation.seats:
-                    if seat.id in seat_availability_dict:
-                        seat_availability_dict[seat.id].subtract(reservation)
-
-    def _prune_seats_below_availability_threshold(
-        self, seats: Sequence[SeatAvailability], threshold: timedelta
-    ) -> Sequence[SeatAvailability]:
-        available_seats: list[SeatAvailability] = []
-        for seat in seats:
-            seat.filter_time_ranges_below(threshold)
-            if len(seat.availability) > 0:
-                available_seats.append(seat)
-        return available_seats
@@ -0,0 +1,170 @@
+"""Moves finished reservations out of `coworking__reservation` into its archive table.
+
+Every query for active and upcoming reservations filters `coworking__reservation` by
+time, so the table is kept to reservations that are recent or still in play.
+Reservations that ended in a final state, cancelled or checked out, before a cutoff are
+moved to `coworking__reservation_archive` in batches, along with the ids of their
+users and seats. Lapsed drafts, and other reservations cancelled before their check-in
+timeout passed, may instead be compacted, that is deleted outright, when they are not
+wanted for history. Reservations cancelled later are no-shows, which `utilization.backfill`
+counts from the history, so they are always archived.
+
+Queries over all reservations, such as analytics, select from `reservation_history`,
+which spans both tables."""
+
+from datetime import datetime
+from sqlalchemy import (
+    ARRAY,
+    Column,
+    ColumnElement,
+    Integer,
+    Subquery,
+    and_,
+    cast,
+    delete,
+    func,
+    insert,
+    literal,
+    select,
+    union_all,
+)
+from sqlalchemy.dialects.postgresql import aggregate_order_by, array
+from sqlalchemy.orm import Session
+from ...entities.coworking import ReservationArchiveEntity, ReservationEntity
+from ...entities.coworking.reservation_seat_table import reservation_seat_table
+from ...entities.coworking.reservation_user_table import reservation_user_table
+from ...models.coworking import ReservationState
+from .policy import RESERVATION_CHECKIN_TIMEOUT, current_policies
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# Reservations moved per transaction, so that archiving does not hold locks for long
+ARCHIVE_BATCH_SIZE = 1000
+
+FINAL_STATES = (ReservationState.CANCELLED, ReservationState.CHECKED_OUT)
+
+
+def archive_batch(
+    session: Session,
+    before: datetime,
+    compact: bool = False,
+    batch_size: int = ARCHIVE_BATCH_SIZE,
+) -> tuple[int, int]:
+    """Archive a batch of reservations that ended in a final state before a cutoff.
+
+    Args:
+        session (Session): The session to write through. Committing is left to the caller.
+        before (datetime): Reservations ending before this time are archived.
+        compact (bool): Whether to delete reservations cancelled before their check-in
+            timeout passed, rather than archive them.
+        batch_size (int): The most reservations to move.
+
+    Returns:
+        tuple[int, int]: The numbers of reservations archived and compacted, which are
+            both zero once no reservations remain to archive.
+    """
+    checkin_timeout = current_policies(session).duration(RESERVATION_CHECKIN_TIMEOUT)
+    lapsed = and_(
+        ReservationEntity.state == ReservationState.CANCELLED,
+        ReservationEntity.updated_at < ReservationEntity.start + checkin_timeout,
+    )
+    batch = session.execute(
+        select(ReservationEntity.id, lapsed)
+        .where(
+            ReservationEntity.end < before,
+            ReservationEntity.state.in_(FINAL_STATES),
+        )
+        .order_by(ReservationEntity.id)
+        .limit(batch_size)
+        .with_for_update(skip_locked=True)
+    ).all()
+    ids = [id for id, _ in batch]
+    if not ids:
+        return 0, 0
+    archived_ids = [id for id, is_lapsed in batch if not (compact and is_lapsed)]
+
+    if archived_ids:
+        session.execute(
+            insert(ReservationArchiveEntity).from_select(
+                [
+                    "id",
+                    "start",
+                    "end",
+                    "state",
+                    "walkin",
+                    "room_id",
+                    "created_at",
+                    "updated_at",
+                    "user_ids",
+                    "seat_ids",
+                    "archived_at",
+                ],
+                select(
+                    ReservationEntity.id,
+                    ReservationEntity.start,
+                    ReservationEntity.end,
+                    ReservationEntity.state,
+                    ReservationEntity.walkin,
+                    ReservationEntity.room_id,
+                    ReservationEntity.created_at,
+                    ReservationEntity.updated_at,
+                    _ids_of(reservation_user_table.c.user_id),
+                    _ids_of(reservation_seat_table.c.seat_id),
+                    literal(datetime.now()),
+                ).where(ReservationEntity.id.in_(archived_ids)),
+            )
+        )
+
+    for join_table in (reservation_user_table, reservation_seat_table):
+        session.execute(delete(join_table).where(join_table.c.reservation_id.in_(ids)))
+    session.execute(delete(ReservationEntity).where(ReservationEntity.id.in_(ids)))
+
+    # Deleted rows would otherwise linger in the session's identity map
+    session.expire_all()
+    return len(archived_ids), len(ids) - len(archived_ids)
+
+
+def reservation_history() -> Subquery:
+    """Every reservation, whether archived or not.
+
+    Returns:
+        Subquery: Rows of `id`, `start`, `end`, `state`, `walkin`, `room_id`,
+            `created_at`, `updated_at`, `user_ids`, and `seat_ids`.
+    """
+    live = select(
+        ReservationEntity.id,
+        ReservationEntity.start,
+        ReservationEntity.end,
+        ReservationEntity.state,
+        ReservationEntity.walkin,
+        ReservationEntity.room_id,
+        ReservationEntity.created_at,
+        ReservationEntity.updated_at,
+        _ids_of(reservation_user_table.c.user_id).label("user_ids"),
+        _ids_of(reservation_seat_table.c.seat_id).label("seat_ids"),
+    )
+    archived = select(
+        ReservationArchiveEntity.id,
+        ReservationArchiveEntity.start,
+        ReservationArchiveEntity.end,
+        ReservationArchiveEntity.state,
+        ReservationArchiveEntity.walkin,
+        ReservationArchiveEntity.room_id,
+        ReservationArchiveEntity.created_at,
+        ReservationArchiveEntity.updated_at,
+        ReservationArchiveEntity.user_ids,
+        ReservationArchiveEntity.seat_ids,
+    )
+    return union_all(live, archived).subquery("reservation_history")
+
+
+def _ids_of(column: Column[int]) -> ColumnElement[list[int]]:
+    """The ids in a column of a join table of a reservation, as an array."""
+    return func.coalesce(
+        select(func.array_agg(aggregate_order_by(column, column)))
+        .where(column.table.c.reservation_id == ReservationEntity.id)
+        .scalar_subquery(),
+        cast(array([], type_=Integer), ARRAY(Integer)),
+    )
@@ -0,0 +1,125 @@
+"""Process-wide cache of the subject-independent room reservation grid.
+
+Most of the room reservation map for a date is the same for every user: which slots
+of which rooms are reserved by anyone and which are held for office hours. That grid
+is built once per date and first slot, shared between requests, and a user's own
+reservations are overlaid on a copy of it per request.
+
+Grids are dropped when room reservations on their date are written, when policies,
+operating hours, or rooms change, and otherwise expire after `ROOM_GRID_TTL` so that
+writes made by other processes are eventually observed. Writes are flushed before
+the request's unit of work commits, so grids are dropped again after the commit in
+case another request rebuilt them from the data committed before.
+"""
+
+from collections import OrderedDict
+from datetime import date, datetime, timedelta
+from threading import Lock
+from sqlalchemy.orm import Session
+from ...database import after_commit
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+ROOM_GRID_TTL = timedelta(minutes=1)
+
+# Length of the slots of the room reservation map, which room search finds slots in too
+ROOM_SLOT_DURATION = timedelta(minutes=30)
+
+# Grids are keyed by date and first slot, so only a handful are live at once
+MAX_ROOM_GRIDS = 64
+
+
+class RoomGrid:
+    """Slot states of every reservable room on a date, from reservations and office hours.
+
+    Each row holds RoomState values beginning at `operating_hours_start` in slots of
+    `ROOM_SLOT_DURATION`. Rows are tuples so that a shared grid cannot be mutated."""
+
+    __slots__ = (
+        "operating_hours_start",
+        "operating_hours_end",
+        "number_of_time_slots",
+        "rows",
+        "expires_at",
+    )
+
+    def __init__(
+        self,
+        operating_hours_start: datetime,
+        operating_hours_end: datetime,
+        number_of_time_slots: int,
+        rows: dict[str, list[int]],
+    ):
+        self.operating_hours_start = operating_hours_start
+        self.operating_hours_end = operating_hours_end
+        self.number_of_time_slots = number_of_time_slots
+        self.rows = {room_id: tuple(row) for room_id, row in rows.items()}
+        self.expires_at = datetime.now() + ROOM_GRID_TTL
+
+    def copy_rows(self) -> dict[str, list[int]]:
+        """A mutable copy of the rows to overlay a user's reservations onto."""
+        return {room_id: list(row) for room_id, row in self.rows.items()}
+
+
+class RoomGridCache:
+    """A bounded, thread-safe map of (date, first slot) to RoomGrid."""
+
+    def __init__(self, max_grids: int = MAX_ROOM_GRIDS):
+        self._max_grids = max_grids
+        self._grids: OrderedDict[tuple[date, datetime], RoomGrid] = OrderedDict()
+        self._lock = Lock()
+
+    def get(self, day: date, operating_hours_start: datetime) -> RoomGrid | None:
+        """The cached grid of the date beginning at the given slot, if still fresh."""
+        key = (day, operating_hours_start)
+        with self._lock:
+            grid = self._grids.get(key)
+            if grid is None:
+                return None
+            if grid.expires_at <= datetime.now():
+                del self._grids[key]
+                return None
+            self._grids.move_to_end(key)
+            return grid
+
+    def put(self, day: date, grid: RoomGrid) -> None:
+        """Cache a grid, evicting the least recently used grid when full."""
+        with self._lock:
+            self._grids[(day, grid.operating_hours_start)] = grid
+            self._grids.move_to_end((day, grid.operating_hours_start))
+            while len(self._grids) > self._max_grids:
+                self._grids.popitem(last=False)
+
+    def invalidate(
+        self, start: datetime, end: datetime, session: Session | None = None
+    ) -> None:
+        """Drop the grids of every date overlapped by [start, end).
+
+        When given the session that wrote the change, they are dropped again once it commits.
+        """
+        if session is not None:
+            after_commit(session, lambda: self.invalidate(start, end))
+        first, last = start.date(), (end - timedelta(microseconds=1)).date()
+        with self._lock:
+            for key in [key for key in self._grids if first <= key[0] <= last]:
+                del self._grids[key]
+
+    def clear(self, session: Session | None = None) -> None:
+        """Drop every grid, and again once the given session commits, if any."""
+        if session is not None:
+            after_commit(session, self.clear)
+        with self._lock:
+            self._grids.clear()
+
+    def __len__(self) -> int:
+        return len(self._grids)
+
+
+_cache = RoomGridCache()
+
+
+def room_grids() -> RoomGridCache:
+    """The room grid cache shared by this process."""
+    return _cache
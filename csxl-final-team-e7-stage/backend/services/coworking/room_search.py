@@ -0,0 +1,195 @@
+"""Service that searches for free study rooms to reserve."""
+
+from datetime import date, datetime, time, timedelta
+from fastapi import Depends
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ...database import db_session
+from ...models import User
+from ...models.room import Room
+from ...models.coworking import ReservationState, RoomSlot, SlotCalendar, TimeRange
+from ...entities import RoomEntity, UserEntity
+from ...entities.coworking import ReservationEntity
+from .reservation import ReservationException
+from .policy import PolicyService
+from .operating_hours import OperatingHoursService
+from .room_grid import ROOM_SLOT_DURATION
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# The XL is reserved by seat rather than as a room.
+XL_ROOM_ID = "SN156"
+
+
+class RoomSearchService:
+    """RoomSearchService finds rooms with free time matching a user's constraints."""
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        policy_svc: PolicyService = Depends(),
+        operating_hours_svc: OperatingHoursService = Depends(),
+    ):
+        """Initializes a new RoomSearchService.
+
+        Args:
+            session (Session): The database session to use, typically injected by FastAPI.
+        """
+        self._session = session
+        self._policy_svc = policy_svc
+        self._operating_hours_svc = operating_hours_svc
+
+    def search(
+        self,
+        subject: User,
+        duration: timedelta,
+        first_day: date,
+        last_day: date,
+        earliest: time = time(0),
+        latest: time | None = None,
+        capacity: int = 1,
+        limit: int = 10,
+    ) -> list[RoomSlot]:
+        """Find free slots in reservable rooms, best matches first.
+
+        Slots are free when the XL is open, the room is neither reserved nor held for
+        office hours, and the subject has no other reservation at the time. The earliest
+        slots come first, and among slots starting together the smallest room with enough
+        capacity is best. Within a room and day, slots returned do not overlap.
+
+        Args:
+            subject (User): The user searching, whose own reservations are excluded.
+            duration (timedelta): How long the room is needed.
+            first_day (date): The first day to search.
+            last_day (date): The last day to search, limited by the subject's reservation window.
+            earliest (time): The earliest time of day a slot may start.
+            latest (time | None): The latest time of day a slot may end, or midnight when None.
+            capacity (int): The minimum capacity of the room.
+            limit (int): The maximum number of slots to return.
+
+        Returns:
+            list[RoomSlot]: The best matching free slots.
+
+        Raises:
+            ReservationException: If the duration is not allowed by policy or the search range is empty.
+        """
+        if (
+            duration < self._policy_svc.minimum_reservation_duration()
+            or duration > self._policy_svc.maximum_initial_reservation_duration(subject)
+        ):
+            raise ReservationException(
+                "Search duration is outside of the reservation duration limits."
+            )
+        if duration % ROOM_SLOT_DURATION != timedelta(0):
+            raise ReservationException(
+                f"Search duration must be a multiple of {ROOM_SLOT_DURATION.seconds // 60} minutes."
+            )
+
+        now = datetime.now()
+        first_day = max(first_day, now.date())
+        last_day = min(
+            last_day, (now + self._policy_svc.reservation_window(subject)).date()
+        )
+        if (
+            first_day > last_day
+            or (latest is not None and earliest >= latest)
+            or limit <= 0
+        ):
+            return []
+
+        rooms = self._session.execute(
+            select(RoomEntity.id, RoomEntity.nickname, RoomEntity.capacity)
+            .where(
+                RoomEntity.reservable == True,
+                RoomEntity.id != XL_ROOM_ID,
+                RoomEntity.capacity >= capacity,
+            )
+            .order_by(RoomEntity.capacity, RoomEntity.id)
+        ).all()
+        if len(rooms) == 0:
+            return []
+
+        calendar = self._build_calendar(
+            subject, first_day, last_day, [room.id for room in rooms], now
+        )
+
+        earliest_slot = calendar.slot_of(earliest, round_up=True)
+        latest_slot = (
+            calendar.slots_per_day if latest is None else calendar.slot_of(latest)
+        )
+
+        slots: list[RoomSlot] = []
+        for room in rooms:
+            for start, end in calendar.find(
+                room.id, duration // ROOM_SLOT_DURATION, earliest_slot, latest_slot
+            ):
+                slots.append(
+                    RoomSlot(
+                        start=start,
+                        end=end,
+                        room=Room(id=room.id, nickname=room.nickname),
+                        capacity=room.capacity,
+                    )
+                )
+
+        # Rooms are ordered by capacity, and the sort is stable, so ties prefer the best fit.
+        slots.sort(key=lambda slot: slot.start)
+        return slots[:limit]
+
+    def _build_calendar(
+        self,
+        subject: User,
+        first_day: date,
+        last_day: date,
+        room_ids: list[str],
+        now: datetime,
+    ) -> SlotCalendar:
+        """Build the free slots of rooms from operating hours, office hours, and reservations."""
+        days = (last_day - first_day).days + 1
+        calendar = SlotCalendar(first_day, days, room_ids, ROOM_SLOT_DURATION)
+        start = datetime.combine(first_day, time())
+        end = start + timedelta(days=days)
+
+        for operating_hours in self._operating_hours_svc.schedule(
+            TimeRange(start=start, end=end)
+        ):
+            calendar.open(operating_hours.start, operating_hours.end)
+
+        for day in range(days):
+            midnight = start + timedelta(days=day)
+            for room_id, blocks in self._policy_svc.office_hours(midnight).items():
+                for block_start, block_end in blocks:
+                    calendar.block(
+                        datetime.combine(midnight, block_start),
+                        datetime.combine(midnight, block_end),
+                        room_id,
+                    )
+
+        active = (
+            ReservationEntity.start < end,
+            ReservationEntity.end > start,
+            ReservationEntity.state.not_in(
+                [ReservationState.CANCELLED, ReservationState.CHECKED_OUT]
+            ),
+        )
+        for room_id, reservation_start, reservation_end in self._session.execute(
+            select(
+                ReservationEntity.room_id,
+                ReservationEntity.start,
+                ReservationEntity.end,
+            ).where(*active, ReservationEntity.room_id.in_(room_ids))
+        ):
+            calendar.block(reservation_start, reservation_end, room_id)
+
+        # Users may not have conflicting reservations, including in the XL.
+        for reservation_start, reservation_end in self._session.execute(
+            select(ReservationEntity.start, ReservationEntity.end)
+            .join(ReservationEntity.users)
+            .where(*active, UserEntity.id == subject.id)
+        ):
+            calendar.block(reservation_start, reservation_end)
+
+        calendar.block(start, now)
+        return calendar
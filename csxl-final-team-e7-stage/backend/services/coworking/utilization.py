@@ -0,0 +1,294 @@
+"""Hourly rollups of seat and room utilization, and the analytics reported from them.
+
+A reservation counts toward the rollups of the hours it spans once it reaches a final
+state in use: checked out, or cancelled for not being checked into in time, which is a
+no-show. `ReservationService` calls `record` for each such transition, in the same
+transaction. The transitions are made by conditional updates, so each is made and
+recorded once however many requests observe it at the same time.
+
+`backfill` rebuilds the rollups of a span of hours from every reservation, archived or
+not, and the `UtilizationService` reports read only the rollups."""
+
+from datetime import datetime, timedelta
+from typing import Iterable, Iterator
+from fastapi import Depends
+from sqlalchemy import Integer, and_, case, cast, delete, func, or_, select, true
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ...database import db_session
+from ...entities.coworking import (
+    ReservationEntity,
+    RoomUtilizationEntity,
+    SeatEntity,
+    SeatUtilizationEntity,
+)
+from ...models import User
+from ...models.coworking import (
+    HourlyUtilization,
+    ReservationState,
+    RoomUtilization,
+    SeatTypeUtilization,
+    TimeRange,
+    UtilizationReport,
+    WeekdayUtilization,
+)
+from ..permission import PermissionService
+from .policy import RESERVATION_CHECKIN_TIMEOUT, current_policies
+from .reservation_archive import reservation_history
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+ONE_HOUR = timedelta(hours=1)
+ONE_MINUTE = timedelta(minutes=1)
+
+MEASURES = ("reserved_minutes", "checked_in_minutes", "no_shows")
+
+Rollup = type[SeatUtilizationEntity] | type[RoomUtilizationEntity]
+
+
+def record(
+    session: Session, reservations: Iterable[ReservationEntity], checked_in: bool
+) -> None:
+    """Add reservations that reached a final state to the rollups of their hours.
+
+    Args:
+        session (Session): The session the transitions were made in.
+        reservations (Iterable[ReservationEntity]): The reservations transitioned.
+        checked_in (bool): Whether the reservations were checked out, rather than
+            cancelled as no-shows.
+    """
+    seats: dict[tuple[int, datetime], list[int]] = {}
+    rooms: dict[tuple[str, datetime], list[int]] = {}
+    for reservation in reservations:
+        no_shows = 0 if checked_in else 1
+        for hour, minutes in _hours(reservation.start, reservation.end):
+            measures = (minutes, minutes if checked_in else 0, no_shows)
+            for seat in reservation.seats:
+                _add(seats, (seat.id, hour), measures)
+            if reservation.room_id is not None:
+                _add(rooms, (reservation.room_id, hour), measures)
+            no_shows = 0
+    _upsert(session, SeatUtilizationEntity, "seat_id", seats)
+    _upsert(session, RoomUtilizationEntity, "room_id", rooms)
+
+
+def backfill(session: Session, time_range: TimeRange) -> int:
+    """Rebuild the rollups of the hours in a span from the reservations during them.
+
+    No-shows are not told apart from other cancellations in the reservation tables, so
+    cancellations made once the check-in timeout had passed are counted as no-shows.
+    The timeout is read from the current policy snapshot, which callers outside the
+    application, such as scripts, load first.
+
+    Args:
+        session (Session): The session to write through. Committing is left to the caller.
+        time_range (TimeRange): The span, whose hours from the one containing its start
+            are rebuilt.
+
+    Returns:
+        int: The number of rollup rows written.
+    """
+    first = _hour_of(time_range.start)
+    for entity in (SeatUtilizationEntity, RoomUtilizationEntity):
+        session.execute(
+            delete(entity).where(entity.hour >= first, entity.hour < time_range.end)
+        )
+
+    checkin_timeout = current_policies(session).duration(RESERVATION_CHECKIN_TIMEOUT)
+    history = reservation_history()
+    hours = (
+        func.generate_series(
+            func.date_trunc("hour", history.c.start), history.c.end, ONE_HOUR
+        )
+        .table_valued("hour")
+        .render_derived("hours")
+    )
+    seats = (
+        func.unnest(history.c.seat_ids).table_valued("seat_id").render_derived("seats")
+    )
+
+    checked_in = history.c.state == ReservationState.CHECKED_OUT
+    no_show = and_(
+        history.c.state == ReservationState.CANCELLED,
+        history.c.updated_at >= history.c.start + checkin_timeout,
+    )
+    overlap = func.least(history.c.end, hours.c.hour + ONE_HOUR) - func.greatest(
+        history.c.start, hours.c.hour
+    )
+    minutes = cast(func.floor(func.extract("epoch", overlap) / 60), Integer)
+    measures = (
+        func.sum(minutes),
+        func.sum(case((checked_in, minutes), else_=0)),
+        func.sum(
+            case(
+                (
+                    and_(
+                        no_show,
+                        hours.c.hour == func.date_trunc("hour", history.c.start),
+                    ),
+                    1,
+                ),
+                else_=0,
+            )
+        ),
+    )
+    counted = (
+        or_(checked_in, no_show),
+        history.c.start < history.c.end,
+        history.c.start < time_range.end,
+        history.c.end > first,
+        hours.c.hour >= first,
+        hours.c.hour < time_range.end,
+        hours.c.hour < history.c.end,
+    )
+
+    written = 0
+    for entity, key, source in (
+        (
+            SeatUtilizationEntity,
+            seats.c.seat_id,
+            history.join(hours, true()).join(seats, true()),
+        ),
+        (
+            RoomUtilizationEntity,
+            history.c.room_id,
+            history.join(hours, true()),
+        ),
+    ):
+        written += session.execute(
+            insert(entity).from_select(
+                [key.name, "hour", *MEASURES],
+                select(key, hours.c.hour, *measures)
+                .select_from(source)
+                .where(key.is_not(None), *counted)
+                .group_by(key, hours.c.hour),
+            )
+        ).rowcount
+    return written
+
+
+class UtilizationService:
+    """Reports utilization of the coworking space from the hourly rollups."""
+
+    def __init__(
+        self,
+        session: Session = Depends(db_session),
+        permission_svc: PermissionService = Depends(),
+    ):
+        """Initializes a new UtilizationService.
+
+        Args:
+            session (Session, optional): The database session to use, typically injected by FastAPI.
+            permission_svc (PermissionService, optional): The backend permission service, injected by FastAPI.
+        """
+        self._session = session
+        self._permission_svc = permission_svc
+
+    def get_report(self, subject: User, time_range: TimeRange) -> UtilizationReport:
+        """Summarize seat and room utilization by hour of day, weekday, seat type, and room.
+
+        Args:
+            subject (User): The user requesting the report.
+            time_range (TimeRange): The span to report on, from the hour containing its start.
+
+        Returns:
+            UtilizationReport: The utilization summaries.
+
+        Raises:
+            UserPermissionException: If the subject may not read utilization analytics.
+        """
+        self._permission_svc.enforce(
+            subject, "coworking.utilization.read", "coworking/utilization"
+        )
+        start = _hour_of(time_range.start)
+
+        def summarize(entity: Rollup, *keys, join=None) -> list[dict]:
+            query = (
+                select(*keys, *(func.sum(getattr(entity, name)) for name in MEASURES))
+                .select_from(entity)
+                .where(entity.hour >= start, entity.hour < time_range.end)
+            )
+            if join is not None:
+                query = query.join(*join)
+            query = query.group_by(*keys).order_by(*keys)
+            return [
+                dict(zip([key.name for key in keys] + list(MEASURES), row))
+                for row in self._session.execute(query)
+            ]
+
+        def hour_of_day(entity: Rollup):
+            return cast(func.extract("hour", entity.hour), Integer).label("hour")
+
+        def weekday(entity: Rollup):
+            # isodow numbers Monday as 1, whereas `datetime.weekday()` numbers it 0
+            return (cast(func.extract("isodow", entity.hour), Integer) - 1).label(
+                "weekday"
+            )
+
+        seat, room = SeatUtilizationEntity, RoomUtilizationEntity
+        return UtilizationReport(
+            start=start,
+            end=time_range.end,
+            seats_by_hour=[
+                HourlyUtilization(**row) for row in summarize(seat, hour_of_day(seat))
+            ],
+            seats_by_weekday=[
+                WeekdayUtilization(**row) for row in summarize(seat, weekday(seat))
+            ],
+            seats_by_type=[
+                SeatTypeUtilization(**row)
+                for row in summarize(
+                    seat,
+                    SeatEntity.has_monitor,
+                    SeatEntity.sit_stand,
+                    join=(SeatEntity, SeatEntity.id == seat.seat_id),
+                )
+            ],
+            rooms_by_hour=[
+                HourlyUtilization(**row) for row in summarize(room, hour_of_day(room))
+            ],
+            rooms_by_weekday=[
+                WeekdayUtilization(**row) for row in summarize(room, weekday(room))
+            ],
+            rooms=[RoomUtilization(**row) for row in summarize(room, room.room_id)],
+        )
+
+
+def _hour_of(moment: datetime) -> datetime:
+    """The start of the hour containing a moment."""
+    return moment.replace(minute=0, second=0, microsecond=0)
+
+
+def _hours(start: datetime, end: datetime) -> Iterator[tuple[datetime, int]]:
+    """The hours a span overlaps, with the whole minutes of each it covers."""
+    hour = _hour_of(start)
+    while hour < end:
+        yield hour, (min(end, hour + ONE_HOUR) - max(start, hour)) // ONE_MINUTE
+        hour += ONE_HOUR
+
+
+def _add(rows: dict, key: tuple, measures: tuple[int, int, int]) -> None:
+    rows[key] = [
+        total + value for total, value in zip(rows.get(key, [0, 0, 0]), measures)
+    ]
+
+
+def _upsert(session: Session, entity: Rollup, key: str, rows: dict) -> None:
+    """Add measures to rollup rows, creating those that do not exist yet."""
+    if not rows:
+        return
+    statement = insert(entity).values(
+        [
+            {key: id, "hour": hour, **dict(zip(MEASURES, measures))}
+            for (id, hour), measures in rows.items()
+        ]
+    )
+    columns = entity.__table__.c
+    session.execute(
+        statement.on_conflict_do_update(
+            index_elements=[key, "hour"],
+            set_={name: columns[name] + statement.excluded[name] for name in MEASURES},
+        )
+    )
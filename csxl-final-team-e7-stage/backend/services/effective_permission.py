@@ -0,0 +1,114 @@
+"""Maintains the effective_permission table of every permission each user holds.
+
+The table is derived from the `permission` and `user_role` tables. The functions here
+are called wherever those change, in the same transaction, and `rebuild` recomputes
+the table from scratch for data inserted by other means, such as bulk loads."""
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.orm import Session
+from ..entities import EffectivePermissionEntity, PermissionEntity, user_role_table
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def add_grant(session: Session, permission: PermissionEntity) -> None:
+    """Give a flushed permission to its user, or to every member of its role."""
+    if permission.user_id is not None:
+        user_ids = [permission.user_id]
+    else:
+        user_ids = list(
+            session.scalars(
+                select(user_role_table.c.user_id).where(
+                    user_role_table.c.role_id == permission.role_id
+                )
+            )
+        )
+    _insert(
+        session,
+        [
+            EffectivePermissionEntity.row(
+                user_id,
+                permission.id,
+                permission.role_id,
+                permission.action,
+                permission.resource,
+            )
+            for user_id in user_ids
+        ],
+    )
+
+
+def remove_grant(session: Session, permission_id: int) -> None:
+    """Take a permission away from everyone holding it."""
+    session.execute(
+        delete(EffectivePermissionEntity).where(
+            EffectivePermissionEntity.permission_id == permission_id
+        )
+    )
+
+
+def add_role_member(session: Session, role_id: int, user_id: int) -> None:
+    """Give a new member of a role the role's permissions."""
+    permissions = session.execute(
+        select(
+            PermissionEntity.id, PermissionEntity.action, PermissionEntity.resource
+        ).where(PermissionEntity.role_id == role_id)
+    )
+    _insert(
+        session,
+        [
+            EffectivePermissionEntity.row(user_id, id, role_id, action, resource)
+            for id, action, resource in permissions
+        ],
+    )
+
+
+def remove_role_member(session: Session, role_id: int, user_id: int) -> None:
+    """Take a role's permissions away from a former member."""
+    session.execute(
+        delete(EffectivePermissionEntity).where(
+            EffectivePermissionEntity.user_id == user_id,
+            EffectivePermissionEntity.role_id == role_id,
+        )
+    )
+
+
+def rebuild(session: Session) -> int:
+    """Recompute the effective permissions of every user from scratch.
+
+    Returns:
+        int: The number of effective permissions."""
+    session.flush()
+    session.execute(delete(EffectivePermissionEntity))
+    granted = session.execute(
+        select(
+            PermissionEntity.user_id,
+            PermissionEntity.id,
+            PermissionEntity.role_id,
+            PermissionEntity.action,
+            PermissionEntity.resource,
+        ).where(PermissionEntity.user_id.is_not(None))
+    )
+    through_roles = session.execute(
+        select(
+            user_role_table.c.user_id,
+            PermissionEntity.id,
+            PermissionEntity.role_id,
+            PermissionEntity.action,
+            PermissionEntity.resource,
+        ).join(user_role_table, user_role_table.c.role_id == PermissionEntity.role_id)
+    )
+    rows = [
+        EffectivePermissionEntity.row(*row)
+        for result in (granted, through_roles)
+        for row in result
+    ]
+    _insert(session, rows)
+    return len(rows)
+
+
+def _insert(session: Session, rows: list[dict]) -> None:
+    if len(rows) > 0:
+        session.execute(insert(EffectivePermissionEntity), rows)
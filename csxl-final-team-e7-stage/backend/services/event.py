@@ -2,11 +2,13 @@
 The Event Service allows the API to manipulate event data in the database.
 """
 
-from typing import Sequence
+from typing import Iterator, Sequence
 
 from fastapi import Depends
 from sqlalchemy import func, select, and_, func, or_, exists, or_
-from sqlalchemy.orm import Session, aliased
+from sqlalchemy import ColumnElement, String, cast, false, literal
+from sqlalchemy.orm import Session, aliased, joinedload, selectinload
+from sqlalchemy.sql import Select
 from backend.entities.user_entity import UserEntity
 from backend.models.event_registration import EventRegistration
 from ..models.public_user import PublicUser
@@ -15,7 +17,7 @@ from backend.models.pagination import Paginated, PaginationParams
 from backend.models.registration_type import RegistrationType
 
 from ..models import User, Event, EventDetails, Paginated, EventPaginationParams
-from ..database import db_session
+from ..database import STREAM_BATCH_SIZE, db_session
 from backend.models.event import Event, DraftEvent
 from backend.models.event_details import EventDetails
 from backend.models.coworking.time_range import TimeRange
@@ -23,8 +25,9 @@ from ..entities import (
     EventEntity,
     EventRegistrationEntity,
 )
-from ..entities import EventEntity, OrganizationEntity
-from .permission import PermissionService
+from ..entities import EventEntity, OrganizationEntity, OrganizationMemberEntity
+from .permission import Grants, PermissionService
+from .versioning import expect_version, flush_versioned
 from .exceptions import (
     ResourceNotFoundException,
     EventRegistrationException,
@@ -116,9 +119,13 @@ class EventService:
 
         length = self._session.execute(length_statement).scalar()
         entities = self._session.execute(statement).scalars()
+        grants = self._permission.get_grants(subject)
 
         return Paginated(
-            items=[entity.to_details_model(subject) for entity in entities],
+            items=[
+                self._with_capabilities(entity.to_details_model(subject), grants)
+                for entity in entities
+            ],
             length=length,
             params=pagination_params,
         )
@@ -138,10 +145,12 @@ class EventService:
         """
         # Select all entries in `Event` table
         event_entities = (self._session.query(EventEntity)).all()
+        grants = self._permission.get_grants(subject)
 
         # Convert entities to details models and return
         return [
-            event_entity.to_details_model(subject) for event_entity in event_entities
+            self._with_capabilities(event_entity.to_details_model(subject), grants)
+            for event_entity in event_entities
         ]
 
     def get_events_in_time_range(
@@ -162,8 +171,168 @@ class EventService:
             .where(EventEntity.time >= time_range.start)
             .where(EventEntity.time < time_range.end)
         )
+        grants = self._permission.get_grants(subject)
 
-        return [entity.to_details_model(subject) for entity in event_entities]
+        return [
+            self._with_capabilities(entity.to_details_model(subject), grants)
+            for entity in event_entities
+        ]
+
+    def stream(self, subject: User | None = None) -> Iterator[EventDetails]:
+        """
+        Yields all events from the table as they are read, rather than loading them all
+
+        Args:
+            subject: The User making the request.
+
+        Returns:
+            Iterator[EventDetails]: Each `EventDetails`, in no particular order
+        """
+        return self._stream(select(EventEntity), subject)
+
+    def stream_in_time_range(
+        self, time_range: TimeRange, subject: User | None = None
+    ) -> Iterator[EventDetails]:
+        """
+        Yields the events in the time range as they are read, rather than loading them all
+
+        Args:
+            time_range: The period over which to search for events.
+            subject: The User making the request.
+
+        Returns:
+            Iterator[EventDetails]: Each `EventDetails` in the time range
+        """
+        query = (
+            select(EventEntity)
+            .where(EventEntity.time >= time_range.start)
+            .where(EventEntity.time < time_range.end)
+        )
+        return self._stream(query, subject)
+
+    def _stream(self, query: Select, subject: User | None) -> Iterator[EventDetails]:
+        """Yield the details of the events selected by a query in batches.
+
+        Rows are fetched `STREAM_BATCH_SIZE` at a time through a server-side cursor, with
+        the registrations and organization of each batch loaded alongside it. Nothing is
+        queried until the first event is requested."""
+        query = query.options(
+            selectinload(EventEntity.registrations).joinedload(
+                EventRegistrationEntity.user
+            ),
+            joinedload(EventEntity.organization)
+            .selectinload(OrganizationEntity.members)
+            .joinedload(OrganizationMemberEntity.user),
+        ).execution_options(yield_per=STREAM_BATCH_SIZE)
+        grants = self._permission.get_grants(subject)
+        for entity in self._session.scalars(query):
+            yield self._with_capabilities(entity.to_details_model(subject), grants)
+
+    def _with_capabilities(self, event: EventDetails, grants: Grants) -> EventDetails:
+        """Annotate an event with what the subject, whose grants are given, may do with it.
+
+        Organizers may edit their events, as may users permitted to update the events of
+        the hosting organization, as in `update`."""
+        event.can_edit = event.is_organizer or grants.check(
+            "organization.events.update", f"organization/{event.organization_id}"
+        )
+        return event
+
+    def get_managed_events(self, subject: User) -> list[EventDetails]:
+        """
+        Get the events a user can edit, found in one statement: those they organize, and
+        those hosted by organizations whose events they are permitted to update.
+
+        Args:
+            subject: a valid User model representing the currently logged in User
+
+        Returns:
+            list[EventDetails]: the events the subject can edit, in order of time
+        """
+        query = (
+            select(EventEntity)
+            .where(self._editable_by(subject))
+            .order_by(EventEntity.time)
+        )
+        events = [
+            entity.to_details_model(subject)
+            for entity in self._session.scalars(query)
+        ]
+        for event in events:
+            event.can_edit = True
+        return events
+
+    def get_managed_registrations(
+        self, subject: User, time_range: TimeRange
+    ) -> list[EventRegistration]:
+        """
+        Get the registrations a user can manage for events within a time range, found in
+        one statement: those of events they organize, and those of events hosted by
+        organizations whose registrations they are permitted to manage.
+
+        Args:
+            subject: a valid User model representing the currently logged in User
+            time_range: The period over which to search for event registrations.
+
+        Returns:
+            list[EventRegistration]: the registrations, in order of event time
+        """
+        query = (
+            select(EventRegistrationEntity)
+            .join(EventEntity, EventRegistrationEntity.event_id == EventEntity.id)
+            .where(EventEntity.time >= time_range.start)
+            .where(EventEntity.time < time_range.end)
+            .where(self._registrations_manageable_by(subject))
+            .options(
+                joinedload(EventRegistrationEntity.event),
+                joinedload(EventRegistrationEntity.user),
+            )
+            .order_by(EventEntity.time, EventRegistrationEntity.user_id)
+        )
+        return [entity.to_model() for entity in self._session.scalars(query)]
+
+    def _organizes(self, subject: User | None) -> ColumnElement[bool]:
+        """SQL predicate of whether the subject is an organizer of each row's event."""
+        if subject is None or subject.id is None:
+            return false()
+        # Aliased so as not to correlate with registrations selected by the outer query
+        organizer = aliased(EventRegistrationEntity)
+        return exists().where(
+            organizer.event_id == EventEntity.id,
+            organizer.user_id == subject.id,
+            organizer.registration_type == RegistrationType.ORGANIZER,
+        )
+
+    def _permits_for_organization(
+        self, subject: User | None, action: str
+    ) -> ColumnElement[bool]:
+        """SQL predicate of whether the subject may carry out an action on the
+        organization hosting each row's event."""
+        return self._permission.permits(
+            subject,
+            action,
+            literal("organization/", String)
+            + cast(EventEntity.organization_id, String),
+        )
+
+    def _editable_by(self, subject: User | None) -> ColumnElement[bool]:
+        """SQL predicate of whether the subject can edit each event, as in `update`."""
+        return or_(
+            self._organizes(subject),
+            self._permits_for_organization(subject, "organization.events.update"),
+        )
+
+    def _registrations_manageable_by(
+        self, subject: User | None
+    ) -> ColumnElement[bool]:
+        """SQL predicate of whether the subject can manage the registrations of each
+        event, as in `get_registrations_of_event`."""
+        return or_(
+            self._organizes(subject),
+            self._permits_for_organization(
+                subject, "organization.events.manage_registrations"
+            ),
+        )
 
     def create(self, subject: User, event: DraftEvent) -> EventDetails:
         """
@@ -188,9 +357,9 @@ class EventService:
         # Otherwise, create new object
         event_entity = EventEntity.from_draft_model(event)
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         self._session.add(event_entity)
-        self._session.commit()
+        self._session.flush()
 
         # Retrieve the detail model of the event created
         event_details = event_entity.to_details_model()
@@ -203,8 +372,9 @@ class EventService:
                 )
 
         # Return added object
-        # NOTE: Must re-convert the entity to a model again so that the registration
-        # for the event organizer is automatically populated
+        # NOTE: Registrations were added by id rather than through the relationship, so
+        # they must be reloaded for the organizers to be populated
+        self._session.expire(event_entity, ["registrations"])
         return event_entity.to_details_model(subject)
 
     def get_by_id(self, id: int, subject: User | None = None) -> EventDetails:
@@ -231,7 +401,8 @@ class EventService:
             raise ResourceNotFoundException(f"No event found with matching ID: {id}")
 
         # Convert entry to a model and return
-        return entity.to_details_model(subject)
+        grants = self._permission.get_grants(subject)
+        return self._with_capabilities(entity.to_details_model(subject), grants)
 
     def get_events_by_organization(
         self, organization: OrganizationDetails, subject: User | None = None
@@ -254,7 +425,11 @@ class EventService:
         )
 
         # Convert entities to models and return
-        return [event.to_details_model(subject) for event in events]
+        grants = self._permission.get_grants(subject)
+        return [
+            self._with_capabilities(event.to_details_model(subject), grants)
+            for event in events
+        ]
 
     def update(self, subject: User, event: Event) -> EventDetails:
         """
@@ -265,6 +440,9 @@ class EventService:
 
         Returns:
             EventDetails: a valid EventDetails model representing the updated event object
+
+        Raises:
+            VersionConflictException when the event was changed by another request
         """
 
         # Query the event with matching id
@@ -285,6 +463,9 @@ class EventService:
                 f"organization/{event.organization_id}",
             )
 
+        # Changes must be to the version of the event the client read, if sent
+        expect_version(event_entity, event.version, EventEntity.to_details_model)
+
         # Update event object
         event_entity.name = event.name
         event_entity.time = event.time
@@ -292,6 +473,7 @@ class EventService:
         event_entity.location = event.location
         event_entity.public = event.public
         event_entity.registration_limit = event.registration_limit
+        flush_versioned(self._session, event_entity, EventEntity.to_details_model)
 
         # If attempting to edit organizers, enforce registration management permissions
         if event.organizers != event_details.organizers:
@@ -326,8 +508,9 @@ class EventService:
                         RegistrationType.ORGANIZER
                     )
 
-        # Save changes
-        self._session.commit()
+        # Save changes, reloading registrations changed by id
+        self._session.flush()
+        self._session.expire(event_entity, ["registrations"])
 
         # Return updated object
         return event_entity.to_details_model(subject)
@@ -355,11 +538,11 @@ class EventService:
             f"organization/{event.organization_id}",
         )
 
-        # Delete object and commit
+        # Delete object and flush
         self._session.delete(event)
 
         # Save changes
-        self._session.commit()
+        self._session.flush()
 
     """Event Registration Service Methods"""
 
@@ -459,14 +642,14 @@ class EventService:
             f"organization/{event.organization_id}",
         )
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         event_registration_entity = EventRegistrationEntity(
             user_id=user_id,
             event_id=event.id,
             registration_type=RegistrationType.ORGANIZER,
         )
         self._session.add(event_registration_entity)
-        self._session.commit()
+        self._session.flush()
 
         # Return registration
         return event_registration_entity.to_flat_model()
@@ -513,14 +696,14 @@ class EventService:
                 existing_registration
             ).to_flat_model()
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         event_registration_entity = EventRegistrationEntity(
             user_id=attendee.id,
             event_id=event.id,
             registration_type=RegistrationType.ATTENDEE,
         )
         self._session.add(event_registration_entity)
-        self._session.commit()
+        self._session.flush()
 
         # Return registration
         return event_registration_entity.to_flat_model()
@@ -552,14 +735,14 @@ class EventService:
         ):
             return
 
-        # Delete object and commit
+        # Delete object and flush
         self._session.delete(
             self._session.get(
                 EventRegistrationEntity,
                 (event.id, attendee.id),
             )
         )
-        self._session.commit()
+        self._session.flush()
 
     def get_registrations_of_user(
         self, subject: User, user: User, time_range: TimeRange
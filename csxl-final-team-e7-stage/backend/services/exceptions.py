@@ -5,6 +5,8 @@ These custom exceptions can then be handled peoperly
 at the API level.
 """
 
+from pydantic import BaseModel
+
 
 class ResourceNotFoundException(Exception):
     """ResourceNotFoundException is raised when a user attempts to access a resource that does not exist."""
@@ -33,3 +35,31 @@ class DuplicateMemberException(Exception):
         super().__init__(
             f"Member with slug: {slug} and user_id: {user_id} already exists"
         )
+
+
+class IdempotencyKeyReusedException(Exception):
+    """IdempotencyKeyReusedException is raised when an Idempotency-Key is sent with a request other than the one it was first sent with."""
+
+    def __init__(self, key: str):
+        super().__init__(
+            f"Idempotency-Key {key} was already used for a different request"
+        )
+
+
+class IdempotencyKeyInProgressException(Exception):
+    """IdempotencyKeyInProgressException is raised when a request is retried with an Idempotency-Key whose first request has not completed."""
+
+    def __init__(self, key: str):
+        super().__init__(
+            f"The request first sent with Idempotency-Key {key} has not completed"
+        )
+
+
+class VersionConflictException(Exception):
+    """VersionConflictException is raised when a resource was changed by another request since the version being changed was read."""
+
+    def __init__(self, current: BaseModel | None):
+        super().__init__(
+            "The resource was changed by another request. Retry with its current version."
+        )
+        self.current = current
@@ -0,0 +1,112 @@
+"""Replay the first response to requests retried with the same `Idempotency-Key`.
+
+Clients on unreliable connections retry requests that create things, such as drafting
+a reservation or registering for an event, and send the same key with each attempt.
+The first attempt claims the key by inserting its row, in the same transaction as the
+request's own writes, and stores its response in the row before the transaction
+commits. Retries are answered with the stored response rather than being run again.
+
+An attempt made while another with the same key is still running waits on the other's
+uncommitted row. If the other commits, its response is replayed; if it rolls back, as
+it does on any error, the waiting attempt claims the key and runs in its place. Errors
+are therefore never stored, and a failed request can be retried with the same key.
+"""
+
+from datetime import datetime, timedelta
+from fastapi import Depends
+from sqlalchemy import delete, select, update
+from sqlalchemy.dialects.postgresql import insert
+from sqlalchemy.orm import Session
+from ..database import db_session
+from ..entities import IdempotencyKeyEntity
+from ..models import User
+from .exceptions import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# How long a response is replayed for, after which its key may be used again
+IDEMPOTENCY_KEY_TTL = timedelta(hours=24)
+
+
+class IdempotencyService:
+    """Service that claims idempotency keys and stores the responses of their requests."""
+
+    def __init__(self, session: Session = Depends(db_session)):
+        """Initializes the `IdempotencyService` session"""
+        self._session = session
+
+    def claim(self, subject: User, key: str, fingerprint: str) -> bytes | None:
+        """Claim a key for a request, or get the response its first attempt stored.
+
+        Args:
+            subject (User): The user making the request, whose keys are their own.
+            key (str): The request's `Idempotency-Key`.
+            fingerprint (str): A digest of the request, so that a key cannot be reused
+                for another request.
+
+        Returns:
+            bytes | None: The response body to replay, or None if the request claimed the
+                key and should be run, followed by `complete`.
+
+        Raises:
+            IdempotencyKeyReusedException: If the key was claimed by another request.
+            IdempotencyKeyInProgressException: If the claiming request has committed
+                without completing.
+        """
+        now = datetime.now()
+
+        # Expired keys of the user are removed so that they may be claimed again
+        self._session.execute(
+            delete(IdempotencyKeyEntity).where(
+                IdempotencyKeyEntity.user_id == subject.id,
+                IdempotencyKeyEntity.created_at <= now - IDEMPOTENCY_KEY_TTL,
+            )
+        )
+
+        # Blocks while another transaction holds an uncommitted claim of the key
+        claimed = self._session.execute(
+            insert(IdempotencyKeyEntity)
+            .values(
+                user_id=subject.id, key=key, fingerprint=fingerprint, created_at=now
+            )
+            .on_conflict_do_nothing()
+            .returning(IdempotencyKeyEntity.key)
+        ).first()
+        if claimed is not None:
+            return None
+
+        fingerprint_claimed, response = self._session.execute(
+            select(
+                IdempotencyKeyEntity.fingerprint, IdempotencyKeyEntity.response
+            ).where(
+                IdempotencyKeyEntity.user_id == subject.id,
+                IdempotencyKeyEntity.key == key,
+            )
+        ).one()
+        if fingerprint_claimed != fingerprint:
+            raise IdempotencyKeyReusedException(key)
+        if response is None:
+            raise IdempotencyKeyInProgressException(key)
+        return response
+
+    def complete(self, subject: User, key: str, response: bytes) -> None:
+        """Store the response of a request that claimed a key, to replay to its retries.
+
+        Args:
+            subject (User): The user making the request.
+            key (str): The request's `Idempotency-Key`.
+            response (bytes): The JSON body of the response.
+        """
+        self._session.execute(
+            update(IdempotencyKeyEntity)
+            .where(
+                IdempotencyKeyEntity.user_id == subject.id,
+                IdempotencyKeyEntity.key == key,
+            )
+            .values(response=response)
+        )
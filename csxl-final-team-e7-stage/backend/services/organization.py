@@ -2,9 +2,10 @@
 The Organizations Service allows the API to manipulate organizations data in the database.
 """
 
+from typing import Iterator
 from fastapi import Depends
-from sqlalchemy import select
-from sqlalchemy.orm import Session
+from sqlalchemy import ColumnElement, String, exists, false, literal, or_, select
+from sqlalchemy.orm import Session, joinedload, selectinload
 
 from backend.entities.organization_member_entity import OrganizationMemberEntity
 from backend.models.member_role import MemberRole
@@ -14,13 +15,15 @@ from backend.models.permission import Permission
 from backend.models.organization_status import OrganizationStatus
 from backend.services.user import UserService
 
-from ..database import db_session
+from ..database import STREAM_BATCH_SIZE, db_session
 from ..models.organization import Organization
 from ..models.organization_details import OrganizationDetails
 from ..entities.organization_entity import OrganizationEntity
 from backend.models.public_user import PublicUser
 from ..models import User
 from .permission import PermissionService
+from .versioning import expect_version, flush_versioned
+from .response_cache import catalog_responses
 from datetime import date
 from ..models.semester import Semester
 
@@ -64,6 +67,72 @@ class OrganizationService:
         # Convert entries to a model and return
         return [entity.to_model(subject) for entity in entities]
 
+    def stream(self, subject: User | None = None) -> Iterator[Organization]:
+        """
+        Yields all organizations from the table as they are read
+
+        Returns:
+            Iterator[Organization]: Each `Organization`, with its members loaded per batch
+        """
+        query = (
+            select(OrganizationEntity)
+            .options(
+                selectinload(OrganizationEntity.members).joinedload(
+                    OrganizationMemberEntity.user
+                )
+            )
+            .execution_options(yield_per=STREAM_BATCH_SIZE)
+        )
+        for entity in self._session.scalars(query):
+            yield entity.to_model(subject)
+
+    def get_managed_organizations(self, subject: User) -> list[Organization]:
+        """
+        Retrieves the organizations the subject can manage, in one statement
+
+        Returns:
+            list[Organization]: Each `Organization` the subject may update, as an admin or leader
+        """
+        query = (
+            select(OrganizationEntity)
+            .where(self.manageable_by(subject))
+            .order_by(OrganizationEntity.name)
+        )
+        entities = self._session.scalars(query).all()
+        return [entity.to_model(subject) for entity in entities]
+
+    def manageable_by(self, subject: User | None) -> ColumnElement[bool]:
+        """
+        SQL predicate of whether the subject can manage each organization and its members,
+        as `check_orgmember_perms` decides for one: by permission to update it, or as its leader.
+
+        Parameters:
+            subject: the User in question, if any
+
+        Returns:
+            ColumnElement[bool]: The predicate, over `OrganizationEntity`, for a `where` clause
+        """
+        return or_(
+            self._permission.permits(
+                subject,
+                "organization.update",
+                literal("organization/", String) + OrganizationEntity.slug,
+            ),
+            self._leads(subject, OrganizationEntity.id),
+        )
+
+    def _leads(
+        self, subject: User | None, organization_id: ColumnElement[int]
+    ) -> ColumnElement[bool]:
+        """SQL predicate of whether the subject is a leader of each row's organization."""
+        if subject is None or subject.id is None:
+            return false()
+        return exists().where(
+            OrganizationMemberEntity.organization_id == organization_id,
+            OrganizationMemberEntity.user_id == subject.id,
+            OrganizationMemberEntity.role == MemberRole.LEADER,
+        )
+
     def create(self, subject: User, organization: Organization) -> Organization:
         """
         Creates a organization based on the input object and adds it to the table.
@@ -89,9 +158,10 @@ class OrganizationService:
         # Otherwise, create new object
         organization_entity = OrganizationEntity.from_model(organization)
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         self._session.add(organization_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("organization", session=self._session)
 
         # Return added object
         return organization_entity.to_model(subject)
@@ -156,7 +226,8 @@ class OrganizationService:
         elif organization.status == OrganizationStatus.APPLICATION_BASED.value:
             organization_member_entity.role = MemberRole.PENDING
         self._session.add(organization_member_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("organization", session=self._session)
 
         return organization_member_entity.to_flat_model()
 
@@ -190,7 +261,8 @@ class OrganizationService:
         existing_member.title = member.title
         existing_member.role = member.role
 
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("organization", session=self._session)
 
         return existing_member.to_model()
 
@@ -222,7 +294,8 @@ class OrganizationService:
             self._session.get(OrganizationMemberEntity, (organization.id, user.id))
         )
 
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("organization", session=self._session)
 
     def get_members(
         self, subject: User, organization: OrganizationDetails, pending: bool
@@ -303,16 +376,17 @@ class OrganizationService:
         """
         Checks if the user has perms to update the org members
         """
-        if (
-            self._permission.check(
-                user, "organization.update", f"organization/{organization.slug}"
+        query = select(
+            or_(
+                self._permission.permits(
+                    user,
+                    "organization.update",
+                    literal(f"organization/{organization.slug}", String),
+                ),
+                self._leads(user, literal(organization.id)),
             )
-            is True
-        ):
-            return True
-
-        member = self.get_member(user, user, organization) # type: ignore
-        return member is not None and member.role is MemberRole.LEADER
+        )
+        return self._session.scalar(query) is True
 
     def enforce_orgmember_perms(self, user: User, organization: Organization):
         """
@@ -337,6 +411,7 @@ class OrganizationService:
 
         Raises:
             ResourceNotFoundException: If no organization is found with the corresponding ID
+            VersionConflictException: If the organization was changed by another request
         """
 
         # Check if user has admin permissions
@@ -351,6 +426,9 @@ class OrganizationService:
                 f"No organization found with matching ID: {organization.id}"
             )
 
+        # Changes must be to the version of the organization the client read, if sent
+        expect_version(obj, organization.version, OrganizationEntity.to_model)
+
         # Update organization object
         obj.name = organization.name
         obj.shorthand = organization.shorthand
@@ -369,8 +447,9 @@ class OrganizationService:
         obj.status = OrganizationStatus(organization.status)
         obj.application_link = organization.application_link
 
-        # Save changes
-        self._session.commit()
+        # Save changes, unless another request changed the organization first
+        flush_versioned(self._session, obj, OrganizationEntity.to_model)
+        catalog_responses().invalidate("organization", session=self._session)
 
         # Return updated object
         return obj.to_model(subject)
@@ -403,10 +482,11 @@ class OrganizationService:
                 f"No organization found with matching slug: {slug}"
             )
 
-        # Delete object and commit
+        # Delete object and flush
         self._session.delete(obj)
         # Save changes
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("organization", session=self._session)
     
     def _get_current_semeseter(self):
         current_month = date.today().month
@@ -3,23 +3,62 @@ Permission Service grants, revokes, tests, and enforces permissions for users an
 
 This Service is more of an internal service that other services take dependency on. It is not directly
 exposed via the API.
+
+Checks read the effective_permission table, which holds every permission a user holds directly or
+through their roles, rather than joining user and role grants on each check. Many checks for the same
+user are answered by their `Grants`, loaded with a single query, and listings of rows a user may act on
+are filtered in SQL with the predicates of `permits`.
 """
 
 import re
+from typing import Iterable, Sequence
 from fastapi import Depends
 from functools import lru_cache
-from sqlalchemy import select
+from sqlalchemy import ColumnElement, String, exists, false, literal, select
 from sqlalchemy.orm import Session
 from ..database import db_session
 from ..models import User, Permission, Role, RoleDetails
-from ..entities import UserEntity, PermissionEntity, RoleEntity
+from ..entities import (
+    UserEntity,
+    PermissionEntity,
+    RoleEntity,
+    EffectivePermissionEntity,
+)
 from ..services.exceptions import UserPermissionException
+from . import effective_permission
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
 __license__ = "MIT"
 
 
+class Grants:
+    """The permissions a user holds, loaded once to answer any number of checks in memory.
+
+    Services annotating each item of a listing with what the subject may do with it, such
+    as whether they can edit it, check the subject's grants rather than querying per item.
+    """
+
+    __slots__ = ("_patterns",)
+
+    def __init__(self, permissions: Iterable[tuple[str, str]] = ()):
+        """
+        Args:
+            permissions (Iterable[tuple[str, str]]): The action and resource patterns held.
+        """
+        self._patterns = [
+            (_compile_pattern(action), _compile_pattern(resource))
+            for action, resource in permissions
+        ]
+
+    def check(self, action: str, resource: str) -> bool:
+        """Whether the permissions allow carrying out an action on a resource."""
+        for action_re, resource_re in self._patterns:
+            if action_re.fullmatch(action) and resource_re.fullmatch(resource):
+                return True
+        return False
+
+
 class PermissionService:
     """PermissionService grants, revokes, tests, and enforces permissions for users and roles in the system."""
 
@@ -39,11 +78,19 @@ class PermissionService:
             subject (User): The user to get permissions for.
 
         Returns:
-            list[Permission]: The permissions for the user."""
-        user_permissions = self._get_user_permissions(subject)
-        roles_permissions = self._get_user_roles_permissions(subject)
-        permissions = user_permissions + roles_permissions
-        return [permission.to_model() for permission in permissions]
+            list[Permission]: The permissions for the user, direct grants first."""
+        query = (
+            select(PermissionEntity)
+            .join(
+                EffectivePermissionEntity,
+                EffectivePermissionEntity.permission_id == PermissionEntity.id,
+            )
+            .where(EffectivePermissionEntity.user_id == subject.id)
+            .order_by(
+                EffectivePermissionEntity.role_id.is_not(None), PermissionEntity.id
+            )
+        )
+        return [permission.to_model() for permission in self._session.scalars(query)]
 
     def grant(
         self, grantor: User, grantee: User | Role | RoleDetails, permission: Permission
@@ -82,7 +129,8 @@ class PermissionService:
             raise ValueError("grantee must be User or Role")
 
         self._session.add(permission_entity)
-        self._session.commit()
+        self._session.flush()
+        effective_permission.add_grant(self._session, permission_entity)
         return True
 
     def revoke(self, revoker: User, permission: Permission) -> bool:
@@ -108,8 +156,9 @@ class PermissionService:
         self.enforce(revoker, "permission.revoke", f"permission/{permission_entity.id}")
         self.enforce(revoker, permission_entity.action, permission_entity.resource)
 
+        effective_permission.remove_grant(self._session, permission_entity.id)
         self._session.delete(permission_entity)
-        self._session.commit()
+        self._session.flush()
         return True
 
     def enforce(self, subject: User, action: str, resource: str) -> None:
@@ -138,96 +187,131 @@ class PermissionService:
         Returns:
             bool: True if the user has permission to carry out the action on the resource, False otherwise.
         """
-        # Check user permissions
-        user_perms = self._get_user_permissions(subject)
-        if self._has_permission(user_perms, action, resource):
-            return True
+        if subject.id is None:
+            return False
+        query = (
+            select(literal(True))
+            .where(
+                EffectivePermissionEntity.user_id == subject.id,
+                *self._matches(action, resource),
+            )
+            .limit(1)
+        )
+        return self._session.scalar(query) is not None
 
-        # Check role permissions
-        role_permissions = self._get_user_roles_permissions(subject)
-        return self._has_permission(role_permissions, action, resource)
-
-    def _get_user_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user.
+    def get_grants(self, subject: User | None) -> Grants:
+        """Load all of the permissions a user holds, directly or through their roles.
 
         Args:
-            subject (User): The user to get permissions for.
+            subject (User | None): The user to load permissions for, if any.
 
         Returns:
-            list[PermissionEntity]: The permissions for the user."""
-        user_query = select(PermissionEntity).where(
-            PermissionEntity.user_id == subject.id
+            Grants: The user's permissions, for checking many actions and resources."""
+        if subject is None or subject.id is None:
+            return Grants()
+        query = (
+            select(PermissionEntity.action, PermissionEntity.resource)
+            .join(
+                EffectivePermissionEntity,
+                EffectivePermissionEntity.permission_id == PermissionEntity.id,
+            )
+            .where(EffectivePermissionEntity.user_id == subject.id)
         )
-        user_perms = [p for p in self._session.execute(user_query).scalars()]
-        return user_perms
+        return Grants(self._session.execute(query).tuples())
 
-    def _get_user_roles_permissions(self, subject: User) -> list[PermissionEntity]:
-        """Get the permissions for a user's roles.
+    def check_many(
+        self, subject: User, checks: Sequence[tuple[str, str]]
+    ) -> list[bool]:
+        """Check if a user has permission to carry out each of many actions on resources.
+
+        The user's permissions are loaded once, rather than once per check.
 
         Args:
-            subject (User): The user to get permissions for.
+            subject (User): The user to check permissions for.
+            checks (Sequence[tuple[str, str]]): The (action, resource) pairs to check.
 
         Returns:
-            list[PermissionEntity]: The permissions for the user's roles."""
-        user_entity = self._session.get(UserEntity, subject.id)
-        if user_entity == None:
-            return []
-        role_ids = [role.id for role in user_entity.roles]
-        if len(role_ids) == 0:
-            return []
-        role_query = select(PermissionEntity).where(
-            PermissionEntity.role_id.in_(role_ids)
-        )
-        return [p for p in self._session.execute(role_query).scalars()]
+            list[bool]: Whether the user has each permission, in the order of the checks.
+        """
+        grants = self.get_grants(subject)
+        return [grants.check(action, resource) for action, resource in checks]
 
-    def _has_permission(
-        self, permissions: list[PermissionEntity], action: str, resource: str
-    ) -> bool:
-        """Check if a user has permission to carry out an action on a resource in a list of permissions.
+    def permits(
+        self, subject: User | None, action: str, resource: ColumnElement[str]
+    ) -> ColumnElement[bool]:
+        """A SQL predicate of whether a user may carry out an action on each row's resource.
+
+        Listings of the rows a user may act on filter by the predicate in one statement,
+        rather than checking each row's resource in turn.
 
         Args:
-            permissions (list[PermissionEntity]): The permissions to check.
+            subject (User | None): The user to check permissions for, if any.
             action (str): The action in question.
-            resource (str): The resource in question.
+            resource (ColumnElement[str]): An expression of each row's resource, such as
+                `literal("organization/") + OrganizationEntity.slug`.
 
         Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
-        """
-        for permission in permissions:
-            if self._check_permission(permission, action, resource):
-                return True
-        return False
+            ColumnElement[bool]: The predicate, for use in a `where` clause."""
+        if subject is None or subject.id is None:
+            return false()
+        return exists().where(
+            EffectivePermissionEntity.user_id == subject.id,
+            EffectivePermissionEntity.action_prefix.in_(_prefixes(action)),
+            literal(action, String).like(
+                EffectivePermissionEntity.action_like, escape="\\"
+            ),
+            resource.like(EffectivePermissionEntity.resource_like, escape="\\"),
+        )
 
-    def _check_permission(
-        self, permission: PermissionEntity, action: str, resource: str
-    ) -> bool:
-        """Check if a user has permission to carry out an action on a resource.
+    def get_user_ids_with_permission(self, action: str, resource: str) -> list[int]:
+        """Get the ids of the users with permission to carry out an action on a resource.
 
         Args:
-            permission (PermissionEntity): The permission to check.
             action (str): The action in question.
             resource (str): The resource in question.
 
         Returns:
-            bool: True if the user has permission to carry out the action on the resource, False otherwise.
+            list[int]: The ids of the users, directly or through their roles, in order.
         """
-        action_re = self._expand_pattern(permission.action)
-        if action_re.fullmatch(action) is not None:
-            resource_re = self._expand_pattern(permission.resource)
-            return resource_re.fullmatch(resource) is not None
-        else:
-            return False
+        query = (
+            select(EffectivePermissionEntity.user_id)
+            .where(*self._matches(action, resource))
+            .distinct()
+            .order_by(EffectivePermissionEntity.user_id)
+        )
+        return list(self._session.scalars(query))
 
-    @lru_cache()
-    def _expand_pattern(self, pattern: str) -> re.Pattern:
-        """Expand a permission pattern into a regular expression.
+    def _matches(self, action: str, resource: str) -> list:
+        """Criteria for effective permissions whose patterns match an action and resource.
 
-        This function is memoized to avoid recompiling the same regular expression multiple times.
+        A pattern can only match when its wildcard-free prefix is a prefix of the value,
+        so the indexed prefixes narrow the rows before the patterns are matched.
 
         Args:
-            pattern (str): The pattern to expand.
+            action (str): The action in question.
+            resource (str): The resource in question.
 
         Returns:
-            re.Pattern: The compiled regular expression."""
-        search = pattern.replace("*", ".*")
-        return re.compile(f"^{search}$")
+            list: The criteria, for use in a `where` clause."""
+        return [
+            EffectivePermissionEntity.action_prefix.in_(_prefixes(action)),
+            EffectivePermissionEntity.resource_prefix.in_(_prefixes(resource)),
+            literal(action, String).like(
+                EffectivePermissionEntity.action_like, escape="\\"
+            ),
+            literal(resource, String).like(
+                EffectivePermissionEntity.resource_like, escape="\\"
+            ),
+        ]
+
+
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern: str) -> re.Pattern:
+    """Compile a permission pattern, in which only `*` is a wildcard, to a regular expression."""
+    search = re.escape(pattern).replace(r"\*", ".*")
+    return re.compile(f"^{search}$")
+
+
+def _prefixes(value: str) -> list[str]:
+    """Every prefix of a value, from the empty string to the value itself."""
+    return [value[:length] for length in range(len(value) + 1)]
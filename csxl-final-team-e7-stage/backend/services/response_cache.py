@@ -0,0 +1,112 @@
+"""Process-wide cache of serialized catalog responses.
+
+Listings of terms, courses, rooms, and organizations are the same for every client and
+change rarely, so their JSON bodies are encoded and compressed once and then served as
+bytes until the data changes. Each resource has a version which the services that write
+it bump, through `invalidate`, when they flush a change and again once it commits.
+
+A body is only stored if its resource's version did not change while it was loaded, so
+a request that read the data before a write committed cannot cache what it read. When
+reads are served by a replica, bodies are not stored until the replica has had time to
+replicate the write, and entries otherwise expire after `RESPONSE_CACHE_TTL` so that
+writes made by other processes are eventually observed.
+"""
+
+import gzip
+from datetime import datetime, timedelta
+from threading import Lock
+from sqlalchemy.orm import Session
+from .. import database
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+RESPONSE_CACHE_TTL = timedelta(minutes=1)
+
+# Bodies that fit in a single packet are not worth compressing
+MINIMUM_GZIP_SIZE = 1400
+
+
+class CachedResponse:
+    """The JSON body of a response, and its gzip encoding when large enough to use."""
+
+    __slots__ = ("body", "gzipped", "expires_at")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.gzipped = (
+            gzip.compress(body, compresslevel=9)
+            if len(body) >= MINIMUM_GZIP_SIZE
+            else None
+        )
+        self.expires_at = datetime.now() + RESPONSE_CACHE_TTL
+
+
+class ResponseCache:
+    """A thread-safe map of resource name to its cached response body."""
+
+    def __init__(self):
+        self._responses: dict[str, CachedResponse] = {}
+        self._versions: dict[str, int] = {}
+        self._unsettled_until: dict[str, datetime] = {}
+        self._lock = Lock()
+
+    def version(self, resource: str) -> int:
+        """The current version of a resource, to be passed to `put` after loading it."""
+        with self._lock:
+            return self._versions.get(resource, 0)
+
+    def get(self, resource: str) -> CachedResponse | None:
+        """The cached response of the resource, if still fresh."""
+        with self._lock:
+            response = self._responses.get(resource)
+            if response is None:
+                return None
+            if response.expires_at <= datetime.now():
+                del self._responses[resource]
+                return None
+            return response
+
+    def put(self, resource: str, version: int, body: bytes) -> CachedResponse:
+        """Cache the body of a resource loaded at the given version.
+
+        The body is not stored if the resource has changed since that version was read.
+
+        Returns:
+            CachedResponse: The response of the body, whether or not it was stored.
+        """
+        response = CachedResponse(body)
+        with self._lock:
+            if version == self._versions.get(resource, 0) and (
+                self._unsettled_until.get(resource, datetime.min) <= datetime.now()
+            ):
+                self._responses[resource] = response
+        return response
+
+    def invalidate(self, *resources: str, session: Session | None = None) -> None:
+        """Drop the responses of the resources and bump their versions.
+
+        When given the session that wrote the change, they are invalidated again once it
+        commits."""
+        if session is not None:
+            database.after_commit(session, lambda: self.invalidate(*resources))
+        unsettled_until = datetime.now()
+        if database.read_engine is not database.engine:
+            unsettled_until += timedelta(seconds=database.READ_YOUR_WRITES_SECONDS)
+        with self._lock:
+            for resource in resources:
+                self._responses.pop(resource, None)
+                self._versions[resource] = self._versions.get(resource, 0) + 1
+                self._unsettled_until[resource] = unsettled_until
+
+    def __len__(self) -> int:
+        return len(self._responses)
+
+
+_cache = ResponseCache()
+
+
+def catalog_responses() -> ResponseCache:
+    """The catalog response cache shared by this process."""
+    return _cache
@@ -5,10 +5,12 @@ Role Service is primarily for the administration of roles and their members and
 from fastapi import Depends
 from sqlalchemy import select
 from sqlalchemy.orm import Session
-from ..database import db_session
+from ..database import checkpoint, db_session
 from ..models import User, Role, RoleDetails, Permission
 from ..entities import RoleEntity, PermissionEntity, UserEntity
 from .permission import PermissionService
+from . import effective_permission
+from .coworking.policy import current_policies, load_policies
 
 
 class RoleService:
@@ -55,7 +57,7 @@ class RoleService:
         self._permission.enforce(subject, "role.create", "role/")
         role_entity = RoleEntity(name=name)
         self._session.add(role_entity)
-        self._session.commit()
+        self._session.flush()
         return role_entity.to_model()
 
     def details(self, subject: User, id: int) -> RoleDetails:
@@ -119,7 +121,12 @@ class RoleService:
         user = self._session.get(UserEntity, member.id)
         if user:
             role.users.append(user)
-            self._session.commit()
+            self._session.flush()
+            effective_permission.add_role_member(self._session, id, user.id)
+            if current_policies().has_group(id):
+                # Reloaded group policies are shared by all requests, so commit first.
+                checkpoint(self._session)
+                load_policies(self._session)
         return self.details(subject, id)
 
     def is_member(self, subject: User, id: int, userId: int) -> bool:
@@ -151,5 +158,10 @@ class RoleService:
         role = self._session.get(RoleEntity, id)
         user = self._session.get(UserEntity, userId)
         role.users.remove(user)
-        self._session.commit()
+        self._session.flush()
+        effective_permission.remove_role_member(self._session, id, user.id)
+        if current_policies().has_group(id):
+            # Reloaded group policies are shared by all requests, so commit first.
+            checkpoint(self._session)
+            load_policies(self._session)
         return True
@@ -12,6 +12,8 @@ from ..models import RoomDetails
 from ..models.user import User
 from ..entities import RoomEntity
 from .permission import PermissionService
+from .coworking.room_grid import room_grids
+from .response_cache import catalog_responses
 
 from ..services.exceptions import ResourceNotFoundException
 from datetime import datetime
@@ -82,9 +84,11 @@ class RoomService:
         # Create new object
         room_entity = RoomEntity.from_model(room)
 
-        # Add new object to table and commit changes
+        # Add new object to table and flush changes
         self._session.add(room_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("room", "term", "course", session=self._session)
+        room_grids().clear(self._session)
 
         # Return added object
         return room_entity.to_details_model()
@@ -117,8 +121,10 @@ class RoomService:
         room_entity.capacity = room.capacity
         room_entity.reservable = room.reservable
 
-        # Commit changes
-        self._session.commit()
+        # Flush changes
+        self._session.flush()
+        catalog_responses().invalidate("room", "term", "course", session=self._session)
+        room_grids().clear(self._session)
 
         # Return edited object
         return room_entity.to_details_model()
@@ -141,6 +147,8 @@ class RoomService:
         if room_entity is None:
             raise ResourceNotFoundException(f"Room with id: {id} does not exist.")
 
-        # Delete and commit changes
+        # Delete and flush changes
         self._session.delete(room_entity)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("room", "term", "course", session=self._session)
+        room_grids().clear(self._session)
@@ -8,9 +8,11 @@ from sqlalchemy import select, or_, func, cast, String
 from sqlalchemy.orm import Session
 from ..database import db_session
 from ..models import User, UserDetails, Paginated, PaginationParams
+from ..models.trusted import construct
 from ..entities import UserEntity
 from .exceptions import ResourceNotFoundException
 from .permission import PermissionService
+from .response_cache import catalog_responses
 
 __authors__ = ["Kris Jordan"]
 __copyright__ = "Copyright 2023"
@@ -31,7 +33,7 @@ class UserService:
         self._permission = permission
 
     def get(self, pid: int) -> UserDetails | None:
-        """Get a User by PID.
+        """Get a User by PID, along with the permissions they hold.
 
         Args:
             pid: The PID of the user.
@@ -39,16 +41,28 @@ class UserService:
         Returns:
             UserDetails | None: The user or None if not found.
         """
+        user = self.get_identity(pid)
+        if user is None:
+            return None
+        return construct(
+            UserDetails, **dict(user), permissions=self._permission.get_permissions(user)
+        )
+
+    def get_identity(self, pid: int) -> User | None:
+        """Get a User by PID, without their permissions.
+
+        This is a single lookup of the indexed `pid` column, which is all that resolving
+        the user making a request needs. Loading permissions is left to `get`.
+
+        Args:
+            pid: The PID of the user.
+
+        Returns:
+            User | None: The user or None if not found.
+        """
         query = select(UserEntity).where(UserEntity.pid == pid)
         user_entity: UserEntity | None = self._session.scalar(query)
-        if user_entity is None:
-            return None
-        else:
-            user = user_entity.to_model()
-            user_fields = user.model_dump()
-            user_fields["permissions"] = self._permission.get_permissions(user)
-            user_details = UserDetails(**user_fields)
-            return user_details
+        return None if user_entity is None else user_entity.to_model()
 
     def get_by_id(self, id: int) -> User:
         """Get a User by their id.
@@ -159,7 +173,7 @@ class UserService:
             self._permission.enforce(subject, "user.create", "user/")
         entity = UserEntity.from_model(user)
         self._session.add(entity)
-        self._session.commit()
+        self._session.flush()
         return entity.to_model()
 
     def update(self, subject: User, user: User) -> User:
@@ -181,5 +195,6 @@ class UserService:
             self._permission.enforce(subject, "user.update", f"user/{user.id}")
         entity = self._session.get(UserEntity, user.id)
         entity.update(user)
-        self._session.commit()
+        self._session.flush()
+        catalog_responses().invalidate("term", "course", session=self._session)
         return entity.to_model()
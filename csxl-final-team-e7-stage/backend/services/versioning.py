@@ -0,0 +1,67 @@
+"""Optimistic concurrency control of entities with a `version` column.
+
+Reservations, events, and organizations are mapped with a `version_id_col`, so each
+UPDATE of one is conditional on the version it was read at, and increments it. When
+two requests change the same row, the second's update matches no row and fails, rather
+than overwriting the first's change, without either holding a lock while it runs.
+Clients may also send the version they last read, which is compared before any change.
+
+Either way, a `VersionConflictException` carrying the current state of the entity is
+raised, which the API answers with 409 Conflict so the client can retry from it."""
+
+from typing import Callable, TypeVar
+from pydantic import BaseModel
+from sqlalchemy import inspect
+from sqlalchemy.orm import Session
+from sqlalchemy.orm.exc import StaleDataError
+from ..entities import EntityBase
+from .exceptions import VersionConflictException
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+E = TypeVar("E", bound=EntityBase)
+
+
+def expect_version(
+    entity: E, version: int | None, to_model: Callable[[E], BaseModel]
+) -> None:
+    """Ensure the version of an entity a client read, if it sent one, is current.
+
+    Args:
+        entity (E): The entity, as loaded.
+        version (int | None): The version the client read, or None if not sent.
+        to_model (Callable[[E], BaseModel]): Converts the entity to its current state.
+
+    Raises:
+        VersionConflictException: If the entity has changed since the client read it.
+    """
+    if version is not None and version != entity.version:  # type: ignore[attr-defined]
+        raise VersionConflictException(to_model(entity))
+
+
+def flush_versioned(
+    session: Session, entity: E, to_model: Callable[[E], BaseModel]
+) -> None:
+    """Flush changes to a versioned entity, failing if another request changed it first.
+
+    Args:
+        session (Session): The session the entity was loaded by.
+        entity (E): The changed entity.
+        to_model (Callable[[E], BaseModel]): Converts the entity to its current state.
+
+    Raises:
+        VersionConflictException: If the entity was changed since it was loaded. Its
+            current state is read on a session of its own, since the request's
+            transaction, which the unit of work owns, is rolled back as a whole.
+    """
+    identity = inspect(entity).identity
+    try:
+        session.flush()
+    except StaleDataError:
+        with Session(session.get_bind()) as current_session:
+            current = current_session.get(type(entity), identity)
+            raise VersionConflictException(
+                None if current is None else to_model(current)
+            )
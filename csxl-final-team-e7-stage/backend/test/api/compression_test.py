@@ -0,0 +1,190 @@
+"""Tests for the route-aware response compression middleware."""
+
+import brotli
+import pytest
+import threading
+import zlib
+import zstandard
+from unittest.mock import create_autospec
+from fastapi import FastAPI, Response
+from fastapi.responses import StreamingResponse
+from fastapi.testclient import TestClient
+from ...api import compression as compression_module
+from ...api import metrics
+from ...api.authentication import registered_user
+from ...api.compression import (
+    ENCODERS,
+    MINIMUM_SIZE,
+    NO_COMPRESSION,
+    STREAM_ENCODERS,
+    CompressionMiddleware,
+    CompressionPolicy,
+    compression,
+)
+from ...services.permission import PermissionService
+from ..services.user_data import root
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+ITEMS = [{"id": i, "name": f"Item {i}", "description": "A" * 40} for i in range(100)]
+
+
+@pytest.fixture()
+def client():
+    """An app with routes of each kind of response the policy distinguishes, whose
+    metrics are scraped as root."""
+    metrics.reset_metrics()
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    app.add_middleware(metrics.RequestMetricsMiddleware)
+    app.include_router(metrics.api)
+    app.dependency_overrides[registered_user] = lambda: root
+    app.dependency_overrides[PermissionService] = lambda: create_autospec(
+        PermissionService
+    )
+
+    @app.get("/items")
+    def get_items() -> list[dict]:
+        return ITEMS
+
+    @app.get("/items/{id}")
+    def get_item(id: int) -> dict:
+        return ITEMS[id]
+
+    @app.get("/image")
+    def get_image() -> Response:
+        return Response(bytes(5000), media_type="image/png")
+
+    @app.get("/stream")
+    def get_stream() -> StreamingResponse:
+        lines = (f"{item}\n".encode() for item in ITEMS)
+        return StreamingResponse(lines, media_type="text/plain")
+
+    @app.get("/uncompressed")
+    @compression(NO_COMPRESSION)
+    def get_uncompressed() -> list[dict]:
+        return ITEMS
+
+    @app.get("/small")
+    @compression(CompressionPolicy(minimum_size=50))
+    def get_small() -> dict:
+        return ITEMS[0]
+
+    yield TestClient(app)
+    metrics.reset_metrics()
+
+
+def _get(client: TestClient, path: str, accept_encoding: str = "gzip, br, zstd"):
+    return client.get(path, headers={"Accept-Encoding": accept_encoding})
+
+
+def test_preferred_encoding_is_used(client: TestClient):
+    for accept_encoding, encoding in [
+        ("gzip, deflate, br, zstd", "zstd"),
+        ("gzip, br", "br"),
+        ("gzip", "gzip"),
+        ("gzip, zstd;q=0", "gzip"),
+    ]:
+        response = _get(client, "/items", accept_encoding)
+        assert response.headers["Content-Encoding"] == encoding
+        assert response.headers["Vary"] == "Accept-Encoding"
+        assert response.json() == ITEMS
+
+
+def test_clients_not_accepting_encodings_are_sent_identity(client: TestClient):
+    response = _get(client, "/items", "identity")
+    assert "Content-Encoding" not in response.headers
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.json() == ITEMS
+
+
+def test_small_bodies_are_not_compressed(client: TestClient):
+    assert "Content-Encoding" not in _get(client, "/items/1").headers
+
+
+def test_excluded_types_are_not_compressed(client: TestClient):
+    response = _get(client, "/image")
+    assert "Content-Encoding" not in response.headers
+    assert "Vary" not in response.headers
+
+
+def test_streamed_responses_are_compressed_as_they_stream(client: TestClient):
+    for encoding in ["zstd", "br", "gzip", "identity"]:
+        response = _get(client, "/stream", encoding)
+        assert response.headers.get("Content-Encoding", "identity") == encoding
+        assert "Content-Length" not in response.headers
+        assert response.text == "".join(f"{item}\n" for item in ITEMS)
+
+
+@pytest.mark.parametrize(
+    "encoding, decompress",
+    [
+        ("zstd", zstandard.ZstdDecompressor().decompressobj().decompress),
+        ("br", brotli.Decompressor().process),
+        ("gzip", zlib.decompressobj(wbits=31).decompress),
+    ],
+)
+def test_each_streamed_chunk_can_be_decoded_on_arrival(encoding, decompress):
+    compress, finish = STREAM_ENCODERS[encoding](3)
+    for item in ITEMS[:3]:
+        chunk = f"{item}\n".encode()
+        assert decompress(compress(chunk)) == chunk
+    assert decompress(finish()) == b""
+
+
+@pytest.mark.parametrize("offload_size, offloaded", [(1024, True), (10**9, False)])
+def test_large_bodies_are_compressed_off_the_event_loop(
+    monkeypatch: pytest.MonkeyPatch, offload_size: int, offloaded: bool
+):
+    threads: dict[str, int] = {}
+    encode = ENCODERS["zstd"]
+
+    def spy(body: bytes, level: int) -> bytes:
+        threads["compress"] = threading.get_ident()
+        return encode(body, level)
+
+    monkeypatch.setitem(ENCODERS, "zstd", spy)
+    monkeypatch.setattr(compression_module, "OFFLOAD_SIZE", offload_size)
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/items")
+    async def get_items() -> list[dict]:
+        threads["loop"] = threading.get_ident()
+        return ITEMS
+
+    response = _get(TestClient(app), "/items", "zstd")
+    assert response.json() == ITEMS
+    assert (threads["compress"] != threads["loop"]) == offloaded
+
+
+def test_route_policies(client: TestClient):
+    assert "Content-Encoding" not in _get(client, "/uncompressed").headers
+    assert _get(client, "/small").headers["Content-Encoding"] == "zstd"
+
+
+def test_metrics_are_not_compressed(client: TestClient):
+    for id in range(20):
+        metrics.observe("GET", f"/items/{id}", 200, 0.01, metrics.RequestStats())
+    response = _get(client, "/api/metrics")
+    assert len(response.content) > MINIMUM_SIZE
+    assert "Content-Encoding" not in response.headers
+
+
+def test_bytes_saved_and_cpu_time_are_reported(client: TestClient):
+    response = _get(client, "/items")
+    bytes_saved = len(response.content) - int(response.headers["Content-Length"])
+    _get(client, "/items/1")
+    samples = dict(
+        line.rsplit(" ", 1)
+        for line in client.get("/api/metrics").text.splitlines()
+        if not line.startswith("#")
+    )
+    labels = 'method="GET",route="/items",status="200"'
+    saved = samples[f"http_response_compression_bytes_saved_total{{{labels}}}"]
+    assert int(saved) == bytes_saved
+    assert float(samples[f"http_response_compression_seconds_total{{{labels}}}"]) > 0
+    labels = 'method="GET",route="/items/{id}",status="200"'
+    assert samples[f"http_response_compression_bytes_saved_total{{{labels}}}"] == "0"
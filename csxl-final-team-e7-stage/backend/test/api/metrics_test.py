@@ -0,0 +1,125 @@
+"""Tests for the request and database instrumentation middleware."""
+
+import logging
+import pytest
+from unittest.mock import create_autospec
+from fastapi import FastAPI, Request
+from fastapi.responses import JSONResponse
+from fastapi.testclient import TestClient
+from sqlalchemy import create_engine, text
+from ...api import metrics
+from ...api.authentication import registered_user
+from ...services.exceptions import UserPermissionException
+from ...services.permission import PermissionService
+from ..services.user_data import root
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def permission_svc():
+    """A permission service granting whatever is checked, unless told otherwise."""
+    return create_autospec(PermissionService)
+
+
+@pytest.fixture()
+def client(monkeypatch: pytest.MonkeyPatch, permission_svc: PermissionService):
+    """An app whose single route executes two SQL statements, scraped as root."""
+    monkeypatch.setenv("SLOW_REQUEST_QUERIES", "2")
+    metrics.reset_metrics()
+    engine = create_engine("sqlite://")
+
+    app = FastAPI()
+    app.add_middleware(metrics.RequestMetricsMiddleware)
+    app.include_router(metrics.api)
+    app.dependency_overrides[registered_user] = lambda: root
+    app.dependency_overrides[PermissionService] = lambda: permission_svc
+
+    @app.exception_handler(UserPermissionException)
+    def permission_exception_handler(request: Request, e: UserPermissionException):
+        return JSONResponse(status_code=403, content={"message": str(e)})
+
+    @app.get("/items/{id}")
+    def get_item(id: int) -> int:
+        with engine.connect() as connection:
+            connection.execute(text("SELECT 1"))
+            return connection.execute(text("SELECT :id"), {"id": id}).scalar_one()
+
+    @app.post("/items")
+    def create_item() -> int:
+        with engine.begin() as connection:
+            return connection.execute(text("SELECT 1")).scalar_one()
+
+    yield TestClient(app)
+    metrics.reset_metrics()
+
+
+def test_server_timing_header(client: TestClient):
+    response = client.get("/items/7")
+    assert response.json() == 7
+    assert 'desc="2 queries"' in response.headers["server-timing"]
+    assert response.headers["server-timing"].startswith("app;dur=")
+
+
+def test_metrics_aggregate_by_route(client: TestClient):
+    client.get("/items/1")
+    client.get("/items/2")
+    body = client.get("/api/metrics").text
+    labels = 'method="GET",route="/items/{id}",status="200"'
+    assert f"http_requests_total{{{labels}}} 2" in body
+    assert f"http_request_db_queries_total{{{labels}}} 4" in body
+
+
+def test_metrics_require_permission(
+    client: TestClient, permission_svc: PermissionService
+):
+    client.get("/api/metrics")
+    permission_svc.enforce.assert_called_with(root, "metrics.read", "metrics")  # type: ignore
+    permission_svc.enforce.side_effect = UserPermissionException(  # type: ignore
+        "metrics.read", "metrics"
+    )
+    assert client.get("/api/metrics").status_code == 403
+
+
+def test_metrics_require_authentication(client: TestClient):
+    del client.app.dependency_overrides[registered_user]  # type: ignore
+    assert client.get("/api/metrics").status_code == 403
+
+
+def test_metric_families_are_contiguous(client: TestClient):
+    """Each family's samples follow its own `# TYPE` line, before the next family's."""
+    client.get("/items/1")
+    client.post("/items")
+    families = []
+    for line in client.get("/api/metrics").text.splitlines():
+        if line.startswith("# TYPE "):
+            families.append(line.split()[2])
+        elif not line.startswith("#"):
+            name = line.split("{")[0]
+            suffixes = ("_bucket", "_sum", "_count")
+            assert name == families[-1] or name.removeprefix(families[-1]) in suffixes
+    assert len(families) == len(set(families)) == len(metrics.FAMILIES)
+
+
+def test_metrics_count_commits(client: TestClient):
+    client.post("/items")
+    body = client.get("/api/metrics").text
+    labels = 'method="POST",route="/items",status="200"'
+    assert f"http_request_db_commits_total{{{labels}}} 1" in body
+
+
+def test_slow_request_logged(client: TestClient, caplog: pytest.LogCaptureFixture):
+    with caplog.at_level(logging.WARNING, logger=metrics.__name__):
+        client.get("/items/3")
+    assert "Slow request GET /items/3 (/items/{id})" in caplog.text
+    assert "SELECT" in caplog.text
+
+
+def test_no_tracking_outside_requests():
+    engine = create_engine("sqlite://")
+    metrics.install_query_listeners()
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+    assert metrics.current_stats() is None
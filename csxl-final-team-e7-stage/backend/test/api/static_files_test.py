@@ -0,0 +1,96 @@
+"""Tests for serving the front-end build from its manifest."""
+
+import brotli
+import gzip
+import pytest
+from pathlib import Path
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from ...api.static_files import IMMUTABLE, StaticFileMiddleware
+from ...script.compress_static import compress_directory
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+INDEX = b"<!doctype html><html><body><app-root></app-root></body></html>"
+BUNDLE = b"console.log('Welcome to the XL!');\n" * 100
+BUNDLE_NAME = "main.8c2e44c5ef0a7b1d.js"
+
+
+@pytest.fixture()
+def build(tmp_path: Path) -> Path:
+    """A front-end build with an index, a fingerprinted bundle, and an icon."""
+    (tmp_path / "index.html").write_bytes(INDEX)
+    (tmp_path / BUNDLE_NAME).write_bytes(BUNDLE)
+    (tmp_path / "favicon.ico").write_bytes(bytes(1000))
+    return tmp_path
+
+
+def _client(directory: Path) -> TestClient:
+    app = FastAPI()
+    app.mount("/", StaticFileMiddleware(directory=directory))
+    return TestClient(app)
+
+
+def test_unknown_paths_serve_index(build: Path):
+    client = _client(build)
+    response = client.get("/coworking/reservation/1")
+    assert response.status_code == 200
+    assert response.content == INDEX
+    assert response.headers["Cache-Control"] == "no-cache"
+    assert client.get("/").content == INDEX
+
+
+def test_index_revalidates_by_etag(build: Path):
+    client = _client(build)
+    etag = client.get("/").headers["ETag"]
+    (build / "index.html").write_bytes(b"changed after startup")
+    response = client.get("/", headers={"If-None-Match": etag})
+    assert response.status_code == 304
+
+
+def test_files_are_read_into_manifest_at_startup(build: Path):
+    client = _client(build)
+    (build / "added.js").write_bytes(BUNDLE)
+    assert client.get("/added.js").content == INDEX
+
+
+def test_fingerprinted_files_are_immutable(build: Path):
+    client = _client(build)
+    assert client.get(f"/{BUNDLE_NAME}").headers["Cache-Control"] == IMMUTABLE
+    assert "Cache-Control" not in client.get("/favicon.ico").headers
+
+
+def test_compressed_on_first_request(build: Path):
+    client = _client(build)
+    response = client.get(f"/{BUNDLE_NAME}", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.headers["Vary"] == "Accept-Encoding"
+    assert response.content == BUNDLE
+    plain = client.get(f"/{BUNDLE_NAME}", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.content == BUNDLE
+    assert plain.headers["ETag"] != response.headers["ETag"]
+
+
+def test_precompressed_siblings_are_served(build: Path):
+    assert compress_directory(str(build)) >= 1
+    assert gzip.decompress((build / f"{BUNDLE_NAME}.gz").read_bytes()) == BUNDLE
+    assert brotli.decompress((build / f"{BUNDLE_NAME}.br").read_bytes()) == BUNDLE
+    (build / f"{BUNDLE_NAME}.br").write_bytes(brotli.compress(b"from sibling"))
+    client = _client(build)
+    response = client.get(f"/{BUNDLE_NAME}", headers={"Accept-Encoding": "gzip, br"})
+    assert response.headers["Content-Encoding"] == "br"
+    assert response.content == b"from sibling"
+    response = client.get(
+        f"/{BUNDLE_NAME}", headers={"Accept-Encoding": "br;q=0, gzip"}
+    )
+    assert response.headers["Content-Encoding"] == "gzip"
+    assert response.content == BUNDLE
+
+
+def test_incompressible_files_are_served_as_is(build: Path):
+    response = _client(build).get("/favicon.ico", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in response.headers
+    assert response.content == bytes(1000)
@@ -0,0 +1,93 @@
+"""Tests for streaming listings as JSON arrays and newline-delimited JSON."""
+
+import json
+import pytest
+from fastapi import FastAPI, Request
+from fastapi.testclient import TestClient
+from pydantic import BaseModel, TypeAdapter
+from ...api import streaming
+from ...api.compression import CompressionMiddleware
+from ...api.streaming import NDJSON, streamed_json_response
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class Item(BaseModel):
+    id: int
+    name: str
+
+
+class ItemDetails(Item):
+    owner: str
+
+
+ITEMS = [Item(id=i, name=f"Item {i}") for i in range(250)]
+
+
+@pytest.fixture()
+def client():
+    """An app streaming a listing, and an empty one, through compression."""
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+
+    @app.get("/items")
+    def get_items(request: Request, count: int = len(ITEMS)):
+        return streamed_json_response(request, (item for item in ITEMS[:count]))
+
+    @app.get("/details", response_model=list[Item])
+    def get_details(request: Request):
+        details = (ItemDetails(owner="root", **item.model_dump()) for item in ITEMS)
+        return streamed_json_response(request, details)
+
+    return TestClient(app)
+
+
+def test_streamed_as_json_array(client: TestClient):
+    response = client.get("/items")
+    assert response.headers["Content-Type"] == "application/json"
+    assert "Accept" in response.headers["Vary"]
+    assert response.json() == [item.model_dump() for item in ITEMS]
+    assert client.get("/items", params={"count": 0}).json() == []
+    assert client.get("/items", params={"count": 1}).json() == [ITEMS[0].model_dump()]
+
+
+def test_streamed_as_ndjson_when_accepted(client: TestClient):
+    response = client.get("/items", headers={"Accept": NDJSON})
+    assert response.headers["Content-Type"] == NDJSON
+    lines = response.text.splitlines()
+    assert [json.loads(line) for line in lines] == [item.model_dump() for item in ITEMS]
+    assert (
+        client.get("/items", headers={"Accept": NDJSON}, params={"count": 0}).text == ""
+    )
+
+
+def test_models_are_encoded_through_response_model(client: TestClient):
+    """Fields the route's response model does not declare are left out, as FastAPI
+    leaves them out of the responses it encodes itself."""
+    expected = [item.model_dump() for item in ITEMS]
+    assert client.get("/details").json() == expected
+    response = client.get("/details", headers={"Accept": NDJSON})
+    assert [json.loads(line) for line in response.text.splitlines()] == expected
+
+
+def test_built_models_are_not_validated_again(
+    client: TestClient, monkeypatch: pytest.MonkeyPatch
+):
+    """Models, such as those constructed from trusted entities, are dumped as built."""
+
+    def validate_python(*args, **kwargs):
+        raise AssertionError("models were validated again")
+
+    monkeypatch.setattr(TypeAdapter, "validate_python", validate_python)
+    assert len(client.get("/details").json()) == len(ITEMS)
+
+
+def test_models_are_encoded_in_batches(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(streaming, "ENCODE_BATCH_SIZE", 100)
+    request = Request({"type": "http"})
+    chunks = list(streaming.json_array_chunks(request, iter(ITEMS)))
+    assert len(chunks) == 4
+    assert json.loads(b"".join(chunks)) == [item.model_dump() for item in ITEMS]
+    assert len(list(streaming.ndjson_chunks(request, iter(ITEMS)))) == 3
@@ -173,6 +173,19 @@ def test_subtract_availability_after_last(time: dict[str, datetime]):
     assert availability_list.availability[0].end == time[IN_THIRTY_MINUTES]
 
 
+def test_subtract_availability_within_gap(time: dict[str, datetime]):
+    availability_list = AvailabilityList(
+        availability=[
+            TimeRange(start=time[NOW], end=time[IN_THIRTY_MINUTES]),
+            TimeRange(start=time[IN_TWO_HOURS], end=time[IN_THREE_HOURS]),
+        ]
+    )
+    availability_list.subtract(
+        TimeRange(start=time[IN_ONE_HOUR], end=time[IN_ONE_HOUR] + THIRTY_MINUTES)
+    )
+    assert len(availability_list.availability) == 2
+
+
 def test_subtract_all_availability_across_multiple(time: dict[str, datetime]):
     availability_list = AvailabilityList(
         availability=[
@@ -0,0 +1,157 @@
+"""Property-based tests checking IntervalSet against AvailabilityList and TimeRange."""
+
+from datetime import datetime, timedelta
+from hypothesis import given, strategies as st
+from ....models.coworking import AvailabilityList, IntervalSet, TimeRange
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+BASE = datetime(2024, 1, 8, 9, 30, 15, 250)
+MINUTE = timedelta(minutes=1)
+
+# A single interval expressed as (start, end) minute offsets from BASE.
+minute_ranges = st.tuples(
+    st.integers(min_value=0, max_value=600), st.integers(min_value=1, max_value=180)
+).map(lambda pair: (pair[0], pair[0] + pair[1]))
+
+# Sorted availability with gaps of at least a minute between ranges, as
+# AvailabilityList produces when built from operating hours.
+minute_availability = st.lists(
+    st.tuples(
+        st.integers(min_value=1, max_value=60), st.integers(min_value=1, max_value=120)
+    ),
+    max_size=12,
+).map(lambda gaps_and_lengths: _accumulate(gaps_and_lengths))
+
+
+def _accumulate(gaps_and_lengths: list[tuple[int, int]]) -> list[tuple[int, int]]:
+    ranges, cursor = [], 0
+    for gap, length in gaps_and_lengths:
+        ranges.append((cursor + gap, cursor + gap + length))
+        cursor += gap + length
+    return ranges
+
+
+def _time_range(minutes: tuple[int, int]) -> TimeRange:
+    return TimeRange(start=BASE + minutes[0] * MINUTE, end=BASE + minutes[1] * MINUTE)
+
+
+def _availability_list(ranges: list[tuple[int, int]]) -> AvailabilityList:
+    return AvailabilityList(availability=[_time_range(r) for r in ranges])
+
+
+def _pairs(time_ranges: list[TimeRange]) -> list[tuple[datetime, datetime]]:
+    return [(time_range.start, time_range.end) for time_range in time_ranges]
+
+
+def _covered_minutes(ranges: list[tuple[int, int]]) -> set[int]:
+    return {minute for start, end in ranges for minute in range(start, end)}
+
+
+def _interval_set_minutes(interval_set: IntervalSet) -> set[int]:
+    return _covered_minutes(
+        [
+            ((start - BASE) // MINUTE, (end - BASE) // MINUTE)
+            for start, end in interval_set
+        ]
+    )
+
+
+@given(minute_availability)
+def test_round_trip(ranges: list[tuple[int, int]]):
+    availability_list = _availability_list(ranges)
+    interval_set = IntervalSet.from_availability_list(availability_list)
+    assert _pairs(interval_set.to_time_ranges()) == _pairs(
+        availability_list.availability
+    )
+    assert IntervalSet.from_time_ranges(interval_set.to_time_ranges()) == interval_set
+
+
+@given(minute_availability, minute_ranges)
+def test_constrain_matches_availability_list(
+    ranges: list[tuple[int, int]], bounds: tuple[int, int]
+):
+    expected = _availability_list(ranges)
+    expected.constrain(_time_range(bounds))
+    actual = IntervalSet.from_time_ranges(_availability_list(ranges).availability)
+    bounds_range = _time_range(bounds)
+    actual = actual.constrain(bounds_range.start, bounds_range.end)
+    assert _pairs(actual.to_time_ranges()) == _pairs(expected.availability)
+
+
+@given(minute_availability, st.lists(minute_ranges, max_size=6))
+def test_difference_matches_availability_list_subtract(
+    ranges: list[tuple[int, int]], blocks: list[tuple[int, int]]
+):
+    expected = _availability_list(ranges)
+    for block in blocks:
+        expected.subtract(_time_range(block))
+    actual = IntervalSet.from_time_ranges(
+        _availability_list(ranges).availability
+    ) - IntervalSet.from_time_ranges([_time_range(block) for block in blocks])
+    assert _pairs(actual.to_time_ranges()) == _pairs(expected.availability)
+
+
+@given(minute_availability, st.integers(min_value=0, max_value=150))
+def test_filter_matches_availability_list(
+    ranges: list[tuple[int, int]], minimum_minutes: int
+):
+    minimum = minimum_minutes * MINUTE
+    expected = _availability_list(ranges)
+    expected.filter_time_ranges_below(minimum)
+    actual = IntervalSet.from_time_ranges(
+        _availability_list(ranges).availability
+    ).filter_shorter_than(minimum)
+    assert _pairs(actual.to_time_ranges()) == _pairs(expected.availability)
+
+
+@given(minute_availability)
+def test_total_duration_matches_availability_list(ranges: list[tuple[int, int]]):
+    availability_list = _availability_list(ranges)
+    assert (
+        IntervalSet.from_availability_list(availability_list).total_duration()
+        == availability_list.total_duration()
+    )
+
+
+@given(st.lists(minute_ranges, max_size=8), st.lists(minute_ranges, max_size=8))
+def test_set_operations_match_minute_coverage(
+    a: list[tuple[int, int]], b: list[tuple[int, int]]
+):
+    a_set = IntervalSet.from_time_ranges([_time_range(r) for r in a])
+    b_set = IntervalSet.from_time_ranges([_time_range(r) for r in b])
+    a_minutes, b_minutes = _covered_minutes(a), _covered_minutes(b)
+    assert _interval_set_minutes(a_set | b_set) == a_minutes | b_minutes
+    assert _interval_set_minutes(a_set & b_set) == a_minutes & b_minutes
+    assert _interval_set_minutes(a_set - b_set) == a_minutes - b_minutes
+
+
+@given(st.lists(minute_ranges, max_size=8))
+def test_normalized(ranges: list[tuple[int, int]]):
+    """Intervals are sorted, non-empty, and separated by gaps."""
+    intervals = list(IntervalSet.from_time_ranges([_time_range(r) for r in ranges]))
+    assert all(start < end for start, end in intervals)
+    assert all(intervals[i][1] < intervals[i + 1][0] for i in range(len(intervals) - 1))
+
+
+@given(minute_availability, minute_ranges)
+def test_intersection_with_range_is_constrain(
+    ranges: list[tuple[int, int]], bounds: tuple[int, int]
+):
+    interval_set = IntervalSet.from_availability_list(_availability_list(ranges))
+    bounds_range = _time_range(bounds)
+    assert interval_set & IntervalSet.between(
+        bounds_range.start, bounds_range.end
+    ) == interval_set.constrain(bounds_range.start, bounds_range.end)
+
+
+def test_bounds():
+    assert IntervalSet().bounds() is None
+    interval_set = IntervalSet.from_time_ranges(
+        [_time_range((30, 60)), _time_range((0, 10))]
+    )
+    bounds = interval_set.bounds()
+    assert bounds is not None
+    assert (bounds.start, bounds.end) == (BASE, BASE + 60 * MINUTE)
@@ -0,0 +1,92 @@
+"""Tests for the SlotCalendar bitsets of free room slots."""
+
+import pytest
+from datetime import date, datetime, time, timedelta
+from hypothesis import given, strategies as st
+from ....models.coworking import SlotCalendar
+from ....models.coworking.slot_calendar import _runs_of
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+DAY = date(2024, 1, 8)
+MIDNIGHT = datetime.combine(DAY, time())
+
+
+def _at(hour: int, minute: int = 0, days: int = 0) -> datetime:
+    return MIDNIGHT + timedelta(days=days, hours=hour, minutes=minute)
+
+
+def _slots(free: int) -> list[int]:
+    return [i for i in range(free.bit_length()) if free >> i & 1]
+
+
+def test_open_rounds_inward():
+    calendar = SlotCalendar(DAY, 1, ["SN135"])
+    calendar.open(_at(9, 45), _at(11, 15))
+    assert _slots(calendar.free_slots("SN135", 0)) == [20, 21]
+
+
+def test_block_rounds_outward():
+    calendar = SlotCalendar(DAY, 1, ["SN135", "SN137"])
+    calendar.open(_at(10), _at(12))
+    calendar.block(_at(10, 45), _at(11, 5), "SN135")
+    assert _slots(calendar.free_slots("SN135", 0)) == [20, 23]
+    assert _slots(calendar.free_slots("SN137", 0)) == [20, 21, 22, 23]
+
+
+def test_ranges_spanning_midnight_and_outside_calendar():
+    calendar = SlotCalendar(DAY, 2, ["SN135"])
+    calendar.open(_at(-2), _at(1, days=1))
+    assert _slots(calendar.free_slots("SN135", 0)) == list(range(48))
+    assert _slots(calendar.free_slots("SN135", 1)) == [0, 1]
+    calendar.block(_at(23, 30), _at(0, 30, days=1))
+    assert 47 not in _slots(calendar.free_slots("SN135", 0))
+    assert _slots(calendar.free_slots("SN135", 1)) == [1]
+
+
+def test_block_unknown_room_is_ignored():
+    calendar = SlotCalendar(DAY, 1, ["SN135"])
+    calendar.open(_at(10), _at(11))
+    calendar.block(_at(10), _at(11), "SN999")
+    assert _slots(calendar.free_slots("SN135", 0)) == [20, 21]
+
+
+def test_find_non_overlapping_runs_within_window():
+    calendar = SlotCalendar(DAY, 2, ["SN135"])
+    calendar.open(_at(10), _at(14))
+    calendar.open(_at(10, days=1), _at(12, days=1))
+    calendar.block(_at(11, 30), _at(12))
+    runs = list(calendar.find("SN135", 2, earliest=20, latest=28))
+    assert runs == [
+        (_at(10), _at(11)),
+        (_at(12), _at(13)),
+        (_at(13), _at(14)),
+        (_at(10, days=1), _at(11, days=1)),
+        (_at(11, days=1), _at(12, days=1)),
+    ]
+    assert list(calendar.find("SN135", 2, earliest=25, latest=28)) == [
+        (_at(12, 30), _at(13, 30))
+    ]
+    assert list(calendar.find("SN135", 9)) == []
+
+
+def test_granularity():
+    calendar = SlotCalendar(DAY, 1, ["SN135"], timedelta(hours=1))
+    calendar.open(_at(10), _at(12, 30))
+    assert calendar.slots_per_day == 24
+    assert calendar.slot_of(time(12, 30)) == 12
+    assert calendar.slot_of(time(12, 30), round_up=True) == 13
+    assert list(calendar.find("SN135", 2)) == [(_at(10), _at(12))]
+    with pytest.raises(ValueError):
+        SlotCalendar(DAY, 1, ["SN135"], timedelta(minutes=7))
+
+
+@given(st.integers(min_value=0, max_value=(1 << 48) - 1), st.integers(1, 12))
+def test_runs_of_matches_brute_force(free: int, length: int):
+    expected = 0
+    for j in range(48):
+        if all(free >> (j + i) & 1 for i in range(length)):
+            expected |= 1 << j
+    assert _runs_of(free, length) == expected
@@ -0,0 +1,45 @@
+"""Tests for constructing models from trusted values."""
+
+import pytest
+from pydantic import BaseModel, Field, ValidationError
+from ...models.trusted import construct, validating
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+class Item(BaseModel):
+    id: int | None = None
+    name: str
+    tags: list[str] = Field(default_factory=list)
+
+
+def test_construct_matches_validation():
+    item = construct(Item, id=1, name="Chair", tags=["wood"])
+    assert item == Item(id=1, name="Chair", tags=["wood"])
+    assert item.model_dump() == {"id": 1, "name": "Chair", "tags": ["wood"]}
+
+
+def test_construct_fills_defaults():
+    item = construct(Item, name="Chair")
+    assert item == Item(name="Chair")
+    assert item.model_fields_set == {"name"}
+
+
+def test_construct_calls_default_factories():
+    first, second = construct(Item, name="Chair"), construct(Item, name="Desk")
+    first.tags.append("wood")
+    assert second.tags == []
+
+
+def test_construct_does_not_validate():
+    item = construct(Item, name=42)
+    assert item.name == 42
+
+
+def test_validating_validates_constructed_models():
+    with validating():
+        with pytest.raises(ValidationError):
+            construct(Item, name=42)
+    assert construct(Item, name=42).name == 42
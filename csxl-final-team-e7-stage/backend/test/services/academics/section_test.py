@@ -36,6 +36,10 @@ def test_all(section_svc: SectionService):
     assert isinstance(sections[0], SectionDetails)
 
 
+def test_stream(section_svc: SectionService):
+    assert list(section_svc.stream()) == section_svc.all()
+
+
 def test_get_by_term(section_svc: SectionService):
     sections = section_svc.get_by_term(term_data.f_23.id)
 
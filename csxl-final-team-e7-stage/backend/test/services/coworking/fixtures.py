@@ -13,6 +13,8 @@ from ....services.coworking import (
     ReservationService,
     PolicyService,
     StatusService,
+    RoomSearchService,
+    UtilizationService,
 )
 
 __authors__ = [
@@ -51,9 +53,9 @@ def seat_svc(session: Session):
 
 
 @pytest.fixture()
-def policy_svc():
+def policy_svc(session: Session, permission_svc: PermissionService):
     """CoworkingPolicyService fixture."""
-    return PolicyService()
+    return PolicyService(session, permission_svc)
 
 
 @pytest.fixture()
@@ -70,6 +72,22 @@ def reservation_svc(
     )
 
 
+@pytest.fixture()
+def room_search_svc(
+    session: Session,
+    policy_svc: PolicyService,
+    operating_hours_svc: OperatingHoursService,
+):
+    """RoomSearchService fixture."""
+    return RoomSearchService(session, policy_svc, operating_hours_svc)
+
+
+@pytest.fixture()
+def utilization_svc(session: Session, permission_svc: PermissionService):
+    """UtilizationService fixture."""
+    return UtilizationService(session, permission_svc)
+
+
 @pytest.fixture()
 def status_svc():
     policies_mock = create_autospec(PolicyService)
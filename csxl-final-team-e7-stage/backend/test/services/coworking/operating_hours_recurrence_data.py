@@ -0,0 +1,47 @@
+"""Data for recurring operating hours tests.
+
+Two terms are setup relative to the time of the test run:
+
+1. current_term, which includes today and therefore overlaps operating_hours_data
+2. upcoming_term, which begins four days from now and runs for twelve weeks
+"""
+
+import pytest
+from sqlalchemy.orm import Session
+from ....entities.academics import TermEntity
+from ....models.academics import Term
+from .time import *
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+current_term: Term
+upcoming_term: Term
+
+
+def insert_fake_data(session: Session, time: dict[str, datetime]):
+    global current_term, upcoming_term
+
+    current_term = Term(
+        id="CUR",
+        name="Current Term",
+        start=time[MIDNIGHT_TODAY] - 7 * ONE_DAY,
+        end=time[MIDNIGHT_TODAY] + 30 * ONE_DAY,
+    )
+    upcoming_term = Term(
+        id="UPC",
+        name="Upcoming Term",
+        start=time[MIDNIGHT_TODAY] + 4 * ONE_DAY,
+        end=time[MIDNIGHT_TODAY] + 88 * ONE_DAY,
+    )
+
+    for term in [current_term, upcoming_term]:
+        session.add(TermEntity.from_model(term))
+
+
+@pytest.fixture(autouse=True)
+def fake_data_fixture(session: Session, time: dict[str, datetime]):
+    insert_fake_data(session, time)
+    session.commit()
+    yield
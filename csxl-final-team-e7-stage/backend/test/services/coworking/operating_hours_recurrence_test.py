@@ -0,0 +1,262 @@
+"""Tests for recurring operating hours in the Coworking Operating Hours Service."""
+
+from datetime import date, time as clock
+from unittest.mock import create_autospec
+
+from ....services.coworking import OperatingHoursService
+from ....services.coworking.operating_hours import MATERIALIZATION_HORIZON
+from ....models.coworking import (
+    OperatingHours,
+    OperatingHoursRecurrence,
+    TimeRange,
+    WeeklyOperatingHours,
+)
+from ....services.coworking.exceptions import OperatingHoursCannotOverlapException
+from ....services import PermissionService
+from ....services.exceptions import ResourceNotFoundException
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import permission_svc, operating_hours_svc
+from .time import *
+
+# Insert fake data entities in database
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from .operating_hours_recurrence_data import fake_data_fixture as insert_order_2
+
+# Import the fake model data in a namespace for test assertions
+from . import operating_hours_data, operating_hours_recurrence_data
+from ..core_data import user_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _every_day(term_id: str, exceptions: list[date] = []) -> OperatingHoursRecurrence:
+    return OperatingHoursRecurrence(
+        term_id=term_id,
+        weekly_hours=[
+            WeeklyOperatingHours(weekday=weekday, start=clock(10), end=clock(18))
+            for weekday in range(7)
+        ],
+        exceptions=exceptions,
+    )
+
+
+def _materialized(
+    operating_hours_svc: OperatingHoursService, time_range: TimeRange
+) -> list[OperatingHours]:
+    return [
+        operating_hours
+        for operating_hours in operating_hours_svc.schedule(time_range)
+        if operating_hours.id is not None
+    ]
+
+
+def test_create_recurrence_materializes_through_horizon(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Occurrences from the term start through the horizon are persisted as operating hours."""
+    term = operating_hours_recurrence_data.upcoming_term
+    recurrence = operating_hours_svc.create_recurrence(
+        user_data.root, _every_day(term.id)
+    )
+    assert recurrence.id is not None
+    assert recurrence.materialized_until == term.start + MATERIALIZATION_HORIZON
+
+    materialized = _materialized(
+        operating_hours_svc, TimeRange(start=term.start, end=term.end)
+    )
+    assert len(materialized) == MATERIALIZATION_HORIZON.days
+    assert materialized[0].start == term.start + timedelta(hours=10)
+    assert materialized[0].end == term.start + timedelta(hours=18)
+
+
+def test_create_recurrence_skips_exceptions(operating_hours_svc: OperatingHoursService):
+    """Exception dates do not produce operating hours."""
+    term = operating_hours_recurrence_data.upcoming_term
+    holiday = (term.start + ONE_DAY).date()
+    operating_hours_svc.create_recurrence(
+        user_data.root, _every_day(term.id, exceptions=[holiday])
+    )
+    result = operating_hours_svc.schedule(
+        TimeRange(start=term.start, end=term.start + 3 * ONE_DAY)
+    )
+    assert [operating_hours.start.date() for operating_hours in result] == [
+        term.start.date(),
+        (term.start + 2 * ONE_DAY).date(),
+    ]
+
+
+def test_create_recurrence_only_on_pattern_weekdays(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Only the weekdays named in the weekly pattern are materialized."""
+    term = operating_hours_recurrence_data.upcoming_term
+    weekday = term.start.weekday()
+    operating_hours_svc.create_recurrence(
+        user_data.root,
+        OperatingHoursRecurrence(
+            term_id=term.id,
+            weekly_hours=[
+                WeeklyOperatingHours(weekday=weekday, start=clock(9), end=clock(12)),
+                WeeklyOperatingHours(weekday=weekday, start=clock(13), end=clock(17)),
+            ],
+        ),
+    )
+    materialized = _materialized(
+        operating_hours_svc, TimeRange(start=term.start, end=term.end)
+    )
+    assert len(materialized) == 2 * MATERIALIZATION_HORIZON.days // 7
+    assert all(
+        operating_hours.start.weekday() == weekday for operating_hours in materialized
+    )
+
+
+def test_create_recurrence_overlap(operating_hours_svc: OperatingHoursService):
+    """A template overlapping existing operating hours raises without inserting anything."""
+    term = operating_hours_recurrence_data.current_term
+    with pytest.raises(OperatingHoursCannotOverlapException):
+        operating_hours_svc.create_recurrence(
+            user_data.root,
+            OperatingHoursRecurrence(
+                term_id=term.id,
+                weekly_hours=[
+                    WeeklyOperatingHours(
+                        weekday=weekday, start=clock(0), end=clock(23, 59)
+                    )
+                    for weekday in range(7)
+                ],
+            ),
+        )
+    operating_hours_svc._session.rollback()
+    assert len(
+        operating_hours_svc.schedule(TimeRange(start=term.start, end=term.end))
+    ) == len(operating_hours_data.all)
+
+
+def test_create_recurrence_overlap_beyond_horizon(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Occurrences past the materialization horizon are checked against one-off hours."""
+    term = operating_hours_recurrence_data.upcoming_term
+    late = term.end - ONE_DAY + timedelta(hours=12)
+    operating_hours_svc.create(
+        user_data.root, TimeRange(start=late, end=late + ONE_HOUR)
+    )
+    with pytest.raises(OperatingHoursCannotOverlapException):
+        operating_hours_svc.create_recurrence(user_data.root, _every_day(term.id))
+
+
+def test_create_recurrence_overlapping_template(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Two templates on one term cannot share open windows."""
+    term = operating_hours_recurrence_data.upcoming_term
+    operating_hours_svc.create_recurrence(user_data.root, _every_day(term.id))
+    with pytest.raises(OperatingHoursCannotOverlapException):
+        operating_hours_svc.create_recurrence(
+            user_data.root,
+            OperatingHoursRecurrence(
+                term_id=term.id,
+                weekly_hours=[
+                    WeeklyOperatingHours(weekday=0, start=clock(17), end=clock(20))
+                ],
+            ),
+        )
+
+
+def test_create_recurrence_term_not_found(operating_hours_svc: OperatingHoursService):
+    """A template for an unknown term raises ResourceNotFoundException."""
+    with pytest.raises(ResourceNotFoundException):
+        operating_hours_svc.create_recurrence(user_data.root, _every_day("NOPE"))
+
+
+def test_create_recurrence_enforces_permission(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Ensure we are enforcing coworking.operating_hours.create on coworking/operating_hours"""
+    permission_svc = create_autospec(PermissionService)
+    operating_hours_svc._permission_svc = permission_svc
+    operating_hours_svc.create_recurrence(
+        user_data.user, _every_day(operating_hours_recurrence_data.upcoming_term.id)
+    )
+    permission_svc.enforce.assert_called_with(
+        user_data.user,
+        "coworking.operating_hours.create",
+        "coworking/operating_hours",
+    )
+
+
+def test_schedule_expands_beyond_horizon(operating_hours_svc: OperatingHoursService):
+    """Queries past the materialized horizon include unpersisted occurrences."""
+    term = operating_hours_recurrence_data.upcoming_term
+    recurrence = operating_hours_svc.create_recurrence(
+        user_data.root, _every_day(term.id)
+    )
+    assert recurrence.materialized_until is not None
+    start = recurrence.materialized_until - 2 * ONE_DAY
+    result = operating_hours_svc.schedule(
+        TimeRange(start=start, end=start + 4 * ONE_DAY)
+    )
+    assert len(result) == 4
+    assert [operating_hours.id is None for operating_hours in result] == [
+        False,
+        False,
+        True,
+        True,
+    ]
+
+
+def test_schedule_expansion_stops_at_term_end(
+    operating_hours_svc: OperatingHoursService,
+):
+    """Unpersisted occurrences are bounded by the term's end date."""
+    term = operating_hours_recurrence_data.upcoming_term
+    operating_hours_svc.create_recurrence(user_data.root, _every_day(term.id))
+    result = operating_hours_svc.schedule(
+        TimeRange(start=term.end - ONE_DAY, end=term.end + 7 * ONE_DAY)
+    )
+    assert len(result) == 2
+    assert result[-1].start.date() == term.end.date()
+
+
+def test_extend_recurrence(operating_hours_svc: OperatingHoursService):
+    """Extending a template materializes occurrences through the new date."""
+    term = operating_hours_recurrence_data.upcoming_term
+    recurrence = operating_hours_svc.create_recurrence(
+        user_data.root, _every_day(term.id)
+    )
+    extended = operating_hours_svc.extend_recurrence(
+        user_data.root, recurrence, term.end + ONE_DAY
+    )
+    assert extended.materialized_until == term.end + ONE_DAY
+    materialized = _materialized(
+        operating_hours_svc, TimeRange(start=term.start, end=term.end + ONE_DAY)
+    )
+    assert len(materialized) == (term.end - term.start).days + 1
+
+
+def test_delete_recurrence(operating_hours_svc: OperatingHoursService):
+    """Deleting a template removes its upcoming operating hours."""
+    term = operating_hours_recurrence_data.upcoming_term
+    recurrence = operating_hours_svc.create_recurrence(
+        user_data.root, _every_day(term.id)
+    )
+    operating_hours_svc.delete_recurrence(user_data.root, recurrence)
+    assert operating_hours_svc.schedule(TimeRange(start=term.start, end=term.end)) == []
+    with pytest.raises(ResourceNotFoundException):
+        operating_hours_svc.get_recurrence(recurrence.id)  # type: ignore
+
+
+def test_weekly_hours_cannot_overlap():
+    """Overlapping windows on one weekday are rejected by the model."""
+    with pytest.raises(ValueError):
+        OperatingHoursRecurrence(
+            term_id="UPC",
+            weekly_hours=[
+                WeeklyOperatingHours(weekday=2, start=clock(9), end=clock(12)),
+                WeeklyOperatingHours(weekday=2, start=clock(11), end=clock(14)),
+            ],
+        )
@@ -0,0 +1,66 @@
+"""Data for coworking policy tests.
+
+Policies setup:
+
+1. Everyone may walk in up to fifteen minutes ahead (overriding the default)
+2. Ambassadors may reserve two weeks in advance
+3. SN135 is held for office hours from 10:00 to 11:00 every Monday
+"""
+
+import pytest
+from datetime import time, timedelta
+from sqlalchemy.orm import Session
+from ....entities.coworking import GroupPolicyEntity, RoomPolicyEntity
+from ....models.coworking import GroupPolicy, RoomPolicy
+from ....services.coworking import policy
+from ....services.coworking.policy import (
+    MONDAY,
+    RESERVATION_WINDOW,
+    WALKIN_WINDOW,
+    PolicySnapshot,
+    load_policies,
+)
+from ..reset_table_id_seq import reset_table_id_seq
+from .. import role_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+walkin_window = GroupPolicy(id=1, key=WALKIN_WINDOW, value=timedelta(minutes=15))
+ambassador_reservation_window = GroupPolicy(
+    id=2,
+    role_id=role_data.ambassador_role.id,
+    key=RESERVATION_WINDOW,
+    value=timedelta(weeks=2),
+)
+group_policies = [walkin_window, ambassador_reservation_window]
+
+office_hours = RoomPolicy(
+    id=1, room_id="SN135", weekday=MONDAY, start=time(10), end=time(11)
+)
+room_policies = [office_hours]
+
+
+def insert_fake_data(session: Session):
+    for group_policy in group_policies:
+        session.add(GroupPolicyEntity.from_model(group_policy))
+    for room_policy in room_policies:
+        session.add(RoomPolicyEntity.from_model(room_policy))
+
+    reset_table_id_seq(
+        session, GroupPolicyEntity, GroupPolicyEntity.id, len(group_policies) + 1
+    )
+    reset_table_id_seq(
+        session, RoomPolicyEntity, RoomPolicyEntity.id, len(room_policies) + 1
+    )
+
+
+@pytest.fixture(autouse=True)
+def fake_data_fixture(session: Session, monkeypatch: pytest.MonkeyPatch):
+    # Loaded snapshots are process-wide; restore the defaults after each test.
+    monkeypatch.setattr(policy, "_snapshot", PolicySnapshot())
+    insert_fake_data(session)
+    session.commit()
+    load_policies(session)
+    yield
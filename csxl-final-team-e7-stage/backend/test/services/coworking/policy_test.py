@@ -0,0 +1,184 @@
+"""Tests for the data-driven Coworking Policy Service."""
+
+import pytest
+from datetime import datetime, time, timedelta
+from unittest.mock import create_autospec
+from sqlalchemy.orm import Session
+
+from ....services import PermissionService, RoleService
+from ....services.coworking import PolicyService
+from ....services.coworking import policy
+from ....services.coworking.policy import (
+    DEFAULT_POLICIES,
+    MAXIMUM_INITIAL_RESERVATION_DURATION,
+    RESERVATION_WINDOW,
+    WALKIN_WINDOW,
+    current_policies,
+)
+from ....entities.coworking import GroupPolicyEntity
+from ....services.exceptions import ResourceNotFoundException
+from ....models.coworking import GroupPolicy, RoomPolicy
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import permission_svc, policy_svc
+from .time import ONE_DAY, ONE_HOUR
+
+# Insert fake data entities in database
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from ..room_data import fake_data_fixture as insert_order_1
+from .policy_data import fake_data_fixture as insert_order_2
+
+# Import the fake model data in a namespace for test assertions
+from . import policy_data
+from ..core_data import user_data
+from .. import role_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+A_MONDAY = datetime(2024, 4, 1)
+
+
+def test_default_policy(policy_svc: PolicyService):
+    """Keys without overrides use the default value."""
+    assert (
+        policy_svc.maximum_initial_reservation_duration(user_data.user)
+        == DEFAULT_POLICIES[MAXIMUM_INITIAL_RESERVATION_DURATION]
+    )
+
+
+def test_everyone_override(policy_svc: PolicyService):
+    """An override without a role applies to all users."""
+    assert policy_svc.walkin_window(user_data.user) == policy_data.walkin_window.value
+
+
+def test_group_override(policy_svc: PolicyService):
+    """Members of a role with an override see the group's value; others see the default."""
+    assert (
+        policy_svc.reservation_window(user_data.ambassador)
+        == policy_data.ambassador_reservation_window.value
+    )
+    assert (
+        policy_svc.reservation_window(user_data.user)
+        == DEFAULT_POLICIES[RESERVATION_WINDOW]
+    )
+
+
+def test_office_hours(policy_svc: PolicyService):
+    """Room policies are looked up by the weekday of the date."""
+    assert policy_svc.office_hours(A_MONDAY) == {"SN135": ((time(10), time(11)),)}
+    assert policy_svc.office_hours(A_MONDAY + ONE_DAY) == {}
+
+
+def test_non_reservable_rooms(policy_svc: PolicyService):
+    """Rooms marked as not reservable are reported."""
+    assert policy_svc.non_reservable_rooms() == ["SN156"]
+
+
+def test_set_group_policy_reloads(policy_svc: PolicyService):
+    """Changing a policy takes effect in the current snapshot without a restart."""
+    policy_svc.set_group_policy(
+        user_data.root,
+        GroupPolicy(
+            role_id=role_data.ambassador_role.id,
+            key=RESERVATION_WINDOW,
+            value=timedelta(weeks=3),
+        ),
+    )
+    assert policy_svc.reservation_window(user_data.ambassador) == timedelta(weeks=3)
+    assert len(policy_svc.list_group_policies(user_data.root)) == len(
+        policy_data.group_policies
+    )
+    assert PolicyService(
+        policy_svc._session, policy_svc._permission_svc
+    ).reservation_window(user_data.ambassador) == timedelta(weeks=3)
+
+
+def test_set_group_policy_unknown_key(policy_svc: PolicyService):
+    """Only known policy keys may be set."""
+    with pytest.raises(ResourceNotFoundException):
+        policy_svc.set_group_policy(
+            user_data.root, GroupPolicy(key="nap_duration", value=ONE_HOUR)
+        )
+
+
+def test_set_group_policy_enforces_permission(policy_svc: PolicyService):
+    """Ensure we are enforcing coworking.policy.update on coworking/policy"""
+    permission_svc = create_autospec(PermissionService)
+    policy_svc._permission_svc = permission_svc
+    policy_svc.set_group_policy(
+        user_data.user, GroupPolicy(key=RESERVATION_WINDOW, value=ONE_DAY)
+    )
+    permission_svc.enforce.assert_called_with(
+        user_data.user, "coworking.policy.update", "coworking/policy"
+    )
+
+
+def test_list_policies_enforces_permission(policy_svc: PolicyService):
+    """Ensure we are enforcing coworking.policy.read on coworking/policy"""
+    permission_svc = create_autospec(PermissionService)
+    policy_svc._permission_svc = permission_svc
+    policy_svc.list_group_policies(user_data.user)
+    permission_svc.enforce.assert_called_with(
+        user_data.user, "coworking.policy.read", "coworking/policy"
+    )
+    permission_svc.enforce.reset_mock()
+    policy_svc.list_room_policies(user_data.user)
+    permission_svc.enforce.assert_called_with(
+        user_data.user, "coworking.policy.read", "coworking/policy"
+    )
+
+
+def test_snapshot_reloads_after_ttl(
+    session: Session,
+    policy_svc: PolicyService,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """Changes made through another process are seen once the snapshot expires."""
+    with Session(session.get_bind()) as other_session:
+        entity = other_session.get(GroupPolicyEntity, policy_data.walkin_window.id)
+        entity.value = ONE_HOUR  # type: ignore
+        other_session.commit()
+
+    fresh = PolicyService(session, policy_svc._permission_svc)
+    assert fresh.walkin_window(user_data.user) == policy_data.walkin_window.value
+
+    monkeypatch.setattr(policy, "POLICY_SNAPSHOT_TTL", timedelta(0))
+    expired = PolicyService(session, policy_svc._permission_svc)
+    assert expired.walkin_window(user_data.user) == ONE_HOUR
+    assert current_policies().duration(WALKIN_WINDOW) == ONE_HOUR
+
+
+def test_delete_group_policy_restores_default(policy_svc: PolicyService):
+    """Removing an override falls back to the default."""
+    policy_svc.delete_group_policy(user_data.root, policy_data.walkin_window.id)  # type: ignore
+    assert policy_svc.walkin_window(user_data.user) == DEFAULT_POLICIES["walkin_window"]
+
+
+def test_room_policy_add_and_delete(policy_svc: PolicyService):
+    """Room policies are added to and removed from the snapshot."""
+    added = policy_svc.add_room_policy(
+        user_data.root,
+        RoomPolicy(
+            room_id="SN137", weekday=A_MONDAY.weekday(), start=time(14), end=time(15)
+        ),
+    )
+    assert policy_svc.office_hours(A_MONDAY)["SN137"] == ((time(14), time(15)),)
+    policy_svc.delete_room_policy(user_data.root, added.id)  # type: ignore
+    assert "SN137" not in policy_svc.office_hours(A_MONDAY)
+
+
+def test_role_membership_reloads(session, permission_svc: PermissionService):
+    """Adding a member to a role with overrides reloads the snapshot."""
+    role_svc = RoleService(session, permission_svc)
+    role_svc.add_member(user_data.root, role_data.ambassador_role.id, user_data.user)  # type: ignore
+    assert (
+        current_policies().duration(RESERVATION_WINDOW, user_data.user)
+        == policy_data.ambassador_reservation_window.value
+    )
+    role_svc.remove_member(user_data.root, role_data.ambassador_role.id, user_data.user.id)  # type: ignore
+    assert (
+        current_policies().duration(RESERVATION_WINDOW, user_data.user)
+        == DEFAULT_POLICIES[RESERVATION_WINDOW]
+    )
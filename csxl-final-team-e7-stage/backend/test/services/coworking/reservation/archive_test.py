@@ -0,0 +1,97 @@
+"""Tests for archiving reservations and querying their history."""
+
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .....entities.coworking import ReservationArchiveEntity, ReservationEntity
+from .....models.coworking import ReservationState
+from .....services.coworking.reservation_archive import (
+    archive_batch,
+    reservation_history,
+)
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ...room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _live_ids(session: Session) -> set[int]:
+    return set(session.scalars(select(ReservationEntity.id)))
+
+
+def test_archive_final_reservations(session: Session, time: dict[str, datetime]):
+    """Checked out and cancelled reservations that have ended are archived."""
+    before = time[IN_THIRTY_MINUTES] + ONE_MINUTE
+    assert archive_batch(session, before) == (2, 0)
+    assert _live_ids(session) == {1, 4, 5, 6}
+
+    archived = session.get(ReservationArchiveEntity, 2)
+    assert archived is not None
+    assert archived.state == ReservationState.CHECKED_OUT
+    assert archived.user_ids == [user_data.ambassador.id]
+    assert archived.seat_ids == [seat_data.monitor_seat_01.id]
+
+    assert archive_batch(session, before) == (0, 0)
+
+
+def test_archive_only_ended_reservations(session: Session, time: dict[str, datetime]):
+    assert archive_batch(session, time[NOW]) == (0, 0)
+    assert len(_live_ids(session)) == len(reservation_data.reservations)
+
+
+def test_archive_in_batches(session: Session, time: dict[str, datetime]):
+    before = time[IN_THIRTY_MINUTES] + ONE_MINUTE
+    assert archive_batch(session, before, batch_size=1) == (1, 0)
+    assert archive_batch(session, before, batch_size=1) == (1, 0)
+    assert archive_batch(session, before, batch_size=1) == (0, 0)
+
+
+def test_compact_cancelled_reservations(session: Session, time: dict[str, datetime]):
+    assert archive_batch(session, time[IN_THIRTY_MINUTES] + ONE_MINUTE, True) == (1, 1)
+    assert session.get(ReservationArchiveEntity, 3) is None
+    assert 3 not in _live_ids(session)
+
+
+def test_compact_keeps_no_shows(session: Session, time: dict[str, datetime]):
+    """Reservations cancelled once the check-in timeout passed are counted as no-shows
+    by the utilization backfill, so they are archived rather than compacted."""
+    no_show = session.get(ReservationEntity, 3)
+    no_show.updated_at = no_show.start + timedelta(minutes=15)
+    session.commit()
+    assert archive_batch(session, time[IN_THIRTY_MINUTES] + ONE_MINUTE, True) == (2, 0)
+    assert session.get(ReservationArchiveEntity, 3) is not None
+
+
+def test_reservation_history_spans_archive(session: Session, time: dict[str, datetime]):
+    archive_batch(session, time[IN_THIRTY_MINUTES] + ONE_MINUTE)
+    history = reservation_history()
+    rows = {
+        row.id: row
+        for row in session.execute(select(history).order_by(history.c.id)).all()
+    }
+    assert list(rows) == [
+        reservation.id for reservation in reservation_data.reservations
+    ]
+    for reservation in reservation_data.reservations:
+        row = rows[reservation.id]
+        assert row.state == reservation.state
+        assert row.start == reservation.start
+        assert row.user_ids == sorted(user.id for user in reservation.users)
+        assert row.seat_ids == sorted(seat.id for seat in reservation.seats)
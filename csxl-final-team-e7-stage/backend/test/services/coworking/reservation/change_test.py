@@ -1,13 +1,20 @@
 """ReservationService#change_reservation method tests"""
 
 import pytest
+from sqlalchemy.orm import Session
 from unittest.mock import create_autospec
 
 from .....services import PermissionService, UserPermissionException
 from .....services.coworking import ReservationService
 from .....services.coworking.reservation import ReservationException
 from .....models.coworking import ReservationState
-from .....services.exceptions import ResourceNotFoundException
+from .....services.exceptions import (
+    ResourceNotFoundException,
+    VersionConflictException,
+)
+from .....entities import IdempotencyKeyEntity
+from .....entities.coworking import ReservationEntity
+from .....services.idempotency import IdempotencyService
 
 from .....models.user import UserIdentity
 from .....models.coworking.seat import SeatIdentity
@@ -182,12 +189,12 @@ def test_change_reservation_change_start_not_implemented(
         )
 
 
-def test_change_reservation_change_end_not_implemented(
+def test_change_reservation_change_end_before_extend_window(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
-    """This test is for 100% coverage but should be replaced with actual tests for when
-    changing a reservation end time has logic implemented."""
-    with pytest.raises(NotImplementedError):
+    """Changing the end of a reservation extends it, which is only possible shortly
+    before it ends. Extensions are tested further in extend_test.py."""
+    with pytest.raises(ReservationException):
         reservation_svc.change_reservation(
             user_data.ambassador,
             ReservationPartial(
@@ -196,3 +203,74 @@ def test_change_reservation_change_end_not_implemented(
                 end=reservation_data.reservation_4.end + timedelta(minutes=423),
             ),
         )
+
+
+def test_change_reservation_increments_version(reservation_svc: ReservationService):
+    reservation = reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(id=5, state=ReservationState.CONFIRMED, version=1),
+    )
+    assert reservation.state == ReservationState.CONFIRMED
+    assert reservation.version == 2
+
+
+def test_change_reservation_stale_version(reservation_svc: ReservationService):
+    with pytest.raises(VersionConflictException) as conflict:
+        reservation_svc.change_reservation(
+            user_data.user,
+            ReservationPartial(id=5, state=ReservationState.CONFIRMED, version=2),
+        )
+    assert conflict.value.current is not None
+    assert conflict.value.current.state == ReservationState.DRAFT  # type: ignore
+    assert conflict.value.current.version == 1  # type: ignore
+
+
+def test_change_reservation_concurrently_changed(
+    session: Session, reservation_svc: ReservationService
+):
+    """A change to a reservation another request changed after it was read fails."""
+    read = session.get(ReservationEntity, 5)
+    assert read is not None and read.version == 1
+
+    with Session(session.get_bind()) as other_session:
+        other = other_session.get(ReservationEntity, 5)
+        other.state = ReservationState.CANCELLED  # type: ignore
+        other_session.commit()
+
+    with pytest.raises(VersionConflictException) as conflict:
+        reservation_svc.change_reservation(
+            user_data.user,
+            ReservationPartial(id=5, state=ReservationState.CONFIRMED),
+        )
+    assert conflict.value.current.state == ReservationState.CANCELLED  # type: ignore
+    assert conflict.value.current.version == 2  # type: ignore
+
+
+def test_change_reservation_conflict_rolls_back_unit_of_work(
+    session: Session, reservation_svc: ReservationService
+):
+    """A conflict leaves the request's transaction, including its idempotency key
+    claim, to be rolled back as a whole by the unit of work, so a retry can claim the
+    key again rather than the claim being lost while the request carries on."""
+    idempotency_svc = IdempotencyService(session)
+    assert idempotency_svc.claim(user_data.user, "retry", "fingerprint") is None
+    read = session.get(ReservationEntity, 5)
+    assert read is not None and read.version == 1
+
+    with Session(session.get_bind()) as other_session:
+        other = other_session.get(ReservationEntity, 5)
+        other.state = ReservationState.CANCELLED  # type: ignore
+        other_session.commit()
+
+    with pytest.raises(VersionConflictException) as conflict:
+        reservation_svc.change_reservation(
+            user_data.user,
+            ReservationPartial(id=5, state=ReservationState.CONFIRMED),
+        )
+    assert conflict.value.current.version == 2  # type: ignore
+    assert not session.is_active
+
+    session.rollback()
+    assert session.get(IdempotencyKeyEntity, (user_data.user.id, "retry")) is None
+    assert idempotency_svc.claim(user_data.user, "retry", "fingerprint") is None
+    assert session.get(ReservationEntity, 5).version == 2  # type: ignore
@@ -2,14 +2,19 @@
 
 import pytest
 from unittest.mock import create_autospec
+from sqlalchemy import select, text
+from sqlalchemy.orm import Session
 
+from .....entities.coworking import SeatEntity
 from .....services import PermissionService
 from .....services.coworking import ReservationService
 from .....services.coworking.reservation import ReservationException
+from .....services.exceptions import UserPermissionException
 from .....models.coworking import ReservationState
 
 from .....models.user import UserIdentity
 from .....models.coworking.seat import SeatIdentity
+from .....models.room import RoomPartial
 
 # Imported fixtures provide dependencies injected for the tests as parameters.
 # Dependent fixtures (seat_svc) are required to be imported in the testing module.
@@ -33,6 +38,7 @@ from .reservation_data import fake_data_fixture as insert_order_4
 
 # Import the fake model data in a namespace for test assertions
 from ...core_data import user_data
+from ... import room_data
 from .. import operating_hours_data
 from .. import seat_data
 from . import reservation_data
@@ -113,6 +119,31 @@ def test_draft_reservation_some_taken_seats(reservation_svc: ReservationService)
     assert reservation.seats[0].id == seat_data.monitor_seat_01.id
 
 
+def test_draft_reservation_locks_chosen_seats(
+    session: Session, reservation_svc: ReservationService
+):
+    """Drafts do not wait on seats they requested but were not given."""
+    taken = reservation_data.reservation_1.seats[0]
+    with Session(session.get_bind()) as other_session:
+        other_session.execute(
+            select(SeatEntity).where(SeatEntity.id == taken.id).with_for_update()
+        )
+        session.execute(text("SET LOCAL lock_timeout = '1s'"))
+        reservation = reservation_svc.draft_reservation(
+            user_data.ambassador,
+            reservation_data.test_request(
+                {
+                    "seats": [
+                        SeatIdentity(**taken.model_dump()),
+                        SeatIdentity(**seat_data.monitor_seat_01.model_dump()),
+                    ]
+                }
+            ),
+        )
+        other_session.rollback()
+    assert [seat.id for seat in reservation.seats] == [seat_data.monitor_seat_01.id]
+
+
 def test_draft_reservation_seat_availability_truncated(
     reservation_svc: ReservationService,
 ):
@@ -287,18 +318,107 @@ def test_draft_reservation_permissions(reservation_svc: ReservationService):
     )
 
 
-def test_draft_reservation_multiple_users_not_implemented(
+def test_draft_reservation_party(reservation_svc: ReservationService):
+    """Each user of a party is given one of the available seats, next to one another."""
+    reservation = reservation_svc.draft_reservation(
+        user_data.ambassador,
+        reservation_data.test_request(
+            {
+                "users": [
+                    UserIdentity(id=user_data.root.id),
+                    UserIdentity(id=user_data.ambassador.id),
+                ],
+                "seats": [
+                    SeatIdentity(id=seat.id)
+                    for seat in [
+                        seat_data.monitor_seat_01,
+                        seat_data.monitor_seat_10,
+                        seat_data.monitor_seat_11,
+                    ]
+                ],
+            }
+        ),
+    )
+    assert {user.id for user in reservation.users} == {
+        user_data.root.id,
+        user_data.ambassador.id,
+    }
+    assert len(reservation.seats) == 2
+    first, second = reservation.seats
+    assert abs(first.x - second.x) + abs(first.y - second.y) == 1
+
+
+def test_draft_reservation_party_member_conflict(reservation_svc: ReservationService):
+    """A party may not reserve while any of its users holds a conflicting reservation."""
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.ambassador,
+            reservation_data.test_request(
+                {
+                    "users": [
+                        UserIdentity(id=user_data.ambassador.id),
+                        UserIdentity(id=user_data.user.id),
+                    ],
+                    "seats": [
+                        SeatIdentity(id=seat_data.monitor_seat_10.id),
+                        SeatIdentity(id=seat_data.monitor_seat_11.id),
+                    ],
+                }
+            ),
+        )
+
+
+def test_draft_reservation_party_of_strangers(reservation_svc: ReservationService):
+    """Users without permission to manage reservations may only reserve for themselves."""
+    with pytest.raises(UserPermissionException):
+        reservation_svc.draft_reservation(
+            user_data.leader,
+            reservation_data.test_request(
+                {
+                    "users": [
+                        UserIdentity(id=user_data.leader.id),
+                        UserIdentity(id=user_data.user_org_members.id),
+                    ],
+                    "seats": [
+                        SeatIdentity(id=seat_data.monitor_seat_10.id),
+                        SeatIdentity(id=seat_data.monitor_seat_11.id),
+                    ],
+                }
+            ),
+        )
+
+
+def test_draft_reservation_party_exceeds_room_capacity(
     reservation_svc: ReservationService,
 ):
-    with pytest.raises(NotImplementedError):
+    with pytest.raises(ReservationException):
         reservation_svc.draft_reservation(
             user_data.ambassador,
             reservation_data.test_request(
                 {
                     "users": [
-                        UserIdentity(**user_data.root.model_dump()),
-                        UserIdentity(**user_data.ambassador.model_dump()),
-                    ]
+                        UserIdentity(id=user_data.root.id),
+                        UserIdentity(id=user_data.ambassador.id),
+                        UserIdentity(id=user_data.leader.id),
+                    ],
+                    "seats": [],
+                    "room": RoomPartial(id=room_data.pair_a.id),
+                }
+            ),
+        )
+
+
+def test_draft_reservation_party_too_few_seats(reservation_svc: ReservationService):
+    with pytest.raises(ReservationException):
+        reservation_svc.draft_reservation(
+            user_data.ambassador,
+            reservation_data.test_request(
+                {
+                    "users": [
+                        UserIdentity(id=user_data.root.id),
+                        UserIdentity(id=user_data.ambassador.id),
+                    ],
+                    "seats": [SeatIdentity(id=seat_data.monitor_seat_01.id)],
                 }
             ),
         )
@@ -0,0 +1,260 @@
+"""ReservationService#change_reservation tests of extending reservations."""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import create_autospec
+from sqlalchemy.orm import Session
+
+from .....entities import UserEntity
+from .....entities.coworking import ReservationEntity, SeatEntity
+from .....models.coworking import ReservationPartial, ReservationState
+from .....services.coworking import PolicyService, ReservationService
+from .....services.coworking.reservation import ReservationException
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ...room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from ... import room_data
+from .. import seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def ending_soon(session: Session, time: dict[str, datetime]) -> ReservationEntity:
+    """The checked in reservation_1, made to end within the extend window."""
+    entity = session.get(ReservationEntity, reservation_data.reservation_1.id)
+    assert entity is not None
+    entity.end = time[NOW] + FIVE_MINUTES
+    session.commit()
+    return entity
+
+
+def _extend(
+    reservation_svc: ReservationService, entity: ReservationEntity, end: datetime
+):
+    return reservation_svc.change_reservation(
+        user_data.user, ReservationPartial(id=entity.id, end=end)
+    )
+
+
+def test_extend(reservation_svc: ReservationService, ending_soon: ReservationEntity):
+    end = ending_soon.end + THIRTY_MINUTES
+    version = ending_soon.version
+    extended = _extend(reservation_svc, ending_soon, end)
+    assert extended.end == end
+    assert extended.state == ReservationState.CHECKED_IN
+    assert extended.version == version + 1
+
+
+def test_extend_before_window(
+    reservation_svc: ReservationService, time: dict[str, datetime]
+):
+    entity = reservation_svc._session.get(
+        ReservationEntity, reservation_data.reservation_1.id
+    )
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, entity, time[IN_ONE_HOUR])  # type: ignore
+
+
+def test_extend_too_long(
+    reservation_svc: ReservationService,
+    policy_svc: PolicyService,
+    ending_soon: ReservationEntity,
+):
+    end = ending_soon.end + policy_svc.extend_duration(user_data.user) + ONE_MINUTE
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, end)
+
+
+def test_extend_earlier(
+    reservation_svc: ReservationService, ending_soon: ReservationEntity
+):
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, ending_soon.end - ONE_MINUTE)
+
+
+def test_extend_draft(reservation_svc: ReservationService):
+    entity = reservation_svc._session.get(
+        ReservationEntity, reservation_data.reservation_5.id
+    )
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, entity, entity.end + ONE_MINUTE)  # type: ignore
+
+
+def test_extend_until_next_reservation(
+    session: Session,
+    reservation_svc: ReservationService,
+    ending_soon: ReservationEntity,
+):
+    next_start = ending_soon.end + THIRTY_MINUTES
+    session.add(
+        ReservationEntity(
+            state=ReservationState.CONFIRMED,
+            start=next_start,
+            end=next_start + ONE_HOUR,
+            walkin=False,
+            users=[session.get(type(ending_soon.users[0]), user_data.ambassador.id)],
+            seats=[session.get(SeatEntity, seat_data.monitor_seat_00.id)],
+        )
+    )
+    session.commit()
+
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, next_start + ONE_MINUTE)
+    assert _extend(reservation_svc, ending_soon, next_start).end == next_start
+
+
+def test_extend_past_lapsed_draft(
+    session: Session,
+    reservation_svc: ReservationService,
+    policy_svc: PolicyService,
+    ending_soon: ReservationEntity,
+    time: dict[str, datetime],
+):
+    """Drafts past the draft timeout do not hold the seats they drafted."""
+    next_start = ending_soon.end + THIRTY_MINUTES
+    draft = ReservationEntity(
+        state=ReservationState.DRAFT,
+        start=next_start,
+        end=next_start + ONE_HOUR,
+        walkin=False,
+        users=[session.get(UserEntity, user_data.ambassador.id)],
+        seats=[session.get(SeatEntity, seat_data.monitor_seat_00.id)],
+    )
+    session.add(draft)
+    session.flush()
+    draft.created_at = time[NOW] - policy_svc.reservation_draft_timeout() - ONE_MINUTE
+    session.commit()
+
+    end = next_start + ONE_MINUTE
+    assert _extend(reservation_svc, ending_soon, end).end == end
+
+
+def test_extend_room_within_weekly_limit(
+    session: Session,
+    reservation_svc: ReservationService,
+    policy_svc: PolicyService,
+    time: dict[str, datetime],
+):
+    """Extensions of room reservations count toward the weekly limit of their users."""
+    limit = policy_svc.room_reservation_weekly_limit(user_data.leader)
+    entity = ReservationEntity(
+        state=ReservationState.CHECKED_IN,
+        start=time[NOW] + FIVE_MINUTES - limit + THIRTY_MINUTES,
+        end=time[NOW] + FIVE_MINUTES,
+        walkin=False,
+        room_id=room_data.group_a.id,
+        users=[session.get(UserEntity, user_data.leader.id)],
+        seats=[],
+    )
+    session.add(entity)
+    session.commit()
+
+    with pytest.raises(ReservationException):
+        reservation_svc.change_reservation(
+            user_data.leader,
+            ReservationPartial(
+                id=entity.id, end=entity.end + THIRTY_MINUTES + ONE_MINUTE
+            ),
+        )
+    extended = reservation_svc.change_reservation(
+        user_data.leader,
+        ReservationPartial(id=entity.id, end=entity.end + THIRTY_MINUTES),
+    )
+    assert extended.end == time[NOW] + FIVE_MINUTES + THIRTY_MINUTES
+
+
+def test_extend_beyond_operating_hours(
+    reservation_svc: ReservationService,
+    policy_svc: PolicyService,
+    ending_soon: ReservationEntity,
+    time: dict[str, datetime],
+):
+    policy_mock = create_autospec(PolicyService)
+    policy_mock.extend_window.return_value = policy_svc.extend_window(user_data.user)
+    policy_mock.extend_duration.return_value = ONE_DAY
+    reservation_svc._policy_svc = policy_mock
+
+    with pytest.raises(ReservationException):
+        _extend(reservation_svc, ending_soon, time[IN_THREE_HOURS] + ONE_MINUTE)
+
+
+def test_extend_room_beyond_operating_hours(
+    session: Session,
+    reservation_svc: ReservationService,
+    policy_svc: PolicyService,
+    time: dict[str, datetime],
+):
+    """Room reservations are extended only within operating hours, as seats are."""
+    entity = ReservationEntity(
+        state=ReservationState.CHECKED_IN,
+        start=time[IN_THREE_HOURS] - ONE_HOUR,
+        end=time[IN_THREE_HOURS] - FIVE_MINUTES,
+        walkin=False,
+        room_id=room_data.group_a.id,
+        users=[session.get(UserEntity, user_data.leader.id)],
+        seats=[],
+    )
+    session.add(entity)
+    session.commit()
+
+    policy_mock = create_autospec(PolicyService)
+    policy_mock.extend_window.return_value = ONE_DAY
+    policy_mock.extend_duration.return_value = ONE_DAY
+    reservation_svc._policy_svc = policy_mock
+
+    with pytest.raises(ReservationException):
+        reservation_svc.change_reservation(
+            user_data.leader,
+            ReservationPartial(id=entity.id, end=time[IN_THREE_HOURS] + ONE_MINUTE),
+        )
+
+
+def test_extend_holds_seats_from_drafts(
+    session: Session,
+    reservation_svc: ReservationService,
+    ending_soon: ReservationEntity,
+):
+    """Drafts of the seat wait for an uncommitted extension to commit."""
+    _extend(reservation_svc, ending_soon, ending_soon.end + THIRTY_MINUTES)
+
+    def draft_lock():
+        with Session(session.get_bind()) as draft_session:
+            ReservationService(
+                draft_session,
+                reservation_svc._permission_svc,
+                reservation_svc._policy_svc,
+                reservation_svc._operating_hours_svc,
+                reservation_svc._seat_svc,
+            )._lock_reservables([seat_data.monitor_seat_00.id], None)
+            draft_session.rollback()
+
+    with ThreadPoolExecutor(1) as executor:
+        waiting = executor.submit(draft_lock)
+        with pytest.raises(TimeoutError):
+            waiting.result(timeout=0.5)
+        session.commit()
+        waiting.result(timeout=10)
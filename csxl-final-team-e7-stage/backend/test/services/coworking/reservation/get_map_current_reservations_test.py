@@ -104,23 +104,20 @@ def test_round_idx_calculation(reservation_svc: ReservationService):
     time2 = datetime.now().replace(hour=18, minute=0)
     time3 = datetime.now().replace(hour=10, minute=1)
     time4 = datetime.now().replace(hour=18, minute=14)
-    rounded_time = reservation_svc._round_to_closest_half_hour(time, True)
-    rounded_time2 = reservation_svc._round_to_closest_half_hour(time2, False)
-    rounded_time3 = reservation_svc._round_to_closest_half_hour(time3, True)
-    rounded_time4 = reservation_svc._round_to_closest_half_hour(time4, False)
+    rounded_time = reservation_svc._round_to_slot(time, True)
+    rounded_time2 = reservation_svc._round_to_slot(time2, False)
+    rounded_time3 = reservation_svc._round_to_slot(time3, True)
+    rounded_time4 = reservation_svc._round_to_slot(time4, False)
 
     assert rounded_time.hour == 10 and rounded_time.minute == 0
     assert rounded_time2.hour == 18 and rounded_time2.minute == 0
     assert rounded_time3.hour == 10 and rounded_time3.minute == 30
     assert rounded_time4.hour == 18 and rounded_time4.minute == 0 
 
-def test_query_confirmed_reservations_by_date_and_room(
-    reservation_svc: ReservationService, time: dict[str, datetime]
-):
-    """Test getting all reservations for a particular date."""
-    reservations = reservation_svc._query_confirmed_reservations_by_date_and_room(time[NOW], None)
-    assert True
-    #TODO: Add in better assert statements here. 
+    # Times already on a slot boundary are left as they are
+    on_boundary = datetime.now().replace(hour=10, minute=30)
+    assert reservation_svc._round_to_slot(on_boundary, True).minute == 30
+    assert reservation_svc._round_to_slot(on_boundary, False).minute == 30
 
 def test_get_reservable_rooms(reservation_svc: ReservationService):
     # Hardcoded for now, and this might change depending on which rooms are labeled as reservable.
@@ -131,13 +128,6 @@ def test_get_reservable_rooms(reservation_svc: ReservationService):
     assert rooms[3].id == 'SN141' and rooms[3].reservable is True
 
 
-def test_query_xl_reservations_by_date_for_user(reservation_svc: ReservationService, time: dict[str, datetime]):
-    reservations = reservation_svc._query_xl_reservations_by_date_for_user(time[NOW], user_data.user)
-    assert len(reservations) == 1
-    assert reservations[0].room is None
-    assert reservations[0].users[0].first_name == 'Sally'
-
-
 def test_get_map_reserved_times_by_date(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
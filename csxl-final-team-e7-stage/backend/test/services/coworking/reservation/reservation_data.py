@@ -7,6 +7,7 @@ from .....entities.coworking import ReservationEntity
 from .....models.coworking import Reservation, ReservationState, ReservationRequest
 from .....models.user import UserIdentity
 from .....models.coworking.seat import SeatIdentity
+from .....services.coworking import room_grid
 from ..time import *
 
 from ...core_data import user_data
@@ -159,7 +160,11 @@ def test_request(overrides: dict | None = None) -> ReservationRequest:
 
 
 @pytest.fixture(autouse=True)
-def fake_data_fixture(session: Session, time: dict[str, datetime]):
+def fake_data_fixture(
+    session: Session, time: dict[str, datetime], monkeypatch: pytest.MonkeyPatch
+):
+    # Room grids are cached process-wide; start each test with an empty cache.
+    monkeypatch.setattr(room_grid, "_cache", room_grid.RoomGridCache())
     insert_fake_data(session, time)
     session.commit()
 
@@ -0,0 +1,142 @@
+"""Tests for the shared room grid behind ReservationService#get_map_reserved_times_by_date."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from .....entities import UserEntity
+from .....entities.coworking import (
+    OperatingHoursEntity,
+    ReservationEntity,
+    SeatEntity,
+)
+from .....models.coworking import ReservationPartial, ReservationState, RoomState
+from .....services.coworking import ReservationService
+from .....services.coworking.room_grid import room_grids
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from ..fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ...room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import seat_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+AVAILABLE = RoomState.AVAILABLE.value
+RESERVED = RoomState.RESERVED.value
+UNAVAILABLE = RoomState.UNAVAILABLE.value
+SUBJECT_RESERVED = RoomState.SUBJECT_RESERVED.value
+
+# Slot indexes, in half hours from 10am, of the reservations inserted below
+NOON, TWO_PM, FOUR_PM = 4, 8, 12
+
+
+@pytest.fixture()
+def next_week(session: Session, time: dict[str, datetime]) -> datetime:
+    """Opens a week from today from 10am to 6pm with three reservations:
+
+    1. Sally Student in SN135 from noon to 1pm
+    2. Amy Ambassador in SN137 from 2pm to 3pm
+    3. Sally Student in the XL from 4pm to 5pm
+    """
+    day = time[MIDNIGHT_TODAY] + 7 * ONE_DAY
+    session.add(
+        OperatingHoursEntity(start=day.replace(hour=10), end=day.replace(hour=18))
+    )
+    for user, room_id, hour, seats in [
+        (user_data.user, "SN135", 12, []),
+        (user_data.ambassador, "SN137", 14, []),
+        (user_data.user, None, 16, [seat_data.reservable_seats[0].id]),
+    ]:
+        session.add(
+            ReservationEntity(
+                start=day.replace(hour=hour),
+                end=day.replace(hour=hour + 1),
+                state=ReservationState.CONFIRMED,
+                walkin=False,
+                room_id=room_id,
+                users=[session.get(UserEntity, user.id)],
+                seats=[session.get(SeatEntity, seat_id) for seat_id in seats],
+            )
+        )
+    session.commit()
+    return day
+
+
+def test_overlay_marks_subject_reservations(
+    reservation_svc: ReservationService, next_week: datetime
+):
+    reserved_date_map = reservation_svc.get_map_reserved_times_by_date(
+        next_week, user_data.user
+    ).reserved_date_map
+    assert "SN156" not in reserved_date_map
+    assert reserved_date_map["SN135"][NOON : NOON + 2] == [SUBJECT_RESERVED] * 2
+    assert reserved_date_map["SN137"][TWO_PM : TWO_PM + 2] == [RESERVED] * 2
+    for room_id in ["SN137", "SN139", "SN141"]:
+        assert reserved_date_map[room_id][NOON : NOON + 2] == [UNAVAILABLE] * 2
+    for row in reserved_date_map.values():
+        assert row[FOUR_PM : FOUR_PM + 2] == [UNAVAILABLE] * 2
+    assert reserved_date_map["SN139"][:NOON] == [AVAILABLE] * NOON
+
+
+def test_grid_is_shared_between_subjects(
+    reservation_svc: ReservationService, next_week: datetime
+):
+    reservation_svc.get_map_reserved_times_by_date(next_week, user_data.user)
+    assert len(room_grids()) == 1
+    reserved_date_map = reservation_svc.get_map_reserved_times_by_date(
+        next_week, user_data.ambassador
+    ).reserved_date_map
+    assert len(room_grids()) == 1
+    assert reserved_date_map["SN135"][NOON : NOON + 2] == [RESERVED] * 2
+    assert reserved_date_map["SN137"][TWO_PM : TWO_PM + 2] == [SUBJECT_RESERVED] * 2
+    assert reserved_date_map["SN139"][NOON : NOON + 2] == [AVAILABLE] * 2
+    assert reserved_date_map["SN139"][TWO_PM : TWO_PM + 2] == [UNAVAILABLE] * 2
+    assert reserved_date_map["SN139"][FOUR_PM : FOUR_PM + 2] == [AVAILABLE] * 2
+
+
+def test_cancelling_room_reservation_invalidates_grid(
+    reservation_svc: ReservationService, session: Session, next_week: datetime
+):
+    reservation_svc.get_map_reserved_times_by_date(next_week, user_data.ambassador)
+    reservation_id = session.scalars(
+        select(ReservationEntity.id).where(
+            ReservationEntity.room_id == "SN135",
+            ReservationEntity.start >= next_week,
+        )
+    ).one()
+    reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(id=reservation_id, state=ReservationState.CANCELLED),
+    )
+    assert len(room_grids()) == 0
+    reserved_date_map = reservation_svc.get_map_reserved_times_by_date(
+        next_week, user_data.ambassador
+    ).reserved_date_map
+    assert reserved_date_map["SN135"][NOON : NOON + 2] == [AVAILABLE] * 2
+
+
+def test_writes_on_other_dates_keep_grid(
+    reservation_svc: ReservationService, next_week: datetime
+):
+    reservation_svc.get_map_reserved_times_by_date(next_week, user_data.user)
+    room_grids().invalidate(next_week - ONE_DAY, next_week)
+    assert len(room_grids()) == 1
+    room_grids().invalidate(next_week + ONE_DAY, next_week + 2 * ONE_DAY)
+    assert len(room_grids()) == 1
@@ -1,11 +1,16 @@
 """ReservationService#get_seat_reservations tests."""
 
+import pytest
 from unittest.mock import create_autospec, call
 
 from .....services.coworking import ReservationService
 from .....services import PermissionService
 from .....models.coworking import Reservation
-from .....services.exceptions import ResourceNotFoundException, UserPermissionException
+from .....services.exceptions import (
+    ResourceNotFoundException,
+    UserPermissionException,
+    VersionConflictException,
+)
 from .....services.coworking.reservation import ReservationException
 from .....models.coworking import ReservationState
 
@@ -64,6 +69,15 @@ def test_staff_checkin_idempotence(
     assert reservation.state == ReservationState.CHECKED_IN
 
 
+def test_staff_checkin_stale_version(
+    reservation_svc: ReservationService,
+):
+    """A check-in of a reservation read before it was changed is a conflict."""
+    stale = reservation_data.reservation_4.model_copy(update={"version": 0})
+    with pytest.raises(VersionConflictException):
+        reservation_svc.staff_checkin_reservation(user_data.ambassador, stale)
+
+
 def test_staff_checkin_not_found(
     reservation_svc: ReservationService, time: dict[str, datetime]
 ):
@@ -0,0 +1,222 @@
+"""Tests for maintaining utilization rollups and reporting from them."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+from .....entities.coworking import (
+    ReservationEntity,
+    RoomUtilizationEntity,
+    SeatUtilizationEntity,
+)
+from .....models.coworking import ReservationPartial, ReservationState, TimeRange
+from .....services import UserPermissionException
+from .....services.coworking import (
+    PolicyService,
+    ReservationService,
+    UtilizationService,
+)
+from .....services.coworking.policy import current_policies
+from .....services.coworking.utilization import backfill
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+# Dependent fixtures (seat_svc) are required to be imported in the testing module.
+from ..fixtures import (
+    reservation_svc,
+    permission_svc,
+    seat_svc,
+    policy_svc,
+    operating_hours_svc,
+    utilization_svc,
+)
+from ..time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+# Since there are relationship dependencies between the entities, order matters.
+from ...core_data import setup_insert_data_fixture as insert_order_0
+from ..operating_hours_data import fake_data_fixture as insert_order_1
+from ...room_data import fake_data_fixture as insert_order_2
+from ..seat_data import fake_data_fixture as insert_order_3
+from .reservation_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from ...core_data import user_data
+from .. import seat_data
+from . import reservation_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+def _rollups(session: Session) -> dict[tuple, tuple[int, int, int]]:
+    rows: dict[tuple, tuple[int, int, int]] = {}
+    for entity, key in (
+        (SeatUtilizationEntity, SeatUtilizationEntity.seat_id),
+        (RoomUtilizationEntity, RoomUtilizationEntity.room_id),
+    ):
+        for row in session.execute(
+            select(
+                key,
+                entity.hour,
+                entity.reserved_minutes,
+                entity.checked_in_minutes,
+                entity.no_shows,
+            )
+        ):
+            rows[(row[0], row[1])] = tuple(row[2:])
+    return rows
+
+
+def _totals(session: Session, seat_id: int) -> tuple[int, int, int]:
+    totals = [0, 0, 0]
+    for (key, _), measures in _rollups(session).items():
+        if key == seat_id:
+            totals = [total + value for total, value in zip(totals, measures)]
+    return tuple(totals)  # type: ignore
+
+
+def test_checkout_by_time_is_recorded_once(
+    session: Session, reservation_svc: ReservationService
+):
+    seat_id = seat_data.monitor_seat_00.id
+    entity = session.get(ReservationEntity, reservation_data.reservation_1.id)
+    assert entity is not None
+
+    # A concurrent request observing the same expiration is not recorded again
+    with Session(session.get_bind()) as other_session:
+        other = other_session.get(ReservationEntity, entity.id)
+        assert other is not None
+        reservation_svc._state_transition_reservation_entities_by_time(
+            entity.end, [entity]
+        )
+        assert entity.state == ReservationState.CHECKED_OUT
+        assert entity.version == 2
+        session.commit()
+
+        other_svc = ReservationService(
+            other_session,
+            reservation_svc._permission_svc,
+            reservation_svc._policy_svc,
+            reservation_svc._operating_hours_svc,
+            reservation_svc._seat_svc,
+        )
+        assert (
+            other_svc._state_transition_reservation_entities_by_time(other.end, [other])
+            == []
+        )
+        assert other.state == ReservationState.CHECKED_OUT
+        other_session.commit()
+
+    reserved, checked_in, no_shows = _totals(session, seat_id)
+    assert 59 <= reserved <= 60
+    assert checked_in == reserved
+    assert no_shows == 0
+
+
+def test_no_show_is_recorded(
+    session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
+):
+    entity = session.get(ReservationEntity, reservation_data.reservation_4.id)
+    assert entity is not None
+    reservation_svc._state_transition_reservation_entities_by_time(
+        entity.start + policy_svc.reservation_checkin_timeout() + ONE_MINUTE,
+        [entity],
+    )
+    assert entity.state == ReservationState.CANCELLED
+    for seat in reservation_data.reservation_4.seats:
+        reserved, checked_in, no_shows = _totals(session, seat.id)
+        assert 29 <= reserved <= 30
+        assert (checked_in, no_shows) == (0, 1)
+
+
+def test_lapsed_draft_is_not_recorded(
+    session: Session, reservation_svc: ReservationService, policy_svc: PolicyService
+):
+    entity = session.get(ReservationEntity, reservation_data.reservation_5.id)
+    assert entity is not None
+    reservation_svc._state_transition_reservation_entities_by_time(
+        entity.created_at + policy_svc.reservation_draft_timeout() + ONE_MINUTE,
+        [entity],
+    )
+    assert entity.state == ReservationState.CANCELLED
+    assert _rollups(session) == {}
+
+
+def test_checkout_by_change_is_recorded(
+    session: Session, reservation_svc: ReservationService
+):
+    reservation_svc.change_reservation(
+        user_data.user,
+        ReservationPartial(
+            id=reservation_data.reservation_1.id, state=ReservationState.CHECKED_OUT
+        ),
+    )
+    reserved, checked_in, _ = _totals(session, seat_data.monitor_seat_00.id)
+    assert 29 <= reserved <= 30
+    assert checked_in == reserved
+
+
+def test_backfill_agrees_with_recorded(
+    session: Session,
+    reservation_svc: ReservationService,
+    time: dict[str, datetime],
+):
+    entity = session.get(ReservationEntity, reservation_data.reservation_1.id)
+    reservation_svc._state_transition_reservation_entities_by_time(
+        entity.end, [entity]  # type: ignore
+    )
+    recorded = _rollups(session)
+
+    span = TimeRange(start=time[A_WEEK_AGO], end=time[TOMORROW] + ONE_DAY)
+    written = backfill(session, span)
+    rebuilt = _rollups(session)
+    assert written == len(rebuilt)
+
+    # The fake checked out reservation, but not the cancelled one, is added
+    checked_out = {
+        key: measures
+        for key, measures in rebuilt.items()
+        if key[0] == seat_data.monitor_seat_01.id
+    }
+    assert {key: rebuilt[key] for key in recorded} == recorded
+    assert set(rebuilt) == set(recorded) | set(checked_out)
+    assert all(key[0] != seat_data.monitor_seat_10.id for key in rebuilt)
+
+    assert backfill(session, span) == written
+    assert _rollups(session) == rebuilt
+
+
+def test_backfill_leaves_policies_current(session: Session, time: dict[str, datetime]):
+    snapshot = current_policies()
+    backfill(session, TimeRange(start=time[A_WEEK_AGO], end=time[NOW]))
+    assert current_policies() is snapshot
+
+
+def test_get_report(
+    session: Session,
+    utilization_svc: UtilizationService,
+    time: dict[str, datetime],
+):
+    span = TimeRange(start=time[A_WEEK_AGO], end=time[TOMORROW] + ONE_DAY)
+    backfill(session, span)
+    report = utilization_svc.get_report(user_data.root, span)
+
+    reserved = sum(row.reserved_minutes for row in report.seats_by_hour)
+    assert 59 <= reserved <= 60
+    assert sum(row.reserved_minutes for row in report.seats_by_weekday) == reserved
+    assert [
+        (row.has_monitor, row.sit_stand, row.checked_in_minutes)
+        for row in report.seats_by_type
+    ] == [(True, True, reserved)]
+    assert report.rooms == []
+
+
+def test_get_report_requires_permission(
+    utilization_svc: UtilizationService, time: dict[str, datetime]
+):
+    with pytest.raises(UserPermissionException):
+        utilization_svc.get_report(
+            user_data.ambassador, TimeRange(start=time[AN_HOUR_AGO], end=time[NOW])
+        )
@@ -0,0 +1,173 @@
+"""Tests for RoomSearchService."""
+
+import pytest
+from datetime import time as time_of_day
+from sqlalchemy.orm import Session
+from types import MappingProxyType
+from ....entities import UserEntity
+from ....entities.coworking import OperatingHoursEntity, ReservationEntity, SeatEntity
+from ....models.coworking import ReservationState
+from ....services.coworking import RoomSearchService, policy
+from ....services.coworking.policy import PolicySnapshot
+from ....services.coworking.reservation import ReservationException
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import (
+    room_search_svc,
+    permission_svc,
+    policy_svc,
+    operating_hours_svc,
+)
+from .time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+from ..core_data import setup_insert_data_fixture as insert_order_0
+from .operating_hours_data import fake_data_fixture as insert_order_1
+from ..room_data import fake_data_fixture as insert_order_2
+from .seat_data import fake_data_fixture as insert_order_3
+
+# Import the fake model data in a namespace for test assertions
+from ..core_data import user_data
+from . import seat_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture(autouse=True)
+def office_hours(time: dict[str, datetime], monkeypatch: pytest.MonkeyPatch):
+    """Holds SN141 (capacity 6) for office hours from 10am to 11am four days from today."""
+    weekday = (time[MIDNIGHT_TODAY] + 4 * ONE_DAY).weekday()
+    office_hours = {"SN141": ((time_of_day(10), time_of_day(11)),)}
+    monkeypatch.setattr(
+        policy,
+        "_snapshot",
+        PolicySnapshot(office_hours=MappingProxyType({weekday: office_hours})),
+    )
+
+
+@pytest.fixture()
+def search_day(session: Session, time: dict[str, datetime]) -> datetime:
+    """Opens four days from today from 10am to 6pm, where:
+
+    1. Amy Ambassador has reserved SN135 (capacity 4) from 10am to noon
+    2. Sally Student has reserved an XL seat from 3pm to 4pm
+    """
+    day = time[MIDNIGHT_TODAY] + 4 * ONE_DAY
+    session.add(
+        OperatingHoursEntity(start=day.replace(hour=10), end=day.replace(hour=18))
+    )
+    session.add(
+        ReservationEntity(
+            start=day.replace(hour=10),
+            end=day.replace(hour=12),
+            state=ReservationState.CONFIRMED,
+            walkin=False,
+            room_id="SN135",
+            users=[session.get(UserEntity, user_data.ambassador.id)],
+            seats=[],
+        )
+    )
+    session.add(
+        ReservationEntity(
+            start=day.replace(hour=15),
+            end=day.replace(hour=16),
+            state=ReservationState.CONFIRMED,
+            walkin=False,
+            room_id=None,
+            users=[session.get(UserEntity, user_data.user.id)],
+            seats=[session.get(SeatEntity, seat_data.reservable_seats[0].id)],
+        )
+    )
+    session.commit()
+    return day
+
+
+def _search(
+    room_search_svc: RoomSearchService, day: datetime, **kwargs
+) -> list[tuple[str, int, int]]:
+    """Search a single day from 9am, returning (room, start hour, start minute) of each slot."""
+    options = {
+        "duration": ONE_HOUR,
+        "earliest": time_of_day(9),
+        "capacity": 4,
+        "limit": 5,
+    } | kwargs
+    subject = options.pop("subject", user_data.root)
+    slots = room_search_svc.search(
+        subject, first_day=day.date(), last_day=day.date(), **options
+    )
+    return [(slot.room.id, slot.start.hour, slot.start.minute) for slot in slots]
+
+
+def test_search_earliest_and_best_fit_first(
+    room_search_svc: RoomSearchService, search_day: datetime
+):
+    assert _search(room_search_svc, search_day) == [
+        ("SN137", 10, 0),
+        ("SN137", 11, 0),
+        ("SN141", 11, 0),
+        ("SN135", 12, 0),
+        ("SN137", 12, 0),
+    ]
+
+
+def test_search_capacity(room_search_svc: RoomSearchService, search_day: datetime):
+    assert _search(room_search_svc, search_day, capacity=5, limit=2) == [
+        ("SN141", 11, 0),
+        ("SN141", 12, 0),
+    ]
+
+
+def test_search_time_of_day_window(
+    room_search_svc: RoomSearchService, search_day: datetime
+):
+    slots = _search(
+        room_search_svc,
+        search_day,
+        duration=2 * ONE_HOUR,
+        earliest=time_of_day(12, 15),
+        latest=time_of_day(15),
+        limit=10,
+    )
+    assert slots == [("SN135", 12, 30), ("SN137", 12, 30), ("SN141", 12, 30)]
+
+
+def test_search_excludes_subject_reservations(
+    room_search_svc: RoomSearchService, search_day: datetime
+):
+    slots = _search(
+        room_search_svc,
+        search_day,
+        subject=user_data.user,
+        earliest=time_of_day(14),
+        limit=3,
+    )
+    assert slots == [("SN135", 14, 0), ("SN137", 14, 0), ("SN141", 14, 0)]
+    slots = _search(
+        room_search_svc,
+        search_day,
+        subject=user_data.user,
+        earliest=time_of_day(14, 30),
+        limit=3,
+    )
+    assert slots == [("SN135", 16, 0), ("SN137", 16, 0), ("SN141", 16, 0)]
+
+
+def test_search_past_days_are_skipped(
+    room_search_svc: RoomSearchService, time: dict[str, datetime]
+):
+    yesterday = (time[NOW] - ONE_DAY).date()
+    assert room_search_svc.search(user_data.root, ONE_HOUR, yesterday, yesterday) == []
+
+
+def test_search_duration_limits(
+    room_search_svc: RoomSearchService, search_day: datetime
+):
+    with pytest.raises(ReservationException):
+        _search(room_search_svc, search_day, duration=FIVE_MINUTES)
+    with pytest.raises(ReservationException):
+        _search(room_search_svc, search_day, duration=3 * ONE_HOUR)
+    with pytest.raises(ReservationException):
+        _search(room_search_svc, search_day, duration=ONE_HOUR + FIVE_MINUTES * 3)
@@ -0,0 +1,204 @@
+"""Tests for the request-scoped unit of work of database sessions and read routing."""
+
+import pytest
+from datetime import timedelta
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine, create_engine, select, text
+from sqlalchemy.exc import InvalidRequestError
+from sqlalchemy.orm import Session
+from ... import database
+from ...api import room
+from ...entities import EntityBase, RoleEntity, RoomEntity
+from ...services import response_cache
+from .conftest import POSTGRES_DATABASE
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def request_session(
+    session: Session, test_engine: Engine, monkeypatch: pytest.MonkeyPatch
+):
+    """The db_session dependency, opening sessions on the test database."""
+    monkeypatch.setattr(database, "engine", test_engine)
+    return database.db_session()
+
+
+def _role_names(session: Session) -> list[str]:
+    session.rollback()
+    return list(session.scalars(select(RoleEntity.name)))
+
+
+def test_db_session_commits_once_request_completes(session: Session, request_session):
+    request = next(request_session)
+    request.add(RoleEntity(name="staff"))
+    request.flush()
+    assert _role_names(session) == []
+    with pytest.raises(StopIteration):
+        next(request_session)
+    assert _role_names(session) == ["staff"]
+
+
+def test_db_session_rolls_back_when_request_raises(session: Session, request_session):
+    request = next(request_session)
+    request.add(RoleEntity(name="staff"))
+    request.flush()
+    with pytest.raises(ValueError):
+        request_session.throw(ValueError())
+    assert _role_names(session) == []
+
+
+def test_checkpoint_commits_before_request_completes(session: Session, request_session):
+    request = next(request_session)
+    request.add(RoleEntity(name="staff"))
+    database.checkpoint(request)
+    with pytest.raises(ValueError):
+        request_session.throw(ValueError())
+    assert _role_names(session) == ["staff"]
+
+
+def test_after_commit_callbacks(session: Session):
+    calls = []
+    session.add(RoleEntity(name="staff"))
+    session.flush()
+    database.after_commit(session, lambda: calls.append("rolled back"))
+    session.rollback()
+    database.after_commit(session, lambda: calls.append("committed"))
+    session.commit()
+    session.commit()
+    assert calls == ["committed"]
+
+
+@pytest.fixture(scope="session")
+def replica_engine() -> Engine:
+    """A second local database standing in for a streaming read replica."""
+    replica_database = f"{POSTGRES_DATABASE}_replica"
+    server = create_engine(database._engine_str(""), isolation_level="AUTOCOMMIT")
+    with server.connect() as connection:
+        connection.execute(text(f"DROP DATABASE IF EXISTS {replica_database}"))
+        connection.execute(text(f"CREATE DATABASE {replica_database}"))
+    server.dispose()
+    return create_engine(database._engine_str(replica_database))
+
+
+@pytest.fixture()
+def client(
+    session: Session,
+    test_engine: Engine,
+    replica_engine: Engine,
+    monkeypatch: pytest.MonkeyPatch,
+):
+    """An app routing room reads to the replica, which has different rooms than the primary.
+
+    Room listings are not cached, so that every request reads from the database."""
+    monkeypatch.setattr(database, "engine", test_engine)
+    monkeypatch.setattr(database, "read_engine", replica_engine)
+    monkeypatch.setattr(database, "_primary_pins", {})
+    monkeypatch.setattr(response_cache, "RESPONSE_CACHE_TTL", timedelta(0))
+    monkeypatch.setattr(response_cache, "_cache", response_cache.ResponseCache())
+    session.add(
+        RoomEntity(
+            id="SN135",
+            building="Sitterson",
+            room="135",
+            nickname="The Nest",
+            capacity=4,
+            reservable=True,
+        )
+    )
+    session.commit()
+    EntityBase.metadata.drop_all(replica_engine)
+    EntityBase.metadata.create_all(replica_engine)
+    with Session(replica_engine) as replica:
+        replica.add(
+            RoomEntity(
+                id="SN137",
+                building="Sitterson",
+                room="137",
+                nickname="The Roost",
+                capacity=4,
+                reservable=True,
+            )
+        )
+        replica.commit()
+
+    app = FastAPI()
+    app.add_middleware(database.UnitOfWorkMiddleware)
+    app.include_router(room.api)
+
+    @app.post("/roles")
+    def create_role(session: Session = Depends(database.db_session)) -> None:
+        session.add(RoleEntity(name="staff"))
+        session.flush()
+
+    @app.post("/roles/duplicate")
+    def create_duplicate_roles(session: Session = Depends(database.db_session)) -> None:
+        # Only flushed, and so found to violate the role name's uniqueness, on commit
+        session.add_all([RoleEntity(name="staff"), RoleEntity(name="staff")])
+
+    return TestClient(app, raise_server_exceptions=False)
+
+
+def _room_ids(client: TestClient, token: str | None = None) -> list[str]:
+    headers = {} if token is None else {"Authorization": f"Bearer {token}"}
+    return [room["id"] for room in client.get("/api/room", headers=headers).json()]
+
+
+def test_read_only_services_read_from_replica(client: TestClient):
+    assert _room_ids(client) == ["SN137"]
+    assert _room_ids(client, "amy") == ["SN137"]
+
+
+def test_writer_reads_own_writes_from_primary(client: TestClient):
+    client.post("/roles", headers={"Authorization": "Bearer amy"})
+    assert _room_ids(client, "amy") == ["SN135"]
+    assert _room_ids(client, "sally") == ["SN137"]
+    assert _room_ids(client) == ["SN137"]
+
+
+def test_pin_to_primary_expires(client: TestClient, monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(database, "READ_YOUR_WRITES_SECONDS", 0)
+    client.post("/roles", headers={"Authorization": "Bearer amy"})
+    assert _room_ids(client, "amy") == ["SN137"]
+
+
+def test_commit_precedes_response(session: Session, client: TestClient):
+    committed_when_sent: list[str] = []
+
+    async def observed(scope, receive, send):
+        async def observe_send(message):
+            if message["type"] == "http.response.start":
+                committed_when_sent.extend(_role_names(session))
+            await send(message)
+
+        await client.app(scope, receive, observe_send)
+
+    assert TestClient(observed).post("/roles").status_code == 200
+    assert committed_when_sent == ["staff"]
+
+
+def test_failed_commit_is_server_error(session: Session, client: TestClient):
+    response = client.post("/roles/duplicate", headers={"Authorization": "Bearer amy"})
+    assert response.status_code == 500
+    assert _role_names(session) == []
+    assert _room_ids(client, "amy") == ["SN137"]
+
+
+def test_read_session_without_replica_uses_primary(
+    session: Session, test_engine: Engine, monkeypatch: pytest.MonkeyPatch
+):
+    monkeypatch.setattr(database, "engine", test_engine)
+    monkeypatch.setattr(database, "read_engine", test_engine)
+    read_session = next(database.db_read_session())
+    assert read_session.get_bind() is test_engine
+
+
+def test_read_session_cannot_write(session: Session, test_engine: Engine, monkeypatch):
+    monkeypatch.setattr(database, "read_engine", test_engine)
+    read_session = next(database.db_read_session())
+    read_session.add(RoleEntity(name="staff"))
+    with pytest.raises(InvalidRequestError):
+        read_session.flush()
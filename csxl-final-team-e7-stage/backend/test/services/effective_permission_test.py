@@ -0,0 +1,109 @@
+"""Tests for maintaining the effective_permission table."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+
+# Tested Dependencies
+from ...entities import EffectivePermissionEntity
+from ...entities.effective_permission_entity import like_pattern, wildcard_free_prefix
+from ...models import Permission
+from ...services import PermissionService, RoleService
+from ...services import effective_permission
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+from .fixtures import permission_svc
+
+# Data Models for Fake Data Inserted in Setup
+from .role_data import ambassador_role
+from .user_data import root, ambassador, user
+from .permission_data import ambassador_permission
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def role_svc(session: Session, permission_svc: PermissionService):
+    return RoleService(session, permission_svc)
+
+
+def _effective_permissions(session: Session) -> set[tuple]:
+    return {
+        (
+            row.user_id,
+            row.permission_id,
+            row.role_id,
+            row.action_like,
+            row.resource_like,
+        )
+        for row in session.scalars(select(EffectivePermissionEntity))
+    }
+
+
+def _assert_rebuild_agrees(session: Session) -> None:
+    maintained = _effective_permissions(session)
+    effective_permission.rebuild(session)
+    assert _effective_permissions(session) == maintained
+
+
+def test_patterns():
+    assert wildcard_free_prefix("organization/*/members") == "organization/"
+    assert wildcard_free_prefix("*") == ""
+    assert wildcard_free_prefix("checkin") == "checkin"
+    assert like_pattern("role.add_member") == "role.add\\_member"
+    assert like_pattern("report/100%*") == "report/100\\%%"
+
+
+def test_grant_to_role_is_held_by_members(
+    session: Session, permission_svc: PermissionService
+):
+    permission_svc.grant(root, ambassador_role, Permission(action="a.*", resource="x"))
+    assert permission_svc.check(ambassador, "a.b", "x")
+    assert not permission_svc.check(user, "a.b", "x")
+    _assert_rebuild_agrees(session)
+
+
+def test_role_membership_changes(session: Session, role_svc: RoleService):
+    permission_svc = role_svc._permission
+    assert not permission_svc.check(user, "checkin.create", "checkin")
+    role_svc.add_member(root, ambassador_role.id, user)
+    assert permission_svc.check(user, "checkin.create", "checkin")
+    _assert_rebuild_agrees(session)
+
+    role_svc.remove_member(root, ambassador_role.id, user.id)
+    assert not permission_svc.check(user, "checkin.create", "checkin")
+    _assert_rebuild_agrees(session)
+
+
+def test_revoke_removes_from_members(
+    session: Session, permission_svc: PermissionService
+):
+    permission_svc.revoke(root, ambassador_permission)
+    assert not permission_svc.check(ambassador, "checkin.create", "checkin")
+    _assert_rebuild_agrees(session)
+
+
+def test_like_wildcards_match_literally(permission_svc: PermissionService):
+    permission_svc.grant(root, user, Permission(action="role.add_member", resource="*"))
+    assert permission_svc.check(user, "role.add_member", "role/1")
+    assert not permission_svc.check(user, "role.addXmember", "role/1")
+    assert not permission_svc.check(user, "role.add_members", "role/1")
+
+
+def test_get_user_ids_with_permission(permission_svc: PermissionService):
+    assert permission_svc.get_user_ids_with_permission("checkin.create", "checkin") == [
+        root.id,
+        ambassador.id,
+    ]
+    permission_svc.grant(
+        root, user, Permission(action="organization.*", resource="organization/cads")
+    )
+    assert permission_svc.get_user_ids_with_permission(
+        "organization.update", "organization/cads"
+    ) == [root.id, user.id]
+    assert permission_svc.get_user_ids_with_permission(
+        "organization.update", "organization/appteam"
+    ) == [root.id]
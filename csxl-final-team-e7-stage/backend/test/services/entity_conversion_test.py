@@ -0,0 +1,55 @@
+"""Tests that entities convert to the same models with and without validation."""
+
+import pytest
+from sqlalchemy import select
+from sqlalchemy.orm import Session
+from ...entities import (
+    EventEntity,
+    OrganizationEntity,
+    RoomEntity,
+    UserEntity,
+)
+from ...entities.academics import CourseEntity, SectionEntity, TermEntity
+from ...entities.coworking import OperatingHoursEntity, ReservationEntity, SeatEntity
+from ...models.trusted import validating
+from .coworking.time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+from .core_data import setup_insert_data_fixture as insert_order_0
+from .academics.term_data import fake_data_fixture as insert_order_1
+from .academics.course_data import fake_data_fixture as insert_order_2
+from .academics.section_data import fake_data_fixture as insert_order_3
+from .coworking.operating_hours_data import fake_data_fixture as insert_order_4
+from .room_data import fake_data_fixture as insert_order_5
+from .coworking.seat_data import fake_data_fixture as insert_order_6
+from .coworking.reservation.reservation_data import fake_data_fixture as insert_order_7
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+CONVERSIONS = [
+    (UserEntity, "to_model"),
+    (RoomEntity, "to_details_model"),
+    (TermEntity, "to_model"),
+    (CourseEntity, "to_details_model"),
+    (SectionEntity, "to_details_model"),
+    (OperatingHoursEntity, "to_model"),
+    (SeatEntity, "to_model"),
+    (ReservationEntity, "to_model"),
+    (EventEntity, "to_details_model"),
+    (OrganizationEntity, "to_details_model"),
+]
+
+
+@pytest.mark.parametrize("entity, method", CONVERSIONS)
+def test_constructed_models_equal_validated_models(
+    session: Session, entity, method: str
+):
+    entities = session.scalars(select(entity)).all()
+    assert entities
+    constructed = [getattr(row, method)() for row in entities]
+    with validating():
+        validated = [getattr(row, method)() for row in entities]
+    assert constructed == validated
@@ -9,6 +9,7 @@ from backend.services.exceptions import (
     EventRegistrationException,
     UserPermissionException,
     ResourceNotFoundException,
+    VersionConflictException,
 )
 from backend.services.organization import OrganizationService
 
@@ -17,8 +18,10 @@ from ....models.coworking.time_range import TimeRange
 from ..coworking.time import *
 
 # Tested Dependencies
+from ....entities import EventEntity
 from ....models import Event, EventDetails, EventPaginationParams
 from ....services import EventService
+from ....services import event as event_service_module
 
 # Injected Service Fixtures
 from ..fixtures import (
@@ -73,6 +76,15 @@ def test_get_all_unauthenticated(event_svc_integration: EventService):
     assert isinstance(fetched_events[0], EventDetails)
 
 
+def test_get_all_can_edit(event_svc_integration: EventService):
+    """Test that events note whether the subject can edit them."""
+    assert all(event.can_edit for event in event_svc_integration.all(root))
+    assert [event.can_edit for event in event_svc_integration.all(user)] == [
+        event.id == event_one.id for event in events
+    ]
+    assert not any(event.can_edit for event in event_svc_integration.all())
+
+
 def test_get_by_id(event_svc_integration: EventService):
     """Test that events can be retrieved based on their ID."""
     fetched_event = event_svc_integration.get_by_id(1, ambassador)
@@ -141,6 +153,41 @@ def test_get_events_in_time_range(event_svc_integration: EventService):
     assert len(events) == 3
 
 
+def test_stream(event_svc_integration: EventService):
+    """Test that streamed events are the events listed by `all`."""
+    assert list(event_svc_integration.stream(ambassador)) == (
+        event_svc_integration.all(ambassador)
+    )
+    assert list(event_svc_integration.stream()) == event_svc_integration.all()
+
+
+def test_stream_in_time_range(event_svc_integration: EventService):
+    """Test that streamed events in a time range are those listed in the range."""
+    time_range = TimeRange(
+        start=date_maker(days_in_future=1, hour=0, minutes=0),
+        end=date_maker(days_in_future=3, hour=0, minutes=0),
+    )
+    streamed = list(event_svc_integration.stream_in_time_range(time_range, root))
+    assert len(streamed) == 3
+    assert streamed == event_svc_integration.get_events_in_time_range(time_range, root)
+
+
+def test_stream_loads_events_in_batches(
+    event_svc_integration: EventService, monkeypatch: pytest.MonkeyPatch
+):
+    """Test that events are read as they are streamed rather than all at once."""
+    monkeypatch.setattr(event_service_module, "STREAM_BATCH_SIZE", 1)
+    session = event_svc_integration._session
+    session.expunge_all()
+
+    streamed = event_svc_integration.stream()
+    assert len(session.identity_map) == 0
+    first = next(streamed)
+    loaded = [o for o in session.identity_map.values() if isinstance(o, EventEntity)]
+    assert [entity.id for entity in loaded] == [first.id]
+    assert 1 + len(list(streamed)) == len(events)
+
+
 def test_create_enforces_permission(event_svc_integration: EventService):
     """Test that the service enforces permissions when attempting to create an event."""
 
@@ -270,6 +317,21 @@ def test_update_event_as_organizer(event_svc_integration: EventService):
     assert event_svc_integration.get_by_id(1).location == "Fetzer Gym"
 
 
+def test_update_event_version(event_svc_integration: EventService):
+    """Test that updates increment an event's version and stale versions conflict."""
+    updated = event_svc_integration.update(
+        root, updated_event_one.model_copy(update={"version": 1})
+    )
+    assert updated.version == 2
+    with pytest.raises(VersionConflictException) as conflict:
+        event_svc_integration.update(
+            root,
+            updated_event_one.model_copy(update={"name": "Stale", "version": 1}),
+        )
+    assert conflict.value.current.name == "Carolina Data Challenge"  # type: ignore
+    assert event_svc_integration.get_by_id(1).name == "Carolina Data Challenge"
+
+
 def test_update_event_as_user(event_svc_integration: EventService):
     """Test that any user is *unable* to create new events."""
     with pytest.raises(UserPermissionException):
@@ -370,6 +432,31 @@ def test_get_registrations_of_event_as_organizer(event_svc_integration: EventSer
     assert len(event_registrations) == 2
 
 
+def test_get_managed_events(event_svc_integration: EventService):
+    """Test that users manage the events they organize, and admins manage every event."""
+    assert [event.id for event in event_svc_integration.get_managed_events(user)] == [
+        event_one.id
+    ]
+    assert len(event_svc_integration.get_managed_events(root)) == len(events)
+    assert event_svc_integration.get_managed_events(ambassador) == []
+
+
+def test_get_managed_registrations(event_svc_integration: EventService):
+    """Test that organizers manage the registrations of their events, and admins all."""
+    time_range = TimeRange(
+        start=date_maker(days_in_future=1, hour=0, minutes=0),
+        end=date_maker(days_in_future=3, hour=0, minutes=0),
+    )
+    registrations = event_svc_integration.get_managed_registrations(user, time_range)
+    assert {registration.event_id for registration in registrations} == {event_one.id}
+    assert {registration.user_id for registration in registrations} == {
+        ambassador.id,
+        user.id,
+    }
+    assert len(event_svc_integration.get_managed_registrations(root, time_range)) == 3
+    assert event_svc_integration.get_managed_registrations(ambassador, time_range) == []
+
+
 def test_get_registrations_of_event_non_organizer(event_svc_integration: EventService):
     event_details = event_svc_integration.get_by_id(event_one.id, ambassador)  # type: ignore
     with pytest.raises(UserPermissionException):
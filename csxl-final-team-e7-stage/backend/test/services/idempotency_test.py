@@ -0,0 +1,147 @@
+"""Tests for claiming idempotency keys and replaying the responses of their requests."""
+
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import update
+from sqlalchemy.orm import Session
+from starlette.requests import Request
+
+# Tested Dependencies
+from ...api.idempotency import idempotent_json_response
+from ...entities import IdempotencyKeyEntity
+from ...models.public_user import PublicUser
+from ...services.idempotency import IDEMPOTENCY_KEY_TTL, IdempotencyService
+from ...services.exceptions import (
+    IdempotencyKeyInProgressException,
+    IdempotencyKeyReusedException,
+)
+
+# Data Setup and Injected Service Fixtures
+from .core_data import setup_insert_data_fixture
+
+# Data Models for Fake Data Inserted in Setup
+from .user_data import ambassador, user
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+KEY = "2f1c5a8e-retry"
+
+
+@pytest.fixture()
+def idempotency_svc(session: Session):
+    return IdempotencyService(session)
+
+
+def _request(path: str) -> Request:
+    return Request(
+        {
+            "type": "http",
+            "method": "POST",
+            "path": path,
+            "query_string": b"",
+            "headers": [],
+        }
+    )
+
+
+def test_claim_then_replay(idempotency_svc: IdempotencyService):
+    assert idempotency_svc.claim(ambassador, KEY, "a") is None
+    idempotency_svc.complete(ambassador, KEY, b'{"id":1}')
+    assert idempotency_svc.claim(ambassador, KEY, "a") == b'{"id":1}'
+
+
+def test_keys_are_per_user(idempotency_svc: IdempotencyService):
+    assert idempotency_svc.claim(ambassador, KEY, "a") is None
+    assert idempotency_svc.claim(user, KEY, "a") is None
+
+
+def test_key_reused_for_another_request(idempotency_svc: IdempotencyService):
+    idempotency_svc.claim(ambassador, KEY, "a")
+    idempotency_svc.complete(ambassador, KEY, b"{}")
+    with pytest.raises(IdempotencyKeyReusedException):
+        idempotency_svc.claim(ambassador, KEY, "b")
+
+
+def test_committed_claim_without_response(
+    session: Session, idempotency_svc: IdempotencyService
+):
+    idempotency_svc.claim(ambassador, KEY, "a")
+    session.commit()
+    with pytest.raises(IdempotencyKeyInProgressException):
+        idempotency_svc.claim(ambassador, KEY, "a")
+
+
+def test_expired_keys_can_be_claimed_again(
+    session: Session, idempotency_svc: IdempotencyService
+):
+    idempotency_svc.claim(ambassador, KEY, "a")
+    idempotency_svc.complete(ambassador, KEY, b"{}")
+    session.execute(
+        update(IdempotencyKeyEntity).values(
+            created_at=datetime.now() - IDEMPOTENCY_KEY_TTL - timedelta(minutes=1)
+        )
+    )
+    assert idempotency_svc.claim(ambassador, KEY, "b") is None
+
+
+@pytest.mark.parametrize("commit", [True, False])
+def test_concurrent_duplicate_waits_for_first_attempt(
+    session: Session, idempotency_svc: IdempotencyService, commit: bool
+):
+    """A duplicate replays the first attempt if it commits, or runs if it rolls back."""
+    assert idempotency_svc.claim(ambassador, KEY, "a") is None
+
+    def duplicate() -> bytes | None:
+        with Session(session.get_bind()) as duplicate_session:
+            claimed = IdempotencyService(duplicate_session).claim(ambassador, KEY, "a")
+            duplicate_session.rollback()
+            return claimed
+
+    with ThreadPoolExecutor(1) as executor:
+        replay = executor.submit(duplicate)
+        with pytest.raises(TimeoutError):
+            replay.result(timeout=0.5)
+        idempotency_svc.complete(ambassador, KEY, b'{"id":1}')
+        if commit:
+            session.commit()
+            assert replay.result(timeout=10) == b'{"id":1}'
+        else:
+            session.rollback()
+            assert replay.result(timeout=10) is None
+
+
+def test_idempotent_json_response_runs_operation_once(
+    idempotency_svc: IdempotencyService,
+):
+    runs: list[PublicUser] = []
+
+    def operation() -> PublicUser:
+        runs.append(PublicUser.model_validate(ambassador.model_dump()))
+        return runs[-1]
+
+    request = _request("/api/events/1/registration")
+    first = idempotent_json_response(
+        request, ambassador, KEY, idempotency_svc, operation
+    )
+    retry = idempotent_json_response(
+        request, ambassador, KEY, idempotency_svc, operation
+    )
+    assert len(runs) == 1
+    assert retry.body == first.body  # type: ignore[union-attr]
+    assert retry.headers["Idempotent-Replayed"] == "true"  # type: ignore[union-attr]
+
+    with pytest.raises(IdempotencyKeyReusedException):
+        idempotent_json_response(
+            _request("/api/events/2/registration"),
+            ambassador,
+            KEY,
+            idempotency_svc,
+            operation,
+        )
+    assert (
+        idempotent_json_response(request, ambassador, None, idempotency_svc, operation)
+        is runs[-1]
+    )
@@ -7,10 +7,14 @@ from unittest.mock import create_autospec
 from backend.services.exceptions import (
     UserPermissionException,
     ResourceNotFoundException,
+    VersionConflictException,
 )
 
 # Tested Dependencies
+from ....entities import OrganizationMemberEntity
 from ....models import Organization
+from ....models.member_role import MemberRole
+from ....models.semester import Semester
 from ....services import OrganizationService
 
 # Injected Service Fixtures
@@ -24,6 +28,7 @@ from .organization_test_data import (
     organizations,
     to_add,
     cads,
+    cssg,
     new_cads,
     to_add_conflicting_id,
     organization_member1,
@@ -49,6 +54,40 @@ def test_get_all(organization_svc_integration: OrganizationService):
     assert isinstance(fetched_organizations[0], Organization)
 
 
+def test_stream(organization_svc_integration: OrganizationService):
+    """Test that streamed organizations are those retrieved by `all`."""
+    streamed = list(organization_svc_integration.stream())
+    assert sorted(streamed, key=lambda organization: organization.id) == sorted(
+        organization_svc_integration.all(), key=lambda organization: organization.id
+    )
+
+
+# Test `OrganizationService.get_managed_organizations()`
+
+
+def test_get_managed_organizations(organization_svc_integration: OrganizationService):
+    """Test that admins manage every organization, and leaders manage those they lead."""
+    managed = organization_svc_integration.get_managed_organizations(root)
+    assert [organization.name for organization in managed] == sorted(
+        organization.name for organization in organizations
+    )
+    assert organization_svc_integration.get_managed_organizations(ambassador) == []
+
+    organization_svc_integration._session.add(
+        OrganizationMemberEntity(
+            organization_id=cssg.id,
+            user_id=ambassador.id,
+            role=MemberRole.LEADER,
+            year=2024,
+            semester=Semester.SPRING,
+        )
+    )
+    managed = organization_svc_integration.get_managed_organizations(ambassador)
+    assert [organization.slug for organization in managed] == [cssg.slug]
+    assert organization_svc_integration.check_orgmember_perms(ambassador, cssg)
+    assert not organization_svc_integration.check_orgmember_perms(ambassador, cads)
+
+
 # Test `OrganizationService.get_by_id()`
 
 
@@ -173,6 +212,21 @@ def test_update_organization_as_root(
     )
 
 
+def test_update_organization_version(
+    organization_svc_integration: OrganizationService,
+):
+    """Test that updates increment an organization's version and stale versions conflict."""
+    updated = organization_svc_integration.update(
+        root, new_cads.model_copy(update={"version": 1})
+    )
+    assert updated.version == 2
+    with pytest.raises(VersionConflictException) as conflict:
+        organization_svc_integration.update(
+            root, new_cads.model_copy(update={"website": "stale", "version": 1})
+        )
+    assert conflict.value.current.website == "https://cads.cs.unc.edu/"  # type: ignore
+
+
 def test_update_organization_as_user(organization_svc_integration: OrganizationService):
     """Test that any user is *unable* to update new organizations."""
     with pytest.raises(UserPermissionException):
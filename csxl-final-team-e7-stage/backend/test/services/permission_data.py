@@ -5,6 +5,7 @@ from sqlalchemy.orm import Session
 from ...entities.permission_entity import PermissionEntity
 
 from ...models.permission import Permission
+from ...services import effective_permission
 
 from . import role_data
 from .reset_table_id_seq import reset_table_id_seq
@@ -47,6 +48,8 @@ def insert_fake_data(session: Session):
         session, PermissionEntity, PermissionEntity.id, len(permissions) + 1
     )
 
+    effective_permission.rebuild(session)
+
 
 @pytest.fixture(autouse=True)
 def fake_data_fixture(session: Session):
@@ -1,6 +1,7 @@
 """Tests for the PermissionService class."""
 
 import pytest
+from typing import Callable
 
 # Tested Dependencies
 from ...models import Permission, User
@@ -82,48 +83,93 @@ def test_root_resource_access(permission_svc: PermissionService):
     assert permission_svc.check(root, "user.delete", "user/1")
 
 
+def _checker(
+    permission_svc: PermissionService, permission: Permission
+) -> Callable[[str, str], bool]:
+    """Grant user, who has no other permissions, a permission, and check it both by
+    querying effective permissions and by the user's Grants, which must agree."""
+    permission_svc.grant(root, user, permission)
+    grants = permission_svc.get_grants(user)
+
+    def check(action: str, resource: str) -> bool:
+        allowed = permission_svc.check(user, action, resource)
+        assert grants.check(action, resource) is allowed
+        return allowed
+
+    return check
+
+
 def test_check_catch_all_permission(permission_svc: PermissionService):
     """Tests that you can create a user with all permissions"""
-    p = Permission(action="*", resource="*")
-    assert permission_svc._check_permission(p, "permission.grant", "*")
-    assert permission_svc._check_permission(p, "permission.grant", "checkin")
-    assert permission_svc._check_permission(p, "permission.revoke", "checkin.*")
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1")
+    check = _checker(permission_svc, Permission(action="*", resource="*"))
+    assert check("permission.grant", "*")
+    assert check("permission.grant", "checkin")
+    assert check("permission.revoke", "checkin.*")
+    assert check("checkin.delete", "checkin/1")
 
 
 def test_check_catch_all_resource_permission(permission_svc: PermissionService):
     """Tests that that all resource permissions can be given to a user using *"""
-    p = Permission(action="permission.grant", resource="*")
-    assert permission_svc._check_permission(p, "permission.grant", "*")
-    assert permission_svc._check_permission(p, "permission.grant", "checkin")
-    assert (
-        permission_svc._check_permission(p, "permission.revoke", "checkin.*") is False
+    check = _checker(
+        permission_svc, Permission(action="permission.grant", resource="*")
     )
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1") is False
+    assert check("permission.grant", "*")
+    assert check("permission.grant", "checkin")
+    assert check("permission.revoke", "checkin.*") is False
+    assert check("checkin.delete", "checkin/1") is False
 
 
 def test_check_specific_resource_permission(permission_svc: PermissionService):
     """Tests giving a specific resource permission to a user"""
-    p = Permission(action="permission.grant", resource="checkin*")
-    assert permission_svc._check_permission(p, "permission.grant", "*") is False
-    assert permission_svc._check_permission(p, "permission.grant", "checkin")
-    assert (
-        permission_svc._check_permission(p, "permission.revoke", "checkin.*") is False
+    check = _checker(
+        permission_svc, Permission(action="permission.grant", resource="checkin*")
     )
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1") is False
+    assert check("permission.grant", "*") is False
+    assert check("permission.grant", "checkin")
+    assert check("permission.revoke", "checkin.*") is False
+    assert check("checkin.delete", "checkin/1") is False
 
 
 def test_check_specific_permission(permission_svc: PermissionService):
     """Tests that you can create a user with a specific permission"""
-    p = Permission(action="checkin.delete", resource="checkin/*")
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/1")
-    assert permission_svc._check_permission(p, "checkin.delete", "checkin/12")
-    assert permission_svc._check_permission(p, "checkin.create", "checkin/12") is False
+    check = _checker(
+        permission_svc, Permission(action="checkin.delete", resource="checkin/*")
+    )
+    assert check("checkin.delete", "checkin/1")
+    assert check("checkin.delete", "checkin/12")
+    assert check("checkin.create", "checkin/12") is False
+    assert check("permission.revoke", "checkin.*") is False
+
+
+def test_check_nonexistent_user(permission_svc: PermissionService):
+    """Test covers the edge case of checking the permissions of a user that does not exist"""
+    assert permission_svc.check(User(id=423), "checkin.create", "checkin") is False
     assert (
-        permission_svc._check_permission(p, "permission.revoke", "checkin.*") is False
+        permission_svc.get_grants(User(id=423)).check("checkin.create", "checkin")
+        is False
     )
+    assert permission_svc.get_permissions(User(id=423)) == []
 
 
-def test_get_user_roles_permissions(permission_svc: PermissionService):
-    """Test covers an edge case of _get_user_roles_permissions when user does not exist"""
-    assert permission_svc._get_user_roles_permissions(User(id=423)) == []
+def test_check_many(permission_svc: PermissionService):
+    """Tests that a batch of checks agrees with checking each one"""
+    permission_svc.grant(
+        root, user, Permission(action="organization.*", resource="organization/cads")
+    )
+    checks = [
+        ("checkin.create", "checkin"),
+        ("organization.update", "organization/cads"),
+        ("organization.update", "organization/appteam"),
+        ("permission.grant", "permission"),
+    ]
+    for subject in [root, ambassador, user]:
+        assert permission_svc.check_many(subject, checks) == [
+            permission_svc.check(subject, action, resource)
+            for action, resource in checks
+        ]
+
+
+def test_get_grants_without_user(permission_svc: PermissionService):
+    """Tests that anonymous and unknown users hold no permissions"""
+    assert permission_svc.get_grants(None).check("checkin.create", "checkin") is False
+    assert permission_svc.check_many(User(id=423), [("*", "*")]) == [False]
@@ -0,0 +1,84 @@
+"""Helpers for asserting that the queries a service runs are supported by indexes.
+
+Test datasets are small enough that PostgreSQL prefers sequential scans no matter
+which indexes exist, so plans are explained with sequential scans disabled. A plan
+that still reads a table in full to evaluate a filter then has no usable index.
+"""
+
+from contextlib import contextmanager
+from typing import Any, Iterable, Iterator
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+CapturedQuery = tuple[str, Any]
+
+
+@contextmanager
+def capture_queries(session: Session) -> Iterator[list[CapturedQuery]]:
+    """Record the SELECT statements, and their parameters, executed by a session."""
+    queries: list[CapturedQuery] = []
+    engine = session.get_bind()
+
+    def before_cursor_execute(
+        conn, cursor, statement, parameters, context, executemany
+    ):
+        if not executemany and statement.lstrip().upper().startswith("SELECT"):
+            queries.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", before_cursor_execute)
+    try:
+        yield queries
+    finally:
+        event.remove(engine, "before_cursor_execute", before_cursor_execute)
+
+
+def explain(session: Session, statement: str, parameters: Any = None) -> dict:
+    """The JSON plan of a statement, chosen with sequential scans disabled."""
+    connection = session.connection()
+    connection.exec_driver_sql("SET LOCAL enable_seqscan = off")
+    try:
+        return connection.exec_driver_sql(
+            f"EXPLAIN (FORMAT JSON) {statement}", parameters
+        ).scalar()[0]["Plan"]
+    finally:
+        connection.exec_driver_sql("RESET enable_seqscan")
+
+
+def unindexed_scans(plan: dict, allowed_tables: Iterable[str] = ()) -> list[str]:
+    """Describe each scan in a plan that filters a table without using an index.
+
+    These are sequential scans, and scans with a filter but no index condition. Scans of `allowed_tables`, such as small lookup tables, are ignored.
+    """
+    allowed = set(allowed_tables)
+    scans: list[str] = []
+    nodes = [plan]
+    while nodes:
+        node = nodes.pop()
+        nodes.extend(node.get("Plans", []))
+        table = node.get("Relation Name")
+        if table is None or table in allowed:
+            continue
+        if node["Node Type"] == "Seq Scan" or (
+            "Filter" in node and "Index Cond" not in node and "Recheck Cond" not in node
+        ):
+            scans.append(f'{node["Node Type"]} on {table}: {node.get("Filter", "")}')
+    return scans
+
+
+def assert_queries_use_indexes(
+    session: Session,
+    queries: Iterable[CapturedQuery],
+    allowed_tables: Iterable[str] = (),
+) -> None:
+    """Fail when any of the captured queries filters a table without an index."""
+    allowed_tables = tuple(allowed_tables)
+    failures = []
+    for statement, parameters in queries:
+        scans = unindexed_scans(explain(session, statement, parameters), allowed_tables)
+        if len(scans) > 0:
+            failures.append("\n  ".join([" ".join(statement.split()), *scans]))
+    assert failures == [], "Queries without a supporting index:\n" + "\n".join(failures)
@@ -0,0 +1,138 @@
+"""Tests that the hottest service queries are supported by indexes.
+
+Each test captures the statements a service method executes against the seeded test
+dataset and explains them; see `query_plan` for how plans are checked."""
+
+from datetime import datetime, timedelta
+from sqlalchemy.orm import Session
+from ...models import EventPaginationParams
+from ...models.coworking import TimeRange
+from ...services import (
+    EventService,
+    OrganizationService,
+    PermissionService,
+    UserService,
+)
+from ...services.academics import SectionService
+from ...services.coworking import ReservationService, SeatService
+from .query_plan import assert_queries_use_indexes, capture_queries
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import (
+    user_svc_integration,
+    event_svc_integration,
+    organization_svc_integration,
+)
+from .coworking.fixtures import (
+    permission_svc,
+    reservation_svc,
+    policy_svc,
+    operating_hours_svc,
+    seat_svc,
+)
+from .academics.fixtures import section_svc
+from .coworking.time import *
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+from .core_data import setup_insert_data_fixture as insert_order_0
+from .academics.term_data import fake_data_fixture as insert_order_1
+from .academics.course_data import fake_data_fixture as insert_order_2
+from .academics.section_data import fake_data_fixture as insert_order_3
+from .coworking.operating_hours_data import fake_data_fixture as insert_order_4
+from .room_data import fake_data_fixture as insert_order_5
+from .coworking.seat_data import fake_data_fixture as insert_order_6
+from .coworking.reservation.reservation_data import fake_data_fixture as insert_order_7
+
+# Import the fake model data in a namespace for test assertions
+from . import user_data
+from .academics import term_data
+from .organization import organization_test_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+# Small lookup tables that are read in full by design
+LOOKUP_TABLES = (
+    "role",
+    "room",
+    "academics__term",
+    "coworking__seat",
+    "coworking__operating_hours",
+    "coworking__operating_hours_recurrence",
+)
+
+
+def test_user_queries_use_indexes(session: Session, user_svc_integration: UserService):
+    with capture_queries(session) as queries:
+        user_svc_integration.get(user_data.user.pid)
+        user_svc_integration.get_by_id(user_data.user.id)
+    assert_queries_use_indexes(session, queries, LOOKUP_TABLES)
+
+
+def test_permission_queries_use_indexes(
+    session: Session, permission_svc: PermissionService
+):
+    with capture_queries(session) as queries:
+        permission_svc.check(user_data.ambassador, "checkin.create", "checkin")
+        permission_svc.get_user_ids_with_permission(
+            "organization.update", "organization/cads"
+        )
+    assert_queries_use_indexes(session, queries, LOOKUP_TABLES)
+
+
+def test_event_queries_use_indexes(
+    session: Session, event_svc_integration: EventService, time: dict[str, datetime]
+):
+    week = TimeRange(start=time[A_WEEK_AGO], end=time[NOW] + timedelta(weeks=1))
+    with capture_queries(session) as queries:
+        event_svc_integration.get_paginated_events(
+            EventPaginationParams(
+                range_start=week.start.strftime("%d/%m/%Y, %H:%M:%S"),
+                range_end=week.end.strftime("%d/%m/%Y, %H:%M:%S"),
+            ),
+            user_data.user,
+        )
+        event_svc_integration.get_events_by_organization(
+            organization_test_data.cads, user_data.user
+        )
+        event_svc_integration.get_registrations_of_user(
+            user_data.user, user_data.user, week
+        )
+    assert_queries_use_indexes(session, queries, LOOKUP_TABLES)
+
+
+def test_organization_queries_use_indexes(
+    session: Session, organization_svc_integration: OrganizationService
+):
+    with capture_queries(session) as queries:
+        organization_svc_integration.get_by_slug(organization_test_data.cads.slug)
+        organization_svc_integration.get_organizations_from_member(
+            user_data.user, user_data.user, False
+        )
+    assert_queries_use_indexes(session, queries, LOOKUP_TABLES)
+
+
+def test_section_queries_use_indexes(session: Session, section_svc: SectionService):
+    with capture_queries(session) as queries:
+        section_svc.get_by_term(term_data.f_23.id)
+    assert_queries_use_indexes(session, queries, LOOKUP_TABLES)
+
+
+def test_reservation_queries_use_indexes(
+    session: Session,
+    reservation_svc: ReservationService,
+    seat_svc: SeatService,
+    time: dict[str, datetime],
+):
+    with capture_queries(session) as queries:
+        reservation_svc.get_current_reservations_for_user(
+            user_data.user, user_data.user
+        )
+        reservation_svc.get_seat_reservations(
+            seat_svc.list(), TimeRange(start=time[NOW], end=time[IN_EIGHT_HOURS])
+        )
+        reservation_svc.get_map_reserved_times_by_date(time[NOW], user_data.user)
+        reservation_svc._get_total_time_user_reservations(user_data.user)
+    assert_queries_use_indexes(session, queries, LOOKUP_TABLES)
@@ -0,0 +1,120 @@
+"""Tests for the cached, serialized responses of catalog listings."""
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import Engine
+from sqlalchemy.orm import Session
+from ... import database
+from ...api import organizations, room
+from ...api.compression import CompressionMiddleware
+from ...api.academics import course, term
+from ...entities import RoomEntity
+from ...services import OrganizationService, RoomService
+from ...services import response_cache
+from ...services.academics import CourseService, TermService
+from ...services.permission import PermissionService
+from ...services.response_cache import catalog_responses
+
+# Imported fixtures provide dependencies injected for the tests as parameters.
+from .fixtures import room_svc
+
+# Import the setup_teardown fixture explicitly to load entities in database.
+# The order in which these fixtures run is dependent on their imported alias.
+from .core_data import setup_insert_data_fixture as insert_order_0
+from .academics.term_data import fake_data_fixture as insert_order_1
+from .academics.course_data import fake_data_fixture as insert_order_2
+from .academics.section_data import fake_data_fixture as insert_order_3
+from .room_data import fake_data_fixture as insert_order_4
+
+# Import the fake model data in a namespace for test assertions
+from . import user_data
+
+__authors__ = ["Kris Jordan"]
+__copyright__ = "Copyright 2024"
+__license__ = "MIT"
+
+
+@pytest.fixture()
+def client(session: Session, test_engine: Engine, monkeypatch: pytest.MonkeyPatch):
+    """An app serving the catalog listings from an empty cache and the test database."""
+    monkeypatch.setattr(database, "engine", test_engine)
+    monkeypatch.setattr(database, "read_engine", test_engine)
+    monkeypatch.setattr(response_cache, "_cache", response_cache.ResponseCache())
+    app = FastAPI()
+    app.add_middleware(CompressionMiddleware)
+    for feature_api in (term, course, room, organizations):
+        app.include_router(feature_api.api)
+    return TestClient(app)
+
+
+def _listings(session: Session) -> dict[str, list]:
+    permission_svc = PermissionService(session)
+    return {
+        "/api/academics/term": TermService(session, permission_svc).all(),
+        "/api/academics/course": CourseService(session, permission_svc).all(),
+        "/api/room": RoomService(session, permission_svc).all(),
+        "/api/organizations": OrganizationService(session, permission_svc).all(),
+    }
+
+
+def test_cached_listings_match_models(session: Session, client: TestClient):
+    for path, models in _listings(session).items():
+        expected = [model.model_dump(mode="json") for model in models]
+        assert client.get(path).json() == expected
+        assert client.get(path).json() == expected
+    assert len(catalog_responses()) == 4
+
+
+def test_repeat_requests_are_served_from_cache(session: Session, client: TestClient):
+    rooms = client.get("/api/room").json()
+    session.get(RoomEntity, "SN135").nickname = "The Nest"
+    session.commit()
+    assert client.get("/api/room").json() == rooms
+
+
+def test_service_writes_invalidate_after_commit(
+    session: Session, client: TestClient, room_svc: RoomService
+):
+    client.get("/api/room")
+    room = room_svc.get_by_id("SN135")
+    room.nickname = "The Nest"
+    room_svc.update(user_data.root, room)
+    client.get("/api/room")
+    session.commit()
+    nicknames = {
+        room["id"]: room["nickname"] for room in client.get("/api/room").json()
+    }
+    assert nicknames["SN135"] == "The Nest"
+
+
+def test_bodies_loaded_before_a_write_are_not_stored():
+    cache = response_cache.ResponseCache()
+    version = cache.version("room")
+    cache.invalidate("room")
+    cache.put("room", version, b"[]")
+    assert cache.get("room") is None
+    cache.put("room", cache.version("room"), b"[]")
+    assert cache.get("room").body == b"[]"
+
+
+def test_bodies_are_not_stored_until_replica_settles(monkeypatch: pytest.MonkeyPatch):
+    monkeypatch.setattr(database, "read_engine", object())
+    cache = response_cache.ResponseCache()
+    cache.invalidate("room")
+    cache.put("room", cache.version("room"), b"[]")
+    assert cache.get("room") is None
+    monkeypatch.setattr(database, "READ_YOUR_WRITES_SECONDS", 0)
+    cache.invalidate("room")
+    cache.put("room", cache.version("room"), b"[]")
+    assert cache.get("room") is not None
+
+
+def test_precompressed_bodies_are_sent_to_clients_accepting_gzip(client: TestClient):
+    gzipped = client.get("/api/academics/course", headers={"Accept-Encoding": "gzip"})
+    assert gzipped.headers["Content-Encoding"] == "gzip"
+    assert gzipped.headers["Vary"] == "Accept-Encoding"
+    plain = client.get("/api/academics/course", headers={"Accept-Encoding": "identity"})
+    assert "Content-Encoding" not in plain.headers
+    assert plain.json() == gzipped.json()
+    assert len(plain.content) > len(catalog_responses().get("course").gzipped)
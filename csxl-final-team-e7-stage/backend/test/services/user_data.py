@@ -17,6 +17,7 @@ from backend.models.semester import Semester
 from ...models.user import User
 from ...entities.user_entity import UserEntity
 from ...entities.user_role_table import user_role_table
+from ...services import effective_permission
 from .reset_table_id_seq import reset_table_id_seq
 from . import role_data
 from .organization.organization_demo_data import appteam;
@@ -108,6 +109,8 @@ def insert_fake_data(session: Session):
                 )
             )
 
+    effective_permission.rebuild(session)
+
 
 @pytest.fixture(autouse=True)
 def fake_data_fixture(session: Session):
@@ -44,6 +44,15 @@ def test_get_nonexistent(user_svc_integration: UserService):
     assert user_svc_integration.get(423) is None
 
 
+def test_get_identity(user_svc: UserService, permission_svc_mock: PermissionService):
+    """Test that a user can be identified by PID without loading their permissions."""
+    user = user_svc.get_identity(ambassador.pid)
+    assert user == ambassador
+    assert type(user) is User
+    assert user_svc.get_identity(423) is None
+    permission_svc_mock.get_permissions.assert_not_called()
+
+
 def test_get_by_id(user_svc_integration: UserService):
     """Test that a user can be retrieved by their ID"""
     user = user_svc_integration.get_by_id(ambassador.id)  # type: ignore